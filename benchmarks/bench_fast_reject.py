@@ -0,0 +1,87 @@
+#--------------------------------------------------------------------
+# Benchmark of the fast-reject path of process(): mocked AbstractFiles
+# that are not PDF files (name and MIME type), default log level.
+# Autopsy is not needed (see tests/pdf_module.py).
+# Usage (from the root of the repository):
+#   python2 benchmarks/bench_fast_reject.py [num_files [module.py]]
+# num_files defaults to 10,000,000. module.py: another version of the
+# module to time instead, e.g., a previous revision:
+#   git show <rev>:digiSignedOrProtected_PDFs.py > /tmp/before.py
+# 2026-10-19
+#--------------------------------------------------------------------
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, "tests"))
+from pdf_module import load_module, C_MODULE_PATH_S
+
+C_NUM_FILES = 10 * 1000 * 1000
+C_DISTINCT_FILES = 1000
+
+class MockContext(object):
+    """ingest job context (never cancelled)"""
+    def fileIngestIsCancelled(self):
+        return False
+    def getJobId(self):
+        return 1
+
+class MockFile(object):
+    """AbstractFile that is not a PDF file"""
+    __slots__ = ("m_name_S",)
+    def __init__(self, name_S):
+        self.m_name_S = name_S
+    def getName(self):
+        return self.m_name_S
+    def isFile(self):
+        return True
+    def getType(self):
+        return 0
+    def getMIMEType(self):
+        return "image/jpeg"
+    def getSize(self):
+        return 1000
+    def getParentPath(self):
+        return "/Users/bob/Pictures/"
+
+class NullLogger(object):
+    def logp(self, *args_T):
+        pass
+
+def main():
+    num_files = C_NUM_FILES
+    if len(sys.argv) > 1:
+        num_files = int(sys.argv[1])
+    module_path_S = C_MODULE_PATH_S
+    if len(sys.argv) > 2:
+        module_path_S = sys.argv[2]
+    dsp = load_module(module_path_S)
+
+    # instance as set up by startUp (no settings needed by process())
+    cls = dsp.FindSignedPDFFilesIngestModule
+    module = cls.__new__(cls)
+    module.context = MockContext()
+    module._logger = NullLogger()
+    module.m_passive = False
+    module.m_carve = False
+    module.m_files_count = 0
+    module.m_not_pdf_count = 0
+
+    files_L = [MockFile("IMG_%07d.jpg" % (i)) for i in range(C_DISTINCT_FILES)]
+    start = time.time()
+    for i in xrange(num_files // C_DISTINCT_FILES):
+        for file in files_L:
+            module.process(file)
+    elapsed = time.time() - start
+    if hasattr(module, "flush_file_counters"):
+        module.flush_file_counters()
+
+    Factory = dsp.FindSignedPDFsFilesIngestModuleFactory
+    print "%s: %d files in %.2f s, %.2f us/file (files %d, not PDF %d)" %\
+            (os.path.basename(module_path_S), num_files, elapsed,
+             elapsed / num_files * 1e6, Factory.g_files_count,
+             Factory.g_NotPDFFiles_count)
+
+if __name__ == "__main__":
+    main()
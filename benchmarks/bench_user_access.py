@@ -0,0 +1,93 @@
+#--------------------------------------------------------------------
+# Benchmark of the decoding of the exiftool UserAccess values: decode
+# (user_access_to_int), labels (is_interesting_user_access and
+# user_access_numeric_to_str on the 128 masks) and both per file.
+# Autopsy is not needed (see tests/pdf_module.py).
+# Usage (from the root of the repository):
+#   python2 benchmarks/bench_user_access.py [module.py]
+# module.py: another version of the module to compare with, e.g., a
+# previous revision (its results must be the same):
+#   git show <rev>:digiSignedOrProtected_PDFs.py > /tmp/before.py
+# 2026-10-19
+#--------------------------------------------------------------------
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, "tests"))
+from pdf_module import load_module, C_MODULE_PATH_S
+
+C_NUM_FILES = 20000
+C_DISTINCT_VALUES = 40
+C_REPEAT = 5
+C_PERMISSION_NAMES_L = ["Print", "Modify", "Copy", "Annotate", "Fill forms",
+                        "Extract", "Assemble", "Print high-res"]
+
+class NullOutput(object):
+    """stdout of the older versions (they print while decoding)"""
+    def write(self, S):
+        pass
+
+def decode(dsp, values_L):
+    for value_S in values_L:
+        dsp.user_access_to_int(value_S)
+
+def labels(dsp, masks_L):
+    for mask in masks_L:
+        dsp.is_interesting_user_access(mask)
+        dsp.user_access_numeric_to_str(mask)
+
+def per_file(dsp, values_L):
+    for value_S in values_L:
+        mask = dsp.user_access_to_int(value_S)
+        dsp.is_interesting_user_access(mask)
+        dsp.user_access_numeric_to_str(mask)
+
+def time_us(fn, dsp, args_L):
+    """best time of C_REPEAT runs, in us per item"""
+    stdout = sys.stdout
+    sys.stdout = NullOutput()
+    try:
+        secs = min(timeit.repeat(lambda: fn(dsp, args_L), number=1,
+                                                        repeat=C_REPEAT))
+    finally:
+        sys.stdout = stdout
+    return secs / len(args_L) * 1e6
+
+def results_L(dsp, values_L):
+    stdout = sys.stdout
+    sys.stdout = NullOutput()
+    try:
+        return [dsp.user_access_to_int(value_S) for value_S in values_L] +\
+               [(bool(dsp.is_interesting_user_access(mask)),
+                 dsp.user_access_numeric_to_str(mask)) for mask in range(128)]
+    finally:
+        sys.stdout = stdout
+
+def main():
+    random.seed(1)
+    distinct_L = [", ".join(random.sample(C_PERMISSION_NAMES_L,
+                            random.randint(1, len(C_PERMISSION_NAMES_L))))
+                  for i in range(C_DISTINCT_VALUES)]
+    values_L = [random.choice(distinct_L) for i in range(C_NUM_FILES)]
+    masks_L = range(128) * 150
+
+    modules_L = [load_module(C_MODULE_PATH_S)]
+    if len(sys.argv) > 1:
+        modules_L.insert(0, load_module(sys.argv[1]))
+        if results_L(modules_L[0], distinct_L) !=\
+                                results_L(modules_L[1], distinct_L):
+            print "different results: not comparable"
+            return
+
+    for dsp in modules_L:
+        print "%s: decode %.2f us, labels %.2f us, per file %.2f us" %\
+                (os.path.basename(dsp.__file__).split(".")[0],
+                 time_us(decode, dsp, values_L),
+                 time_us(labels, dsp, masks_L),
+                 time_us(per_file, dsp, values_L))
+
+if __name__ == "__main__":
+    main()
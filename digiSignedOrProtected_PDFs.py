@@ -126,15 +126,19 @@ from org.sleuthkit.datamodel import ReadContentInputStream
 from org.sleuthkit.datamodel import BlackboardArtifact
 from org.sleuthkit.datamodel import BlackboardAttribute
 from org.sleuthkit.datamodel import TskData
+from org.sleuthkit.datamodel import TskFileRange
+from org.sleuthkit.datamodel import CarvingResult
 from org.sleuthkit.autopsy.ingest import IngestModule
 from org.sleuthkit.autopsy.ingest.IngestModule import IngestModuleException
 from org.sleuthkit.autopsy.ingest import FileIngestModule
+from org.sleuthkit.autopsy.ingest import DataSourceIngestModule
 from org.sleuthkit.autopsy.ingest import IngestModuleFactoryAdapter
 from org.sleuthkit.autopsy.ingest import IngestModuleIngestJobSettings
 from org.sleuthkit.autopsy.ingest import IngestModuleIngestJobSettingsPanel
 from org.sleuthkit.autopsy.ingest import IngestMessage
 from org.sleuthkit.autopsy.ingest import IngestServices
 from org.sleuthkit.autopsy.ingest import ModuleDataEvent
+from org.sleuthkit.autopsy.ingest import ModuleContentEvent
 from org.sleuthkit.autopsy.coreutils import Logger
 from org.sleuthkit.autopsy.casemodule import Case
 from org.sleuthkit.autopsy.casemodule.services import Services
@@ -169,7 +173,20 @@ from javax.swing import JButton
 import java.io.File
 from java.lang import Class
 from java.lang import System
+from java.lang import Runtime
+from java.lang.management import ManagementFactory
 from java.sql  import DriverManager, SQLException
+from java.security import KeyStore
+from java.security.cert import CertificateFactory
+from java.security.cert import CertPathValidator
+from java.security.cert import CertPathValidatorException
+from java.security.cert import PKIXParameters
+from java.io import ByteArrayInputStream
+from java.io import FileInputStream
+from java.util import Date
+from java.util import HashSet
+from java.util import ArrayList
+from javax.naming.ldap import LdapName
 
 
 import codecs   # To produce CSV utf-8 files
@@ -181,11 +198,44 @@ import subprocess
 from datetime import datetime
 import time
 import random
+import heapq
+import re
+import zlib
+import fnmatch
+import hashlib
+import binascii
+import collections
 
 
 from subprocess import PIPE, Popen
 import json
 import threading
+import Queue
+
+# resource (setrlimit) is only available on POSIX CPython. Without it,
+# tool limits fall back to the 'prlimit' command (Linux)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# CMS parser of the signature digests (see cms_signed_digests_T):
+# BouncyCastle (on Autopsy's classpath), else the JDK's own PKCS#7
+# parser (no timestamp tokens). None: no digest check
+try:
+    from org.bouncycastle.cms import CMSSignedData
+    from org.bouncycastle.asn1.cms import CMSAttributes
+    from org.bouncycastle.asn1.cms import Time
+    from org.bouncycastle.tsp import TimeStampToken
+    from org.bouncycastle.asn1.pkcs import PKCSObjectIdentifiers
+    C_CMS_PARSER_S = "bouncycastle"
+except ImportError:
+    try:
+        from sun.security.pkcs import PKCS7
+        from sun.security.pkcs import PKCS9Attribute
+        C_CMS_PARSER_S = "sun.security.pkcs"
+    except ImportError:
+        C_CMS_PARSER_S = None
 
 ##--------------------------------------------------------------------
 ## TODO:2018-05-19:g_lock to avoid repeated references to "threading.lock"? 
@@ -233,6 +283,22 @@ C_USER_ACCESS_D = {C_ASSEMBLE_S:C_ASSEMBLE,
                    C_MODIFY_S:C_MODIFY,
                    C_PRINT_S:C_PRINT}
 
+# Permission masks (all combinations of the C_USER_ACCESS_D bits), and
+# column letter of each bit in the permission histogram
+C_PERMISSION_MASKS = 1 << len(C_USER_ACCESS_D)
+C_PERMISSION_LETTERS_L = [(C_ASSEMBLE, "A", C_ASSEMBLE_S),
+                          (C_ANNOTATE, "N", C_ANNOTATE_S),
+                          (C_COPY, "C", C_COPY_S),
+                          (C_EXTRACT, "E", C_EXTRACT_S),
+                          (C_FILLFORMS, "F", C_FILLFORMS_S),
+                          (C_MODIFY, "M", C_MODIFY_S),
+                          (C_PRINT, "P", C_PRINT_S)]
+
+# exiftool's Encryption tag, e.g., "Standard V4.4 (128-bit AES)": key
+# length and algorithm (AES, else RC4 with a key length)
+C_ENCRYPTION_BITS_RE = re.compile(r"(\d+)-bit")
+C_ENCRYPTION_UNKNOWN = "unknown"
+
 #====================================================================
 # Configuration of DEBUG
 #====================================================================
@@ -270,6 +336,12 @@ C_LOG_ALL_COUNTED_FNAMES = "_log_name_COUNTED.log.txt"
 #------------------------------------------------
 C_DB_NAME = "SignedPDFs_Settings.db3"
 
+#------------------------------------------------
+# Name of the revocation store DB (SQLite, next
+# to the settings DB: shared by the cases)
+#------------------------------------------------
+C_REVOCATION_DB_NAME = "SignedPDFs_Revocation.db3"
+
 #------------------------------------------------
 # Fields to be saved/kept in the settings DB
 #------------------------------------------------
@@ -292,6 +364,989 @@ C_AssembleOFF_ModifyON  = "AssembleOFF_ModifyON"
 C_FILES_WITH_PERMISSIONS_KEY="C_FILES_WITH_PERMISSIONS"
 C_FILES_AssembleON_ModifyOFF_KEY="C_FILES_AssembleON_ModifyOFF"
 
+#------------------------------------------------
+# Names of the external tools (used as keys for
+# the per-tool counters and statistics)
+#------------------------------------------------
+C_TOOL_VERIFIER = "verifier"
+C_TOOL_EXIFTOOL = "exiftool"
+C_TOOLS_L = [C_TOOL_VERIFIER, C_TOOL_EXIFTOOL]
+
+#------------------------------------------------
+# Advanced settings.
+# They are kept in the settings DB as the other
+# settings, but they are edited through a single
+# "name=value" text area of the panel.
+# Each entry is (name, default value). The type of
+# the default value sets the type of the setting.
+#------------------------------------------------
+# Seconds between two writes of the live metrics file (0: disabled)
+C_METRICS_INTERVAL_FIELD = "metrics_interval_secs"
+
+# Number of most expensive tool runs listed in the final report
+C_TOOL_TOP_N_FIELD = "tool_top_n"
+
+# Per-process limits of the external tools (0: no limit).
+# Only enforced on Linux (setrlimit/prlimit, nice, ionice)
+C_TOOL_LIMIT_AS_MB_FIELD    = "tool_limit_address_space_mb"
+C_TOOL_LIMIT_CPU_SECS_FIELD = "tool_limit_cpu_secs"
+C_TOOL_LIMIT_NOFILE_FIELD   = "tool_limit_open_files"
+C_TOOL_NICE_FIELD           = "tool_nice"
+# ionice class: 0 (don't change), 1 (realtime), 2 (best-effort), 3 (idle)
+C_TOOL_IONICE_CLASS_FIELD   = "tool_ionice_class"
+
+# Retry queue (files whose copy or verifier run failed)
+C_RETRY_MAX_ATTEMPTS_FIELD = "retry_max_attempts"
+C_RETRY_BACKOFF_SECS_FIELD = "retry_backoff_secs"
+C_RETRY_THREADS_FIELD      = "retry_threads"
+
+# Checkpoint of the verdicts (resume of interrupted ingests)
+C_CHECKPOINT_FIELD = "checkpoint_enabled"
+
+# Adaptive number of concurrent runs (slots) of each external tool.
+# A max of 0 means "number of cores" (verifier) or "2 x number of
+# cores" (exiftool)
+C_ADAPTIVE_SLOTS_FIELD       = "adaptive_tool_slots"
+C_VERIFIER_SLOTS_MIN_FIELD   = "verifier_slots_min"
+C_VERIFIER_SLOTS_MAX_FIELD   = "verifier_slots_max"
+C_EXIFTOOL_SLOTS_MIN_FIELD   = "exiftool_slots_min"
+C_EXIFTOOL_SLOTS_MAX_FIELD   = "exiftool_slots_max"
+C_ADAPTIVE_WINDOW_SECS_FIELD = "adaptive_window_secs"
+
+# Triage pass that decides whether the verifier is needed. Its native
+# scan decodes the #xx escapes of the PDF names (e.g., /Byte#52ange is
+# /ByteRange): an escaped signature name is an indicator, so the file
+# goes to the verifier, as with an escaped /ObjStm (incomplete scan)
+C_TRIAGE_FIELD = "triage_before_verifier"
+
+# Verifier and exiftool run in parallel (shared tool executor) for the
+# files that need both. 0 executor threads means "2 x number of cores"
+C_PARALLEL_CHECKS_FIELD       = "parallel_checks"
+C_TOOL_EXECUTOR_THREADS_FIELD = "tool_executor_threads"
+
+# Deferred analysis: process() queues the PDF files to the module's
+# own pool of workers and returns at once. 0 workers means "number of
+# cores". process() blocks when deferred_queue_max files are queued
+C_DEFERRED_ANALYSIS_FIELD  = "deferred_analysis"
+C_DEFERRED_WORKERS_FIELD   = "deferred_workers"
+C_DEFERRED_QUEUE_MAX_FIELD = "deferred_queue_max"
+
+# Ingest mode: "file" (callback for every file of the image) or
+# "data_source" (the PDF candidates are queried in bulk and analyzed by
+# data_source_workers threads; 0 means "number of cores")
+C_INGEST_MODE_FIELD          = "ingest_mode"
+C_DATA_SOURCE_WORKERS_FIELD  = "data_source_workers"
+C_INGEST_MODE_FILE           = "file"
+C_INGEST_MODE_DATA_SOURCE    = "data_source"
+
+# Files marked KNOWN (e.g., NSRL) by the hash lookup module:
+# "analyze" (as any other file), "skip", or "cached_only" (reported
+# from a cached verdict, never given to the tools).
+# known_verdicts_file: CSV file with the verdicts of a previous case
+# (see C_KNOWN_VERDICTS_FNAME), looked up by MD5
+C_KNOWN_FILES_FIELD          = "known_files"
+C_KNOWN_VERDICTS_FILE_FIELD  = "known_verdicts_file"
+C_KNOWN_FILES_ANALYZE        = "analyze"
+C_KNOWN_FILES_SKIP           = "skip"
+C_KNOWN_FILES_CACHED_ONLY    = "cached_only"
+
+# Path filters on the parent path of the PDF files (see PathFilter):
+# lists of globs and regexes separated by C_PATH_FILTER_SEP_S.
+# Exclusions win; with inclusions, only matching paths are analyzed
+C_PATH_INCLUDE_GLOBS_FIELD   = "path_include_globs"
+C_PATH_EXCLUDE_GLOBS_FIELD   = "path_exclude_globs"
+C_PATH_INCLUDE_REGEXES_FIELD = "path_include_regexes"
+C_PATH_EXCLUDE_REGEXES_FIELD = "path_exclude_regexes"
+C_PATH_FILTER_SEP_S          = ";"
+
+# Budgeted triage (first response): wall-clock and/or volume budget
+# per data source (0: no limit, both 0: off). Likely interesting PDF
+# files go first, the others are deferred and recorded (see
+# C_BUDGET_DEFERRED_FNAME). With budget_deferred_only, only the files
+# deferred by a previous run are analyzed
+C_BUDGET_SECS_FIELD          = "budget_secs"
+C_BUDGET_MB_FIELD            = "budget_mb"
+C_BUDGET_DEFERRED_ONLY_FIELD = "budget_deferred_only"
+
+# Carving of PDF files from unallocated space (UNALLOC_BLOCKS and
+# UNUSED_BLOCKS "files"). The carved files are added to the case and
+# analyzed like the other PDF files. carve_max_mb is the max size of
+# a carved file; with carve_signed_only, only the PDF files with a
+# /ByteRange are carved
+C_CARVE_UNALLOCATED_FIELD = "carve_unallocated"
+C_CARVE_MAX_MB_FIELD      = "carve_max_mb"
+C_CARVE_SIGNED_ONLY_FIELD = "carve_signed_only"
+
+# PDF files embedded in PDF files (attachments, portfolios): the
+# /EmbeddedFile streams are inflated while the parent is read, and the
+# embedded PDF files get the same analysis, reported against the
+# parent (nested path, see C_EMBEDDED_PATH_SEP_S). Limits per analyzed
+# file: embedded PDF files, inflated MB (all the embedded files, PDF
+# or not) and nesting depth
+C_EMBEDDED_PDFS_FIELD      = "embedded_pdfs"
+C_EMBEDDED_MAX_FILES_FIELD = "embedded_max_files"
+C_EMBEDDED_MAX_MB_FIELD    = "embedded_max_mb"
+C_EMBEDDED_MAX_DEPTH_FIELD = "embedded_max_depth"
+
+# Incremental update analysis of the PDF files modified after being
+# signed (verifier codes of C_REVISION_CODES_L): revisions, revision
+# covered by each signature, objects changed/added after signing
+C_REVISION_ANALYSIS_FIELD = "revision_analysis"
+
+# In-process check of the signed files: digest of the /ByteRange of
+# each signature vs. the digest signed in its CMS (one file read,
+# whatever the number of signatures)
+C_SIGNATURE_DIGESTS_FIELD = "signature_digests"
+
+# Validation of the certificate chain of each signature (with the
+# signature digests) against the JVM's trust store, at signing time.
+# Outcomes are cached (LRU, kept in the settings DB across jobs) by
+# leaf, other certificates and validation time bucket. Max entries:
+# 0 for no cache
+C_CHAIN_VALIDATION_FIELD   = "chain_validation"
+C_CHAIN_CACHE_MAX_FIELD    = "chain_cache_max_entries"
+C_CHAIN_TIME_BUCKET_FIELD  = "chain_time_bucket_hours"
+
+# Offline revocation (air-gapped labs): CRLs imported in bulk from a
+# directory (and the CRLs of the DSS of the PDF files) into an indexed
+# store, queried by the chain validation with no network I/O. The
+# verifier can also be run with its network lookups disabled
+C_REVOCATION_STORE_FIELD = "revocation_store"
+C_CRL_IMPORT_DIR_FIELD   = "crl_import_dir"
+C_VERIFIER_OFFLINE_FIELD = "verifier_offline"
+
+# Signer of each signature (subject, issuer, serial, signing time),
+# taken from the CMS read by the signature digests: as attributes of
+# the artifact, and in an indexed table of the work dir (signer ->
+# files)
+C_SIGNER_INDEX_FIELD = "signer_index"
+
+# Times of each signature (claimed signing time, time of its RFC 3161
+# timestamp) as TSK_DATETIME artifacts for the timeline, taken from
+# the CMS read by the signature digests
+C_SIGNATURE_TIMES_FIELD = "signature_times"
+
+C_ADVANCED_SETTINGS_L = [
+        (C_METRICS_INTERVAL_FIELD, 15),
+        (C_TOOL_TOP_N_FIELD, 10),
+        (C_TOOL_LIMIT_AS_MB_FIELD, 0),
+        (C_TOOL_LIMIT_CPU_SECS_FIELD, 0),
+        (C_TOOL_LIMIT_NOFILE_FIELD, 0),
+        (C_TOOL_NICE_FIELD, 0),
+        (C_TOOL_IONICE_CLASS_FIELD, 0),
+        (C_RETRY_MAX_ATTEMPTS_FIELD, 3),
+        (C_RETRY_BACKOFF_SECS_FIELD, 2.0),
+        (C_RETRY_THREADS_FIELD, 1),
+        (C_CHECKPOINT_FIELD, True),
+        (C_ADAPTIVE_SLOTS_FIELD, True),
+        (C_VERIFIER_SLOTS_MIN_FIELD, 1),
+        (C_VERIFIER_SLOTS_MAX_FIELD, 0),
+        (C_EXIFTOOL_SLOTS_MIN_FIELD, 1),
+        (C_EXIFTOOL_SLOTS_MAX_FIELD, 0),
+        (C_ADAPTIVE_WINDOW_SECS_FIELD, 10.0),
+        (C_TRIAGE_FIELD, True),
+        (C_PARALLEL_CHECKS_FIELD, False),
+        (C_TOOL_EXECUTOR_THREADS_FIELD, 0),
+        (C_DEFERRED_ANALYSIS_FIELD, False),
+        (C_DEFERRED_WORKERS_FIELD, 0),
+        (C_DEFERRED_QUEUE_MAX_FIELD, 256),
+        (C_INGEST_MODE_FIELD, C_INGEST_MODE_FILE),
+        (C_DATA_SOURCE_WORKERS_FIELD, 0),
+        (C_KNOWN_FILES_FIELD, C_KNOWN_FILES_ANALYZE),
+        (C_KNOWN_VERDICTS_FILE_FIELD, ""),
+        (C_PATH_INCLUDE_GLOBS_FIELD, ""),
+        (C_PATH_EXCLUDE_GLOBS_FIELD, ""),
+        (C_PATH_INCLUDE_REGEXES_FIELD, ""),
+        (C_PATH_EXCLUDE_REGEXES_FIELD, ""),
+        (C_BUDGET_SECS_FIELD, 0),
+        (C_BUDGET_MB_FIELD, 0),
+        (C_BUDGET_DEFERRED_ONLY_FIELD, False),
+        (C_CARVE_UNALLOCATED_FIELD, False),
+        (C_CARVE_MAX_MB_FIELD, 64),
+        (C_CARVE_SIGNED_ONLY_FIELD, True),
+        (C_EMBEDDED_PDFS_FIELD, False),
+        (C_EMBEDDED_MAX_FILES_FIELD, 32),
+        (C_EMBEDDED_MAX_MB_FIELD, 256),
+        (C_EMBEDDED_MAX_DEPTH_FIELD, 3),
+        (C_REVISION_ANALYSIS_FIELD, True),
+        (C_SIGNATURE_DIGESTS_FIELD, True),
+        (C_CHAIN_VALIDATION_FIELD, True),
+        (C_CHAIN_CACHE_MAX_FIELD, 1024),
+        (C_CHAIN_TIME_BUCKET_FIELD, 24),
+        (C_REVOCATION_STORE_FIELD, True),
+        (C_CRL_IMPORT_DIR_FIELD, ""),
+        (C_VERIFIER_OFFLINE_FIELD, False),
+        (C_SIGNER_INDEX_FIELD, True),
+        (C_SIGNATURE_TIMES_FIELD, True),
+        ]
+
+C_ADVANCED_SETTINGS_DEFAULTS_D = dict(C_ADVANCED_SETTINGS_L)
+
+#------------------------------------------------
+# Live metrics: file written (Prometheus text
+# format) in the work dir during the ingest
+#------------------------------------------------
+C_METRICS_FNAME  = "digiSignedOrProtectedPDF.prom"
+C_METRICS_PREFIX = "digisigned_pdf"
+
+# Name of the cache that tracks the reuse of temp copies of PDF files
+C_CACHE_TEMP_COPY = "temp_copy"
+
+# Name of the cache that tracks the reuse of checkpointed verdicts
+C_CACHE_CHECKPOINT = "checkpoint"
+
+# Name of the cache of the known verdicts (imported hash set)
+C_CACHE_KNOWN_VERDICTS = "known_verdicts"
+
+# Name of the cache of the certificate chain validations
+C_CACHE_CHAIN = "chain_validation"
+
+# Name of the memo of the decoded exiftool UserAccess strings, and its
+# max entries (a case has a few dozen distinct strings: the memo is
+# emptied if it is ever full)
+C_CACHE_USER_ACCESS = "user_access"
+C_USER_ACCESS_MEMO_MAX = 256
+
+# Known verdicts of this case (by MD5), written in the work dir to be
+# imported by a later case (see C_KNOWN_VERDICTS_FILE_FIELD)
+C_KNOWN_VERDICTS_FNAME = "known_verdicts.csv"
+
+# Keys of the known files stats
+C_KNOWN_STAT_SKIPPED     = "known_skipped"
+C_KNOWN_STAT_UNCACHED    = "known_not_cached"
+C_KNOWN_STAT_CACHED      = "known_from_cache"
+C_KNOWN_STAT_HASHSET_HIT = "hashset_hits"
+
+#------------------------------------------------
+# Checkpoint file (per data source) in the work dir
+#------------------------------------------------
+C_CHECKPOINT_FNAME = "checkpoint_ds%d.jsonl"
+
+#------------------------------------------------
+# Resource accounting of the external tools
+#------------------------------------------------
+# Size buckets of the input files: (upper limit in bytes, label).
+# The last bucket has no upper limit.
+C_SIZE_BUCKETS_L = [(1 << 20,   "lt_1MB"),
+                    (10 << 20,  "1MB_10MB"),
+                    (100 << 20, "10MB_100MB"),
+                    (None,      "ge_100MB")]
+
+# Signals that point to a breach of a resource limit:
+# SIGABRT/SIGSEGV (allocation failure), SIGKILL, SIGXCPU
+C_LIMIT_SIGNALS_L = [6, 9, 11, 24]
+
+# Messages of STDERR that point to a breach of the address space limit
+C_LIMIT_STDERR_MARKS_L = ["Could not reserve enough space",
+                          "OutOfMemoryError",
+                          "Out of memory",
+                          "Cannot allocate memory",
+                          "MemoryError"]
+
+# Without os.wait4 (Jython), CPU time and peak RSS of a tool are
+# sampled in /proc/<pid> while it runs, every C_PROC_SAMPLE_SECS.
+# CPU times of /proc/<pid>/stat are in clock ticks (USER_HZ, 100 on
+# Linux whatever the kernel HZ)
+C_PROC_SAMPLE_SECS = 0.2
+C_PROC_CLOCK_TICKS = 100.0
+
+#------------------------------------------------
+# Fast-reject path of process()
+#------------------------------------------------
+# Every case variant of the ".pdf" extension, so the check of the
+# last 4 chars of a name is a single lookup (no lower(), no splitext)
+C_PDF_EXTENSIONS_D = dict([("." + p + d + f, True)
+                                for p in "pP" for d in "dD" for f in "fF"])
+
+# MIME types of PDF files (set by Autopsy's file type detection)
+C_PDF_MIME_TYPES_D = {"application/pdf": True,
+                      "application/x-pdf": True}
+
+# Types of "files" that are not files (never counted)
+C_NOT_FILE_TYPES_L = [TskData.TSK_DB_FILES_TYPE_ENUM.UNALLOC_BLOCKS,
+                      TskData.TSK_DB_FILES_TYPE_ENUM.UNUSED_BLOCKS]
+
+# Files seen by an instance between flushes of its counters
+C_COUNTERS_FLUSH_EVERY = 1024
+
+# Name pattern of the bulk query of the data source mode (SQL LIKE,
+# case insensitive) and condition of its MIME type query
+C_PDF_NAME_PATTERN_S = "%.pdf"
+C_PDF_MIME_WHERE_S = "data_source_obj_id = %d AND mime_type IN (%s)"
+
+#------------------------------------------------
+# Budgeted triage
+#------------------------------------------------
+# Files deferred by the budgeted triage (per data source) in the
+# work dir: obj_id;score;size;reason;path
+C_BUDGET_DEFERRED_FNAME = "budget_deferred_ds%d.csv"
+
+# Priority of a PDF file (see budget_priority): files with a score
+# below C_BUDGET_MIN_SCORE wait for the end of the job, and are only
+# analyzed if there is still some budget left
+C_BUDGET_MIN_SCORE        = 2
+C_BUDGET_SCORE_SIGNATURE  = 3
+C_BUDGET_SCORE_ENCRYPT    = 2
+C_BUDGET_SCORE_USER_PATH  = 2
+C_BUDGET_SCORE_SMALL      = 1
+C_BUDGET_SCORE_LARGE      = -1
+C_BUDGET_SMALL_BYTES      = 1 << 20
+C_BUDGET_LARGE_BYTES      = 10 << 20
+
+# Paths of the users' files (profiles, mail, downloads)
+C_BUDGET_USER_PATHS_RE = re.compile(
+        r"/(users|documents and settings|home)/|mail|outlook|thunderbird"
+        r"|downloads|desktop|documents", re.IGNORECASE)
+
+# Bytes read at the start and at the end of a file for the pre-scan
+# of the markers (incremental updates put signatures at the end)
+C_BUDGET_HEAD_BYTES = 16 << 10
+C_BUDGET_TAIL_BYTES = 64 << 10
+
+# Reasons of the deferral
+C_BUDGET_REASON_EXHAUSTED    = "budget_exhausted"
+C_BUDGET_REASON_LOW_PRIORITY = "low_priority"
+
+#------------------------------------------------
+# Carving of unallocated space
+#------------------------------------------------
+# Markers of the streaming scan: start of a PDF file, end of a
+# revision (the last one ends the file) and signature dictionary.
+# They are searched with str.find(), one pass per marker (several
+# times faster than a regex alternation)
+C_CARVE_HEADER    = "%PDF-"
+C_CARVE_EOF       = "%%EOF"
+C_CARVE_BYTERANGE = "/ByteRange"
+C_CARVE_MARKERS_L = [C_CARVE_HEADER, C_CARVE_EOF, C_CARVE_BYTERANGE]
+
+# Chunk size of the scan. The last bytes of a chunk are scanned again
+# with the next one (a marker may span two chunks)
+C_CARVE_CHUNK_SIZE = 8 << 20
+C_CARVE_OVERLAP    = len(C_CARVE_BYTERANGE) - 1
+
+# Unallocated space "files" of a data source (data source mode)
+C_UNALLOC_WHERE_S = "data_source_obj_id = %d AND type IN (%d, %d)"
+
+# Name of a carved file: id of the unallocated file and offset
+C_CARVED_FNAME = "carved_%d_%d.pdf"
+
+#------------------------------------------------
+# Embedded PDF files
+#------------------------------------------------
+# Dictionary of an embedded file stream, and the object that holds it
+C_EMBEDDED_RE = re.compile(r"/Type\s*/EmbeddedFile(?![A-Za-z0-9])")
+C_OBJ_RE = re.compile(r"(\d+)\s+\d+\s+obj(?![A-Za-z0-9])")
+
+# Filters of an embedded file stream: a single FlateDecode, or none
+# (with a direct /Length). Others (e.g., filter chains) are skipped
+C_STREAM_FILTER_RE = re.compile(r"/Filter\s*(?:/(\w+)|\[\s*/(\w+)\s*\])")
+C_STREAM_LENGTH_RE = re.compile(r"/Length\s+(\d+)(?!\d)(?!\s+\d+\s+R)")
+
+# File specification: name of the file of an embedded file stream
+# (best effort: the nearest /UF or /F string before its /EF entry)
+C_FILESPEC_EF_RE = re.compile(r"/EF\s*<<\s*/U?F\s+(\d+)\s+\d+\s+R")
+C_FILESPEC_NAME_RE = re.compile(r"/U?F\s*\(((?:[^()\\]|\\.){1,255})\)")
+C_FILESPEC_SPAN = 512
+
+# Bytes kept between chunks (an embedded file dictionary and the
+# header of its object), output chunk of the inflate (bounded memory,
+# whatever the compression ratio) and bytes where the PDF header of an
+# embedded file is looked for
+C_EMBEDDED_DICT_MAX     = 4096
+C_EMBEDDED_OUT_CHUNK    = 1 << 20
+C_EMBEDDED_HEADER_BYTES = 1024
+
+# Nested path of an embedded file: parent path, separator, name
+C_EMBEDDED_PATH_SEP_S = ">"
+
+# Outcomes of the embedded file streams
+C_EMBEDDED_PDF         = "pdf"
+C_EMBEDDED_NOT_PDF     = "not_pdf"
+C_EMBEDDED_UNSUPPORTED = "unsupported_filter"
+C_EMBEDDED_CORRUPT     = "corrupt"
+C_EMBEDDED_TRUNCATED   = "truncated"
+C_EMBEDDED_LIMIT       = "limit"
+C_EMBEDDED_OUTCOMES_L = [C_EMBEDDED_PDF, C_EMBEDDED_NOT_PDF,
+                         C_EMBEDDED_UNSUPPORTED, C_EMBEDDED_CORRUPT,
+                         C_EMBEDDED_TRUNCATED, C_EMBEDDED_LIMIT]
+
+#------------------------------------------------
+# Retry queue
+#------------------------------------------------
+# Verifier codes that may be transient and are worth a retry
+C_RETRY_SIG_CODES_L = [101, 102, 105]
+
+# Retry reasons
+C_RETRY_REASON_COPY = "copy_failed"
+C_RETRY_REASON_TOOL = "verifier_code_%d"
+C_RETRY_REASON_CANCELLED = "ingest_cancelled"
+
+#------------------------------------------------
+# Adaptive tool slots (AIMD controller)
+#------------------------------------------------
+# Minimum number of completed runs in a window to take a decision
+C_ADAPTIVE_MIN_RUNS = 4
+
+# Multiplicative decrease when the system is overloaded, i.e., when
+# the load average exceeds C_ADAPTIVE_LOAD_FACTOR x number of cores,
+# or when the mean latency grows by C_ADAPTIVE_LATENCY_FACTOR without
+# a gain of throughput
+C_ADAPTIVE_LOAD_FACTOR    = 1.5
+C_ADAPTIVE_LATENCY_FACTOR = 1.5
+
+#------------------------------------------------
+# Triage pass (exiftool query + native scan)
+#------------------------------------------------
+# exiftool tags for the permissions only, and for the triage pass
+C_EXIFTOOL_PERMISSION_TAGS_L = ["UserAccess", "Encryption"]
+C_EXIFTOOL_TRIAGE_TAGS_L = ["UserAccess", "Encryption", "PDFVersion",
+                            "Linearized", "PageCount"]
+
+# Keys of the triage facts dict
+C_FACT_PERMISSIONS    = "permissions"
+C_FACT_ENCRYPTION     = "encryption"
+C_FACT_PDF_VERSION    = "pdf_version"
+C_FACT_LINEARIZED     = "linearized"
+C_FACT_PAGE_COUNT     = "page_count"
+C_FACT_SIG_INDICATORS = "sig_indicators"
+C_FACT_ACROFORM       = "acroform"
+C_FACT_OBJSTM         = "object_streams"
+C_FACT_ENCRYPT_DICT   = "encrypt_dict"
+C_FACT_SCAN_COMPLETE  = "scan_complete"
+C_FACT_NEEDS_VERIFIER = "needs_verifier"
+
+# Tokens of the native scan. The signature ones are the names of the
+# signature dictionary/field (/ByteRange, /Type /Sig, /FT /Sig) and of
+# the catalog/permission entries that only exist with a signature.
+# Any character of a name may be written as a #xx escape (e.g.,
+# /Byte#52ange): the third group is a name of letters with escaped
+# letters, decoded by scan_tokens
+C_LETTER_ESCAPE_S = "#(?:4[1-9A-Fa-f]|5[0-9Aa]|6[1-9A-Fa-f]|7[0-9Aa])"
+C_SCAN_RE = re.compile(
+    r"/(ByteRange|SigFlags|DocMDP|AcroForm|ObjStm|Encrypt)(?![A-Za-z0-9])"
+    r"|/(Type|FT)\s*/Sig(?![A-Za-z0-9])"
+    r"|/(?=[A-Za-z]*#[4-7])((?:[A-Za-z]|%s)+)(?![A-Za-z0-9#])" %
+                                                    (C_LETTER_ESCAPE_S))
+C_SCAN_SIG_TOKENS_L = ["ByteRange", "SigFlags", "DocMDP", "Type", "FT"]
+
+# Escaped names: names of the first group, and names of /Type /Sig
+# (either may be escaped: the bytes around it are decoded and scanned
+# again). An escaped /ObjStm can't be inflated (see C_SCAN_OBJSTM_RE):
+# the scan is then incomplete
+C_NAME_ESCAPE_RE = re.compile(r"#([0-9A-Fa-f]{2})")
+C_SCAN_NAMES_D = dict([(name_S, True) for name_S in
+        ["ByteRange", "SigFlags", "DocMDP", "AcroForm", "ObjStm", "Encrypt"]])
+C_SCAN_SIG_NAMES_D = {"Type": True, "FT": True, "Sig": True}
+C_SCAN_ESCAPE_WINDOW = 32
+C_SCAN_ESCAPED_OBJSTM = "#ObjStm"
+
+# Start of the data of an object stream (to inflate and scan it:
+# signature dictionaries may be compressed inside object streams)
+C_SCAN_OBJSTM_RE = re.compile(r"/Type\s*/ObjStm(?![A-Za-z0-9])")
+C_SCAN_STREAM_RE = re.compile(r"stream(\r\n|\n|\r)")
+
+# Chunk size and overlap between chunks of the native scan
+C_SCAN_CHUNK_SIZE = 1 << 20
+C_SCAN_OVERLAP    = 64
+
+# Max bytes of an object stream read while inflating it
+C_SCAN_OBJSTM_MAX_BYTES = 16 << 20
+
+# Max bytes inflated from the object streams of a file (a deflate
+# bomb stops the scan there: the scan is incomplete)
+C_SCAN_OBJSTM_MAX_OUT = 64 << 20
+
+# Decision table of the triage:
+# (signature indicator found, scan complete) -> run the verifier?
+# An incomplete scan (e.g., object streams that can't be inflated,
+# as in encrypted files) can't rule out a signature.
+C_TRIAGE_DECISION_D = {(True,  True):  True,
+                       (True,  False): True,
+                       (False, True):  False,
+                       (False, False): True}
+
+# Keys of the triage stats
+C_TRIAGE_VERIFIER_RUN     = "verifier_run"
+C_TRIAGE_VERIFIER_SKIPPED = "verifier_skipped"
+
+#------------------------------------------------
+# Incremental updates (revisions)
+#------------------------------------------------
+# Verifier codes of signed files modified after signing:
+# SIG_STAT_CODE_WARNING_UNSIGNED_CONTENT and
+# SIG_STAT_CODE_ERROR_REVISION_MODIFIED
+C_REVISION_CODES_L = [70, 120]
+
+# Tokens of the revision scan: object header, end of a revision,
+# signed byte range, size of the xref table (trailer or xref stream)
+C_REVISION_RE = re.compile(
+    r"(?<![0-9])(\d+)\s+\d+\s+obj(?![A-Za-z0-9])"
+    r"|%%EOF"
+    r"|/ByteRange\s*\[\s*(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s*\]"
+    r"|/Size\s+(\d+)")
+C_XREF_STREAM_RE = re.compile(r"/Type\s*/XRef(?![A-Za-z0-9])")
+
+# Bytes after a token that must be in the buffer (dictionary of an
+# object, to tell xref streams apart), end of line allowed after the
+# %%EOF covered by a signature, and object numbers kept per signature
+C_REVISION_PEEK        = 512
+C_REVISION_EOL_MAX     = 2
+C_REVISION_MAX_OBJECTS = 20
+
+# Columns of the revisions in the CSV file of the signed files:
+# revisions, revision covered by each signature, objects changed and
+# added after the first signature, bytes after the last signature
+C_REVISION_CSV_COLUMNS_L = ["Revisions", "SignedRevisions",
+                            "ChangedAfterSigning", "AddedAfterSigning",
+                            "UnsignedBytes"]
+
+# Keys of the result of the revision scan (see analyze_revisions)
+C_REV_REVISIONS      = "revisions"
+C_REV_SIGNATURES     = "signatures"
+C_REV_UNSIGNED_BYTES = "unsigned_bytes"
+C_REV_BYTE_RANGE     = "byte_range"
+C_REV_REVISION       = "revision"
+C_REV_CHANGED        = "changed"
+C_REV_ADDED          = "added"
+C_REV_CHANGED_OBJS   = "changed_objects"
+C_REV_ADDED_OBJS     = "added_objects"
+
+# Key of the triage facts (and checkpoint) for the revisions
+C_FACT_REVISIONS = "revisions"
+
+#------------------------------------------------
+# Signature digests (see ByteRangeDigester)
+#------------------------------------------------
+# Tokens of the signature dictionaries: signed byte range, start of
+# the hex string of the CMS ('<' at offset b of the byte range)
+C_SIG_BYTE_RANGE_RE = re.compile(
+    r"/ByteRange\s*\[\s*(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s*\]")
+C_SIG_CONTENTS_RE = re.compile(r"/Contents\s*<")
+C_SIG_NOT_HEX_RE = re.compile(r"[^0-9A-Fa-f]")
+
+# Overlap between chunks (longest token), hex digits of a CMS (min:
+# other /Contents hex strings are dropped, max: memory), and bytes
+# after the CMS within which its /ByteRange must show up (when the
+# /ByteRange comes after the /Contents in the dictionary)
+C_SIG_OVERLAP       = 128
+C_SIG_CMS_MIN_HEX   = 64
+C_SIG_CMS_MAX_HEX   = 1 << 20
+C_SIG_RANGE_WINDOW  = 64 << 10
+
+# Digest algorithms: OID -> hashlib name. All of them are computed on
+# the signed bytes (the algorithm of a signature is only known once
+# its CMS is read, after the first segment of its byte range)
+C_DIGEST_OIDS_D = {"1.3.14.3.2.26":          "sha1",
+                   "2.16.840.1.101.3.4.2.1": "sha256",
+                   "2.16.840.1.101.3.4.2.2": "sha384",
+                   "2.16.840.1.101.3.4.2.3": "sha512"}
+C_DIGEST_NAMES_L = sorted(set(C_DIGEST_OIDS_D.values()))
+
+# Content type of the CMS of a document timestamp (RFC 3161 TSTInfo)
+C_CMS_TST_INFO_OID = "1.2.840.113549.1.9.16.1.4"
+
+# Integrity status of a signature, worst first
+C_SIG_DIGEST_MISMATCH    = "mismatch"
+C_SIG_DIGEST_BAD_RANGE   = "bad_byte_range"
+C_SIG_DIGEST_CMS_ERROR   = "cms_error"
+C_SIG_DIGEST_UNSUPPORTED = "unsupported_algorithm"
+C_SIG_DIGEST_UNCHECKED   = "unchecked"      # no signed digest
+C_SIG_DIGEST_INTACT      = "intact"
+C_SIG_DIGEST_STATUSES_L = [C_SIG_DIGEST_MISMATCH, C_SIG_DIGEST_BAD_RANGE,
+                           C_SIG_DIGEST_CMS_ERROR, C_SIG_DIGEST_UNSUPPORTED,
+                           C_SIG_DIGEST_UNCHECKED, C_SIG_DIGEST_INTACT]
+
+# Kinds of signatures
+C_SIG_KIND_SIGNATURE = "signature"
+C_SIG_KIND_TIMESTAMP = "timestamp"
+
+# Keys of the result of a signature (see check_signature_digests)
+C_SIGD_BYTE_RANGE = "byte_range"
+C_SIGD_KIND       = "kind"
+C_SIGD_ALGORITHM  = "algorithm"
+C_SIGD_STATUS     = "status"
+
+# Column of the signature digests in the CSV file of the signed files
+C_SIG_DIGEST_CSV_COLUMN = "SignatureDigests"
+
+# Key of the triage facts (and checkpoint) for the signature digests
+C_FACT_SIGNATURE_DIGESTS = "signature_digests"
+
+# Key of the chain validation outcome of a signature (see
+# ChainValidationCache): C_CHAIN_VALID, C_CHAIN_NO_CERTIFICATE,
+# C_CHAIN_ERROR or the reason of the failure in lower case (e.g.,
+# "expired", "no_trust_anchor")
+C_SIGD_CHAIN = "chain"
+
+C_CHAIN_VALID          = "valid"
+C_CHAIN_NO_CERTIFICATE = "no_certificate"
+C_CHAIN_ERROR          = "error"
+
+# Table of the chain validation outcomes in the settings DB
+C_CHAIN_CACHE_TABLE = "chain_cache"
+
+# Schema of the revocation store: CRLs (by fingerprint, so a CRL is
+# imported once) and revoked certificates, keyed by (issuer, serial)
+C_REVOCATION_SCHEMA_L = [
+    "CREATE TABLE IF NOT EXISTS crls (Fingerprint TEXT PRIMARY KEY, "
+        "Issuer TEXT, This_Update INTEGER, Next_Update INTEGER, "
+        "Source TEXT);",
+    "CREATE INDEX IF NOT EXISTS crls_issuer ON crls (Issuer);",
+    "CREATE TABLE IF NOT EXISTS revoked (Issuer TEXT, Serial TEXT, "
+        "Revocation_Date INTEGER, Reason TEXT, Crl_Fingerprint TEXT, "
+        "PRIMARY KEY (Issuer, Serial));"]
+
+# Revoked certificates inserted per batch (one transaction per CRL)
+C_REVOCATION_BATCH = 10000
+
+# Key of the revocation status of a signature (see RevocationStore),
+# statuses worst first. "unknown": no CRL of the issuer in the store
+C_SIGD_REVOCATION = "revocation"
+
+C_REVOCATION_REVOKED       = "revoked"
+C_REVOCATION_REVOKED_LATER = "revoked_after_signing"
+C_REVOCATION_UNKNOWN       = "unknown"
+C_REVOCATION_GOOD          = "good"
+C_REVOCATION_STATUSES_L = [C_REVOCATION_REVOKED, C_REVOCATION_REVOKED_LATER,
+                           C_REVOCATION_UNKNOWN, C_REVOCATION_GOOD]
+
+# CRL files of the import directory
+C_CRL_EXTENSIONS_L = [".crl", ".der", ".pem"]
+
+# References to the CRL streams of the DSS (/CRLs) and of its VRI
+# entries (/CRL), and max bytes of a CRL stream
+C_DSS_CRL_REFS_RE = re.compile(r"/CRLs?\s*\[([0-9R\s]*)\]")
+C_DSS_REF_RE      = re.compile(r"(\d+)\s+\d+\s+R")
+C_DSS_CRL_MAX_BYTES = 16 << 20
+
+# Key of the signer of a signature (see signer_identity_D), and keys
+# of its dict. Signing time in ms (None: not in the CMS)
+C_SIGD_SIGNER = "signer"
+
+C_SIGNER_NAME    = "name"       # CN of the subject (else the subject)
+C_SIGNER_SUBJECT = "subject"
+C_SIGNER_ISSUER  = "issuer"
+C_SIGNER_SERIAL  = "serial"     # hex
+C_SIGNER_TIME    = "signing_time"
+
+# Custom attributes of the signers: (key of the signer dict, type
+# name, display name, value type), see create_signer_index
+C_SIGNER_ATTRIBUTES_L = [
+    (C_SIGNER_NAME, "DSP_SIGNER_NAME", "Signer Name", "STRING"),
+    (C_SIGNER_SUBJECT, "DSP_SIGNER_SUBJECT", "Signer Subject", "STRING"),
+    (C_SIGNER_ISSUER, "DSP_SIGNER_ISSUER", "Signer Issuer", "STRING"),
+    (C_SIGNER_SERIAL, "DSP_SIGNER_SERIAL", "Signer Serial Number", "STRING"),
+    (C_SIGNER_TIME, "DSP_SIGNING_TIME", "Signing Time", "DATETIME")]
+
+# Signer index: SQLite DB of the work dir, one row per signature,
+# indexed by signer name and by certificate (issuer, serial)
+C_SIGNER_INDEX_FNAME = "signers.db3"
+C_SIGNER_INDEX_SCHEMA_L = [
+    "CREATE TABLE IF NOT EXISTS signers (Obj_Id INTEGER, "
+        "Sig_Index INTEGER, Data_Source_Id INTEGER, Path TEXT, "
+        "Kind TEXT, Signer_Name TEXT, Subject TEXT, Issuer TEXT, "
+        "Serial TEXT, Signing_Time INTEGER, Status TEXT, "
+        "PRIMARY KEY (Obj_Id, Path, Sig_Index));",
+    "CREATE INDEX IF NOT EXISTS signers_name ON signers "
+        "(Signer_Name COLLATE NOCASE);",
+    "CREATE INDEX IF NOT EXISTS signers_cert ON signers (Issuer, Serial);"]
+
+# Key of the time of the RFC 3161 timestamp of a signature (signature
+# timestamp token, or the document timestamp itself), in ms
+C_SIGD_TSA_TIME = "tsa_time"
+
+# Custom artifact of the signature times (one per time, with
+# TSK_DATETIME), see create_signature_time_type
+C_SIGNATURE_TIME_ARTIFACT_S = "DSP_SIGNATURE_TIME"
+C_SIGNATURE_TIME_DISPLAY_S  = "PDF Signature Times"
+
+# Kinds of signature times
+C_TIME_SIGNING = "signing time"     # claimed by the signer
+C_TIME_TSA     = "TSA time"         # RFC 3161 timestamp
+
+# Signature time artifacts posted per batch (one event and one
+# refresh of the timeline per batch, not per artifact)
+C_SIGNATURE_TIMES_BATCH = 100
+
+# Options of the JVM of the verifier without network: no CRL
+# distribution points nor AIA fetching, and every socket goes to a
+# closed local port (fails at once instead of timing out)
+C_OFFLINE_JAVA_OPTIONS_S = "-Dcom.sun.security.enableCRLDP=false "\
+        "-Dcom.sun.security.enableAIAcaIssuers=false "\
+        "-DsocksProxyHost=127.0.0.1 -DsocksProxyPort=1 "\
+        "-Dsun.net.client.defaultConnectTimeout=1000 "\
+        "-Dsun.net.client.defaultReadTimeout=1000"
+
+#------------------------------------------------
+# Analysis flow (rules engine)
+#------------------------------------------------
+# Facts of the analysis of a PDF file, matched by the flow rules
+C_FLOW_CACHE       = "cache"        # C_CACHE_STATE_*
+C_FLOW_COPY        = "copy"         # C_COPY_*
+C_FLOW_PRESCAN     = "prescan"      # C_PRESCAN_*
+C_FLOW_SIGNATURE   = "signature"    # C_SIGNATURE_*
+C_FLOW_PERMISSIONS = "permissions"  # known?
+C_FLOW_ENCRYPTED   = "encrypted"    # known to be encrypted?
+C_FLOW_STAGE       = "stage"        # C_STAGE_*
+C_FLOW_ADDED       = "added"        # artifact added for the file?
+C_FLOW_REPORTED    = "reported"     # artifact already there (no dups)?
+C_FLOW_PARALLEL    = "parallel"     # parallel checks available?
+C_FLOW_KNOWN       = "known"        # C_KNOWN_FILES_* (KNOWN files only)
+C_FLOW_REVISIONS   = "revisions"    # C_REVISIONS_*
+C_FLOW_DIGESTS     = "digests"      # C_DIGESTS_*
+
+C_CACHE_STATE_NONE       = "none"
+C_CACHE_STATE_CHECKPOINT = "checkpoint"
+C_CACHE_STATE_HASHSET    = "hashset"
+
+C_COPY_PENDING = "pending"
+C_COPY_DONE    = "done"
+C_COPY_FAILED  = "failed"
+
+C_PRESCAN_OFF        = "off"
+C_PRESCAN_PENDING    = "pending"
+C_PRESCAN_INDICATORS = "indicators"
+C_PRESCAN_CLEAN      = "clean"
+C_PRESCAN_INCOMPLETE = "incomplete"
+
+C_SIGNATURE_UNKNOWN    = "unknown"
+C_SIGNATURE_SIGNED     = "signed"
+C_SIGNATURE_NOT_SIGNED = "not_signed"
+C_SIGNATURE_TRANSIENT  = "transient"    # see C_RETRY_SIG_CODES_L
+C_SIGNATURE_FAILED     = "failed"
+C_SIGNATURE_MODIFIED   = "modified"     # see C_REVISION_CODES_L
+
+# states of a file with (at least) one signature to check
+C_SIGNATURE_PRESENT_T = (C_SIGNATURE_SIGNED, C_SIGNATURE_MODIFIED,
+                         C_SIGNATURE_FAILED)
+
+C_REVISIONS_OFF     = "off"
+C_REVISIONS_PENDING = "pending"
+C_REVISIONS_DONE    = "done"
+
+C_DIGESTS_OFF     = "off"
+C_DIGESTS_PENDING = "pending"
+C_DIGESTS_DONE    = "done"
+
+C_STAGE_SIGNATURE   = "signature"
+C_STAGE_PERMISSIONS = "permissions"
+C_STAGE_DONE        = "done"
+
+C_FLOW_INITIAL_FACTS_D = {C_FLOW_CACHE:       C_CACHE_STATE_NONE,
+                          C_FLOW_COPY:        C_COPY_PENDING,
+                          C_FLOW_PRESCAN:     C_PRESCAN_OFF,
+                          C_FLOW_SIGNATURE:   C_SIGNATURE_UNKNOWN,
+                          C_FLOW_PERMISSIONS: False,
+                          C_FLOW_ENCRYPTED:   False,
+                          C_FLOW_STAGE:       C_STAGE_SIGNATURE,
+                          C_FLOW_ADDED:       False,
+                          C_FLOW_REPORTED:    False,
+                          C_FLOW_PARALLEL:    False,
+                          C_FLOW_KNOWN:       C_KNOWN_FILES_ANALYZE,
+                          C_FLOW_REVISIONS:   C_REVISIONS_OFF,
+                          C_FLOW_DIGESTS:     C_DIGESTS_OFF}
+
+# Actions of the flow
+C_ACTION_COPY              = "copy"
+C_ACTION_TRIAGE            = "triage"
+C_ACTION_VERIFIER          = "run_verifier"
+C_ACTION_ASSUME_NOT_SIGNED = "assume_not_signed"
+C_ACTION_EXIFTOOL          = "run_exiftool"
+C_ACTION_PARALLEL_CHECKS   = "run_verifier_and_exiftool"
+C_ACTION_REVISIONS         = "analyze_revisions"
+C_ACTION_DIGESTS           = "check_signature_digests"
+C_ACTION_EMIT_SIGNATURE    = "emit_signature"
+C_ACTION_EMIT_PERMISSIONS  = "emit_permissions"
+C_ACTION_RETRY             = "retry"
+C_ACTION_STOP              = "stop"
+
+# Relative cost of the actions (the verifier is a JVM launch)
+C_ACTION_COSTS_D = {C_ACTION_COPY:              1,
+                    C_ACTION_TRIAGE:            3,
+                    C_ACTION_VERIFIER:          20,
+                    C_ACTION_ASSUME_NOT_SIGNED: 0,
+                    C_ACTION_EXIFTOOL:          3,
+                    # latency of the slowest (the verifier)
+                    C_ACTION_PARALLEL_CHECKS:   20,
+                    C_ACTION_REVISIONS:         2,
+                    C_ACTION_DIGESTS:           2,
+                    C_ACTION_EMIT_SIGNATURE:    0,
+                    C_ACTION_EMIT_PERMISSIONS:  0,
+                    C_ACTION_RETRY:             0,
+                    C_ACTION_STOP:              0}
+
+# Rules of the flow: (name, conditions, action, cost).
+# The conditions map a fact to its accepted values; a rule matches
+# when all its conditions hold. Among the matching rules, the cheapest
+# is taken (ties: the first one), so a conclusive cheap rule (e.g.,
+# stop) wins over a tool run.
+C_RULE_NAME   = 0
+C_RULE_WHEN   = 1
+C_RULE_ACTION = 2
+C_RULE_COST   = 3
+
+#--------------------------------------------------------------------
+# Build a flow rule, whose cost is the cost of its action
+# @param name_S   [IN] rule name (for the stats)
+# @param when_D   [IN] conditions: fact -> tuple of accepted values
+# @param action_S [IN] C_ACTION_*
+# @return rule tuple (see C_RULE_*)
+# 2026-10-19
+#--------------------------------------------------------------------
+def flow_rule(name_S, when_D, action_S):
+    """build a flow rule, with the cost of its action"""
+    return (name_S, when_D, action_S, C_ACTION_COSTS_D[action_S])
+
+C_FLOW_RULES_L = [
+    # Files marked KNOWN by the hash lookup module
+    flow_rule("known_skip",
+        {C_FLOW_KNOWN: (C_KNOWN_FILES_SKIP,),
+         C_FLOW_STAGE: (C_STAGE_SIGNATURE,)},
+        C_ACTION_STOP),
+    flow_rule("known_not_cached",
+        {C_FLOW_KNOWN: (C_KNOWN_FILES_CACHED_ONLY,),
+         C_FLOW_SIGNATURE: (C_SIGNATURE_UNKNOWN,)},
+        C_ACTION_STOP),
+    flow_rule("known_cached_permissions",
+        {C_FLOW_KNOWN: (C_KNOWN_FILES_CACHED_ONLY,),
+         C_FLOW_STAGE: (C_STAGE_PERMISSIONS,),
+         C_FLOW_PERMISSIONS: (False,),
+         C_FLOW_ADDED: (False,),
+         C_FLOW_REPORTED: (False,)},
+        C_ACTION_EMIT_PERMISSIONS),
+
+    # Signature stage
+    flow_rule("copy_for_analysis",
+        {C_FLOW_SIGNATURE: (C_SIGNATURE_UNKNOWN,),
+         C_FLOW_COPY: (C_COPY_PENDING,)},
+        C_ACTION_COPY),
+    flow_rule("copy_failed",
+        {C_FLOW_SIGNATURE: (C_SIGNATURE_UNKNOWN,),
+         C_FLOW_COPY: (C_COPY_FAILED,)},
+        C_ACTION_RETRY),
+    flow_rule("prescan",
+        {C_FLOW_SIGNATURE: (C_SIGNATURE_UNKNOWN,),
+         C_FLOW_COPY: (C_COPY_DONE,),
+         C_FLOW_PRESCAN: (C_PRESCAN_PENDING,)},
+        C_ACTION_TRIAGE),
+    flow_rule("prescan_clean",
+        {C_FLOW_SIGNATURE: (C_SIGNATURE_UNKNOWN,),
+         C_FLOW_PRESCAN: (C_PRESCAN_CLEAN,)},
+        C_ACTION_ASSUME_NOT_SIGNED),
+    # both checks needed: same latency as the verifier alone
+    flow_rule("verify_with_permissions",
+        {C_FLOW_SIGNATURE: (C_SIGNATURE_UNKNOWN,),
+         C_FLOW_COPY: (C_COPY_DONE,),
+         C_FLOW_PRESCAN: (C_PRESCAN_OFF, C_PRESCAN_INDICATORS,
+                          C_PRESCAN_INCOMPLETE),
+         C_FLOW_PERMISSIONS: (False,),
+         C_FLOW_PARALLEL: (True,)},
+        C_ACTION_PARALLEL_CHECKS),
+    flow_rule("verify",
+        {C_FLOW_SIGNATURE: (C_SIGNATURE_UNKNOWN,),
+         C_FLOW_COPY: (C_COPY_DONE,),
+         C_FLOW_PRESCAN: (C_PRESCAN_OFF, C_PRESCAN_INDICATORS,
+                          C_PRESCAN_INCOMPLETE)},
+        C_ACTION_VERIFIER),
+    # modified after signing: what changed? (copy needed, e.g., for
+    # a checkpointed verdict)
+    flow_rule("copy_for_revisions",
+        {C_FLOW_STAGE: (C_STAGE_SIGNATURE,),
+         C_FLOW_SIGNATURE: (C_SIGNATURE_MODIFIED,),
+         C_FLOW_REVISIONS: (C_REVISIONS_PENDING,),
+         C_FLOW_COPY: (C_COPY_PENDING,)},
+        C_ACTION_COPY),
+    flow_rule("revisions",
+        {C_FLOW_STAGE: (C_STAGE_SIGNATURE,),
+         C_FLOW_SIGNATURE: (C_SIGNATURE_MODIFIED,),
+         C_FLOW_REVISIONS: (C_REVISIONS_PENDING,),
+         C_FLOW_COPY: (C_COPY_DONE, C_COPY_FAILED)},
+        C_ACTION_REVISIONS),
+    # a signature: integrity of each one (the verifier only gives
+    # one code per file)
+    flow_rule("copy_for_digests",
+        {C_FLOW_STAGE: (C_STAGE_SIGNATURE,),
+         C_FLOW_SIGNATURE: C_SIGNATURE_PRESENT_T,
+         C_FLOW_DIGESTS: (C_DIGESTS_PENDING,),
+         C_FLOW_COPY: (C_COPY_PENDING,)},
+        C_ACTION_COPY),
+    flow_rule("digests",
+        {C_FLOW_STAGE: (C_STAGE_SIGNATURE,),
+         C_FLOW_SIGNATURE: C_SIGNATURE_PRESENT_T,
+         C_FLOW_DIGESTS: (C_DIGESTS_PENDING,),
+         C_FLOW_COPY: (C_COPY_DONE, C_COPY_FAILED)},
+        C_ACTION_DIGESTS),
+    # once the verifier has answered, one of the report rules always
+    # matches: the revisions are only relevant for a modified file,
+    # the digests for a file with a signature
+    flow_rule("report_no_signature",
+        {C_FLOW_STAGE: (C_STAGE_SIGNATURE,),
+         C_FLOW_SIGNATURE: (C_SIGNATURE_NOT_SIGNED, C_SIGNATURE_TRANSIENT)},
+        C_ACTION_EMIT_SIGNATURE),
+    flow_rule("report_signature",
+        {C_FLOW_STAGE: (C_STAGE_SIGNATURE,),
+         C_FLOW_SIGNATURE: (C_SIGNATURE_SIGNED, C_SIGNATURE_FAILED),
+         C_FLOW_DIGESTS: (C_DIGESTS_OFF, C_DIGESTS_DONE)},
+        C_ACTION_EMIT_SIGNATURE),
+    flow_rule("report_modified",
+        {C_FLOW_STAGE: (C_STAGE_SIGNATURE,),
+         C_FLOW_SIGNATURE: (C_SIGNATURE_MODIFIED,),
+         C_FLOW_REVISIONS: (C_REVISIONS_OFF, C_REVISIONS_DONE),
+         C_FLOW_DIGESTS: (C_DIGESTS_OFF, C_DIGESTS_DONE)},
+        C_ACTION_EMIT_SIGNATURE),
+
+    # Permissions stage
+    flow_rule("signed_reported",
+        {C_FLOW_STAGE: (C_STAGE_PERMISSIONS,), C_FLOW_ADDED: (True,)},
+        C_ACTION_STOP),
+    flow_rule("already_reported",
+        {C_FLOW_STAGE: (C_STAGE_PERMISSIONS,), C_FLOW_REPORTED: (True,)},
+        C_ACTION_STOP),
+    flow_rule("copy_for_permissions",
+        {C_FLOW_STAGE: (C_STAGE_PERMISSIONS,), C_FLOW_PERMISSIONS: (False,),
+         C_FLOW_COPY: (C_COPY_PENDING,)},
+        C_ACTION_COPY),
+    flow_rule("permissions",
+        {C_FLOW_STAGE: (C_STAGE_PERMISSIONS,), C_FLOW_PERMISSIONS: (False,),
+         C_FLOW_COPY: (C_COPY_DONE,)},
+        C_ACTION_EXIFTOOL),
+    flow_rule("report_permissions",
+        {C_FLOW_STAGE: (C_STAGE_PERMISSIONS,), C_FLOW_PERMISSIONS: (True,)},
+        C_ACTION_EMIT_PERMISSIONS),
+    flow_rule("permissions_unavailable",
+        {C_FLOW_STAGE: (C_STAGE_PERMISSIONS,), C_FLOW_PERMISSIONS: (False,),
+         C_FLOW_COPY: (C_COPY_FAILED,)},
+        C_ACTION_EMIT_PERMISSIONS),
+
+    # End of the analysis.
+    # An encrypted file is not readable by the verifier (101) for
+    # good: no point in retrying it
+    flow_rule("encrypted_unreadable",
+        {C_FLOW_STAGE: (C_STAGE_DONE,),
+         C_FLOW_SIGNATURE: (C_SIGNATURE_TRANSIENT,),
+         C_FLOW_ENCRYPTED: (True,)},
+        C_ACTION_STOP),
+    flow_rule("retry_transient",
+        {C_FLOW_STAGE: (C_STAGE_DONE,),
+         C_FLOW_SIGNATURE: (C_SIGNATURE_TRANSIENT,),
+         C_FLOW_ADDED: (False,)},
+        C_ACTION_RETRY),
+    flow_rule("done",
+        {C_FLOW_STAGE: (C_STAGE_DONE,)},
+        C_ACTION_STOP),
+    ]
+
+# Guard against a rule set that loops
+C_FLOW_MAX_STEPS = 20
+
+# Indexes of the per (tool, size bucket) accounting lists
+C_USAGE_RUNS      = 0
+C_USAGE_WALL      = 1
+C_USAGE_USER_CPU  = 2
+C_USAGE_SYS_CPU   = 3
+C_USAGE_MAX_RSS   = 4
+C_USAGE_BYTES     = 5
+
 #====================================================================
 # code
 #====================================================================
@@ -366,6 +1421,66 @@ class FindSignedPDFsFilesIngestModuleFactory(IngestModuleFactoryAdapter):
     # Count the number of files
     g_files_count = 0
 
+    # Count the number of PDF files skipped by the path filters
+    g_PathFiltered_count = 0
+
+    # Compiled path filters of the job (PathFilter, None: no filter)
+    g_path_filter = None
+
+    # Budgeted triage, per data source id:
+    # - TriageBudget (only when a budget is set)
+    # - files deferred by a previous run: obj_id -> True (only with
+    #   budget_deferred_only)
+    # - files deferred by this run: obj_id -> (score, size, reason, path)
+    # - low priority files waiting for the end: [(score, file)]
+    g_budget_D = {}
+    g_budget_previous_D = {}
+    g_budget_deferred_D = {}
+    g_budget_low_D = {}
+    # Priority of the files: obj_id -> score (pre-scan done once)
+    g_budget_scores_D = {}
+    g_budget_stats_D = {"admitted": 0, "held": 0, "caught_up": 0,
+                        "deferred": 0, "done_before": 0}
+
+    # Carving of unallocated space: unallocated files scanned, bytes
+    # and secs of the scans, PDF headers found, PDF files carved
+    g_carve_stats_D = {"files": 0, "bytes": 0, "secs": 0.0,
+                       "candidates": 0, "carved": 0}
+
+    # Embedded file streams: outcome -> count (see C_EMBEDDED_OUTCOMES_L)
+    # and files with embedded PDF files
+    g_embedded_stats_D = dict([(_outcome_S, 0)
+                                for _outcome_S in C_EMBEDDED_OUTCOMES_L])
+    g_embedded_parents_count = 0
+
+    # Signature digests: status -> signatures (C_SIG_DIGEST_STATUSES_L)
+    # and files checked
+    g_digest_stats_D = dict([(_status_S, 0)
+                                for _status_S in C_SIG_DIGEST_STATUSES_L])
+    g_digest_files_count = 0
+
+    # Outcomes of the certificate chain validations (see
+    # ChainValidationCache), None if there is no chain validation
+    g_chain_cache = None
+
+    # Offline revocation store (see RevocationStore), None if off
+    g_revocation_store = None
+
+    # Verifier run without network lookups (see get_tool_env_D)
+    g_verifier_offline = False
+
+    # Signer index of the work dir (see SignerIndex), None if off
+    g_signer_index = None
+
+    # Custom attribute types of the signers: C_SIGNER_* -> type
+    g_signer_attr_types_D = {}
+
+    # Artifact type of the signature times (None if off), artifacts
+    # waiting for the next batch, and artifacts posted
+    g_time_artifact_type = None
+    g_time_artifacts_L = []
+    g_time_artifacts_count = 0
+
     # Count the number of files that are not PDF
     g_NotPDFFiles_count = 0 
 
@@ -383,6 +1498,13 @@ class FindSignedPDFsFilesIngestModuleFactory(IngestModuleFactoryAdapter):
     g_permission_Stats_D[C_AssembleON_ModifyON]   = 0
     g_permission_Stats_D[C_AssembleOFF_ModifyON]  = 0
 
+    # Histogram of the permission masks and of the encryption (see
+    # PermissionHistogram), per job
+    g_permission_histogram = None
+
+    # Memo of user_access_to_int: UserAccess string -> mask
+    g_user_access_memo_D = {}
+
     # Log files for debugging
     if C_Log_Level >= C_LOG_FILE_DETAILS:
         g_log_pdf_names_F          = open_log_file(C_LOG_PDF_FNAMES)
@@ -400,6 +1522,108 @@ class FindSignedPDFsFilesIngestModuleFactory(IngestModuleFactoryAdapter):
     # (e.g., wrong path for VERIFIER.EXE)
     g_final_msg = ""
 
+    # Lock shared by all threads to protect the g_* class variables
+    # (a new threading.Lock() per access does not exclude anything)
+    g_lock = threading.Lock()
+
+    # Number of module instances that went through startUp() and
+    # did not yet run shutDown(). The last one to leave does the
+    # job-wide work (stop the metrics reporter, etc.)
+    g_active_modules_count = 0
+
+    # Background thread that writes the live metrics file
+    g_metrics_reporter = None
+
+    # Number of external tool runs started and not yet finished
+    # (per tool name)
+    g_tool_queue_depth_D = {}
+    for _tool_S in C_TOOLS_L:
+        g_tool_queue_depth_D[_tool_S] = 0
+    del _tool_S
+
+    # Cache statistics, counted by each thread in its own shard (no
+    # lock per lookup, see record_cache_lookup): shard of the calling
+    # thread, and all the shards (cache name -> [hits, misses]), merged
+    # by merged_cache_stats_D()
+    g_cache_stats_local = threading.local()
+    g_cache_stats_L = []
+
+    # Bytes of the temp copies of the PDF files used in this run
+    # (each copy counted once: path -> True)
+    g_temp_store_bytes = 0
+    g_temp_store_paths_D = {}
+
+    # Resource accounting of the external tools:
+    # (tool, size bucket label) -> [runs, wall, user cpu, sys cpu,
+    #                               max rss (KB), input bytes]
+    # (see the C_USAGE_* indexes)
+    g_tool_usage_D = {}
+
+    # Min-heap with the most expensive tool runs:
+    # (cost secs, tool, file, input bytes, wall, user cpu, sys cpu, rss)
+    g_tool_top_L = []
+    g_tool_top_n = C_ADVANCED_SETTINGS_DEFAULTS_D[C_TOOL_TOP_N_FIELD]
+
+    # Triage decisions: verifier runs and verifier runs avoided
+    g_triage_stats_D = {C_TRIAGE_VERIFIER_RUN: 0,
+                        C_TRIAGE_VERIFIER_SKIPPED: 0}
+
+    # Flow rules fired: rule name -> count
+    g_flow_rules_stats_D = dict([(rule_T[C_RULE_NAME], 0)
+                                        for rule_T in C_FLOW_RULES_L])
+
+    # Shared executor of the tool runs (parallel checks), None if off
+    g_tool_executor = None
+
+    # Known verdicts hash set: MD5 -> verdict dict (see PDFVerdict.to_D)
+    g_known_verdicts_D = {}
+
+    # Conclusive verdicts of this job: MD5 -> verdict dict
+    # (written to C_KNOWN_VERDICTS_FNAME at the end)
+    g_seen_verdicts_D = {}
+
+    # Work avoided for known files and known verdicts
+    g_known_stats_D = {C_KNOWN_STAT_SKIPPED: 0,
+                       C_KNOWN_STAT_UNCACHED: 0,
+                       C_KNOWN_STAT_CACHED: 0,
+                       C_KNOWN_STAT_HASHSET_HIT: 0}
+
+    # Pool of the deferred analysis, None if off
+    g_analysis_pool = None
+
+    # Deferred analysis: files queued, analyzed, skipped (cancelled)
+    g_deferred_stats_D = {"queued": 0, "analyzed": 0, "cancelled": 0}
+
+    # Tool runs cancelled (e.g., exiftool when the verifier is conclusive)
+    g_tool_cancelled_D = dict([(tool_S, 0) for tool_S in C_TOOLS_L])
+
+    # Adaptive concurrency controllers: tool name -> AdaptiveToolSlots
+    # (empty when the controller is disabled)
+    g_tool_slots_D = {}
+
+    # Per-process limits applied to the external tools
+    # (setting name -> value, see C_TOOL_LIMIT_*)
+    g_tool_limits_D = {}
+
+    # Retry queue: list of [AbstractFile, full path, reason, attempts]
+    g_retry_queue_L = []
+
+    # Outcome of the retries: full path of the recovered files and
+    # (full path, last reason) of the files that still failed
+    g_retry_recovered_L = []
+    g_retry_permanent_L = []
+
+    # Checkpoints: data source id -> {object id -> verdict dict}
+    # and data source id -> checkpoint file (opened in append mode)
+    g_checkpoint_D = {}
+    g_checkpoint_F_D = {}
+
+    # Number of tool runs that breached a resource limit (per tool)
+    g_tool_limit_breaches_D = {}
+    for _tool_S in C_TOOLS_L:
+        g_tool_limit_breaches_D[_tool_S] = 0
+    del _tool_S
+
     #--------------------------------------------
     def __init__(self):
         self.settings = None
@@ -447,6 +1671,14 @@ class FindSignedPDFsFilesIngestModuleFactory(IngestModuleFactoryAdapter):
     def createFileIngestModule(self, ingestOptions):
         return FindSignedPDFFilesIngestModule(self.settings)
 
+    # Data source mode (see C_INGEST_MODE_FIELD): only the module of
+    # the selected mode does something, the other one stays passive
+    def isDataSourceIngestModuleFactory(self):
+        return True
+
+    def createDataSourceIngestModule(self, ingestOptions):
+        return FindSignedPDFsDataSourceIngestModule(self.settings)
+
 #--------------------------------------------------------------------
 # File-level ingest module. One object gets created per thread.
 #--------------------------------------------------------------------
@@ -473,11 +1705,30 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
 
     #--------------------------------------------------------------------
     # Constructor with parameter
+    # data_source_core: True for the instances run by the data source
+    # module (see FindSignedPDFsDataSourceIngestModule)
     # 2017-08-20
     #--------------------------------------------------------------------
-    def __init__(self, settings):
+    def __init__(self, settings, data_source_core=False):
         self.context = None
         self.local_settings = settings
+
+        # In data source mode, the instances created by Autopsy for
+        # every file are passive: the data source module does the job
+        self.m_passive = (not data_source_core) and\
+                (settings.get_advanced_setting(C_INGEST_MODE_FIELD) ==
+                                                C_INGEST_MODE_DATA_SOURCE)
+
+        # Counters of the fast-reject path: this instance is run by a
+        # single ingest thread, so they need no lock. They are added
+        # to the shared counters every C_COUNTERS_FLUSH_EVERY files
+        # and at shutDown (see flush_file_counters)
+        self.m_files_count = 0
+        self.m_not_pdf_count = 0
+
+        # Carve the PDF files of the unallocated space?
+        self.m_carve = settings.get_advanced_setting(C_CARVE_UNALLOCATED_FIELD)
+
         self.log(Level.INFO, Sep_S)
         self.log(Level.INFO, "**INIT with parameters**")
         self.log(Level.INFO, Sep_S)
@@ -513,6 +1764,9 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
     #--------------------------------------------------------------------
     def startUp(self, context):
 
+        if self.m_passive:
+            return
+
         # start timer
         self.m_time_start = time.time()
 
@@ -584,6 +1838,339 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
 
             raise IngestModuleException(Err_S)
 
+        if self.local_settings.get_advanced_setting(C_SIGNATURE_DIGESTS_FIELD)\
+                and C_CMS_PARSER_S is None:
+            Warning_S = "no CMS parser (BouncyCastle, sun.security.pkcs):"\
+                        " signature digests are not checked"
+            self.log(Level.WARNING, Warning_S)
+
+        # Reuse the verdicts of a previous (interrupted) run
+        self.m_data_source_id = context.getDataSource().getId()
+        self.load_checkpoint()
+        self.load_budget()
+
+        # Register this instance and start the live metrics
+        # reporter (only the first instance of the job does it)
+        self.m_started = True
+        self.register_module_instance()
+
+    #--------------------------------------------------------------------
+    # Add the counters of the fast-reject path to the shared counters
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def flush_file_counters(self):
+        """flush the per-instance file counters"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        Factory.g_lock.acquire()
+        Factory.g_files_count += self.m_files_count
+        Factory.g_NotPDFFiles_count += self.m_not_pdf_count
+        Factory.g_lock.release()
+        self.m_files_count = 0
+        self.m_not_pdf_count = 0
+
+    #--------------------------------------------------------------------
+    # Register a started module instance. The first instance starts
+    # the background metrics reporter.
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def register_module_instance(self):
+        """count the running instance and start the metrics reporter"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        interval_secs = \
+            self.local_settings.get_advanced_setting(C_METRICS_INTERVAL_FIELD)
+
+        Factory.g_lock.acquire()
+        try:
+            Factory.g_active_modules_count += 1
+            Factory.g_tool_top_n = \
+                    self.local_settings.get_advanced_setting(C_TOOL_TOP_N_FIELD)
+            for name_S in [C_TOOL_LIMIT_AS_MB_FIELD,
+                           C_TOOL_LIMIT_CPU_SECS_FIELD,
+                           C_TOOL_LIMIT_NOFILE_FIELD,
+                           C_TOOL_NICE_FIELD,
+                           C_TOOL_IONICE_CLASS_FIELD]:
+                Factory.g_tool_limits_D[name_S] = \
+                        self.local_settings.get_advanced_setting(name_S)
+            Factory.g_verifier_offline = \
+                self.local_settings.get_advanced_setting(C_VERIFIER_OFFLINE_FIELD)
+
+            if Factory.g_active_modules_count == 1:
+                self.create_tool_slots()
+                self.create_tool_executor()
+                self.create_analysis_pool()
+                self.load_known_verdicts()
+                self.compile_path_filter()
+                self.create_chain_cache()
+                self.create_revocation_store()
+                self.create_signer_index()
+                self.create_signature_time_type()
+                Factory.g_permission_histogram = PermissionHistogram()
+            if Factory.g_metrics_reporter is None and interval_secs > 0:
+                metrics_fname = os.path.join(self.getWorkDir(),
+                                                        C_METRICS_FNAME)
+                Factory.g_metrics_reporter = \
+                        MetricsReporter(metrics_fname, interval_secs)
+                Factory.g_metrics_reporter.start()
+
+                Log_S = "metrics reporter started ('%s', every %d secs)" %\
+                        (metrics_fname, interval_secs)
+                self.log(Level.INFO, Log_S)
+        finally:
+            Factory.g_lock.release()
+
+    #--------------------------------------------------------------------
+    # Create the adaptive concurrency controllers of the external tools
+    # (first instance of the job; called with g_lock held)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def create_tool_slots(self):
+        """create one AdaptiveToolSlots per external tool"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        settings = self.local_settings
+
+        Factory.g_tool_slots_D = {}
+        if not settings.get_advanced_setting(C_ADAPTIVE_SLOTS_FIELD):
+            return
+
+        num_cores = get_num_cores()
+        window_secs = settings.get_advanced_setting(C_ADAPTIVE_WINDOW_SECS_FIELD)
+        for tool_S, min_field, max_field, default_max in [
+                (C_TOOL_VERIFIER, C_VERIFIER_SLOTS_MIN_FIELD,
+                                  C_VERIFIER_SLOTS_MAX_FIELD, num_cores),
+                (C_TOOL_EXIFTOOL, C_EXIFTOOL_SLOTS_MIN_FIELD,
+                                  C_EXIFTOOL_SLOTS_MAX_FIELD, 2 * num_cores)]:
+            min_slots = max(1, settings.get_advanced_setting(min_field))
+            max_slots = settings.get_advanced_setting(max_field)
+            if max_slots <= 0:
+                max_slots = default_max
+            max_slots = max(min_slots, max_slots)
+
+            Factory.g_tool_slots_D[tool_S] = AdaptiveToolSlots(tool_S,
+                                        min_slots, max_slots, window_secs)
+
+            Log_S = "adaptive slots for %s: min=%d max=%d (%d cores)" %\
+                    (tool_S, min_slots, max_slots, num_cores)
+            self.log(Level.INFO, Log_S)
+
+    #--------------------------------------------------------------------
+    # Create the shared executor of the tool runs, when the parallel
+    # checks are on (first instance of the job; called with g_lock held)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def create_tool_executor(self):
+        """create the shared ToolExecutor"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        settings = self.local_settings
+
+        Factory.g_tool_executor = None
+        if not settings.get_advanced_setting(C_PARALLEL_CHECKS_FIELD):
+            return
+
+        num_threads = settings.get_advanced_setting(
+                                            C_TOOL_EXECUTOR_THREADS_FIELD)
+        if num_threads <= 0:
+            num_threads = 2 * get_num_cores()
+        Factory.g_tool_executor = ToolExecutor(num_threads)
+
+        Log_S = "parallel checks on: tool executor with %d threads" %\
+                (num_threads)
+        self.log(Level.INFO, Log_S)
+
+    #--------------------------------------------------------------------
+    # Compile the path filters of the settings, once per job
+    # (first instance of the job; called with g_lock held)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def compile_path_filter(self):
+        """compile the include/exclude path filters"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        settings = self.local_settings
+
+        patterns_L = []
+        for name_S in [C_PATH_INCLUDE_GLOBS_FIELD, C_PATH_EXCLUDE_GLOBS_FIELD,
+                   C_PATH_INCLUDE_REGEXES_FIELD, C_PATH_EXCLUDE_REGEXES_FIELD]:
+            value_S = settings.get_advanced_setting(name_S) or ""
+            patterns_L.append([pattern_S.strip() for pattern_S in
+                                    value_S.split(C_PATH_FILTER_SEP_S)
+                                    if len(pattern_S.strip()) > 0])
+
+        Factory.g_path_filter = None
+        if sum([len(L) for L in patterns_L]) == 0:
+            return
+
+        path_filter = PathFilter(*patterns_L)
+        for regex_S, error_S in path_filter.m_bad_regexes_L:
+            Warning_S = "path filter: ignoring bad regex '%s' (%s)" %\
+                    (regex_S, error_S)
+            self.log(Level.WARNING, Warning_S)
+        Factory.g_path_filter = path_filter
+
+        Log_S = "path filters: include %s, exclude %s" %\
+                (patterns_L[0] + patterns_L[2], patterns_L[1] + patterns_L[3])
+        self.log(Level.INFO, Log_S)
+
+    #--------------------------------------------------------------------
+    # Create the pool of the deferred analysis, when it is on
+    # (first instance of the job; called with g_lock held)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def create_analysis_pool(self):
+        """create the pool of workers of the deferred analysis"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        settings = self.local_settings
+
+        Factory.g_analysis_pool = None
+        if not settings.get_advanced_setting(C_DEFERRED_ANALYSIS_FIELD):
+            return
+
+        num_workers = settings.get_advanced_setting(C_DEFERRED_WORKERS_FIELD)
+        if num_workers <= 0:
+            num_workers = get_num_cores()
+        queue_max = max(1,
+                settings.get_advanced_setting(C_DEFERRED_QUEUE_MAX_FIELD))
+        Factory.g_analysis_pool = ToolExecutor(num_workers, queue_max,
+                                                    "digiSignedPDF-analysis")
+
+        Log_S = "deferred analysis on: %d workers, up to %d queued files" %\
+                (num_workers, queue_max)
+        self.log(Level.INFO, Log_S)
+
+    #--------------------------------------------------------------------
+    # Wait for the deferred analysis of the queued files and stop the
+    # pool. Files still queued when the ingest is cancelled are not
+    # analyzed (they end in the retry report as cancelled).
+    # Called by the last instance of the job.
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def drain_analysis_pool(self):
+        """wait for the deferred analysis and stop its pool"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        pool = Factory.g_analysis_pool
+        Factory.g_analysis_pool = None
+        Factory.g_lock.release()
+
+        if pool is None:
+            return
+
+        time_start = time.time()
+        pool.shutdown()
+
+        Factory.g_lock.acquire()
+        stats_D = dict(Factory.g_deferred_stats_D)
+        Factory.g_lock.release()
+
+        Log_S = "deferred analysis: %d files analyzed, %d cancelled "\
+                "(drained in %.1f secs)" %\
+                (stats_D["analyzed"], stats_D["cancelled"],
+                 time.time() - time_start)
+        self.log(Level.INFO, Log_S)
+
+    #--------------------------------------------------------------------
+    # Deferred analysis of a PDF file (run by the analysis pool)
+    # @param file       [IN] AbstractFile (PDF file)
+    # @param run_handle [IN] ToolTask of the analysis (unused)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def deferred_analysis(self, file, run_handle=None):
+        """analyze a queued PDF file, unless the ingest was cancelled"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        if self.context.fileIngestIsCancelled():
+            Factory.g_lock.acquire()
+            Factory.g_deferred_stats_D["cancelled"] += 1
+            Factory.g_lock.release()
+            self.push_retry(file, C_RETRY_REASON_CANCELLED)
+            return
+
+        try:
+            process_result, retry_reason_S = self.analyze_pdf_file(file)
+        except:
+            retry_reason_S = "%s (%s)" % (sys.exc_info()[0],
+                                                    sys.exc_info()[1])
+            Except_S = "deferred analysis of '%s' failed: %s" %\
+                    (file.getName(), retry_reason_S)
+            self.log(Level.SEVERE, Except_S)
+
+        if retry_reason_S is not None:
+            self.push_retry(file, retry_reason_S)
+
+        Factory.g_lock.acquire()
+        Factory.g_deferred_stats_D["analyzed"] += 1
+        Factory.g_lock.release()
+
+    #--------------------------------------------------------------------
+    # Stop the shared executor of the tool runs, if any.
+    # Called by the last instance of the job, once no more tool runs
+    # can be submitted (after the retries).
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def stop_tool_executor(self):
+        """stop the shared ToolExecutor, if any"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        executor = Factory.g_tool_executor
+        Factory.g_tool_executor = None
+        Factory.g_lock.release()
+
+        if executor is not None:
+            executor.shutdown()
+
+    #--------------------------------------------------------------------
+    # Unregister a module instance.
+    # @return True if this was the last running instance of the job
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def unregister_module_instance(self):
+        """uncount the instance, telling whether it was the last one"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        if not getattr(self, "m_started", False):
+            # startUp() failed: nothing was registered
+            return False
+        self.m_started = False
+
+        Factory.g_lock.acquire()
+        try:
+            Factory.g_active_modules_count -= 1
+            is_last = (Factory.g_active_modules_count == 0)
+        finally:
+            Factory.g_lock.release()
+
+        return is_last
+
+    #--------------------------------------------------------------------
+    # Stop the metrics reporter (writing a final snapshot).
+    # Called by the last instance of the job, once everything is done.
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def stop_metrics_reporter(self):
+        """stop the background metrics reporter, if any"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        reporter = Factory.g_metrics_reporter
+        Factory.g_metrics_reporter = None
+        Factory.g_lock.release()
+
+        # Stop outside of the lock: the reporter needs it for
+        # the final snapshot
+        if reporter is not None:
+            reporter.stop()
+
 
 
     #---------------------------------------------------------------
@@ -621,6 +2208,24 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
         # Msg_S = "finished: %d PDF files" % (self.m_PDFFiles_count)
         # self.log(Level.INFO, Msg_S)
 
+        if self.m_passive:
+            return
+
+        if not getattr(self, "m_started", False):
+            # startUp() failed (e.g., wrong path for VERIFIER.EXE):
+            # just tell why there are no results
+            msg_to_show = "Got no results (%s)" %\
+                    (FindSignedPDFsFilesIngestModuleFactory.g_final_msg)
+            self.log(Level.INFO, msg_to_show)
+            self.postIngestMessage(self.getModuleName(), msg_to_show)
+            return
+
+        # The counters of every instance must be in before the reports
+        self.flush_file_counters()
+
+        # Is this the last running instance of the job?
+        is_last_instance = self.unregister_module_instance()
+
         #--------------------------------------------------
         # DEBUG -- it always returns 1...
         #--------------------------------------------------
@@ -629,6 +2234,20 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
         self.log(Level.INFO, Log_S)
         #--------------------------------------------------
 
+        if not is_last_instance:
+            # The job-wide work (retries, reports, CSV files) is done
+            # by the last instance, once every thread is done with
+            # process(): otherwise the reports would be incomplete
+            return
+
+        # Deferred files are analyzed, then failed files get
+        # another chance before the reports
+        self.drain_analysis_pool()
+        self.budget_catch_up()
+        self.drain_retry_queue()
+        self.stop_tool_executor()
+        self.flush_signature_times()
+
         # Elaspsed time
         g_elapsed_time_secs = time.time() -\
                 FindSignedPDFsFilesIngestModuleFactory.g_start_time
@@ -654,6 +2273,12 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
                  FindSignedPDFsFilesIngestModuleFactory.g_PDFFilesInserted_count, 
                  g_elapsed_time_secs)
 
+            num_filtered = \
+                FindSignedPDFsFilesIngestModuleFactory.g_PathFiltered_count
+            if num_filtered > 0:
+                msg_to_show = "%s -- %d PDF skipped by path filters" %\
+                        (msg_to_show, num_filtered)
+
         self.log(Level.INFO, msg_to_show)
         # Post message on central logger
         self.postIngestMessage(self.getModuleName(), msg_to_show)
@@ -686,6 +2311,11 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
 
             self.log(Level.INFO, Log_S)
             self.postIngestMessage(self.getModuleName(), Log_S)
+            self.report_permission_histogram()
+
+            # Verifier runs avoided by the triage, flow rules fired
+            self.report_triage_stats()
+            self.report_flow_rules_stats()
 
             # write the dict with results to a CSV file 
             # (if the option to do so is set)
@@ -723,6 +2353,269 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
             #---
             lock.release()
 
+        # Job-wide reports and final snapshot of the live metrics
+        self.close_checkpoints()
+        self.save_chain_cache()
+        self.close_revocation_store()
+        self.close_signer_index()
+        self.report_known_files()
+        self.report_budget()
+        self.report_carving()
+        self.report_embedded()
+        self.report_signature_digests()
+        self.report_retry_outcome()
+        self.report_tool_usage()
+        self.stop_metrics_reporter()
+
+
+    #--------------------------------------------------------------------
+    # Report how many verifier runs the triage avoided
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def report_triage_stats(self):
+        """report the verifier runs/skips decided by the triage"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        stats_D = dict(Factory.g_triage_stats_D)
+        Factory.g_lock.release()
+
+        num_run = stats_D[C_TRIAGE_VERIFIER_RUN]
+        num_skipped = stats_D[C_TRIAGE_VERIFIER_SKIPPED]
+        num_triaged = num_run + num_skipped
+        if num_triaged == 0:
+            return
+
+        Log_S = "triage: verifier run on %d of %d PDF files "\
+                "(%d runs avoided, %.1f%%)" %\
+                (num_run, num_triaged, num_skipped,
+                 100.0 * num_skipped / num_triaged)
+        self.log(Level.INFO, Log_S)
+        self.postIngestMessage(self.getModuleName(), Log_S)
+
+    #--------------------------------------------------------------------
+    # Report how many times each flow rule fired
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def report_flow_rules_stats(self):
+        """report the flow rules fired"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        stats_D = dict(Factory.g_flow_rules_stats_D)
+        Factory.g_lock.release()
+
+        fired_L = ["%s=%d" % (rule_T[C_RULE_NAME],
+                              stats_D[rule_T[C_RULE_NAME]])
+                        for rule_T in C_FLOW_RULES_L
+                        if stats_D[rule_T[C_RULE_NAME]] > 0]
+        if len(fired_L) == 0:
+            return
+
+        Log_S = "flow rules fired: %s" % (", ".join(fired_L))
+        self.log(Level.INFO, Log_S)
+
+    #--------------------------------------------------------------------
+    # Push a file on the retry queue
+    # @param file     [IN] AbstractFile that failed
+    # @param reason_S [IN] why it failed (C_RETRY_REASON_*)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def push_retry(self, file, reason_S):
+        """queue 'file' for a later retry"""
+        fullFilePath_S = os.path.join(file.getParentPath(), file.getName())
+
+        Log_S = "file '%s' queued for retry (%s)" % (fullFilePath_S, reason_S)
+        self.log(Level.INFO, Log_S)
+
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        Factory.g_lock.acquire()
+        Factory.g_retry_queue_L.append([file, fullFilePath_S, reason_S, 0])
+        Factory.g_lock.release()
+
+    #--------------------------------------------------------------------
+    # Drain the retry queue: each round waits an exponential backoff
+    # and then re-analyzes the queued files with (few) retry_threads
+    # threads, so transient I/O or memory pressure has time to go away.
+    # Files still failing after retry_max_attempts rounds are permanent
+    # failures. Stops if the ingest is cancelled.
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def drain_retry_queue(self):
+        """retry the files that failed during the main pass"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        max_attempts = \
+            self.local_settings.get_advanced_setting(C_RETRY_MAX_ATTEMPTS_FIELD)
+        backoff_secs = \
+            self.local_settings.get_advanced_setting(C_RETRY_BACKOFF_SECS_FIELD)
+        num_threads = max(1,
+            self.local_settings.get_advanced_setting(C_RETRY_THREADS_FIELD))
+
+        Factory.g_lock.acquire()
+        pending_L = Factory.g_retry_queue_L
+        Factory.g_retry_queue_L = []
+        Factory.g_lock.release()
+
+        attempt = 0
+        while len(pending_L) > 0 and attempt < max_attempts:
+            if self.context.fileIngestIsCancelled():
+                break
+
+            attempt += 1
+            wait_secs = backoff_secs * (2 ** (attempt - 1))
+            Log_S = "retry round %d: %d file(s), waiting %.1f secs" %\
+                    (attempt, len(pending_L), wait_secs)
+            self.log(Level.INFO, Log_S)
+            time.sleep(wait_secs)
+
+            failed_L = []
+            lock = threading.Lock()
+            work_L = list(pending_L)
+
+            def retry_worker():
+                while not self.context.fileIngestIsCancelled():
+                    lock.acquire()
+                    if len(work_L) == 0:
+                        lock.release()
+                        return
+                    entry = work_L.pop()
+                    lock.release()
+
+                    entry[3] += 1
+                    try:
+                        result, reason_S = self.analyze_pdf_file(entry[0])
+                    except:
+                        reason_S = "%s (%s)" % (sys.exc_info()[0],
+                                                        sys.exc_info()[1])
+
+                    lock.acquire()
+                    if reason_S is None:
+                        Factory.g_lock.acquire()
+                        Factory.g_retry_recovered_L.append(entry[1])
+                        Factory.g_lock.release()
+                    else:
+                        entry[2] = reason_S
+                        failed_L.append(entry)
+                    lock.release()
+
+            threads_L = [threading.Thread(target=retry_worker)
+                                    for i in range(min(num_threads,
+                                                        len(work_L)))]
+            for thread in threads_L:
+                thread.start()
+            for thread in threads_L:
+                thread.join()
+
+            # Files not picked because the ingest was cancelled
+            failed_L.extend(work_L)
+            pending_L = failed_L
+
+        # Still failing: permanent failures
+        Factory.g_lock.acquire()
+        for entry in pending_L:
+            if self.context.fileIngestIsCancelled():
+                reason_S = C_RETRY_REASON_CANCELLED
+            else:
+                reason_S = entry[2]
+            Factory.g_retry_permanent_L.append((entry[1], reason_S))
+        Factory.g_lock.release()
+
+    #--------------------------------------------------------------------
+    # Report the outcome of the retry queue: recovered files and
+    # permanent failures (log, ingest messages and CSV file)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def report_retry_outcome(self):
+        """report the recovered and the permanently failed files"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        recovered_L = sorted(Factory.g_retry_recovered_L)
+        permanent_L = sorted(Factory.g_retry_permanent_L)
+        Factory.g_lock.release()
+
+        if len(recovered_L) == 0 and len(permanent_L) == 0:
+            return
+
+        Log_S = "retried files: %d recovered, %d permanent failures" %\
+                (len(recovered_L), len(permanent_L))
+        self.postIngestMessage(self.getModuleName(), Log_S)
+
+        Lines_L = [Log_S]
+        for fullFilePath_S in recovered_L:
+            Lines_L.append("RECOVERED '%s'" % (fullFilePath_S))
+        for fullFilePath_S, reason_S in permanent_L:
+            Lines_L.append("FAILED '%s' (%s)" % (fullFilePath_S, reason_S))
+        self.log(Level.INFO, "\n".join(Lines_L))
+
+        if self.local_settings.get_create_csv_file_flag():
+            filename = "%s_RETRY_%s.csv" % (Case.getCurrentCase().getName(),
+                                                    get_now_timestamp_S())
+            full_path_filename = os.path.join(self.getWorkDir(),filename)
+            retry_outcome2CSVfile(recovered_L, permanent_L, ";",
+                                                    full_path_filename)
+
+    #--------------------------------------------------------------------
+    # Report the resource usage of the external tools (per tool and
+    # size bucket) and the most expensive runs. Written to the log,
+    # to the ingest messages and (if enabled) to a CSV file.
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def report_tool_usage(self):
+        """report the resource accounting of the external tools"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        usage_D = dict([(k, list(v)) for k, v in
+                                    Factory.g_tool_usage_D.iteritems()])
+        top_L = sorted(Factory.g_tool_top_L, reverse=True)
+        limit_breaches_D = dict(Factory.g_tool_limit_breaches_D)
+        Factory.g_lock.release()
+
+        if len(usage_D) == 0:
+            return
+
+        Lines_L = ["external tools usage (tool/size: runs, wall, "\
+                   "user cpu, sys cpu, max rss KB, MB read)"]
+        for tool_S, bucket_S in sorted(usage_D.iterkeys()):
+            U = usage_D[(tool_S, bucket_S)]
+            Lines_L.append("%s/%s: %d runs, %.1fs wall, %s user, %s sys, "\
+                    "%s KB, %.1f MB" %\
+                    (tool_S, bucket_S, U[C_USAGE_RUNS], U[C_USAGE_WALL],
+                     secs_or_na_S(U[C_USAGE_USER_CPU]),
+                     secs_or_na_S(U[C_USAGE_SYS_CPU]),
+                     value_or_na_S(U[C_USAGE_MAX_RSS]),
+                     U[C_USAGE_BYTES] / (1024.0 * 1024.0)))
+
+        Lines_L.append("runs stopped by a resource limit: %s" %\
+                (", ".join(["%s=%d" % (k, v) for k, v in
+                                    sorted(limit_breaches_D.iteritems())])))
+        Lines_L.append("top %d most expensive tool runs:" % (len(top_L)))
+        for (cost, tool_S, evidence_path_S, path_S, size, wall, user_cpu,
+                                                sys_cpu, rss) in top_L:
+            Lines_L.append("%.2fs %s '%s' (%d bytes, rss %s KB, copy '%s')" %\
+                    (cost, tool_S, evidence_path_S, size, value_or_na_S(rss),
+                     path_S))
+
+        Log_S = "\n".join(Lines_L)
+        self.log(Level.INFO, Log_S)
+        self.postIngestMessage(self.getModuleName(), Log_S)
+
+        if self.local_settings.get_create_csv_file_flag():
+            filename = "%s_TOOLS_%s.csv" % (Case.getCurrentCase().getName(),
+                                                    get_now_timestamp_S())
+            full_path_filename = os.path.join(self.getWorkDir(),filename)
+            tool_usage2CSVfile(usage_D, top_L, ";", full_path_filename)
+
+            Log_S = "Tools usage CSV file created '%s'" % (filename)
+            self.log(Level.INFO, Log_S)
 
     #--------------------------------------------------------------------
     # Write the result of signed DICT to CSV file
@@ -833,7 +2726,7 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
         """Increment, with a lock, the shared class 
            variable g_signedPDFFiles_count"""
         # Acquire lock
-        lock = threading.Lock()
+        lock = FindSignedPDFsFilesIngestModuleFactory.g_lock
         lock.acquire()
         FindSignedPDFsFilesIngestModuleFactory.g_signedPDFFiles_count =\
                 FindSignedPDFsFilesIngestModuleFactory.g_signedPDFFiles_count+1
@@ -849,7 +2742,7 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
         """Increment, with a lock, the shared class 
            variable g_PDFFilesInserted_count"""
         # Acquire lock
-        lock = threading.Lock()
+        lock = FindSignedPDFsFilesIngestModuleFactory.g_lock
         lock.acquire()
         FindSignedPDFsFilesIngestModuleFactory.g_PDFFilesInserted_count =\
              FindSignedPDFsFilesIngestModuleFactory.g_PDFFilesInserted_count+1
@@ -875,27 +2768,47 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
     #--------------------------------------------------------------------
     def process(self, file):
 
-        # Use blackboard class to index blackboard artifacts for keyword search
-        blackboard = Case.getCurrentCase().getServices().getBlackboard()
+        if self.m_passive:
+            return IngestModule.ProcessResult.OK
 
         if self.context.fileIngestIsCancelled():
             return IngestModule.ProcessResult.OK
 
-        # Acquire lock
-        #---
-        lock = threading.Lock()
-        lock.acquire()
+        # Unallocated space: carve it (otherwise skipped as non-file)
+        if self.m_carve and file.getType() in C_NOT_FILE_TYPES_L:
+            carved_L = self.carve_unallocated(file)
+            if len(carved_L) > 0:
+                # The carved files go through process() as any file
+                self.context.addFilesToJob(carved_L)
+            return IngestModule.ProcessResult.OK
 
-        # Write to DEBUG log file
+        #------------------------------------------------------------
+        # Fast-reject path: most files are not PDF files. Without the
+        # per-file DEBUG log files, they are rejected with no lock,
+        # no log and no string formatting
+        #------------------------------------------------------------
+        if C_Log_Level < C_LOG_FILE_DETAILS and\
+                                not is_pdf_candidate(file, file.getName()):
+            if file.isFile() and file.getType() not in C_NOT_FILE_TYPES_L:
+                self.m_files_count += 1
+                self.m_not_pdf_count += 1
+                if self.m_files_count >= C_COUNTERS_FLUSH_EVERY:
+                    self.flush_file_counters()
+            return IngestModule.ProcessResult.OK
+
+        # Write to DEBUG log file (the lock only when there is one)
         if C_Log_Level >= C_LOG_FILE_DETAILS:
+            # Acquire lock
+            #---
+            FindSignedPDFsFilesIngestModuleFactory.g_lock.acquire()
             Msg_S = "%d:'%s'" %\
                 (FindSignedPDFsFilesIngestModuleFactory.g_files_count,
                         file.getName())
             file_F = \
                FindSignedPDFsFilesIngestModuleFactory.g_log_every_fnames_F
             write_log_file(file_F, Msg_S)
-        #---
-        lock.release()
+            #---
+            FindSignedPDFsFilesIngestModuleFactory.g_lock.release()
 
         #------------------------------------------------------------
         # Skip non-files
@@ -921,9 +2834,6 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
 
             return IngestModule.ProcessResult.OK
 
-        # alias for Module name
-        ModuleName = FindSignedPDFsFilesIngestModuleFactory.moduleName
-
         #--------------------------------------------------------------------
         # https://docs.python.org/2/library/threading.html
         # http://www.jython.org/jythonbook/en/1.0/Concurrency.html
@@ -931,9 +2841,8 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
         #                            are-static-class-variables-possible
         #====================================================================
         # Acquire lock
-        lock = threading.Lock()
         #---
-        lock.acquire()
+        FindSignedPDFsFilesIngestModuleFactory.g_lock.acquire()
         FindSignedPDFsFilesIngestModuleFactory.g_files_count += 1
 
         # Write to DEBUG log file
@@ -945,21 +2854,11 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
                FindSignedPDFsFilesIngestModuleFactory.g_log_all_counted_fnames_F
             write_log_file(file_F, Msg_S)
         #---
-        lock.release()
-
-        # Log
-        if C_Log_Level >= C_LOG_ANALYZE:
-            JobID_S = "%s" % (self.context.getJobId())
-            Log_S = "JobID:%s --- analyzing file '%s' (file #%d)" %\
-                (JobID_S, file.getName(), 
-                        FindSignedPDFsFilesIngestModuleFactory.g_files_count)
-            self.log(Level.INFO, Log_S)
-
+        FindSignedPDFsFilesIngestModuleFactory.g_lock.release()
 
         if not self.is_pdf_file(file):
             # A file, but not a PDF file...
-            lock = threading.Lock()
-            lock.acquire()
+            FindSignedPDFsFilesIngestModuleFactory.g_lock.acquire()
             #---
             FindSignedPDFsFilesIngestModuleFactory.g_NotPDFFiles_count += 1
 
@@ -972,7 +2871,7 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
                   FindSignedPDFsFilesIngestModuleFactory.g_log_not_pdf_names_F
                 write_log_file(file_F, Msg_S)
             #---
-            lock.release()
+            FindSignedPDFsFilesIngestModuleFactory.g_lock.release()
 
             if C_Log_Level >= C_LOG_FILE_DETAILS:
                 Log_S = "not a PDF file '%s'" % (file.getName())
@@ -981,9 +2880,30 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
             # not (considered as) a PDF file
             return IngestModule.ProcessResult.OK
 
+        # Log (PDF files only: the others are not analyzed)
+        if C_Log_Level >= C_LOG_ANALYZE:
+            JobID_S = "%s" % (self.context.getJobId())
+            Log_S = "JobID:%s --- analyzing file '%s' (file #%d)" %\
+                (JobID_S, file.getName(), 
+                        FindSignedPDFsFilesIngestModuleFactory.g_files_count)
+            self.log(Level.INFO, Log_S)
+
+        # Out of the scope of the analysis (path filters)?
+        path_filter = FindSignedPDFsFilesIngestModuleFactory.g_path_filter
+        if path_filter is not None and\
+                            path_filter.is_skipped(file.getParentPath()):
+            FindSignedPDFsFilesIngestModuleFactory.g_lock.acquire()
+            FindSignedPDFsFilesIngestModuleFactory.g_PathFiltered_count += 1
+            FindSignedPDFsFilesIngestModuleFactory.g_lock.release()
+
+            if C_Log_Level >= C_LOG_FILE_DETAILS:
+                Log_S = "PDF file '%s' skipped by the path filters" %\
+                        (file.getName())
+                self.log(Level.INFO, Log_S)
+            return IngestModule.ProcessResult.OK
+
         # another PDF file: update the counter
-        lock = threading.Lock()
-        lock.acquire()
+        FindSignedPDFsFilesIngestModuleFactory.g_lock.acquire()
         #---
         FindSignedPDFsFilesIngestModuleFactory.g_PDFFiles_count += 1
 
@@ -997,11 +2917,47 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
             write_log_file(file_F, Msg_S)
 
         #---
-        lock.release()
-        
-        filename = file.getName()
+        FindSignedPDFsFilesIngestModuleFactory.g_lock.release()
 
-        if C_Log_Level >= C_LOG_FILE_DETAILS:
+        # Budgeted triage: deferred now, at the end or never?
+        if self.budget_defers(file):
+            return IngestModule.ProcessResult.OK
+
+        # Deferred analysis: leave the ingest thread to the other modules
+        pool = FindSignedPDFsFilesIngestModuleFactory.g_analysis_pool
+        if pool is not None:
+            FindSignedPDFsFilesIngestModuleFactory.g_lock.acquire()
+            FindSignedPDFsFilesIngestModuleFactory.g_deferred_stats_D["queued"] += 1
+            FindSignedPDFsFilesIngestModuleFactory.g_lock.release()
+            pool.submit(self.deferred_analysis, (file,))
+            return IngestModule.ProcessResult.OK
+        
+        process_result, retry_reason_S = self.analyze_pdf_file(file)
+        if retry_reason_S is not None:
+            self.push_retry(file, retry_reason_S)
+
+        return process_result
+
+    #--------------------------------------------------------------------
+    # Analysis of a PDF file: copy to the work dir, signature check,
+    # permissions check and artifacts.
+    # The steps are not hard-coded: at every step the facts of the
+    # analysis (cache state, triage, verifier code, ...) are matched
+    # against the rules of C_FLOW_RULES_L, and the action of the
+    # cheapest matching rule is run, until a rule says stop or retry.
+    # Called by process() and by the retry queue.
+    # @param file [IN] AbstractFile (PDF file)
+    # @return (IngestModule.ProcessResult, retry reason or None)
+    #         The retry reason is set for failures that are worth
+    #         retrying (copy failure, verifier code 101/102/105).
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def analyze_pdf_file(self, file):
+        """analyze a PDF file, telling whether it should be retried"""
+
+        filename = file.getName()
+
+        if C_Log_Level >= C_LOG_FILE_DETAILS:
             # LOG
             msg_S = "Processing PDF file: '" + filename +\
                 "' (#%d)" %\
@@ -1019,55 +2975,291 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
 
         # save the full file name in the dictionary 
         # Acquire lock
-        lock = threading.Lock()
+        lock = FindSignedPDFsFilesIngestModuleFactory.g_lock
         lock.acquire()
         FindSignedPDFsFilesIngestModuleFactory.g_fullPathPDFFiles_D[fullFilePath_S] = [temp_fullFilepath]
         lock.release()
 
-        # Does the file already exist? (i.e, was it copied previously)
-        if not os.path.isfile(temp_fullFilepath):
-            # File does not exist: Copy the file
-            ## ContentUtils.writeToFile(file, java.io.File(temp_fullFilepath))
+        analysis = self.new_analysis(file, fullFilePath_S, temp_fullFilepath)
 
-            try:
-                ContentUtils.writeToFile(file, java.io.File(temp_fullFilepath))
-                msg_S = "file '%s' copied" % (filename)
-                self.log(Level.INFO, msg_S)
-            except:
+        # Was the file analyzed by a previous (interrupted) run?
+        # If so, its verdict is reused and no tool is run
+        verdict = self.lookup_checkpoint(file)
+        if verdict is not None:
+            Log_S = "file '%s': verdict %d reloaded from checkpoint" %\
+                    (filename, verdict.signed_code)
+            self.log(Level.INFO, Log_S)
 
-                err_S = "Error in copying file '%s': %s (%s)" %\
-                        (filename, sys.exc_info()[0], sys.exc_info()[1])
-                # err_S = "problems in copying file '%s'" % (filename)
-                self.log(Level.SEVERE, err_S)
+            analysis.facts_D[C_FLOW_CACHE] = C_CACHE_STATE_CHECKPOINT
+            analysis.set_verdict(verdict)
+        else:
+            # Verdict of a previous case (known verdicts hash set)?
+            verdict = self.lookup_known_verdict(file)
+            if verdict is not None:
+                analysis.facts_D[C_FLOW_CACHE] = C_CACHE_STATE_HASHSET
+                analysis.set_verdict(verdict)
 
-                # We're leaving - file could not be copied
-                return IngestModule.ProcessResult.ERROR
+        if file.getKnown() == TskData.FileKnown.KNOWN:
+            analysis.facts_D[C_FLOW_KNOWN] = \
+                    self.local_settings.get_advanced_setting(C_KNOWN_FILES_FIELD)
 
-        else:
-            # DEBUG
-            Log_S = "file '%s' already exists" % (temp_fullFilepath)
-            self.log(Level.INFO, Log_S)
+        process_result, retry_reason_S = self.run_analysis_flow(analysis)
 
-        #----------------------------------------
-        # Is the PDF file digitally signed? 
-        #----------------------------------------
-        # Launch EXE to determine if the PDF file is signed or not
+        # PDF files attached to this one (once it is done)
+        if self.local_settings.get_advanced_setting(C_EMBEDDED_PDFS_FIELD)\
+                and process_result == IngestModule.ProcessResult.OK\
+                and retry_reason_S is None\
+                and analysis.facts_D[C_FLOW_KNOWN] == C_KNOWN_FILES_ANALYZE:
+            self.analyze_embedded_pdfs(file, analysis)
+
+        return (process_result, retry_reason_S)
+
+    #--------------------------------------------------------------------
+    # New analysis of a PDF file, whose facts follow the settings
+    # (triage, revisions, digests, parallel checks)
+    # @param file        [IN] AbstractFile whose artifacts are added
+    # @param full_path_S [IN] full path of the PDF file
+    # @param temp_path_S [IN] path of its copy in the work dir
+    # @return PDFAnalysis
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def new_analysis(self, file, full_path_S, temp_path_S):
+        """analysis of a PDF file, with the facts of the settings"""
+        analysis = PDFAnalysis(file, full_path_S, temp_path_S)
+        if self.local_settings.get_advanced_setting(C_TRIAGE_FIELD):
+            analysis.facts_D[C_FLOW_PRESCAN] = C_PRESCAN_PENDING
+        if self.local_settings.get_advanced_setting(C_REVISION_ANALYSIS_FIELD):
+            analysis.revisions_wanted = True
+        if self.local_settings.get_advanced_setting(C_SIGNATURE_DIGESTS_FIELD)\
+                and C_CMS_PARSER_S is not None:
+            analysis.digests_wanted = True
+        if FindSignedPDFsFilesIngestModuleFactory.g_tool_executor is not None:
+            analysis.facts_D[C_FLOW_PARALLEL] = True
+        return analysis
+
+    #--------------------------------------------------------------------
+    # Run the rules of the analysis flow until a rule says stop or
+    # retry (see analyze_pdf_file)
+    # @param analysis [IN/OUT] PDFAnalysis
+    # @return (IngestModule.ProcessResult, retry reason or None)
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def run_analysis_flow(self, analysis):
+        """run the flow rules on an analysis"""
+        file = analysis.file
+        filename = file.getName()
+
+        for step in range(C_FLOW_MAX_STEPS):
+            rule_T = choose_flow_rule(analysis.facts_D)
+            if rule_T is None:
+                Err_S = "file '%s': no flow rule for facts %s" %\
+                        (filename, analysis.facts_D)
+                self.log(Level.SEVERE, Err_S)
+                return (IngestModule.ProcessResult.ERROR, None)
+
+            rule_S, action_S = rule_T[C_RULE_NAME], rule_T[C_RULE_ACTION]
+            count_flow_rule(rule_S)
+
+            if C_Log_Level >= C_LOG_FILE_DETAILS:
+                Log_S = "[flow] '%s': rule '%s' -> %s" %\
+                        (filename, rule_S, action_S)
+                self.log(Level.INFO, Log_S)
+
+            if action_S == C_ACTION_STOP:
+                count_known_file(analysis.facts_D)
+                count_permissions(analysis, True)
+                if analysis.verdict.signed_code is None or\
+                                            analysis.embedded_depth > 0:
+                    # stopped before any verdict (e.g., known file), or
+                    # embedded file (no object id, no MD5 of its own)
+                    return (IngestModule.ProcessResult.OK, None)
+
+                # Keep the verdict for a resumed run and a later case
+                if analysis.verdict.modified:
+                    self.save_checkpoint(file, analysis.verdict)
+                remember_known_verdict(file, analysis)
+                return (IngestModule.ProcessResult.OK, None)
+
+            if action_S == C_ACTION_RETRY:
+                count_permissions(analysis, False)
+                # Tool failures are retried later
+                if analysis.facts_D[C_FLOW_COPY] == C_COPY_FAILED:
+                    return (IngestModule.ProcessResult.ERROR,
+                                                    C_RETRY_REASON_COPY)
+                return (IngestModule.ProcessResult.OK,
+                        C_RETRY_REASON_TOOL % (analysis.verdict.signed_code))
+
+            self.run_flow_action(action_S, analysis)
+
+        Err_S = "file '%s': analysis stopped after %d steps (facts %s)" %\
+                (filename, C_FLOW_MAX_STEPS, analysis.facts_D)
+        self.log(Level.SEVERE, Err_S)
+        return (IngestModule.ProcessResult.ERROR, None)
+
+    #--------------------------------------------------------------------
+    # Run an action of the analysis flow (see C_FLOW_RULES_L)
+    # @param action_S [IN] C_ACTION_* (other than stop/retry)
+    # @param analysis [IN/OUT] PDFAnalysis, whose facts are updated
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def run_flow_action(self, action_S, analysis):
+        """run an action of the analysis flow"""
+        if action_S == C_ACTION_COPY:
+            if self.copy_to_work_dir(analysis.file, analysis.temp_path_S):
+                analysis.facts_D[C_FLOW_COPY] = C_COPY_DONE
+            else:
+                analysis.facts_D[C_FLOW_COPY] = C_COPY_FAILED
+
+        elif action_S == C_ACTION_TRIAGE:
+            # Triage: one exiftool query + native scan
+            analysis.set_triage_facts(self.triage_pdf(analysis.temp_path_S,
+                                                    analysis.full_path_S))
+
+        elif action_S == C_ACTION_VERIFIER:
+            # Launch EXE to determine if the PDF file is signed or not
+            EXE_signer_path = self.local_settings.get_EXE_signer_path()
+            ret_signed_code = is_pdf_signed(EXE_signer_path,
+                                analysis.temp_path_S, analysis.full_path_S)
+            analysis.set_signed_code(ret_signed_code)
+
+        elif action_S == C_ACTION_PARALLEL_CHECKS:
+            self.run_parallel_checks(analysis)
+
+        elif action_S == C_ACTION_ASSUME_NOT_SIGNED:
+            # No signature indicator at all: not signed
+            analysis.set_signed_code(C_SIG_STAT_CODE_NO_SIGNATURE)
+
+        elif action_S == C_ACTION_EXIFTOOL:
+            EXE_exiftool_path = self.local_settings.get_EXE_exiftool_path()
+            permissions_L, encryption_S = self.get_pdf_permissions(
+                                EXE_exiftool_path, analysis.temp_path_S,
+                                analysis.full_path_S)
+            analysis.set_permissions(permissions_L, encryption_S)
+
+        elif action_S == C_ACTION_REVISIONS:
+            revisions_D = None
+            if analysis.facts_D[C_FLOW_COPY] == C_COPY_DONE:
+                try:
+                    revisions_D = analyze_revisions(analysis.temp_path_S)
+                except IOError:
+                    Err_S = "can't analyze the revisions of '%s': %s" %\
+                            (analysis.temp_path_S, sys.exc_info()[1])
+                    self.log(Level.WARNING, Err_S)
+            analysis.set_revisions(revisions_D)
+
+        elif action_S == C_ACTION_DIGESTS:
+            signatures_L = None
+            if analysis.facts_D[C_FLOW_COPY] == C_COPY_DONE:
+                try:
+                    Factory = FindSignedPDFsFilesIngestModuleFactory
+                    signatures_L = check_signature_digests(
+                                analysis.temp_path_S, Factory.g_chain_cache,
+                                Factory.g_revocation_store)
+                except IOError:
+                    Err_S = "can't check the signature digests of '%s': %s"%\
+                            (analysis.temp_path_S, sys.exc_info()[1])
+                    self.log(Level.WARNING, Err_S)
+            analysis.set_signature_digests(signatures_L)
+            count_signature_digests(signatures_L)
+
+        elif action_S == C_ACTION_EMIT_SIGNATURE:
+            self.emit_signature_artifact(analysis)
+            analysis.facts_D[C_FLOW_STAGE] = C_STAGE_PERMISSIONS
+
+        elif action_S == C_ACTION_EMIT_PERMISSIONS:
+            self.emit_permissions_artifact(analysis)
+            analysis.facts_D[C_FLOW_STAGE] = C_STAGE_DONE
+
+    #--------------------------------------------------------------------
+    # Run the verifier and exiftool in parallel on the shared tool
+    # executor. A signed file doesn't need its permissions (see the
+    # flow rules): if the verifier says so first, exiftool is cancelled.
+    # @param analysis [IN/OUT] PDFAnalysis (copy done)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def run_parallel_checks(self, analysis):
+        """run the signature and permission checks in parallel"""
+        executor = FindSignedPDFsFilesIngestModuleFactory.g_tool_executor
         EXE_signer_path = self.local_settings.get_EXE_signer_path()
-        ret_signed_code = is_pdf_signed(EXE_signer_path, temp_fullFilepath)
+        EXE_exiftool_path = self.local_settings.get_EXE_exiftool_path()
+
+        done_cond = threading.Condition()
+        verifier_task = executor.submit(is_pdf_signed,
+                    (EXE_signer_path, analysis.temp_path_S,
+                     analysis.full_path_S), done_cond)
+        exiftool_task = executor.submit(self.get_pdf_permissions,
+                    (EXE_exiftool_path, analysis.temp_path_S,
+                     analysis.full_path_S), done_cond)
+
+        verifier_task.wait()
+        if verifier_task.error is not None:
+            exiftool_task.cancel()
+            exiftool_task.wait()
+            raise verifier_task.error
+
+        ret_signed_code = verifier_task.result
+        if signature_state_S(ret_signed_code) == C_SIGNATURE_SIGNED:
+            # conclusive: the permissions won't be checked
+            exiftool_task.cancel()
+        exiftool_task.wait()
+
+        analysis.set_signed_code(ret_signed_code)
+        if exiftool_task.error is not None:
+            Warning_S = "exiftool failed on '%s': %s" %\
+                    (analysis.temp_path_S, exiftool_task.error)
+            self.log(Level.WARNING, Warning_S)
+        elif not exiftool_task.cancelled:
+            permissions_L, encryption_S = exiftool_task.result
+            analysis.set_permissions(permissions_L, encryption_S)
+
+    #--------------------------------------------------------------------
+    # Signature step of the analysis: record the verifier code and
+    # add the artifact if the file is signed
+    # @param analysis [IN/OUT] PDFAnalysis with a known verifier code
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def emit_signature_artifact(self, analysis):
+        """record the verifier code, and add the artifact if signed"""
+        # alias for Module name
+        ModuleName = FindSignedPDFsFilesIngestModuleFactory.moduleName
+
+        file = analysis.file
+        filename = file.getName()
+        fullFilePath_S = analysis.full_path_S
+        ret_signed_code = analysis.verdict.signed_code
 
         #------------------------------
         # Append result to dictionary
         # (under lock)
         #------------------------------
-        lock = threading.Lock()
+        lock = FindSignedPDFsFilesIngestModuleFactory.g_lock
         lock.acquire()
         FindSignedPDFsFilesIngestModuleFactory.g_fullPathPDFFiles_D[fullFilePath_S].append(ret_signed_code)
 
         ret_code_S = pdf_code_2_str(ret_signed_code)
 
         FindSignedPDFsFilesIngestModuleFactory.g_fullPathPDFFiles_D[fullFilePath_S].append(ret_code_S)
+
+        # Changes after signing (codes of C_REVISION_CODES_L) and
+        # integrity of each signature
+        revisions_D = analysis.verdict.facts_D.get(C_FACT_REVISIONS)
+        signatures_L = analysis.verdict.facts_D.get(C_FACT_SIGNATURE_DIGESTS)
+        extra_L = ["(empty)"] * len(C_REVISION_CSV_COLUMNS_L) + ["(empty)"]
+        if revisions_D is not None:
+            extra_L[:len(C_REVISION_CSV_COLUMNS_L)] = \
+                                            revisions_csv_L(revisions_D)
+        if signatures_L is not None:
+            extra_L[-1] = signature_digests_csv_S(signatures_L)
+        FindSignedPDFsFilesIngestModuleFactory.g_fullPathPDFFiles_D[fullFilePath_S].extend(extra_L)
         lock.release()
 
+        if signatures_L:
+            self.index_signers(analysis, signatures_L)
+            self.add_signature_times(analysis, signatures_L)
+
         # DEBUG
         if C_Log_Level >= C_LOG_FILE_DETAILS:
             Log_S = "'%s': %d (ret_signed) (%s)" %\
@@ -1089,6 +3281,13 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
             self.safe_inc_signedPDFFiles_count()
             add_as_artifact = True
 
+        elif revisions_D is not None:
+            Info_S = "signed but modified after signing"
+
+            # Safe increment of shared variable g_signedPDFFiles_count
+            self.safe_inc_signedPDFFiles_count()
+            add_as_artifact = True
+
         elif ret_signed_code == 10:
             Info_S = "NOT signed"
 
@@ -1105,11 +3304,18 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
         #----------------------------------------
         C_NO_DUPLICATE = self.local_settings.get_insert_duplicate_flag()
 
+        # A checkpointed file was (maybe) reported by the interrupted
+        # run: only create the artifacts that are missing
+        if analysis.verdict.from_checkpoint:
+            C_NO_DUPLICATE = True
+
         artifactType = \
                 BlackboardArtifact.ARTIFACT_TYPE.TSK_INTERESTING_FILE_HIT
 
-        existingArtifacts_L = file.getArtifacts(artifactType)
-        num_artifacts = len(existingArtifacts_L)
+        existingArtifacts_L = self.existing_artifacts_L(analysis, artifactType)
+        if existingArtifacts_L and (C_NO_DUPLICATE==True):
+            analysis.facts_D[C_FLOW_REPORTED] = True
+
         if add_as_artifact:
             # Check whether the file is already in the ArrayList
             if existingArtifacts_L:
@@ -1130,7 +3336,6 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
                     Msg_S = "adding file '%s' that already exists" % (filename)
                     self.log(Level.WARNING, Msg_S)
 
-        file_was_added = False
         if add_as_artifact:
             # File is gonna be inserted
             # DEBUG
@@ -1148,647 +3353,2153 @@ class FindSignedPDFFilesIngestModule(FileIngestModule):
                 BlackboardAttribute.ATTRIBUTE_TYPE.TSK_SET_NAME.getTypeID(), 
                 ModuleName, ret_code_S)
             art.addAttribute(att)
+            self.add_embedded_path_attribute(art, analysis)
 
-            file_was_added = True
-
-        #----------------------------------------
-        # PDF permissions module
-        # Analysis done through exiftool
-        #----------------------------------------
-        if not file_was_added:
-            # Check whether the file is already in the ArrayList
-            if existingArtifacts_L and (C_NO_DUPLICATE==True):
-                # file already exists and we don't want duplicates
-                add_as_artifact = False
-                # LOG
-                Msg_S ="[PDF ACCESS] skipping file '%s': already exists" %\
-                (filename)
-                self.log(Level.INFO, Msg_S)
-            else:
-                path_tmp_dir = ""
-                EXE_exiftool_path = self.local_settings.get_EXE_exiftool_path()
-                ret_L = self.get_pdf_permissions(EXE_exiftool_path,
-                                                            temp_fullFilepath)
-                if len(ret_L) == 3:
-                    User_Access_flag = ret_L[0]
-                    User_Access_code = ret_L[1]
-                    Encryption_flag  = ret_L[2]
-
-
-                    # DEBUG ---------------------------------------------------
-                    Msg_S = "[file '%s'] User_Access_flag=%s,"\
-                         "User_Access_code=%s,"\
-                         "Encryption_flag='%s'"%\
-                        (filename, User_Access_flag, 
-                                User_Access_code, Encryption_flag)
-                    self.log(Level.INFO, Msg_S)
-                    # DEBUG ---------------------------------------------------
+            if revisions_D is not None:
+                att = BlackboardAttribute(
+                    BlackboardAttribute.ATTRIBUTE_TYPE.TSK_COMMENT.getTypeID(),
+                    ModuleName, revisions_summary_S(revisions_D))
+                art.addAttribute(att)
 
-                    # DEBUG ---------------------------------------------------
-                    Msg_S = "AQUI:[file '%s'] User_Access_code & C_ASSEMBLE: %s,"\
-                            "User_Access_code & C_MODIFY: %s"%\
-                        (filename, User_Access_code & C_ASSEMBLE, 
-                         User_Access_code & C_MODIFY)
-                    self.log(Level.INFO, Msg_S)
+            if signatures_L is not None:
+                att = BlackboardAttribute(
+                BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DESCRIPTION.getTypeID(),
+                    ModuleName, signature_digests_summary_S(signatures_L))
+                art.addAttribute(att)
+                self.add_signer_attributes(art, signatures_L)
 
+            self.post_artifact(art)
+            analysis.facts_D[C_FLOW_ADDED] = True
 
-                    # DEBUG ---------------------------------------------------
-                    Msg_S = "AQUI2:[file '%s'] Encryption_flag=%s,"\
-                            "User_Access_flag=%s,"\
-                       "is_interesting_user_access(User_Access_code=%s)=%s"%\
-                        (filename, Encryption_flag, User_Access_flag, 
-                                User_Access_code,
-                                is_interesting_user_access(User_Access_code))
-                    self.log(Level.INFO, Msg_S)
-                    #----------------------------------------------------------
-
-
-                    # DEBUG ---------------------------------------------------
-                    if (Encryption_flag or User_Access_flag) and\
-                        (is_interesting_user_access(User_Access_code)):
-                        # we have something interesting
-                        user_access_S =\
-                                user_access_numeric_to_str(User_Access_code)
-
-                        # Concurrently update the shared 
-                        # variable g_PDFFilesInserted_count 
-                        self.safe_inc_PDFFilesInserted_count()
-                        
-                        Encryption_S = boolean2str(Encryption_flag)
-                        User_S = boolean2str(User_Access_flag)
-
-                        # Add to m_permission_PDFs_D dictionary
-                        self.add_to_permissions_PDFs_D(fullFilePath_S, 
-                                Encryption_S, User_S, user_access_S)
-
-                        # DEBUG
-                        Msg_S = "[file '%s'] Encryption_flag=%s,"\
-                             "User_Access_flag=%s,"\
-                             "user_Access_S='%s'"%\
-                            (filename,Encryption_S,User_S,user_access_S)
-                        self.log(Level.INFO, Msg_S)
-
-                        # Update stat dictionary
-                        ## --start of exclusive zone--
-                        lock = threading.Lock()
-                        lock.acquire()
-                        # Alias since the "Find....g_permission_Stats_D" 
-                        # identifier is (awfully) long
-                        alias_g_permission_Stats_D =\
-                          FindSignedPDFsFilesIngestModuleFactory.g_permission_Stats_D
-                        alias_g_permission_Stats_D[user_access_S]=\
-                                alias_g_permission_Stats_D[user_access_S] + 1
-                        lock.release()
-                        ## --end of exclusive zone--
+    #--------------------------------------------------------------------
+    # Permissions step of the analysis (PDF permissions module):
+    # add the artifact if the permissions are interesting
+    # @param analysis [IN/OUT] PDFAnalysis
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def emit_permissions_artifact(self, analysis):
+        """add the artifact if the permissions are interesting"""
+        # alias for Module name
+        ModuleName = FindSignedPDFsFilesIngestModuleFactory.moduleName
 
+        file = analysis.file
+        filename = file.getName()
+        fullFilePath_S = analysis.full_path_S
+
+        ret_L = analysis.verdict.permissions_L or []
+        if len(ret_L) == 3:
+            User_Access_flag = ret_L[0]
+            User_Access_code = ret_L[1]
+            Encryption_flag  = ret_L[2]
+
+            # Encryption algorithm and key length (exiftool's
+            # Encryption tag, already queried with the permissions)
+            Encryption_label_S = encryption_label_S(
+                    analysis.verdict.facts_D.get(C_FACT_ENCRYPTION))
+            # counted at the end of the analysis (see count_permissions)
+            analysis.permission_counts_T = (User_Access_flag,
+                    User_Access_code, Encryption_flag, Encryption_label_S)
+
+
+            # DEBUG ---------------------------------------------------
+            Msg_S = "[file '%s'] User_Access_flag=%s,"\
+                 "User_Access_code=%s,"\
+                 "Encryption_flag='%s'"%\
+                (filename, User_Access_flag, 
+                        User_Access_code, Encryption_flag)
+            self.log(Level.INFO, Msg_S)
+            # DEBUG ---------------------------------------------------
 
-                        # yes, add as attribute
-                        art = file.newArtifact(
-                  BlackboardArtifact.ARTIFACT_TYPE.TSK_INTERESTING_FILE_HIT)
+            # DEBUG ---------------------------------------------------
+            Msg_S = "AQUI:[file '%s'] User_Access_code & C_ASSEMBLE: %s,"\
+                    "User_Access_code & C_MODIFY: %s"%\
+                (filename, User_Access_code & C_ASSEMBLE, 
+                 User_Access_code & C_MODIFY)
+            self.log(Level.INFO, Msg_S)
 
-                        att = BlackboardAttribute(
-                  BlackboardAttribute.ATTRIBUTE_TYPE.TSK_SET_NAME.getTypeID(), 
-                            ModuleName, user_access_S)
-                        art.addAttribute(att)
 
-                        file_was_added = True
+            # DEBUG ---------------------------------------------------
+            Msg_S = "AQUI2:[file '%s'] Encryption_flag=%s,"\
+                    "User_Access_flag=%s,"\
+               "is_interesting_user_access(User_Access_code=%s)=%s"%\
+                (filename, Encryption_flag, User_Access_flag, 
+                        User_Access_code,
+                        is_interesting_user_access(User_Access_code))
+            self.log(Level.INFO, Msg_S)
+            #----------------------------------------------------------
+
+
+            # DEBUG ---------------------------------------------------
+            if (Encryption_flag or User_Access_flag) and\
+                (is_interesting_user_access(User_Access_code)):
+                # we have something interesting
+                user_access_S =\
+                        user_access_numeric_to_str(User_Access_code)
+
+                # Concurrently update the shared 
+                # variable g_PDFFilesInserted_count 
+                self.safe_inc_PDFFilesInserted_count()
+                
+                Encryption_S = boolean2str(Encryption_flag)
+                User_S = boolean2str(User_Access_flag)
+
+                # Add to m_permission_PDFs_D dictionary
+                self.add_to_permissions_PDFs_D(fullFilePath_S, 
+                        Encryption_S, User_S, user_access_S,
+                        "0x%02x" % (User_Access_code), Encryption_label_S)
+
+                # DEBUG
+                Msg_S = "[file '%s'] Encryption_flag=%s,"\
+                     "User_Access_flag=%s,"\
+                     "user_Access_S='%s'"%\
+                    (filename,Encryption_S,User_S,user_access_S)
+                self.log(Level.INFO, Msg_S)
 
-        if file_was_added:
-            try:
-                # index the artifact for keyword search
-                blackboard.indexArtifact(art)
-            except Blackboard.BlackboardException as e:
-                Except_S = "Error indexing artifact '%s'" %\
-                        (art.getDisplayName())
-                self.log(Level.SEVERE, Except_S)
+                # Update stat dictionary
+                ## --start of exclusive zone--
+                lock = FindSignedPDFsFilesIngestModuleFactory.g_lock
+                lock.acquire()
+                # Alias since the "Find....g_permission_Stats_D" 
+                # identifier is (awfully) long
+                alias_g_permission_Stats_D =\
+                  FindSignedPDFsFilesIngestModuleFactory.g_permission_Stats_D
+                alias_g_permission_Stats_D[user_access_S]=\
+                        alias_g_permission_Stats_D[user_access_S] + 1
+                lock.release()
+                ## --end of exclusive zone--
+
+
+                # yes, add as attribute
+                art = file.newArtifact(
+          BlackboardArtifact.ARTIFACT_TYPE.TSK_INTERESTING_FILE_HIT)
+
+                att = BlackboardAttribute(
+          BlackboardAttribute.ATTRIBUTE_TYPE.TSK_SET_NAME.getTypeID(), 
+                    ModuleName, user_access_S)
+                art.addAttribute(att)
+                self.add_embedded_path_attribute(art, analysis)
+
+                self.post_artifact(art)
+                analysis.facts_D[C_FLOW_ADDED] = True
+        else:
+            # LOG
+            Msg_S ="[PDF ACCESS] no permissions for file '%s'" % (filename)
+            self.log(Level.INFO, Msg_S)
 
-            # Fire an event to notify the UI and others 
-            # that there is a new artifact  
-            IngestServices.getInstance().fireModuleDataEvent(
-             ModuleDataEvent(ModuleName, 
-               BlackboardArtifact.ARTIFACT_TYPE.TSK_INTERESTING_FILE_HIT,None))
+    #--------------------------------------------------------------------
+    # Artifacts of a type already there for the analyzed file. With the
+    # embedded PDF files on, the artifacts of an embedded file carry its
+    # nested path (TSK_PATH): only those of the same file are returned
+    # @param analysis     [IN] PDFAnalysis
+    # @param artifactType [IN] BlackboardArtifact.ARTIFACT_TYPE
+    # @return list of BlackboardArtifact
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def existing_artifacts_L(self, analysis, artifactType):
+        """artifacts of a type of the analyzed (maybe embedded) file"""
+        artifacts_L = analysis.file.getArtifacts(artifactType)
+        if not self.local_settings.get_advanced_setting(C_EMBEDDED_PDFS_FIELD):
+            return artifacts_L
+
+        path_S = None
+        if analysis.embedded_depth > 0:
+            path_S = analysis.full_path_S
+        return [art for art in artifacts_L
+                            if artifact_embedded_path_S(art) == path_S]
 
-        return IngestModule.ProcessResult.OK
+    #--------------------------------------------------------------------
+    # Add the signers of the signatures of a file to its artifact (one
+    # attribute of each C_SIGNER_ATTRIBUTES_L type per signature)
+    # @param art          [IN] BlackboardArtifact
+    # @param signatures_L [IN] signatures (see check_signature_digests)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def add_signer_attributes(self, art, signatures_L):
+        """add the signers of the signatures to the artifact"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        if len(Factory.g_signer_attr_types_D) == 0:
+            return
+        for signature_D in signatures_L:
+            signer_D = signature_D.get(C_SIGD_SIGNER)
+            if signer_D is None:
+                continue
+            for key_S, type_name_S, display_S, value_type_S in\
+                                                    C_SIGNER_ATTRIBUTES_L:
+                value = signer_D[key_S]
+                if value is None:
+                    continue
+                if value_type_S == "DATETIME":
+                    # (seconds since the epoch)
+                    value = long(value / 1000)
+                art.addAttribute(BlackboardAttribute(
+                        Factory.g_signer_attr_types_D[key_S],
+                        Factory.moduleName, value))
 
+    #--------------------------------------------------------------------
+    # Add the signers of a file to the signer index (the rows of the
+    # file are replaced: a checkpointed file indexed by the interrupted
+    # run is not duplicated)
+    # @param analysis     [IN] PDFAnalysis
+    # @param signatures_L [IN] signatures (see check_signature_digests)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def index_signers(self, analysis, signatures_L):
+        """add the signers of a file to the signer index"""
+        signer_index = FindSignedPDFsFilesIngestModuleFactory.g_signer_index
+        if signer_index is None:
+            return
+        try:
+            signer_index.add(analysis.file.getId(), self.m_data_source_id,
+                                        analysis.full_path_S, signatures_L)
+        except SQLException as e:
+            Err_S = "can't index the signers of '%s': %s" %\
+                    (analysis.full_path_S, e)
+            self.log(Level.WARNING, Err_S)
 
     #--------------------------------------------------------------------
-    # Add permissions data of fullFilename to m_permission_PDFs_D dict.
-    # @param fullFilename       [IN] full path name of file. Used as key of dict
-    # @param encrypt_flag_S     [IN] boolean status of encrypt flag
-    # @param user_access_flag_S [IN] boolean status of encrypt flag
-    # @return
-    # 2017-09-27
+    # Add the times of the signatures of a file as artifacts (one per
+    # time, see signature_times_L), posted per batch (see
+    # post_signature_times). A checkpointed file whose time artifacts
+    # are there already gets no new ones
+    # @param analysis     [IN] PDFAnalysis
+    # @param signatures_L [IN] signatures (see check_signature_digests)
+    # @return None
+    # 2026-10-19
     #--------------------------------------------------------------------
-    def add_to_permissions_PDFs_D(self, fullFilename, encrypt_flag_S,
-                                            user_access_flag_S, user_access_S):
-        """Add fullFilename to 
-           FindSignedPDFFilesIngestModule.g_permission_PDFs_D dict"""
+    def add_signature_times(self, analysis, signatures_L):
+        """add the times of the signatures of a file as artifacts"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        ModuleName = Factory.moduleName
+        art_type = Factory.g_time_artifact_type
+        if art_type is None:
+            return
+        times_L = signature_times_L(signatures_L)
+        if len(times_L) == 0:
+            return
+        if analysis.verdict.from_checkpoint and\
+                self.existing_artifacts_L(analysis, art_type.getTypeID()):
+            return
+
+        name_type = Factory.g_signer_attr_types_D.get(C_SIGNER_NAME)
+        arts_L = []
+        for index, what_S, time_millis, name_S in times_L:
+            description_S = "%s of signature %d" % (what_S, index + 1)
+            if name_S is not None:
+                description_S = "%s (%s)" % (description_S, name_S)
+            attributes_L = [
+                BlackboardAttribute(
+                    BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME.getTypeID(),
+                    ModuleName, long(time_millis / 1000)),
+                BlackboardAttribute(
+                BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DESCRIPTION.getTypeID(),
+                    ModuleName, description_S)]
+            if name_S is not None and name_type is not None:
+                attributes_L.append(BlackboardAttribute(name_type,
+                                                        ModuleName, name_S))
+            art = analysis.file.newArtifact(art_type.getTypeID())
+            art.addAttributes(attributes_L)
+            self.add_embedded_path_attribute(art, analysis)
+            arts_L.append(art)
+
+        Factory.g_lock.acquire()
+        Factory.g_time_artifacts_L.extend(arts_L)
+        batch_L = []
+        if len(Factory.g_time_artifacts_L) >= C_SIGNATURE_TIMES_BATCH:
+            batch_L = Factory.g_time_artifacts_L
+            Factory.g_time_artifacts_L = []
+        Factory.g_lock.release()
+        self.post_signature_times(batch_L)
 
-        lock = threading.Lock()
-        lock.acquire()
+    #--------------------------------------------------------------------
+    # Post a batch of signature time artifacts. With the case blackboard
+    # of the SleuthkitCase (Autopsy 4.14+), the whole batch is posted at
+    # once (indexing and event); otherwise, each artifact is indexed for
+    # keyword search, then one module data event for the whole batch
+    # @param arts_L [IN] BlackboardArtifact of the signature times
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def post_signature_times(self, arts_L):
+        """post a batch of signature time artifacts"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        if len(arts_L) == 0:
+            return
+        case = Case.getCurrentCase()
+        try:
+            case_blackboard = case.getSleuthkitCase().getBlackboard()
+            post_artifacts = case_blackboard.postArtifacts
+        except AttributeError:
+            post_artifacts = None
 
-        FindSignedPDFsFilesIngestModuleFactory.g_permission_PDFs_D[fullFilename] = [encrypt_flag_S]
-        FindSignedPDFsFilesIngestModuleFactory.g_permission_PDFs_D[fullFilename].append(user_access_flag_S)
-        FindSignedPDFsFilesIngestModuleFactory.g_permission_PDFs_D[fullFilename].append(user_access_S)
+        if post_artifacts is not None:
+            try:
+                post_artifacts(ArrayList(arts_L), Factory.moduleName)
+            except Exception as e:
+                Except_S = "Error posting %d signature time artifacts: %s" %\
+                        (len(arts_L), e)
+                self.log(Level.SEVERE, Except_S)
+        else:
+            blackboard = case.getServices().getBlackboard()
+            for art in arts_L:
+                try:
+                    blackboard.indexArtifact(art)
+                except Blackboard.BlackboardException as e:
+                    Except_S = "Error indexing artifact '%s': %s" %\
+                            (art.getDisplayName(), e)
+                    self.log(Level.SEVERE, Except_S)
 
-        lock.release()
+            IngestServices.getInstance().fireModuleDataEvent(
+                ModuleDataEvent(Factory.moduleName,
+                                Factory.g_time_artifact_type, arts_L))
+        Factory.g_lock.acquire()
+        Factory.g_time_artifacts_count += len(arts_L)
+        Factory.g_lock.release()
 
     #--------------------------------------------------------------------
-    # Post a message to the ingest messages in box.
-    # @param module_S [IN] name of module
-    # @param msg_S [IN] message to post
+    # Post the last batch of signature time artifacts and report them
+    # (last instance of the job)
     # @return None
-    # 2017-08-04
+    # 2026-10-19
     #--------------------------------------------------------------------
-    def postIngestMessage(self,module_S,msg_S):
-        """post a message into AUTOPSY message GUI logger"""
-        # Create the message
-        message = IngestMessage.createMessage( 
-        IngestMessage.MessageType.DATA,module_S, msg_S)
-        # Post the message
-        IngestServices.getInstance().postMessage(message)
+    def flush_signature_times(self):
+        """post the last signature time artifacts"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        if Factory.g_time_artifact_type is None:
+            return
+
+        Factory.g_lock.acquire()
+        batch_L = Factory.g_time_artifacts_L
+        Factory.g_time_artifacts_L = []
+        Factory.g_lock.release()
+        self.post_signature_times(batch_L)
+
+        if Factory.g_time_artifacts_count > 0:
+            Log_S = "%d signature times added to the timeline" %\
+                    (Factory.g_time_artifacts_count)
+            self.log(Level.INFO, Log_S)
+            self.postIngestMessage(self.getModuleName(), Log_S)
 
     #--------------------------------------------------------------------
-    # Method that returns True if file is considered to be a PDF file, 
-    # false otherwise.
-    # TODO: right now, we are only checking the extension, which can be
-    # misleading (false positive and false negative extension). 
-    # We should inspect the first byte of the file, looking for %PDF...
-    # @param file [IN] file to be checked
-    # @return True if the file is considered a PDF file, False otherwise
-    # Patricio R. Domingues
-    # 2017-08-02
+    # Add the nested path of an embedded PDF file to its artifact
+    # (the artifact belongs to the top-level file)
+    # @param art      [IN] BlackboardArtifact
+    # @param analysis [IN] PDFAnalysis
+    # @return None
+    # 2026-10-19
     #--------------------------------------------------------------------
-    def is_pdf_file(self,file):
-        """check whether file is a PDF file"""
-        filename, file_extension = os.path.splitext(file.getName())
-
-        # DEBUG
-        if C_Log_Level >= C_LOG_FILE_DETAILS:
-            Log_S = "[%s] basename = '%s'" % (file.getName(), filename)
-            self.log(Level.INFO, Log_S)
+    def add_embedded_path_attribute(self, art, analysis):
+        """add the nested path of an embedded file to its artifact"""
+        if analysis.embedded_depth == 0:
+            return
+        att = BlackboardAttribute(
+                BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PATH.getTypeID(),
+                FindSignedPDFsFilesIngestModuleFactory.moduleName,
+                analysis.full_path_S)
+        art.addAttribute(att)
 
-            Log_S = "[%s] extension = '%s'" % (file.getName(), file_extension)
+    #--------------------------------------------------------------------
+    # Analyze the PDF files embedded in a PDF file (and in those, down
+    # to embedded_max_depth levels). The embedded files are extracted
+    # while the content of 'file' is read from the image: the parent
+    # is never written to disk, only the embedded PDF files (the tools
+    # need a file). The limits apply to the whole tree of 'file'
+    # @param file     [IN] AbstractFile (top-level PDF file)
+    # @param analysis [IN] PDFAnalysis of 'file' (done)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def analyze_embedded_pdfs(self, file, analysis):
+        """analyze the PDF files embedded in a PDF file"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        max_depth = \
+            self.local_settings.get_advanced_setting(C_EMBEDDED_MAX_DEPTH_FIELD)
+        limits = EmbeddedLimits(
+            self.local_settings.get_advanced_setting(C_EMBEDDED_MAX_FILES_FIELD),
+            self.local_settings.get_advanced_setting(C_EMBEDDED_MAX_MB_FIELD) << 20)
+        outcomes_D = dict([(outcome_S, 0)
+                                for outcome_S in C_EMBEDDED_OUTCOMES_L])
+
+        # (path of the content, None: 'file' itself; nested path; depth)
+        pending_L = [(None, analysis.full_path_S, 1)]
+        num_embedded = 0
+        while len(pending_L) > 0:
+            content_path_S, path_S, depth = pending_L.pop(0)
+            try:
+                if content_path_S is None:
+                    embedded_L = extract_embedded_pdfs(ContentReader(file),
+                            analysis.temp_path_S, limits, outcomes_D)
+                else:
+                    with open(content_path_S, "rb") as f:
+                        embedded_L = extract_embedded_pdfs(f,
+                                content_path_S, limits, outcomes_D)
+            except (IOError, OSError):
+                Except_S = "can't extract the files embedded in '%s': %s" %\
+                        (path_S, sys.exc_info()[1])
+                self.log(Level.WARNING, Except_S)
+                continue
+
+            for name_S, temp_path_S in embedded_L:
+                nested_path_S = path_S + C_EMBEDDED_PATH_SEP_S + name_S
+                num_embedded += 1
+                self.analyze_embedded_pdf(file, nested_path_S, temp_path_S,
+                                                                    depth)
+                if depth < max_depth:
+                    pending_L.append((temp_path_S, nested_path_S, depth + 1))
+
+        Factory.g_lock.acquire()
+        for outcome_S, count in outcomes_D.iteritems():
+            Factory.g_embedded_stats_D[outcome_S] += count
+        if num_embedded > 0:
+            Factory.g_embedded_parents_count += 1
+        Factory.g_lock.release()
+
+        if num_embedded > 0 or outcomes_D[C_EMBEDDED_LIMIT] > 0:
+            Log_S = "file '%s': %d embedded PDF files analyzed (%s)" %\
+                    (analysis.full_path_S, num_embedded,
+                     embedded_outcomes_S(outcomes_D))
             self.log(Level.INFO, Log_S)
 
-        if file.getSize() == 0:
-            # empty file?
-            return False
+    #--------------------------------------------------------------------
+    # Analyze an embedded PDF file (already extracted to the work dir),
+    # reporting it against the top-level file
+    # @param file          [IN] AbstractFile (top-level PDF file)
+    # @param nested_path_S [IN] nested path of the embedded file
+    # @param temp_path_S   [IN] path of the extracted embedded file
+    # @param depth         [IN] nesting depth (1: attached to 'file')
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def analyze_embedded_pdf(self, file, nested_path_S, temp_path_S, depth):
+        """analyze an extracted embedded PDF file"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        Factory.g_lock.acquire()
+        Factory.g_fullPathPDFFiles_D[nested_path_S] = [temp_path_S]
+        Factory.g_lock.release()
+        add_temp_store_bytes(temp_path_S)
+
+        analysis = self.new_analysis(file, nested_path_S, temp_path_S)
+        analysis.embedded_depth = depth
+        analysis.facts_D[C_FLOW_COPY] = C_COPY_DONE
+
+        process_result, retry_reason_S = self.run_analysis_flow(analysis)
+        if retry_reason_S is not None:
+            # the retry queue holds files of the image
+            Log_S = "embedded file '%s' not retried (%s)" %\
+                    (nested_path_S, retry_reason_S)
+            self.log(Level.WARNING, Log_S)
 
-        if len(file_extension) == 0:
-            # no extension 
-            return False
+    #--------------------------------------------------------------------
+    # Report the embedded files
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def report_embedded(self):
+        """report the PDF files found embedded in PDF files"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
 
-        if file_extension.lower() == ".pdf":
-            # extension is pdf: bingo!
-            ## FIXME: we should check the first 5 bytes, looking for "%PDF-"
-            return True
+        Factory.g_lock.acquire()
+        stats_D = dict(Factory.g_embedded_stats_D)
+        num_parents = Factory.g_embedded_parents_count
+        Factory.g_lock.release()
 
-        # still here? 
-        return False
+        if sum(stats_D.values()) == 0:
+            return
 
-    #----------------------------------------------------------------
-    # @param 
-    # @return
-    # 2017-09-03
-    #----------------------------------------------------------------
-    def get_pdf_permissions(self,path_exiftool, path_pdf_file):
-        """return the permissions for the PDF file 'path_pdf_file'"""
+        Log_S = "embedded files: %d PDF files embedded in %d files (%s)" %\
+                (stats_D[C_EMBEDDED_PDF], num_parents,
+                 embedded_outcomes_S(stats_D))
+        self.log(Level.INFO, Log_S)
+        self.postIngestMessage(self.getModuleName(), Log_S)
 
-        # Needed string
-        # '-a  -UserAccess -Encryption -s %s -j' % (path_pdf_file)
-        exif_process = Popen([path_exiftool, 
-            "-a", "-UserAccess", "-Encryption", "-s", path_pdf_file, "-j"],
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    #--------------------------------------------------------------------
+    # Create the chain validation cache, with the outcomes kept in the
+    # settings DB by previous jobs (first instance of the job; called
+    # with g_lock held)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def create_chain_cache(self):
+        """create the chain validation cache of the job"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        settings = self.local_settings
+        Factory.g_chain_cache = None
+
+        if not settings.get_advanced_setting(C_SIGNATURE_DIGESTS_FIELD) or\
+                not settings.get_advanced_setting(C_CHAIN_VALIDATION_FIELD):
+            return
+
+        max_entries = settings.get_advanced_setting(C_CHAIN_CACHE_MAX_FIELD)
+        Factory.g_chain_cache = ChainValidationCache(max_entries,
+            settings.get_advanced_setting(C_CHAIN_TIME_BUCKET_FIELD) * 3600)
+        if max_entries <= 0:
+            return
+
+        head, tail = os.path.split(os.path.abspath(__file__))
+        settings_db = os.path.join(head, C_DB_NAME)
+        try:
+            num_loaded = Factory.g_chain_cache.load(settings_db)
+        except SQLException as e:
+            Err_S = "can't load the chain cache from '%s': %s" %\
+                    (settings_db, e)
+            self.log(Level.WARNING, Err_S)
+            return
 
-        exif_outcode = exif_process.returncode
+        Log_S = "chain cache: %d outcomes loaded from '%s'" %\
+                (num_loaded, settings_db)
+        self.log(Level.INFO, Log_S)
 
-        Encryption_flag = False
-        User_Access_flag = False
-        User_Access_code_binary = 0
+    #--------------------------------------------------------------------
+    # Save the new chain validation outcomes to the settings DB and
+    # report the hit rate of the cache
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def save_chain_cache(self):
+        """save the chain validation cache of the job"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        chain_cache = Factory.g_chain_cache
+        if chain_cache is None or chain_cache.m_max_entries <= 0:
+            return
+
+        head, tail = os.path.split(os.path.abspath(__file__))
+        settings_db = os.path.join(head, C_DB_NAME)
+        try:
+            num_saved = chain_cache.save(settings_db)
+        except SQLException as e:
+            Err_S = "can't save the chain cache to '%s': %s" %\
+                    (settings_db, e)
+            self.log(Level.WARNING, Err_S)
+            num_saved = 0
+
+        hits, misses = merged_cache_stats_D().get(C_CACHE_CHAIN, [0, 0])
+        if hits + misses == 0:
+            return
+
+        Log_S = "chain cache: %d hits, %d misses (%.1f%% hit rate), "\
+                "%d new outcomes saved" % (hits, misses,
+                    100.0 * hits / (hits + misses), num_saved)
+        self.log(Level.INFO, Log_S)
+        self.postIngestMessage(self.getModuleName(), Log_S)
 
-        stdout_json_S = exif_process.stdout.read()
+    #--------------------------------------------------------------------
+    # Open the revocation store and import the CRL files of the import
+    # directory (first instance of the job; called with g_lock held).
+    # CRLs already in the store are skipped.
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def create_revocation_store(self):
+        """open the revocation store and import the CRL files"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        settings = self.local_settings
+        Factory.g_revocation_store = None
+
+        if Factory.g_chain_cache is None or\
+                not settings.get_advanced_setting(C_REVOCATION_STORE_FIELD):
+            return
+
+        head, tail = os.path.split(os.path.abspath(__file__))
+        revocation_db = os.path.join(head, C_REVOCATION_DB_NAME)
+        try:
+            store = RevocationStore(revocation_db)
+        except SQLException as e:
+            Err_S = "can't open the revocation store '%s': %s" %\
+                    (revocation_db, e)
+            self.log(Level.WARNING, Err_S)
+            return
+        Factory.g_revocation_store = store
+
+        crl_dir_S = settings.get_advanced_setting(C_CRL_IMPORT_DIR_FIELD)
+        if not crl_dir_S:
+            return
+        if not os.path.isdir(crl_dir_S):
+            Warning_S = "CRL import directory '%s' not found" % (crl_dir_S)
+            self.log(Level.WARNING, Warning_S)
+            return
+
+        time_start = time.time()
+        num_files, num_imported, num_bad = 0, 0, 0
+        for dirpath_S, dirnames_L, filenames_L in os.walk(crl_dir_S):
+            for filename_S in sorted(filenames_L):
+                if os.path.splitext(filename_S)[1].lower() not in\
+                                                        C_CRL_EXTENSIONS_L:
+                    continue
+                num_files += 1
+                path_S = os.path.join(dirpath_S, filename_S)
+                try:
+                    with open(path_S, "rb") as f:
+                        num_imported += store.import_crls(f.read(),
+                                                            path_S, "file")
+                except:
+                    # unreadable file, not a CRL (Java exceptions too)
+                    num_bad += 1
+                    Warning_S = "can't import the CRL file '%s': %s" %\
+                                (path_S, sys.exc_info()[1])
+                    self.log(Level.WARNING, Warning_S)
+
+        Log_S = "revocation store: %d CRLs imported from %d files of '%s' "\
+                "(%d bad files) in %.1f secs" % (num_imported, num_files,
+                        crl_dir_S, num_bad, time.time() - time_start)
+        self.log(Level.INFO, Log_S)
 
+    #--------------------------------------------------------------------
+    # Open the signer index of the work dir and get the custom
+    # attribute types of the signers (first instance of the job; called
+    # with g_lock held). Without signature digests there is no signer
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def create_signer_index(self):
+        """open the signer index and get the signer attribute types"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        settings = self.local_settings
+        Factory.g_signer_index = None
+        Factory.g_signer_attr_types_D = {}
+
+        if not settings.get_advanced_setting(C_SIGNER_INDEX_FIELD) or\
+                not settings.get_advanced_setting(C_SIGNATURE_DIGESTS_FIELD)\
+                or C_CMS_PARSER_S is None:
+            return
+
+        index_fname = os.path.join(self.getWorkDir(), C_SIGNER_INDEX_FNAME)
         try:
-            data_L = json.loads(stdout_json_S)
-        except Exception, e:
-            # Something went wrong. Bail out.
-            Except_S = "Exception: can't json loads '%s'" % (e)
-            self.log(Level.WARNING, Except_S)
+            Factory.g_signer_index = SignerIndex(index_fname)
+        except SQLException as e:
+            Err_S = "can't open the signer index '%s': %s" % (index_fname, e)
+            self.log(Level.WARNING, Err_S)
 
-            return [User_Access_flag,User_Access_code_binary,Encryption_flag]
+        skCase = Case.getCurrentCase().getSleuthkitCase()
+        for key_S, type_name_S, display_S, value_type_S in\
+                                                    C_SIGNER_ATTRIBUTES_L:
+            try:
+                skCase.addArtifactAttributeType(type_name_S,
+                        getattr(BlackboardAttribute.\
+                            TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE, value_type_S),
+                        display_S)
+            except:
+                # already there (added by a previous job)
+                pass
+            attr_type = skCase.getAttributeType(type_name_S)
+            if attr_type is None:
+                Err_S = "can't add the attribute type '%s': no signer "\
+                        "attributes" % (type_name_S)
+                self.log(Level.WARNING, Err_S)
+                Factory.g_signer_attr_types_D = {}
+                return
+            Factory.g_signer_attr_types_D[key_S] = attr_type
 
-        data_len = len(data_L)
-        if data_len == 0:
-            # DEBUG
-            Warning_S = "no data returned by exiftool for file '%s'" %\
-                (path_pdf_file)
-            self.log(Level.INFO, Warning_S)
-            return [User_Access_flag,User_Access_code_binary,Encryption_flag]
+    #--------------------------------------------------------------------
+    # Get the custom artifact type of the signature times (first
+    # instance of the job; called with g_lock held)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def create_signature_time_type(self):
+        """get the artifact type of the signature times"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        settings = self.local_settings
+        Factory.g_time_artifact_type = None
+        Factory.g_time_artifacts_L = []
+        Factory.g_time_artifacts_count = 0
+
+        if not settings.get_advanced_setting(C_SIGNATURE_TIMES_FIELD) or\
+                not settings.get_advanced_setting(C_SIGNATURE_DIGESTS_FIELD)\
+                or C_CMS_PARSER_S is None:
+            return
+
+        skCase = Case.getCurrentCase().getSleuthkitCase()
+        try:
+            skCase.addBlackboardArtifactType(C_SIGNATURE_TIME_ARTIFACT_S,
+                                                C_SIGNATURE_TIME_DISPLAY_S)
+        except:
+            # already there (added by a previous job)
+            pass
+        Factory.g_time_artifact_type = \
+                        skCase.getArtifactType(C_SIGNATURE_TIME_ARTIFACT_S)
+        if Factory.g_time_artifact_type is None:
+            Err_S = "can't add the artifact type '%s': no signature times" %\
+                    (C_SIGNATURE_TIME_ARTIFACT_S)
+            self.log(Level.WARNING, Err_S)
 
-        data_D = data_L[0]
+    #--------------------------------------------------------------------
+    # Report the histogram of the permission masks (all the bits) and
+    # of the encryption of the PDF files of the job
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def report_permission_histogram(self):
+        """report the permission masks and the encryption"""
+        histogram = \
+            FindSignedPDFsFilesIngestModuleFactory.g_permission_histogram
+        if histogram is None:
+            return
+        masks_L, encryption_D = histogram.merged_T()
+        if sum(masks_L) == 0 and len(encryption_D) == 0:
+            return
+
+        Log_S = "permission masks of %d PDF files (UserAccess):\n%s" %\
+                (sum(masks_L), permission_histogram_table_S(masks_L))
+        if len(encryption_D) > 0:
+            Log_S = "%s\nencryption: %s" % (Log_S, ", ".join(["%s=%d" %
+                    (encryption_S, encryption_D[encryption_S])
+                    for encryption_S in sorted(encryption_D)]))
+        self.log(Level.INFO, Log_S)
+        self.postIngestMessage(self.getModuleName(), Log_S)
 
-        C_ENCRYPTION_key="Encryption"
-        if C_ENCRYPTION_key in data_D:
-            Encryption_value = data_D[C_ENCRYPTION_key]
-            Encryption_flag = True
-    
-        C_USER_ACCESS_key="UserAccess"
-        if C_USER_ACCESS_key in data_D:
-            User_Access_value_S = data_D[C_USER_ACCESS_key]
-            User_Access_flag = True
+    #--------------------------------------------------------------------
+    # Report the rows of the signer index and close it
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def close_signer_index(self):
+        """report and close the signer index"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        signer_index = Factory.g_signer_index
+        if signer_index is None:
+            return
+        Factory.g_signer_index = None
+
+        Log_S = "signer index '%s': %d signatures indexed" %\
+                (signer_index.m_db_path_S, signer_index.num_rows)
+        self.log(Level.INFO, Log_S)
+        if signer_index.num_rows > 0:
+            self.postIngestMessage(self.getModuleName(), Log_S)
+        signer_index.close()
 
-            User_Access_code_binary = user_access_to_int( User_Access_value_S )
+    #--------------------------------------------------------------------
+    # Report the lookups of the revocation store and close it
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def close_revocation_store(self):
+        """report and close the revocation store"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        store = Factory.g_revocation_store
+        if store is None:
+            return
+        Factory.g_revocation_store = None
+
+        Log_S = "revocation store: %d CRLs of DSS cached, lookups: %s" %\
+                (store.m_imported_D.get("dss", 0),
+                 ", ".join(["%s=%d" % (status_S, store.m_lookups_D[status_S])
+                            for status_S in C_REVOCATION_STATUSES_L]))
+        self.log(Level.INFO, Log_S)
+        if sum(store.m_lookups_D.values()) > 0:
+            self.postIngestMessage(self.getModuleName(), Log_S)
+        store.close()
 
-        return [User_Access_flag,User_Access_code_binary,Encryption_flag]
+    #--------------------------------------------------------------------
+    # Report the integrity of the signatures checked in-process
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def report_signature_digests(self):
+        """report the integrity status of the signatures"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        stats_D = dict(Factory.g_digest_stats_D)
+        num_files = Factory.g_digest_files_count
+        Factory.g_lock.release()
+
+        if num_files == 0:
+            return
+
+        Log_S = "signature digests: %d signatures in %d files (%s)" %\
+                (sum(stats_D.values()), num_files,
+                 ", ".join(["%s=%d" % (status_S, stats_D[status_S])
+                            for status_S in C_SIG_DIGEST_STATUSES_L]))
+        self.log(Level.INFO, Log_S)
+        self.postIngestMessage(self.getModuleName(), Log_S)
 
-#====================================================================
-# PANEL-related classes
-#====================================================================
-#--------------------------------------------------------------------
-# Class
-# 2017-08-20
-#--------------------------------------------------------------------
-class Process_FindSignedPDFFilesWithUISettings(IngestModuleIngestJobSettings):
-    """Class that deals with PANEL settings and alike"""
+    #--------------------------------------------------------------------
+    # Index a new artifact for keyword search and notify the UI
+    # @param art [IN] BlackboardArtifact
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def post_artifact(self, art):
+        """index a new artifact and fire the module data event"""
+        # Use blackboard class to index blackboard artifacts for keyword search
+        blackboard = Case.getCurrentCase().getServices().getBlackboard()
 
-    serialVersionUID = 1L
+        # alias for Module name
+        ModuleName = FindSignedPDFsFilesIngestModuleFactory.moduleName
+
+        try:
+            # index the artifact for keyword search
+            blackboard.indexArtifact(art)
+        except Blackboard.BlackboardException as e:
+            Except_S = "Error indexing artifact '%s'" %\
+                    (art.getDisplayName())
+            self.log(Level.SEVERE, Except_S)
+
+        # Fire an event to notify the UI and others 
+        # that there is a new artifact  
+        IngestServices.getInstance().fireModuleDataEvent(
+         ModuleDataEvent(ModuleName, 
+           BlackboardArtifact.ARTIFACT_TYPE.TSK_INTERESTING_FILE_HIT,None))
 
     #--------------------------------------------------------------------
-    # constructor. Sets the default value.
-    # 2017-08-21
+    # Copy 'file' to the work dir (unless the copy already exists)
+    # @param file              [IN] AbstractFile to copy
+    # @param temp_fullFilepath [IN] path of the copy
+    # @return True if the copy exists, False if the copy failed
+    # 2026-10-19
     #--------------------------------------------------------------------
-    def __init__(self):
-        # Note: on Autopsy 4.4.1, the jython interpreter complains
-        # about the non existence of the self.m_insert_duplicate flag.
-        self.m_insert_duplicate = None
-        pass
-        # No init is done here. Init is done through the DB3 database.
+    def copy_to_work_dir(self, file, temp_fullFilepath):
+        """copy 'file' to temp_fullFilepath if not there yet"""
+        filename = file.getName()
 
-    # getter for serialVersionUID
-    def getVersionNumber(self):
-        return serialVersionUID
+        # Does the file already exist? (i.e, was it copied previously)
+        if os.path.isfile(temp_fullFilepath):
+            # DEBUG
+            Log_S = "file '%s' already exists" % (temp_fullFilepath)
+            self.log(Level.INFO, Log_S)
+            record_cache_lookup(C_CACHE_TEMP_COPY, True)
+            add_temp_store_bytes(temp_fullFilepath)
+            return True
 
-    def get_insert_duplicate_flag(self):
-        return self.m_insert_duplicate
+        # File does not exist: Copy the file
+        record_cache_lookup(C_CACHE_TEMP_COPY, False)
+        try:
+            ContentUtils.writeToFile(file, java.io.File(temp_fullFilepath))
+            msg_S = "file '%s' copied" % (filename)
+            self.log(Level.INFO, msg_S)
+            add_temp_store_bytes(temp_fullFilepath)
+        except:
+            err_S = "Error in copying file '%s': %s (%s)" %\
+                    (filename, sys.exc_info()[0], sys.exc_info()[1])
+            self.log(Level.SEVERE, err_S)
+            return False
 
-    def set_insert_duplicate_flag(self,flag):
-        self.m_insert_duplicate = flag
+        return True
 
-    def get_create_csv_file_flag(self):
-        return self.m_create_csv_file
+    #--------------------------------------------------------------------
+    # Load the checkpoint of the data source of this job (once per job
+    # and data source). The checkpoint is a file of JSON lines in the
+    # work dir, one line per analyzed file; later lines win.
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def load_checkpoint(self):
+        """load the checkpoint of the current data source"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
 
-    def set_create_csv_file_flag(self,flag):
-        self.m_create_csv_file = flag
+        if not self.local_settings.get_advanced_setting(C_CHECKPOINT_FIELD):
+            return
 
-    def get_EXE_signer_path(self):
-        return self.m_EXE_signer_path
+        ds_id = self.m_data_source_id
+        checkpoint_fname = os.path.join(self.getWorkDir(),
+                                        C_CHECKPOINT_FNAME % (ds_id))
 
-    def set_EXE_signer_path(self,pathExe):
-        self.m_EXE_signer_path = pathExe
+        Factory.g_lock.acquire()
+        try:
+            if ds_id in Factory.g_checkpoint_D:
+                # Already loaded by another instance
+                return
+
+            verdicts_D = {}
+            num_bad_lines = 0
+            if os.path.isfile(checkpoint_fname):
+                with open(checkpoint_fname, "r") as f:
+                    for line_S in f:
+                        try:
+                            entry_D = json.loads(line_S)
+                            verdicts_D[entry_D["obj_id"]] = entry_D
+                        except (ValueError, KeyError):
+                            # e.g., last line cut by a crash
+                            num_bad_lines += 1
+
+            Factory.g_checkpoint_D[ds_id] = verdicts_D
+            unbuffered = 0
+            Factory.g_checkpoint_F_D[ds_id] = \
+                        open(checkpoint_fname, "a", unbuffered)
+        finally:
+            Factory.g_lock.release()
+
+        Log_S = "checkpoint '%s': %d verdicts loaded (%d bad lines)" %\
+                (checkpoint_fname, len(verdicts_D), num_bad_lines)
+        self.log(Level.INFO, Log_S)
 
-    def get_EXE_exiftool_path(self):
-        return self.m_EXE_exiftool_path
+    #--------------------------------------------------------------------
+    # Set up the budgeted triage of the current data source: its budget
+    # and, with budget_deferred_only, the files deferred by the
+    # previous run (done once per data source)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def load_budget(self):
+        """set up the budgeted triage of the current data source"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        settings = self.local_settings
+
+        max_secs = settings.get_advanced_setting(C_BUDGET_SECS_FIELD)
+        max_bytes = settings.get_advanced_setting(C_BUDGET_MB_FIELD) << 20
+        deferred_only = \
+            settings.get_advanced_setting(C_BUDGET_DEFERRED_ONLY_FIELD)
+        if max_secs <= 0 and max_bytes <= 0 and not deferred_only:
+            return
+
+        ds_id = self.m_data_source_id
+        deferred_fname = os.path.join(self.getWorkDir(),
+                                        C_BUDGET_DEFERRED_FNAME % (ds_id))
+
+        Factory.g_lock.acquire()
+        try:
+            if ds_id in Factory.g_budget_deferred_D:
+                # Already done by another instance
+                return
+            Factory.g_budget_deferred_D[ds_id] = {}
+            Factory.g_budget_low_D[ds_id] = []
+            if max_secs > 0 or max_bytes > 0:
+                Factory.g_budget_D[ds_id] = TriageBudget(max_secs, max_bytes)
+            previous_D = None
+            if deferred_only:
+                previous_D = CSVfile2budget_deferred_D(";", deferred_fname)
+            if previous_D is not None:
+                Factory.g_budget_previous_D[ds_id] = previous_D
+        finally:
+            Factory.g_lock.release()
+
+        Log_S = "budgeted triage: %s secs, %s MB" %\
+                (max_secs or "no limit", (max_bytes >> 20) or "no limit")
+        if previous_D is not None:
+            Log_S = "%s; only the %d files deferred by the previous run" %\
+                    (Log_S, len(previous_D))
+        self.log(Level.INFO, Log_S)
+        if deferred_only and previous_D is None:
+            Warning_S = "budget_deferred_only: no files deferred by a "\
+                        "previous run ('%s'), every PDF file is analyzed" %\
+                        (deferred_fname)
+            self.log(Level.WARNING, Warning_S)
 
-    def set_EXE_exiftool_path(self,exiftoolExe):
-        self.m_EXE_exiftool_path = exiftoolExe
+    #--------------------------------------------------------------------
+    # Budgeted triage of a PDF file, before its analysis:
+    # - not deferred by the previous run (budget_deferred_only): skip
+    # - budget exhausted: deferred (recorded)
+    # - low priority: held for the end of the job (see budget_catch_up)
+    # - otherwise: analyzed now, charged to the budget
+    # @param file [IN] AbstractFile (PDF file)
+    # @return True if the file must not be analyzed now
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def budget_defers(self, file):
+        """apply the budgeted triage to a PDF file"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        ds_id = self.m_data_source_id
+
+        previous_D = Factory.g_budget_previous_D.get(ds_id)
+        if previous_D is not None and file.getId() not in previous_D:
+            # analyzed by the previous run
+            count_budget_stat("done_before")
+            return True
 
-#--------------------------------------------------------------------
-# Class that controls the configuration panels
-# 2017-08-20
-#--------------------------------------------------------------------
-class Process_FindSignedPDFFilesWithUISettingsPanel(
-                        IngestModuleIngestJobSettingsPanel):
-    """Class to create the user interface shown to the user"""
-    def __init__(self,settings):
-        self.local_settings = settings
-        self.initComponents()
-        self.customizeComponents()
+        budget = Factory.g_budget_D.get(ds_id)
+        if budget is None:
+            return False
 
-    def checkBoxEvent(self, event):
-        # duplicate insert
-        if self.checkbox.isSelected():
-            self.local_settings.set_insert_duplicate_flag(True)
-        else:
-            self.local_settings.set_insert_duplicate_flag(False)
+        score = budget_priority(file)
+        if budget.exhausted():
+            record_budget_deferred(ds_id, file, score,
+                                                C_BUDGET_REASON_EXHAUSTED)
+            return True
 
-        # Create CSV file
-        if self.checkbox_create_file.isSelected():
-            self.local_settings.set_create_csv_file_flag(True)
-        else:
-            self.local_settings.set_create_csv_file_flag(False)
+        if score < C_BUDGET_MIN_SCORE:
+            Factory.g_lock.acquire()
+            Factory.g_budget_low_D[ds_id].append((score, file))
+            Factory.g_lock.release()
+            count_budget_stat("held")
+            return True
+
+        budget.consume(file.getSize())
+        count_budget_stat("admitted")
+        return False
 
     #--------------------------------------------------------------------
-    # onClick even handler for Find_Program_Exec_BTN
-    # @param e [IN] event
-    # @return This is an event handler. It doesn't return explicitly.
-    # 2017-08-22
+    # End of the budgeted triage: the low priority files are analyzed
+    # (best first) while there is budget left, the others deferred.
+    # Called by the last instance of the job.
+    # @return None
+    # 2026-10-19
     #--------------------------------------------------------------------
-    def onClickVerifier(self,e):
-        """onClick event handler for Find_Program_Exec_BTN button"""
-        chooseFile = JFileChooser()
-        filter_obj = FileNameExtensionFilter("EXE",["exe"])
-        chooseFile.addChoosableFileFilter(filter_obj)
+    def budget_catch_up(self):
+        """analyze the held files while the budget lasts"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        low_D = Factory.g_budget_low_D
+        Factory.g_budget_low_D = {}
+        Factory.g_lock.release()
+
+        for ds_id, low_L in low_D.iteritems():
+            budget = Factory.g_budget_D.get(ds_id)
+            if budget is None:
+                # budget_deferred_only without budget: nothing held
+                continue
+            low_L.sort(key=lambda entry_T: -entry_T[0])
+            for score, file in low_L:
+                if budget.exhausted() or\
+                                self.context.fileIngestIsCancelled():
+                    record_budget_deferred(ds_id, file, score,
+                                                C_BUDGET_REASON_LOW_PRIORITY)
+                    continue
+
+                budget.consume(file.getSize())
+                count_budget_stat("caught_up")
+                process_result, retry_reason_S = self.analyze_pdf_file(file)
+                if retry_reason_S is not None:
+                    self.push_retry(file, retry_reason_S)
 
-        ret = chooseFile.showDialog(self.panel0, "Select JSIGN EXE")
-        if ret == JFileChooser.APPROVE_OPTION:
-            file = chooseFile.getSelectedFile()
-            Canonical_file = file.getCanonicalPath()
-            self.Program_Executable_TF.setText(Canonical_file)
+    #--------------------------------------------------------------------
+    # Report the budgeted triage and write the deferred files of each
+    # data source (for a later pass with budget_deferred_only)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def report_budget(self):
+        """report the budgeted triage, recording the deferred files"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        deferred_D = Factory.g_budget_deferred_D
+        Factory.g_budget_deferred_D = {}
+        stats_D = dict(Factory.g_budget_stats_D)
+        Factory.g_lock.release()
+
+        for ds_id, files_D in deferred_D.iteritems():
+            deferred_fname = os.path.join(self.getWorkDir(),
+                                        C_BUDGET_DEFERRED_FNAME % (ds_id))
+            budget_deferred2CSVfile(files_D, ";", deferred_fname)
+
+            Log_S = "budgeted triage: %d PDF files analyzed (%d held and "\
+                    "caught up), %d deferred to '%s'" %\
+                    (stats_D["admitted"] + stats_D["caught_up"],
+                     stats_D["caught_up"], len(files_D), deferred_fname)
+            if stats_D["done_before"] > 0:
+                Log_S = "%s, %d done by the previous run" %\
+                        (Log_S, stats_D["done_before"])
+            self.log(Level.INFO, Log_S)
+            self.postIngestMessage(self.getModuleName(), Log_S)
 
     #--------------------------------------------------------------------
-    # onClick even handler for Find_Exiftool_BTN
-    # @param e [IN] event
-    # @return This is an event handler. It doesn't return explicitly.
-    # 2017-09-24
+    # Carve the PDF files of an unallocated space file: its content is
+    # streamed in chunks of C_CARVE_CHUNK_SIZE bytes (memory does not
+    # grow with the size of the file) and scanned by a PDFCarver.
+    # The carved files are added to the case (as layout files of the
+    # unallocated space, no copy of their content)
+    # @param file [IN] AbstractFile (UNALLOC_BLOCKS or UNUSED_BLOCKS)
+    # @return list of the carved files (LayoutFile)
+    # 2026-10-19
     #--------------------------------------------------------------------
-    def onClickExiftool(self,e):
-        """onClick event handler for Find_Exiftool_BTN"""
-        # NOTE: calling JFileChooser() crashes autopsy...
-        # 2017-09-24
+    def carve_unallocated(self, file):
+        """carve the PDF files of an unallocated space file"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        carver = PDFCarver(
+            self.local_settings.get_advanced_setting(C_CARVE_MAX_MB_FIELD) << 20,
+            self.local_settings.get_advanced_setting(C_CARVE_SIGNED_ONLY_FIELD))
+
+        time_start = time.time()
+        num_bytes = 0
+        buffer = jarray.zeros(C_CARVE_CHUNK_SIZE, "b")
+        stream = ReadContentInputStream(file)
         try:
-            chooseFile = JFileChooser()
-            filter_obj = FileNameExtensionFilter("EXE",["exe"])
-            chooseFile.addChoosableFileFilter(filter_obj)
-
-            ret = chooseFile.showDialog(self.panel0, "Select exiftool EXE")
-            if ret == JFileChooser.APPROVE_OPTION:
-                file = chooseFile.getSelectedFile()
-                Canonical_file = file.getCanonicalPath()
-                self.Program_Exiftool_TF.setText(Canonical_file)
-        except e:
-            Err_S = "Error within onClickExiftool"
-            self.Error_Message.setText(Err_S)
+            while not self.context.fileIngestIsCancelled():
+                num_read = stream.read(buffer, 0, C_CARVE_CHUNK_SIZE)
+                if num_read <= 0:
+                    break
+                carver.feed(jarray_bytes_S(buffer, num_read))
+                num_bytes += num_read
+        except:
+            Except_S = "carving of '%s' stopped at byte %d: %s (%s)" %\
+                    (file.getName(), num_bytes, sys.exc_info()[0],
+                     sys.exc_info()[1])
+            self.log(Level.WARNING, Except_S)
+        stream.close()
+        elapsed_secs = time.time() - time_start
+
+        carved_files_L = self.add_carved_files(file, carver.finish())
+
+        Factory.g_lock.acquire()
+        stats_D = Factory.g_carve_stats_D
+        stats_D["files"] += 1
+        stats_D["bytes"] += num_bytes
+        stats_D["secs"] += elapsed_secs
+        stats_D["candidates"] += carver.num_headers
+        stats_D["carved"] += len(carved_files_L)
+        Factory.g_lock.release()
+
+        Log_S = "carving '%s': %d PDF files out of %d headers "\
+                "(%.1f MB in %.1f secs, %.1f MB/s)" %\
+                (file.getName(), len(carved_files_L), carver.num_headers,
+                 num_bytes / 1048576.0, elapsed_secs,
+                 num_bytes / 1048576.0 / max(elapsed_secs, 0.001))
+        self.log(Level.INFO, Log_S)
 
+        return carved_files_L
 
     #--------------------------------------------------------------------
-    # Reads setting from the setting database
-    # 2017-08-23
+    # Add the PDF files carved from an unallocated space file to the
+    # case (under $CarvedFiles)
+    # @param file      [IN] AbstractFile (unallocated space)
+    # @param carved_L  [IN] [(offset, length, has /ByteRange)]
+    # @return list of the carved files (LayoutFile)
+    # 2026-10-19
     #--------------------------------------------------------------------
-    def check_Database_entries(self):
-        head, tail = os.path.split(os.path.abspath(__file__)) 
-        settings_db = os.path.join(head, C_DB_NAME)
-        try: 
-            Class.forName("org.sqlite.JDBC").newInstance()
-            dbConn = DriverManager.getConnection("jdbc:sqlite:%s" % settings_db)
-        except SQLException as e:
-            Err_S = "Error opening setting DB '%s'" % (C_DB_NAME)
-            self.Error_Message.setText(Err_S)
+    def add_carved_files(self, file, carved_L):
+        """add the carved PDF files to the case"""
+        if len(carved_L) == 0:
+            return []
+
+        layout_L = file.getRanges()
+        carved_files_L = []
+        for offset, length, signed in carved_L:
+            name_S = C_CARVED_FNAME % (file.getId(), offset)
+            carved_files_L.append(CarvingResult.CarvedFile(name_S, length,
+                                    carved_ranges_L(layout_L, offset, length)))
 
-        C_SET_VALUE="Setting_Value"
         try:
-            stmt = dbConn.createStatement()
-            SQL_Statement = 'Select Setting_Name, Setting_Value from settings;' 
-            resultSet = stmt.executeQuery(SQL_Statement)
-
-            while resultSet.next():
+            skCase = Case.getCurrentCase().getSleuthkitCase()
+            files_L = skCase.addCarvedFiles(CarvingResult(file,
+                                                        carved_files_L))
+        except:
+            Except_S = "can't add the PDF files carved from '%s': %s (%s)" %\
+                    (file.getName(), sys.exc_info()[0], sys.exc_info()[1])
+            self.log(Level.SEVERE, Except_S)
+            return []
 
-                setting_name_S = resultSet.getString("Setting_Name")
+        IngestServices.getInstance().fireModuleContentEvent(
+                                                ModuleContentEvent(file))
+        return list(files_L)
 
-                # Signer EXE name
-                if setting_name_S == C_SIGNER_EXEC_FIELD:
-                    signer_exec_path = resultSet.getString(C_SET_VALUE)
-                    self.Program_Executable_TF.setText(signer_exec_path)
-                    # Set the appropriate field
-                    self.local_settings.set_EXE_signer_path(signer_exec_path)
+    #--------------------------------------------------------------------
+    # Report the carving of the unallocated space (with its throughput)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def report_carving(self):
+        """report the PDF files carved from unallocated space"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        stats_D = dict(Factory.g_carve_stats_D)
+        Factory.g_lock.release()
+
+        if stats_D["files"] == 0:
+            return
+
+        num_MB = stats_D["bytes"] / 1048576.0
+        Log_S = "carving: %d PDF files carved out of %d headers found in "\
+                "%d unallocated space files (%.1f MB scanned at %.1f MB/s)" %\
+                (stats_D["carved"], stats_D["candidates"], stats_D["files"],
+                 num_MB, num_MB / max(stats_D["secs"], 0.001))
+        self.log(Level.INFO, Log_S)
+        self.postIngestMessage(self.getModuleName(), Log_S)
 
-                # Don't insert duplicates
-                if setting_name_S == C_DONT_INSERT_DUPLICATES:
-                    dont_insert_duplicates = resultSet.getString(C_SET_VALUE)
-                    flag = str2boolean(dont_insert_duplicates)
-                    self.local_settings.set_insert_duplicate_flag(flag)
+    #--------------------------------------------------------------------
+    # @param file [IN] AbstractFile
+    # @return PDFVerdict kept in the checkpoint for 'file', None if none
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def lookup_checkpoint(self, file):
+        """returns the checkpointed verdict of 'file' (or None)"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        verdicts_D = Factory.g_checkpoint_D.get(self.m_data_source_id)
+        if verdicts_D is None:
+            # checkpoints are disabled
+            Factory.g_lock.release()
+            return None
+        entry_D = verdicts_D.get(file.getId())
+        Factory.g_lock.release()
+
+        record_cache_lookup(C_CACHE_CHECKPOINT, entry_D is not None)
+        if entry_D is None:
+            return None
+        return PDFVerdict.from_D(entry_D)
 
-                # Create CSV file
-                if setting_name_S == C_CREATE_CSV_FILE:
-                    create_CSV_file = resultSet.getString(C_SET_VALUE)
-                    flag = str2boolean(create_CSV_file)
-                    self.local_settings.set_create_csv_file_flag(flag)
+    #--------------------------------------------------------------------
+    # Verdict of 'file' in the known verdicts hash set (imported from
+    # a previous case), looked up by MD5
+    # @param file [IN] AbstractFile
+    # @return PDFVerdict or None (no set, no MD5 or unknown MD5)
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def lookup_known_verdict(self, file):
+        """returns the known verdict of 'file' (or None)"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        if len(Factory.g_known_verdicts_D) == 0:
+            return None
+        md5_S = file.getMd5Hash()
+        if not md5_S:
+            return None
+
+        Factory.g_lock.acquire()
+        entry_D = Factory.g_known_verdicts_D.get(md5_S.lower())
+        if entry_D is not None:
+            Factory.g_known_stats_D[C_KNOWN_STAT_HASHSET_HIT] += 1
+        Factory.g_lock.release()
+
+        record_cache_lookup(C_CACHE_KNOWN_VERDICTS, entry_D is not None)
+        if entry_D is None:
+            return None
+
+        verdict = PDFVerdict.from_D(entry_D)
+        # Verdict of another case: no artifact of this case yet,
+        # and worth keeping in the checkpoint
+        verdict.from_checkpoint = False
+        verdict.modified = True
+        return verdict
 
-                # exiftool EXE name
-                if setting_name_S == C_EXIFTOOL_EXEC_FIELD:
-                    exiftool_path = resultSet.getString(C_SET_VALUE)
-                    self.Program_Exiftool_TF.setText(exiftool_path)
-                    self.local_settings.set_EXE_exiftool_path(exiftool_path)
-            
-            # only set a "read successfully" if message site is empty
-            current_err_msg_S = self.Error_Message.getText()
-            if len(current_err_msg_S) == 0:
-                self.Error_Message.setText("Settings read successfully")
+    #--------------------------------------------------------------------
+    # Load the known verdicts hash set (first instance of the job;
+    # called with g_lock held)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def load_known_verdicts(self):
+        """load the known verdicts CSV file, if configured"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        Factory.g_known_verdicts_D = {}
+        Factory.g_seen_verdicts_D = {}
+
+        filename = \
+            self.local_settings.get_advanced_setting(C_KNOWN_VERDICTS_FILE_FIELD)
+        if not filename:
+            return
+
+        if not os.path.isfile(filename):
+            Warning_S = "known verdicts file '%s' not found" % (filename)
+            self.log(Level.WARNING, Warning_S)
+            return
+
+        Factory.g_known_verdicts_D = CSVfile2known_verdicts_D(";", filename)
+        Log_S = "known verdicts: %d loaded from '%s'" %\
+                (len(Factory.g_known_verdicts_D), filename)
+        self.log(Level.INFO, Log_S)
 
-        except SQLException as e:
-            self.Error_Message.setText("Error reading settings database")
+    #--------------------------------------------------------------------
+    # Report the work avoided for known files and known verdicts, and
+    # write the known verdicts of this case for a later case
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def report_known_files(self):
+        """report the work avoided thanks to known files/verdicts"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+
+        Factory.g_lock.acquire()
+        stats_D = dict(Factory.g_known_stats_D)
+        seen_verdicts_D = Factory.g_seen_verdicts_D
+        Factory.g_seen_verdicts_D = {}
+        Factory.g_lock.release()
+
+        num_avoided = stats_D[C_KNOWN_STAT_SKIPPED] +\
+                      stats_D[C_KNOWN_STAT_UNCACHED] +\
+                      stats_D[C_KNOWN_STAT_CACHED] +\
+                      stats_D[C_KNOWN_STAT_HASHSET_HIT]
+        if num_avoided > 0:
+            Log_S = "known files: %d skipped, %d not cached, %d from cache;"\
+                    " known verdicts: %d hits (%d PDF files not analyzed)" %\
+                    (stats_D[C_KNOWN_STAT_SKIPPED],
+                     stats_D[C_KNOWN_STAT_UNCACHED],
+                     stats_D[C_KNOWN_STAT_CACHED],
+                     stats_D[C_KNOWN_STAT_HASHSET_HIT], num_avoided)
+            self.log(Level.INFO, Log_S)
+            self.postIngestMessage(self.getModuleName(), Log_S)
 
-        stmt.close()
-        dbConn.close()
+        if len(seen_verdicts_D) > 0:
+            full_path_filename = os.path.join(self.getWorkDir(),
+                                                    C_KNOWN_VERDICTS_FNAME)
+            known_verdicts2CSVfile(seen_verdicts_D, ";", full_path_filename)
 
     #--------------------------------------------------------------------
-    # Save entries from the GUI to the database.
-    # 2017-08-23
+    # Append the verdict of 'file' to the checkpoint (flushed at once,
+    # so it survives a crash of Autopsy)
+    # @param file    [IN] AbstractFile
+    # @param verdict [IN] PDFVerdict
+    # @return None
+    # 2026-10-19
     #--------------------------------------------------------------------
-    def SaveSettings(self, e):
-        """Save entries from GUI to the database"""
-        head, tail = os.path.split(os.path.abspath(__file__)) 
-        settings_db = os.path.join(head,C_DB_NAME)
+    def save_checkpoint(self, file, verdict):
+        """add the verdict of 'file' to the checkpoint"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        ds_id = self.m_data_source_id
 
-        # Check whether the given path for the files are correct
-        Signer_Exec_Path = self.Program_Executable_TF.getText()
-        Exiftool_Exec_Path = self.Program_Exiftool_TF.getText()
+        entry_D = verdict.to_D()
+        entry_D["obj_id"] = file.getId()
+        line_S = json.dumps(entry_D) + "\n"
 
-        if not os.path.exists(Signer_Exec_Path):
-            Err_S = "ERROR: Cannot find SIGNER executable" 
-        elif not os.path.exists(Exiftool_Exec_Path):
-            Err_S = "ERROR: Cannot find ExifTool executable'" 
-        else:
-            Err_S = ""
+        Factory.g_lock.acquire()
+        try:
+            checkpoint_F = Factory.g_checkpoint_F_D.get(ds_id)
+            if checkpoint_F is not None:
+                checkpoint_F.write(line_S)
+                checkpoint_F.flush()
+                Factory.g_checkpoint_D[ds_id][entry_D["obj_id"]] = entry_D
+        finally:
+            Factory.g_lock.release()
 
-        try: 
-            Class.forName("org.sqlite.JDBC").newInstance()
-            Jdbc_S = "jdbc:sqlite:%s"  % settings_db
-            dbConn = DriverManager.getConnection(Jdbc_S)
-        except SQLException as e:
-            Err_S = "Error opening setting DB '%s'" % (C_DB_NAME)
-            self.Error_Message.setText(Err_S)
+    #--------------------------------------------------------------------
+    # Close the checkpoint files (last instance of the job)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def close_checkpoints(self):
+        """close the checkpoint files"""
+        Factory = FindSignedPDFsFilesIngestModuleFactory
 
+        Factory.g_lock.acquire()
+        for checkpoint_F in Factory.g_checkpoint_F_D.itervalues():
+            checkpoint_F.close()
+        Factory.g_checkpoint_F_D = {}
+        Factory.g_checkpoint_D = {}
+        Factory.g_lock.release()
 
-        try:
-            stmt = dbConn.createStatement()
 
-            # C_SIGNER_EXEC_FIELD
-            SQL_Statement = 'UPDATE settings SET Setting_Value="%s" '\
-                    'WHERE Setting_Name="%s";' %\
-            (self.Program_Executable_TF.getText(),C_SIGNER_EXEC_FIELD) 
-            stmt.execute(SQL_Statement)
-            # DEBUG
-            # Msg_S = "Settings Saved:'%s'" % (SQL_Statement)
-        except SQLException as e:
-            err_S = "Error inserting settings ('%s'): %s (%s)" %\
-                      (SQL_Statement, sys.exc_info()[0], sys.exc_info()[1])
-            self.Error_Message.setText(err_S)
+    #--------------------------------------------------------------------
+    # Add permissions data of fullFilename to m_permission_PDFs_D dict.
+    # @param fullFilename       [IN] full path name of file. Used as key of dict
+    # @param encrypt_flag_S     [IN] boolean status of encrypt flag
+    # @param user_access_flag_S [IN] boolean status of encrypt flag
+    # @param user_access_mask_S [IN] permission mask (hex)
+    # @param encryption_S       [IN] encryption (see encryption_label_S)
+    # @return
+    # 2017-09-27
+    #--------------------------------------------------------------------
+    def add_to_permissions_PDFs_D(self, fullFilename, encrypt_flag_S,
+                                user_access_flag_S, user_access_S,
+                                user_access_mask_S="", encryption_S=""):
+        """Add fullFilename to 
+           FindSignedPDFFilesIngestModule.g_permission_PDFs_D dict"""
 
+        lock = FindSignedPDFsFilesIngestModuleFactory.g_lock
+        lock.acquire()
 
-        try:
-            # C_EXIFTOOL_EXEC_FIELD
-            SQL_Statement = 'UPDATE settings SET Setting_Value="%s" '\
-                    'WHERE Setting_Name="%s";' %\
-            (self.Program_Exiftool_TF.getText(),C_EXIFTOOL_EXEC_FIELD) 
-            stmt.execute(SQL_Statement)
+        FindSignedPDFsFilesIngestModuleFactory.g_permission_PDFs_D[fullFilename] = [encrypt_flag_S]
+        FindSignedPDFsFilesIngestModuleFactory.g_permission_PDFs_D[fullFilename].append(user_access_flag_S)
+        FindSignedPDFsFilesIngestModuleFactory.g_permission_PDFs_D[fullFilename].append(user_access_S)
+        FindSignedPDFsFilesIngestModuleFactory.g_permission_PDFs_D[fullFilename].extend([user_access_mask_S, encryption_S])
 
-        except SQLException as e:
-            err_S = "Error inserting settings ('%s'): %s (%s)" %\
-                      (SQL_Statement, sys.exc_info()[0], sys.exc_info()[1])
-            self.Error_Message.setText(err_S)
+        lock.release()
 
-        try:
-            # C_DONT_INSERT_DUPLICATES
-            insert_duplicate_flag =\
-                    self.local_settings.get_insert_duplicate_flag()
-            insert_duplicate_flag_S = boolean2str(insert_duplicate_flag)
+    #--------------------------------------------------------------------
+    # Post a message to the ingest messages in box.
+    # @param module_S [IN] name of module
+    # @param msg_S [IN] message to post
+    # @return None
+    # 2017-08-04
+    #--------------------------------------------------------------------
+    def postIngestMessage(self,module_S,msg_S):
+        """post a message into AUTOPSY message GUI logger"""
+        # Create the message
+        message = IngestMessage.createMessage( 
+        IngestMessage.MessageType.DATA,module_S, msg_S)
+        # Post the message
+        IngestServices.getInstance().postMessage(message)
 
-            SQL_Statement = 'UPDATE settings SET Setting_Value="%s" '\
-                    'WHERE Setting_Name="%s";' %\
-            (insert_duplicate_flag_S,C_DONT_INSERT_DUPLICATES) 
-            stmt.execute(SQL_Statement)
-        except SQLException as e:
-            err_S = "Error inserting settings ('%s'): %s (%s)" %\
-                      (SQL_Statement, sys.exc_info()[0], sys.exc_info()[1])
-            self.Error_Message.setText(err_S)
+    #--------------------------------------------------------------------
+    # Method that returns True if file is considered to be a PDF file, 
+    # false otherwise.
+    # TODO: right now, we are only checking the extension, which can be
+    # misleading (false positive and false negative extension). 
+    # We should inspect the first byte of the file, looking for %PDF...
+    # @param file [IN] file to be checked
+    # @return True if the file is considered a PDF file, False otherwise
+    # Patricio R. Domingues
+    # 2017-08-02
+    #--------------------------------------------------------------------
+    def is_pdf_file(self,file):
+        """check whether file is a PDF file"""
+        filename, file_extension = os.path.splitext(file.getName())
+
+        # DEBUG
+        if C_Log_Level >= C_LOG_FILE_DETAILS:
+            Log_S = "[%s] basename = '%s'" % (file.getName(), filename)
+            self.log(Level.INFO, Log_S)
+
+            Log_S = "[%s] extension = '%s'" % (file.getName(), file_extension)
+            self.log(Level.INFO, Log_S)
+
+        if file.getSize() == 0:
+            # empty file?
+            return False
+
+        if file.getMIMEType() in C_PDF_MIME_TYPES_D:
+            # detected as PDF (whatever the extension)
+            return True
+
+        if len(file_extension) == 0:
+            # no extension 
+            return False
+
+        if file_extension.lower() == ".pdf":
+            # extension is pdf: bingo!
+            ## FIXME: we should check the first 5 bytes, looking for "%PDF-"
+            return True
+
+        # still here? 
+        return False
+
+    #----------------------------------------------------------------
+    # @param 
+    # @return (permissions list, exiftool's Encryption tag or None)
+    # 2017-09-03
+    #----------------------------------------------------------------
+    def get_pdf_permissions(self,path_exiftool, path_pdf_file,
+                                    evidence_path_S=None, run_handle=None):
+        """return the permissions for the PDF file 'path_pdf_file'"""
+        data_D = self.get_pdf_metadata(path_exiftool, path_pdf_file,
+                                C_EXIFTOOL_PERMISSION_TAGS_L, run_handle,
+                                evidence_path_S)
+        return (permissions_from_exif_D(data_D), data_D.get("Encryption"))
+
+    #----------------------------------------------------------------
+    # Run exiftool once on 'path_pdf_file', asking for the tags 'tags_L'
+    # @param path_exiftool [IN] path of exiftool
+    # @param path_pdf_file [IN] PDF file
+    # @param tags_L        [IN] exiftool tags (e.g., "UserAccess")
+    # @param run_handle    [IN] ToolTask of the run, if cancellable
+    # @param evidence_path_S [IN] full path of the file of the case
+    # @return dict tag -> value (empty dict if exiftool failed)
+    # 2026-10-19
+    #----------------------------------------------------------------
+    def get_pdf_metadata(self, path_exiftool, path_pdf_file, tags_L,
+                                    run_handle=None, evidence_path_S=None):
+        """return the exiftool tags 'tags_L' of 'path_pdf_file'"""
+
+        # Needed string
+        # '-a  -UserAccess -Encryption -s %s -j' % (path_pdf_file)
+        cmd_L = [path_exiftool, "-a"] + ["-%s" % (tag_S) for tag_S in tags_L]
+        cmd_L += ["-s", path_pdf_file, "-j"]
+        run_result = run_external_tool(C_TOOL_EXIFTOOL, cmd_L, path_pdf_file,
+                    run_handle=run_handle, evidence_path_S=evidence_path_S)
+        if run_result.cancelled:
+            return {}
+
+        exif_outcode = run_result.returncode
+        stdout_json_S = run_result.stdout_S
+
+        if run_result.limit_breached:
+            Warning_S = "exiftool breached a resource limit on file '%s' "\
+                    "(returncode=%s)" % (path_pdf_file, exif_outcode)
+            self.log(Level.WARNING, Warning_S)
 
         try:
-            # C_CREATE_CSV_FILE
-            create_CSV_file_flag =\
-                    self.local_settings.get_create_csv_file_flag()
-            create_CSV_file_flag_S = boolean2str(create_CSV_file_flag)
+            data_L = json.loads(stdout_json_S)
+        except Exception, e:
+            # Something went wrong. Bail out.
+            Except_S = "Exception: can't json loads '%s'" % (e)
+            self.log(Level.WARNING, Except_S)
+            return {}
 
-            SQL_Statement = 'UPDATE settings SET Setting_Value="%s" '\
-                    'WHERE Setting_Name="%s";' %\
-            (create_CSV_file_flag_S,C_CREATE_CSV_FILE)
-            stmt.execute(SQL_Statement)
-        except SQLException as e:
-            err_S = "Error inserting settings ('%s'): %s (%s)" %\
-                      (SQL_Statement, sys.exc_info()[0], sys.exc_info()[1])
-            self.Error_Message.setText(err_S)
+        data_len = len(data_L)
+        if data_len == 0:
+            # DEBUG
+            Warning_S = "no data returned by exiftool for file '%s'" %\
+                (path_pdf_file)
+            self.log(Level.INFO, Warning_S)
+            return {}
 
-        if len(Err_S) == 0:
-            Msg_S = "OK - settings saved"
+        return data_L[0]
+
+    #----------------------------------------------------------------
+    # Triage pass of a PDF file: a single exiftool query (permissions,
+    # encryption, version, linearization, pages) plus a native scan
+    # for signature indicators (exiftool doesn't report them).
+    # The decision table then says whether the verifier is needed.
+    # @param path_pdf_file [IN] PDF file (temp copy)
+    # @param evidence_path_S [IN] full path of the file of the case
+    # @return dict with the triage facts (see C_FACT_*)
+    # 2026-10-19
+    #----------------------------------------------------------------
+    def triage_pdf(self, path_pdf_file, evidence_path_S=None):
+        """gather the cheap facts of a PDF file"""
+        EXE_exiftool_path = self.local_settings.get_EXE_exiftool_path()
+        data_D = self.get_pdf_metadata(EXE_exiftool_path, path_pdf_file,
+                        C_EXIFTOOL_TRIAGE_TAGS_L,
+                        evidence_path_S=evidence_path_S)
+
+        facts_D = scan_pdf_indicators(path_pdf_file)
+        facts_D[C_FACT_PERMISSIONS] = permissions_from_exif_D(data_D)
+        facts_D[C_FACT_ENCRYPTION]  = data_D.get("Encryption")
+        facts_D[C_FACT_PDF_VERSION] = data_D.get("PDFVersion")
+        facts_D[C_FACT_LINEARIZED]  = data_D.get("Linearized")
+        facts_D[C_FACT_PAGE_COUNT]  = data_D.get("PageCount")
+        facts_D[C_FACT_NEEDS_VERIFIER] = triage_needs_verifier(facts_D)
+
+        # Stats of the decision table
+        if facts_D[C_FACT_NEEDS_VERIFIER]:
+            key_S = C_TRIAGE_VERIFIER_RUN
         else:
-            Msg_S = Err_S
-        self.Error_Message.setText(Msg_S)
+            key_S = C_TRIAGE_VERIFIER_SKIPPED
+        Factory = FindSignedPDFsFilesIngestModuleFactory
+        Factory.g_lock.acquire()
+        Factory.g_triage_stats_D[key_S] += 1
+        Factory.g_lock.release()
+
+        if C_Log_Level >= C_LOG_FILE_DETAILS:
+            Log_S = "[triage] '%s': %s" % (path_pdf_file, facts_D)
+            self.log(Level.INFO, Log_S)
 
+        return facts_D
 
-        stmt.close()
-        dbConn.close()
+#--------------------------------------------------------------------
+# Data source-level ingest module (data source mode, see
+# C_INGEST_MODE_FIELD). Instead of a callback for every file of the
+# image, the PDF candidates are queried in bulk (by name and by MIME
+# type), sorted by size and path, and analyzed by a pool of worker
+# threads. Each worker runs its own FindSignedPDFFilesIngestModule
+# (the analysis core shared with the file mode), exactly as an
+# ingest thread does in file mode: counters, artifacts, retries and
+# reports are the same in both modes.
+# 2026-10-19
+#--------------------------------------------------------------------
+class FindSignedPDFsDataSourceIngestModule(DataSourceIngestModule):
 
-        # Reread the current elements from the DB
-        self.customizeComponents()
+    _logger = \
+         Logger.getLogger(FindSignedPDFsFilesIngestModuleFactory.moduleName)
+
+    def log(self, level, msg):
+        self._logger.logp(level, self.__class__.__name__, 
+                                        inspect.stack()[1][3], msg)
+
+    def __init__(self, settings):
+        self.context = None
+        self.local_settings = settings
+        self.m_passive = \
+                (settings.get_advanced_setting(C_INGEST_MODE_FIELD) !=
+                                                C_INGEST_MODE_DATA_SOURCE)
+        self.m_cores_L = []
 
     #--------------------------------------------------------------------
-    # Init the GUI components
-    # 2017-08-22
+    # Start one analysis core per worker
+    # 'context' is an instance of org.sleuthkit.autopsy.ingest.IngestJobContext
+    # 2026-10-19
     #--------------------------------------------------------------------
-    def initComponents(self):
+    def startUp(self, context):
+        if self.m_passive:
+            return
 
-        self.panel0 = JPanel()
+        self.context = context
 
-        self.rbgPanel0 = ButtonGroup()
-        self.gbPanel0 = GridBagLayout()
-        self.gbcPanel0 = GridBagConstraints()
-        self.panel0.setLayout( self.gbPanel0 ) 
+        num_workers = \
+            self.local_settings.get_advanced_setting(C_DATA_SOURCE_WORKERS_FIELD)
+        if num_workers <= 0:
+            num_workers = get_num_cores()
 
-        # checkbox: do no insert duplicates
-        self.checkbox = JCheckBox("Do not insert duplicate files",
-                actionPerformed=self.checkBoxEvent)
-        self.gbcPanel0.gridx = 0 
-        self.gbcPanel0.gridy = 1 
-        self.gbcPanel0.gridwidth = 1 
-        self.gbcPanel0.gridheight = 1 
-        self.gbcPanel0.fill = GridBagConstraints.BOTH 
-        self.gbcPanel0.weightx = 1 
-        self.gbcPanel0.weighty = 0 
-        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
-        self.gbPanel0.setConstraints( self.checkbox, self.gbcPanel0 ) 
-        self.panel0.add( self.checkbox ) 
+        for i in range(num_workers):
+            core = FindSignedPDFFilesIngestModule(self.local_settings,
+                                                    data_source_core=True)
+            # appended first: shutDown() must see the failed core too
+            self.m_cores_L.append(core)
+            core.startUp(context)
 
-        # checkbox: create CSV file with list of 
-        # all PDFs and respective status
-        self.checkbox_create_file =\
-                JCheckBox("Create CSV file with PDF status",
-                                actionPerformed=self.checkBoxEvent)
+    #--------------------------------------------------------------------
+    # Query the PDF candidates of the data source and analyze them
+    # @param dataSource  [IN] Content (data source)
+    # @param progressBar [IN] DataSourceIngestModuleProgress
+    # @return IngestModule.ProcessResult
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def process(self, dataSource, progressBar):
+        if self.m_passive:
+            return IngestModule.ProcessResult.OK
 
-        self.gbcPanel0.gridx = 0 
-        self.gbcPanel0.gridy = 2 
-        self.gbcPanel0.gridwidth = 1 
-        self.gbcPanel0.gridheight = 1 
-        self.gbcPanel0.fill = GridBagConstraints.BOTH 
-        self.gbcPanel0.weightx = 1 
-        self.gbcPanel0.weighty = 0 
-        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
-        self.gbPanel0.setConstraints(self.checkbox_create_file,self.gbcPanel0)
+        progressBar.switchToIndeterminate()
+
+        time_start = time.time()
+        candidates_L = self.find_pdf_candidates(dataSource)
+        if self.local_settings.get_advanced_setting(C_CARVE_UNALLOCATED_FIELD):
+            candidates_L.extend(self.carve_data_source(dataSource))
+        candidates_L.sort(key=pdf_candidate_sort_key)
+        if self.local_settings.get_advanced_setting(C_BUDGET_SECS_FIELD) > 0\
+            or self.local_settings.get_advanced_setting(C_BUDGET_MB_FIELD) > 0:
+            # Budgeted triage: the likely interesting files first
+            # (stable sort: size/path order among equal priorities).
+            # No content is read here: the markers pre-scan is done
+            # by budget_defers, file by file, within the budget
+            candidates_L.sort(key=lambda file: -budget_base_priority(file))
+
+        Log_S = "data source '%s': %d PDF candidates (query: %.1f secs)" %\
+                (dataSource.getName(), len(candidates_L),
+                 time.time() - time_start)
+        self.log(Level.INFO, Log_S)
 
-        self.panel0.add(self.checkbox_create_file)
+        num_candidates = len(candidates_L)
+        progressBar.switchToDeterminate(num_candidates)
 
-        #-------------------------------
-        # EXE path of signer/verfier.exe
-        #-------------------------------
-        # text field
-        self.Program_Executable_TF = JTextField(25) 
-        self.Program_Executable_TF.setEnabled(True)
+        # Workers pick the candidates in order (shared index)
+        lock = threading.Lock()
+        state_D = {"next": 0, "done": 0}
+
+        def worker(core):
+            while not self.context.dataSourceIngestIsCancelled():
+                lock.acquire()
+                index = state_D["next"]
+                state_D["next"] = index + 1
+                lock.release()
+                if index >= num_candidates:
+                    return
+
+                file = candidates_L[index]
+                try:
+                    core.process(file)
+                except:
+                    Except_S = "analysis of '%s' failed: %s (%s)" %\
+                            (file.getName(), sys.exc_info()[0],
+                             sys.exc_info()[1])
+                    self.log(Level.SEVERE, Except_S)
+
+                lock.acquire()
+                state_D["done"] += 1
+                progressBar.progress(file.getName(), state_D["done"])
+                lock.release()
+
+        threads_L = [threading.Thread(target=worker, args=(core,),
+                                    name="digiSignedPDF-datasource-%d" % (i))
+                        for i, core in enumerate(self.m_cores_L)]
+        for thread in threads_L:
+            thread.start()
+        for thread in threads_L:
+            thread.join()
+
+        Log_S = "data source '%s': %d of %d PDF candidates analyzed "\
+                "in %.1f secs" % (dataSource.getName(), state_D["done"],
+                                  num_candidates, time.time() - time_start)
+        self.log(Level.INFO, Log_S)
 
-        # Set the text field with the path of JVERIFIER
-        self.Program_Executable_TF.setText(C_PATH_VERIFIER)
-       
-        self.gbcPanel0.gridx = 0 
-        self.gbcPanel0.gridy = 3 
-        self.gbcPanel0.gridwidth = 1 
-        self.gbcPanel0.gridheight = 1 
-        self.gbcPanel0.fill = GridBagConstraints.BOTH 
-        self.gbcPanel0.weightx = 1 
-        self.gbcPanel0.weighty = 0 
-        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
-        self.gbPanel0.setConstraints(self.Program_Executable_TF,self.gbcPanel0)
+        return IngestModule.ProcessResult.OK
 
-        self.panel0.add(self.Program_Executable_TF)
+    #--------------------------------------------------------------------
+    # PDF candidates of a data source: files named *.pdf, and files
+    # detected as PDF (MIME type) whatever their name
+    # @param dataSource [IN] Content (data source)
+    # @return list of AbstractFile (no duplicates)
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def find_pdf_candidates(self, dataSource):
+        """query the PDF candidates of the data source in bulk"""
+        fileManager = Case.getCurrentCase().getServices().getFileManager()
+        by_name_L = fileManager.findFiles(dataSource, C_PDF_NAME_PATTERN_S)
+
+        mime_types_S = ", ".join(["'%s'" % (mime_S)
+                                        for mime_S in C_PDF_MIME_TYPES_D])
+        where_S = C_PDF_MIME_WHERE_S % (dataSource.getId(), mime_types_S)
+        try:
+            skCase = Case.getCurrentCase().getSleuthkitCase()
+            by_mime_L = skCase.findAllFilesWhere(where_S)
+        except:
+            Except_S = "MIME type query failed (%s): candidates by name only"\
+                    % (sys.exc_info()[1])
+            self.log(Level.WARNING, Except_S)
+            by_mime_L = []
 
-        #-------------------------------
-        # File changer (verifier.exe)
-        #-------------------------------
-        self.Find_Program_Exec_BTN =\
-                JButton( "Verifier EXE", actionPerformed=self.onClickVerifier)
-        self.Find_Program_Exec_BTN.setEnabled(True)
-        self.rbgPanel0.add( self.Find_Program_Exec_BTN )
-        self.gbcPanel0.gridx = 6
-        self.gbcPanel0.gridy = 3
-        self.gbcPanel0.gridwidth = 1
-        self.gbcPanel0.gridheight = 1
-        self.gbcPanel0.fill = GridBagConstraints.BOTH
-        self.gbcPanel0.weightx = 1
-        self.gbcPanel0.weighty = 0
-        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
-        self.gbPanel0.setConstraints(self.Find_Program_Exec_BTN,self.gbcPanel0)
-        self.panel0.add( self.Find_Program_Exec_BTN )
+        candidates_D = {}
+        for file in list(by_name_L) + list(by_mime_L):
+            candidates_D[file.getId()] = file
 
-        #-------------------------------
-        # EXE path of exiftool
-        #-------------------------------
-        # text field
-        self.Program_Exiftool_TF = JTextField(25) 
-        self.Program_Exiftool_TF.setEnabled(True)
+        Log_S = "PDF candidates: %d by name, %d by MIME type, %d distinct" %\
+                (len(by_name_L), len(by_mime_L), len(candidates_D))
+        self.log(Level.INFO, Log_S)
 
-        # Set the text field with the path of EXIFTOOL
-        self.Program_Exiftool_TF.setText(C_PATH_EXIFTOOL)
+        return candidates_D.values()
 
-        self.gbcPanel0.gridx = 0 
-        self.gbcPanel0.gridy = 4 
-        self.gbcPanel0.gridwidth = 1 
-        self.gbcPanel0.gridheight = 1 
-        self.gbcPanel0.fill = GridBagConstraints.BOTH 
-        self.gbcPanel0.weightx = 1 
-        self.gbcPanel0.weighty = 0 
-        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
-        self.gbPanel0.setConstraints(self.Program_Exiftool_TF,self.gbcPanel0)
+    #--------------------------------------------------------------------
+    # Carve the PDF files of the unallocated space of a data source
+    # (see FindSignedPDFFilesIngestModule.carve_unallocated)
+    # @param dataSource [IN] Content (data source)
+    # @return list of the carved files (LayoutFile)
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def carve_data_source(self, dataSource):
+        """carve the PDF files of the unallocated space"""
+        where_S = C_UNALLOC_WHERE_S % (dataSource.getId(),
+                TskData.TSK_DB_FILES_TYPE_ENUM.UNALLOC_BLOCKS.getFileType(),
+                TskData.TSK_DB_FILES_TYPE_ENUM.UNUSED_BLOCKS.getFileType())
+        try:
+            skCase = Case.getCurrentCase().getSleuthkitCase()
+            unalloc_L = skCase.findAllFilesWhere(where_S)
+        except:
+            Except_S = "unallocated space query failed (%s): no carving" %\
+                    (sys.exc_info()[1])
+            self.log(Level.WARNING, Except_S)
+            return []
 
-        self.panel0.add(self.Program_Exiftool_TF)
+        carved_L = []
+        for file in unalloc_L:
+            if self.context.dataSourceIngestIsCancelled():
+                break
+            carved_L.extend(self.m_cores_L[0].carve_unallocated(file))
+        return carved_L
 
-        #-------------------------------
+    #--------------------------------------------------------------------
+    # Shut the analysis cores down (the last one does the reports)
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def shutDown(self):
+        for core in self.m_cores_L:
+            core.shutDown()
+
+#====================================================================
+# PANEL-related classes
+#====================================================================
+#--------------------------------------------------------------------
+# Class
+# 2017-08-20
+#--------------------------------------------------------------------
+class Process_FindSignedPDFFilesWithUISettings(IngestModuleIngestJobSettings):
+    """Class that deals with PANEL settings and alike"""
+
+    serialVersionUID = 1L
+
+    #--------------------------------------------------------------------
+    # constructor. Sets the default value.
+    # 2017-08-21
+    #--------------------------------------------------------------------
+    def __init__(self):
+        # Note: on Autopsy 4.4.1, the jython interpreter complains
+        # about the non existence of the self.m_insert_duplicate flag.
+        self.m_insert_duplicate = None
+        # Advanced settings start with their default values and are
+        # overwritten by the ones found in the DB3 database.
+        self.m_advanced_D = dict(C_ADVANCED_SETTINGS_DEFAULTS_D)
+        # No init is done here. Init is done through the DB3 database.
+
+    # getter for serialVersionUID
+    def getVersionNumber(self):
+        return serialVersionUID
+
+    def get_insert_duplicate_flag(self):
+        return self.m_insert_duplicate
+
+    def set_insert_duplicate_flag(self,flag):
+        self.m_insert_duplicate = flag
+
+    def get_create_csv_file_flag(self):
+        return self.m_create_csv_file
+
+    def set_create_csv_file_flag(self,flag):
+        self.m_create_csv_file = flag
+
+    def get_EXE_signer_path(self):
+        return self.m_EXE_signer_path
+
+    def set_EXE_signer_path(self,pathExe):
+        self.m_EXE_signer_path = pathExe
+
+    def get_EXE_exiftool_path(self):
+        return self.m_EXE_exiftool_path
+
+    def set_EXE_exiftool_path(self,exiftoolExe):
+        self.m_EXE_exiftool_path = exiftoolExe
+
+    #--------------------------------------------------------------------
+    # Getter for an advanced setting
+    # @param name_S [IN] name of the setting (see C_ADVANCED_SETTINGS_L)
+    # @return value of the setting (its default if it was never set)
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def get_advanced_setting(self,name_S):
+        advanced_D = getattr(self, "m_advanced_D", None)
+        if advanced_D is not None and name_S in advanced_D:
+            return advanced_D[name_S]
+        return C_ADVANCED_SETTINGS_DEFAULTS_D[name_S]
+
+    #--------------------------------------------------------------------
+    # Setter for an advanced setting. The value is converted to the
+    # type of the default value of the setting.
+    # @param name_S  [IN] name of the setting
+    # @param value_S [IN] value (string, as kept in the DB)
+    # @return True if the setting was set, False otherwise
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def set_advanced_setting(self,name_S,value_S):
+        if name_S not in C_ADVANCED_SETTINGS_DEFAULTS_D:
+            return False
+
+        value = advanced_setting_from_str(name_S, value_S)
+        if value is None:
+            return False
+
+        if getattr(self, "m_advanced_D", None) is None:
+            self.m_advanced_D = dict(C_ADVANCED_SETTINGS_DEFAULTS_D)
+        self.m_advanced_D[name_S] = value
+        return True
+
+#--------------------------------------------------------------------
+# Class that controls the configuration panels
+# 2017-08-20
+#--------------------------------------------------------------------
+class Process_FindSignedPDFFilesWithUISettingsPanel(
+                        IngestModuleIngestJobSettingsPanel):
+    """Class to create the user interface shown to the user"""
+    def __init__(self,settings):
+        self.local_settings = settings
+        self.initComponents()
+        self.customizeComponents()
+
+    def checkBoxEvent(self, event):
+        # duplicate insert
+        if self.checkbox.isSelected():
+            self.local_settings.set_insert_duplicate_flag(True)
+        else:
+            self.local_settings.set_insert_duplicate_flag(False)
+
+        # Create CSV file
+        if self.checkbox_create_file.isSelected():
+            self.local_settings.set_create_csv_file_flag(True)
+        else:
+            self.local_settings.set_create_csv_file_flag(False)
+
+    #--------------------------------------------------------------------
+    # onClick even handler for Find_Program_Exec_BTN
+    # @param e [IN] event
+    # @return This is an event handler. It doesn't return explicitly.
+    # 2017-08-22
+    #--------------------------------------------------------------------
+    def onClickVerifier(self,e):
+        """onClick event handler for Find_Program_Exec_BTN button"""
+        chooseFile = JFileChooser()
+        filter_obj = FileNameExtensionFilter("EXE",["exe"])
+        chooseFile.addChoosableFileFilter(filter_obj)
+
+        ret = chooseFile.showDialog(self.panel0, "Select JSIGN EXE")
+        if ret == JFileChooser.APPROVE_OPTION:
+            file = chooseFile.getSelectedFile()
+            Canonical_file = file.getCanonicalPath()
+            self.Program_Executable_TF.setText(Canonical_file)
+
+    #--------------------------------------------------------------------
+    # onClick even handler for Find_Exiftool_BTN
+    # @param e [IN] event
+    # @return This is an event handler. It doesn't return explicitly.
+    # 2017-09-24
+    #--------------------------------------------------------------------
+    def onClickExiftool(self,e):
+        """onClick event handler for Find_Exiftool_BTN"""
+        # NOTE: calling JFileChooser() crashes autopsy...
+        # 2017-09-24
+        try:
+            chooseFile = JFileChooser()
+            filter_obj = FileNameExtensionFilter("EXE",["exe"])
+            chooseFile.addChoosableFileFilter(filter_obj)
+
+            ret = chooseFile.showDialog(self.panel0, "Select exiftool EXE")
+            if ret == JFileChooser.APPROVE_OPTION:
+                file = chooseFile.getSelectedFile()
+                Canonical_file = file.getCanonicalPath()
+                self.Program_Exiftool_TF.setText(Canonical_file)
+        except e:
+            Err_S = "Error within onClickExiftool"
+            self.Error_Message.setText(Err_S)
+
+
+    #--------------------------------------------------------------------
+    # Reads setting from the setting database
+    # 2017-08-23
+    #--------------------------------------------------------------------
+    def check_Database_entries(self):
+        head, tail = os.path.split(os.path.abspath(__file__)) 
+        settings_db = os.path.join(head, C_DB_NAME)
+        try: 
+            Class.forName("org.sqlite.JDBC").newInstance()
+            dbConn = DriverManager.getConnection("jdbc:sqlite:%s" % settings_db)
+        except SQLException as e:
+            Err_S = "Error opening setting DB '%s'" % (C_DB_NAME)
+            self.Error_Message.setText(Err_S)
+
+        C_SET_VALUE="Setting_Value"
+        try:
+            stmt = dbConn.createStatement()
+            SQL_Statement = 'Select Setting_Name, Setting_Value from settings;' 
+            resultSet = stmt.executeQuery(SQL_Statement)
+
+            while resultSet.next():
+
+                setting_name_S = resultSet.getString("Setting_Name")
+
+                # Signer EXE name
+                if setting_name_S == C_SIGNER_EXEC_FIELD:
+                    signer_exec_path = resultSet.getString(C_SET_VALUE)
+                    self.Program_Executable_TF.setText(signer_exec_path)
+                    # Set the appropriate field
+                    self.local_settings.set_EXE_signer_path(signer_exec_path)
+
+                # Don't insert duplicates
+                if setting_name_S == C_DONT_INSERT_DUPLICATES:
+                    dont_insert_duplicates = resultSet.getString(C_SET_VALUE)
+                    flag = str2boolean(dont_insert_duplicates)
+                    self.local_settings.set_insert_duplicate_flag(flag)
+
+                # Create CSV file
+                if setting_name_S == C_CREATE_CSV_FILE:
+                    create_CSV_file = resultSet.getString(C_SET_VALUE)
+                    flag = str2boolean(create_CSV_file)
+                    self.local_settings.set_create_csv_file_flag(flag)
+
+                # exiftool EXE name
+                if setting_name_S == C_EXIFTOOL_EXEC_FIELD:
+                    exiftool_path = resultSet.getString(C_SET_VALUE)
+                    self.Program_Exiftool_TF.setText(exiftool_path)
+                    self.local_settings.set_EXE_exiftool_path(exiftool_path)
+
+                # Advanced settings
+                if setting_name_S in C_ADVANCED_SETTINGS_DEFAULTS_D:
+                    value_S = resultSet.getString(C_SET_VALUE)
+                    self.local_settings.set_advanced_setting(setting_name_S,
+                                                                    value_S)
+            
+            # only set a "read successfully" if message site is empty
+            current_err_msg_S = self.Error_Message.getText()
+            if len(current_err_msg_S) == 0:
+                self.Error_Message.setText("Settings read successfully")
+
+        except SQLException as e:
+            self.Error_Message.setText("Error reading settings database")
+
+        stmt.close()
+        dbConn.close()
+
+    #--------------------------------------------------------------------
+    # Save entries from the GUI to the database.
+    # 2017-08-23
+    #--------------------------------------------------------------------
+    def SaveSettings(self, e):
+        """Save entries from GUI to the database"""
+        head, tail = os.path.split(os.path.abspath(__file__)) 
+        settings_db = os.path.join(head,C_DB_NAME)
+
+        # Check whether the given path for the files are correct
+        Signer_Exec_Path = self.Program_Executable_TF.getText()
+        Exiftool_Exec_Path = self.Program_Exiftool_TF.getText()
+
+        if not os.path.exists(Signer_Exec_Path):
+            Err_S = "ERROR: Cannot find SIGNER executable" 
+        elif not os.path.exists(Exiftool_Exec_Path):
+            Err_S = "ERROR: Cannot find ExifTool executable'" 
+        else:
+            Err_S = ""
+
+        try: 
+            Class.forName("org.sqlite.JDBC").newInstance()
+            Jdbc_S = "jdbc:sqlite:%s"  % settings_db
+            dbConn = DriverManager.getConnection(Jdbc_S)
+        except SQLException as e:
+            Err_S = "Error opening setting DB '%s'" % (C_DB_NAME)
+            self.Error_Message.setText(Err_S)
+
+
+        try:
+            stmt = dbConn.createStatement()
+
+            # C_SIGNER_EXEC_FIELD
+            SQL_Statement = 'UPDATE settings SET Setting_Value="%s" '\
+                    'WHERE Setting_Name="%s";' %\
+            (self.Program_Executable_TF.getText(),C_SIGNER_EXEC_FIELD) 
+            stmt.execute(SQL_Statement)
+            # DEBUG
+            # Msg_S = "Settings Saved:'%s'" % (SQL_Statement)
+        except SQLException as e:
+            err_S = "Error inserting settings ('%s'): %s (%s)" %\
+                      (SQL_Statement, sys.exc_info()[0], sys.exc_info()[1])
+            self.Error_Message.setText(err_S)
+
+
+        try:
+            # C_EXIFTOOL_EXEC_FIELD
+            SQL_Statement = 'UPDATE settings SET Setting_Value="%s" '\
+                    'WHERE Setting_Name="%s";' %\
+            (self.Program_Exiftool_TF.getText(),C_EXIFTOOL_EXEC_FIELD) 
+            stmt.execute(SQL_Statement)
+
+        except SQLException as e:
+            err_S = "Error inserting settings ('%s'): %s (%s)" %\
+                      (SQL_Statement, sys.exc_info()[0], sys.exc_info()[1])
+            self.Error_Message.setText(err_S)
+
+        try:
+            # C_DONT_INSERT_DUPLICATES
+            insert_duplicate_flag =\
+                    self.local_settings.get_insert_duplicate_flag()
+            insert_duplicate_flag_S = boolean2str(insert_duplicate_flag)
+
+            SQL_Statement = 'UPDATE settings SET Setting_Value="%s" '\
+                    'WHERE Setting_Name="%s";' %\
+            (insert_duplicate_flag_S,C_DONT_INSERT_DUPLICATES) 
+            stmt.execute(SQL_Statement)
+        except SQLException as e:
+            err_S = "Error inserting settings ('%s'): %s (%s)" %\
+                      (SQL_Statement, sys.exc_info()[0], sys.exc_info()[1])
+            self.Error_Message.setText(err_S)
+
+        try:
+            # C_CREATE_CSV_FILE
+            create_CSV_file_flag =\
+                    self.local_settings.get_create_csv_file_flag()
+            create_CSV_file_flag_S = boolean2str(create_CSV_file_flag)
+
+            SQL_Statement = 'UPDATE settings SET Setting_Value="%s" '\
+                    'WHERE Setting_Name="%s";' %\
+            (create_CSV_file_flag_S,C_CREATE_CSV_FILE)
+            stmt.execute(SQL_Statement)
+        except SQLException as e:
+            err_S = "Error inserting settings ('%s'): %s (%s)" %\
+                      (SQL_Statement, sys.exc_info()[0], sys.exc_info()[1])
+            self.Error_Message.setText(err_S)
+
+        # Advanced settings (name=value lines of the text area).
+        # INSERT OR REPLACE: the rows may not exist yet in the DB
+        for line_S in self.Advanced_Settings_TA.getText().splitlines():
+            line_S = line_S.strip()
+            if len(line_S) == 0 or line_S.startswith("#"):
+                continue
+            if "=" not in line_S:
+                Err_S = "ERROR: advanced setting '%s' is not name=value" %\
+                        (line_S)
+                continue
+
+            name_S, value_S = [elem.strip() for elem in line_S.split("=",1)]
+            if not self.local_settings.set_advanced_setting(name_S,value_S):
+                Err_S = "ERROR: invalid advanced setting '%s'" % (line_S)
+                continue
+
+            try:
+                SQL_Statement = 'INSERT OR REPLACE INTO settings '\
+                        '(Setting_Name, Setting_Value) VALUES ("%s","%s");' %\
+                        (name_S, value_S)
+                stmt.execute(SQL_Statement)
+            except SQLException as e:
+                err_S = "Error inserting settings ('%s'): %s (%s)" %\
+                      (SQL_Statement, sys.exc_info()[0], sys.exc_info()[1])
+                self.Error_Message.setText(err_S)
+
+        if len(Err_S) == 0:
+            Msg_S = "OK - settings saved"
+        else:
+            Msg_S = Err_S
+        self.Error_Message.setText(Msg_S)
+
+
+        stmt.close()
+        dbConn.close()
+
+        # Reread the current elements from the DB
+        self.customizeComponents()
+
+    #--------------------------------------------------------------------
+    # Init the GUI components
+    # 2017-08-22
+    #--------------------------------------------------------------------
+    def initComponents(self):
+
+        self.panel0 = JPanel()
+
+        self.rbgPanel0 = ButtonGroup()
+        self.gbPanel0 = GridBagLayout()
+        self.gbcPanel0 = GridBagConstraints()
+        self.panel0.setLayout( self.gbPanel0 ) 
+
+        # checkbox: do no insert duplicates
+        self.checkbox = JCheckBox("Do not insert duplicate files",
+                actionPerformed=self.checkBoxEvent)
+        self.gbcPanel0.gridx = 0 
+        self.gbcPanel0.gridy = 1 
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.checkbox, self.gbcPanel0 ) 
+        self.panel0.add( self.checkbox ) 
+
+        # checkbox: create CSV file with list of 
+        # all PDFs and respective status
+        self.checkbox_create_file =\
+                JCheckBox("Create CSV file with PDF status",
+                                actionPerformed=self.checkBoxEvent)
+
+        self.gbcPanel0.gridx = 0 
+        self.gbcPanel0.gridy = 2 
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints(self.checkbox_create_file,self.gbcPanel0)
+
+        self.panel0.add(self.checkbox_create_file)
+
+        #-------------------------------
+        # EXE path of signer/verfier.exe
+        #-------------------------------
+        # text field
+        self.Program_Executable_TF = JTextField(25) 
+        self.Program_Executable_TF.setEnabled(True)
+
+        # Set the text field with the path of JVERIFIER
+        self.Program_Executable_TF.setText(C_PATH_VERIFIER)
+       
+        self.gbcPanel0.gridx = 0 
+        self.gbcPanel0.gridy = 3 
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints(self.Program_Executable_TF,self.gbcPanel0)
+
+        self.panel0.add(self.Program_Executable_TF)
+
+        #-------------------------------
+        # File changer (verifier.exe)
+        #-------------------------------
+        self.Find_Program_Exec_BTN =\
+                JButton( "Verifier EXE", actionPerformed=self.onClickVerifier)
+        self.Find_Program_Exec_BTN.setEnabled(True)
+        self.rbgPanel0.add( self.Find_Program_Exec_BTN )
+        self.gbcPanel0.gridx = 6
+        self.gbcPanel0.gridy = 3
+        self.gbcPanel0.gridwidth = 1
+        self.gbcPanel0.gridheight = 1
+        self.gbcPanel0.fill = GridBagConstraints.BOTH
+        self.gbcPanel0.weightx = 1
+        self.gbcPanel0.weighty = 0
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints(self.Find_Program_Exec_BTN,self.gbcPanel0)
+        self.panel0.add( self.Find_Program_Exec_BTN )
+
+        #-------------------------------
+        # EXE path of exiftool
+        #-------------------------------
+        # text field
+        self.Program_Exiftool_TF = JTextField(25) 
+        self.Program_Exiftool_TF.setEnabled(True)
+
+        # Set the text field with the path of EXIFTOOL
+        self.Program_Exiftool_TF.setText(C_PATH_EXIFTOOL)
+
+        self.gbcPanel0.gridx = 0 
+        self.gbcPanel0.gridy = 4 
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints(self.Program_Exiftool_TF,self.gbcPanel0)
+
+        self.panel0.add(self.Program_Exiftool_TF)
+
+        #-------------------------------
         # File changer (exiftool)
         #-------------------------------
         self.Find_Exiftool_BTN =\
@@ -1807,479 +5518,4350 @@ class Process_FindSignedPDFFilesWithUISettingsPanel(
         self.panel0.add( self.Find_Exiftool_BTN )
 
 
-        #------------------------------
-        # Save settings button
-        #------------------------------
-        self.Save_Settings_BTN =\
-                JButton("Save Settings", actionPerformed=self.SaveSettings)
-        self.Save_Settings_BTN.setEnabled(True)
-        self.gbcPanel0.gridx = 0
-        self.gbcPanel0.gridy = 5
-        self.gbcPanel0.gridwidth = 1
-        self.gbcPanel0.gridheight = 1
-        self.gbcPanel0.fill = GridBagConstraints.BOTH
-        self.gbcPanel0.weightx = 1
-        self.gbcPanel0.weighty = 0
-        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
-        self.gbPanel0.setConstraints( self.Save_Settings_BTN, self.gbcPanel0 ) 
-        self.panel0.add( self.Save_Settings_BTN ) 
+        #------------------------------
+        # Save settings button
+        #------------------------------
+        self.Save_Settings_BTN =\
+                JButton("Save Settings", actionPerformed=self.SaveSettings)
+        self.Save_Settings_BTN.setEnabled(True)
+        self.gbcPanel0.gridx = 0
+        self.gbcPanel0.gridy = 5
+        self.gbcPanel0.gridwidth = 1
+        self.gbcPanel0.gridheight = 1
+        self.gbcPanel0.fill = GridBagConstraints.BOTH
+        self.gbcPanel0.weightx = 1
+        self.gbcPanel0.weighty = 0
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH 
+        self.gbPanel0.setConstraints( self.Save_Settings_BTN, self.gbcPanel0 ) 
+        self.panel0.add( self.Save_Settings_BTN ) 
+
+        #------------------------------
+        # Advanced settings (name=value)
+        #------------------------------
+        self.Advanced_Settings_TA = JTextArea(6, 25)
+        self.Advanced_Settings_TA.setEnabled(True)
+        self.Advanced_Settings_TA.setBorder(
+                BorderFactory.createTitledBorder("Advanced (name=value)"))
+        self.Advanced_Settings_SP = JScrollPane(self.Advanced_Settings_TA)
+        self.gbcPanel0.gridx = 0
+        self.gbcPanel0.gridy = 7
+        self.gbcPanel0.gridwidth = 1
+        self.gbcPanel0.gridheight = 1
+        self.gbcPanel0.fill = GridBagConstraints.BOTH
+        self.gbcPanel0.weightx = 1
+        self.gbcPanel0.weighty = 1
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH
+        self.gbPanel0.setConstraints(self.Advanced_Settings_SP,self.gbcPanel0)
+        self.panel0.add(self.Advanced_Settings_SP)
+
+        self.Error_Message = JLabel( "") 
+        self.Error_Message.setEnabled(True)
+        self.gbcPanel0.gridx = 0
+        self.gbcPanel0.gridy = 6
+        self.gbcPanel0.gridwidth = 1 
+        self.gbcPanel0.gridheight = 1 
+        self.gbcPanel0.fill = GridBagConstraints.BOTH 
+        self.gbcPanel0.weightx = 1 
+        self.gbcPanel0.weighty = 0 
+        self.gbcPanel0.anchor = GridBagConstraints.NORTH
+        self.gbPanel0.setConstraints( self.Error_Message, self.gbcPanel0 ) 
+        self.panel0.add( self.Error_Message ) 
+
+        self.add(self.panel0)
+
+
+    #--------------------------------------------------------------------
+    # 2017-08-25
+    #--------------------------------------------------------------------
+    def customizeComponents(self):
+        """customize components"""
+
+        # Read values from DB
+        self.check_Database_entries()
+
+        insert_duplicate_flag = self.local_settings.get_insert_duplicate_flag()
+        self.checkbox.setSelected(insert_duplicate_flag)
+
+        create_csv_file_flag = self.local_settings.get_create_csv_file_flag()
+        self.checkbox_create_file.setSelected(create_csv_file_flag)
+
+        # One "name=value" line per advanced setting
+        Lines_L = []
+        for name_S, default in C_ADVANCED_SETTINGS_L:
+            value = self.local_settings.get_advanced_setting(name_S)
+            Lines_L.append("%s=%s" % (name_S, advanced_setting_to_str(value)))
+        self.Advanced_Settings_TA.setText("\n".join(Lines_L))
+
+    def getSettings(self):
+        return self.local_settings
+
+#====================================================================
+# Verdicts
+#====================================================================
+#--------------------------------------------------------------------
+# Outcome of the analysis of a PDF file: verifier code and (when
+# computed) the permissions [User_Access_flag, User_Access_code,
+# Encryption_flag] returned by get_pdf_permissions().
+# Verdicts are kept in the checkpoint as dicts (to_D/from_D).
+# 2026-10-19
+#--------------------------------------------------------------------
+class PDFVerdict(object):
+    """Verdict of the analysis of a PDF file"""
+
+    def __init__(self, signed_code, permissions_L=None):
+        self.signed_code = signed_code
+        self.permissions_L = permissions_L
+        # Triage facts (see C_FACT_*), empty if there was no triage
+        self.facts_D = {}
+        self.from_checkpoint = False
+        # True when the verdict has data not kept in the checkpoint yet
+        self.modified = True
+
+    def set_permissions(self, permissions_L):
+        self.permissions_L = permissions_L
+        self.modified = True
+
+    def to_D(self):
+        """dict representation (JSON) of the verdict"""
+        return {"signed_code": self.signed_code,
+                "permissions": self.permissions_L,
+                "facts": self.facts_D}
+
+    @staticmethod
+    def from_D(verdict_D):
+        """build a verdict from its dict representation"""
+        verdict = PDFVerdict(verdict_D["signed_code"],
+                             verdict_D.get("permissions"))
+        verdict.facts_D = verdict_D.get("facts") or {}
+        verdict.from_checkpoint = True
+        verdict.modified = False
+        return verdict
+
+#--------------------------------------------------------------------
+# State of the analysis of a PDF file: the file, its verdict (built
+# along the analysis) and the facts matched by the flow rules
+# (see C_FLOW_RULES_L). Facts are only updated through the set_*
+# methods, which keep them consistent with the verdict.
+# 2026-10-19
+#--------------------------------------------------------------------
+class PDFAnalysis(object):
+    """Verdict and flow facts of the analysis of a PDF file"""
+
+    def __init__(self, file, full_path_S, temp_path_S):
+        self.file = file
+        self.full_path_S = full_path_S
+        self.temp_path_S = temp_path_S
+        self.verdict = PDFVerdict(None)
+        self.facts_D = dict(C_FLOW_INITIAL_FACTS_D)
+        # 0: the file itself, N: PDF file embedded N levels down (the
+        # content is in temp_path_S, the artifacts go to 'file')
+        self.embedded_depth = 0
+        # revision analysis enabled: pending once the file is known
+        # to be modified after signing (see set_signed_code)
+        self.revisions_wanted = False
+        # signature digests enabled: pending once the file is known
+        # to have a signature (see set_signed_code)
+        self.digests_wanted = False
+        # permissions for the histogram (see count_permissions)
+        self.permission_counts_T = None
+
+    def set_verdict(self, verdict):
+        """start from a known (e.g., checkpointed) verdict"""
+        self.verdict = verdict
+        if verdict.facts_D:
+            self.set_triage_facts(verdict.facts_D)
+        if verdict.signed_code is not None:
+            self.set_signed_code(verdict.signed_code)
+        if verdict.permissions_L is not None:
+            self.set_permissions(verdict.permissions_L)
+
+    def set_triage_facts(self, facts_D):
+        """record the facts of the triage pass"""
+        self.verdict.facts_D = facts_D
+        if C_FACT_REVISIONS in facts_D:
+            self.facts_D[C_FLOW_REVISIONS] = C_REVISIONS_DONE
+        if C_FACT_SIGNATURE_DIGESTS in facts_D:
+            self.facts_D[C_FLOW_DIGESTS] = C_DIGESTS_DONE
+        if facts_D.get(C_FACT_PERMISSIONS) is not None:
+            self.set_permissions(facts_D[C_FACT_PERMISSIONS])
+        if facts_D.get(C_FACT_ENCRYPT_DICT):
+            self.facts_D[C_FLOW_ENCRYPTED] = True
+        if C_FACT_SIG_INDICATORS not in facts_D:
+            return
+        if not facts_D[C_FACT_SCAN_COMPLETE]:
+            self.facts_D[C_FLOW_PRESCAN] = C_PRESCAN_INCOMPLETE
+        elif facts_D[C_FACT_SIG_INDICATORS]:
+            self.facts_D[C_FLOW_PRESCAN] = C_PRESCAN_INDICATORS
+        else:
+            self.facts_D[C_FLOW_PRESCAN] = C_PRESCAN_CLEAN
+
+    def set_revisions(self, revisions_D):
+        """record the revisions (see analyze_revisions, None: unknown)"""
+        self.verdict.facts_D[C_FACT_REVISIONS] = revisions_D
+        self.verdict.modified = True
+        self.facts_D[C_FLOW_REVISIONS] = C_REVISIONS_DONE
+
+    def set_signature_digests(self, signatures_L):
+        """record the signature digests (see check_signature_digests)"""
+        self.verdict.facts_D[C_FACT_SIGNATURE_DIGESTS] = signatures_L
+        self.verdict.modified = True
+        self.facts_D[C_FLOW_DIGESTS] = C_DIGESTS_DONE
+
+    def set_signed_code(self, signed_code):
+        """record the verifier code"""
+        if self.verdict.signed_code != signed_code:
+            self.verdict.signed_code = signed_code
+            self.verdict.modified = True
+        state_S = signature_state_S(signed_code)
+        self.facts_D[C_FLOW_SIGNATURE] = state_S
+        if state_S == C_SIGNATURE_MODIFIED and self.revisions_wanted and\
+                self.facts_D[C_FLOW_REVISIONS] == C_REVISIONS_OFF:
+            self.facts_D[C_FLOW_REVISIONS] = C_REVISIONS_PENDING
+        if state_S in C_SIGNATURE_PRESENT_T and self.digests_wanted and\
+                self.facts_D[C_FLOW_DIGESTS] == C_DIGESTS_OFF:
+            self.facts_D[C_FLOW_DIGESTS] = C_DIGESTS_PENDING
+
+    def set_permissions(self, permissions_L, encryption_S=None):
+        """record the permissions (see get_pdf_permissions)"""
+        if self.verdict.permissions_L != permissions_L:
+            self.verdict.set_permissions(permissions_L)
+        if encryption_S is not None and\
+                self.verdict.facts_D.get(C_FACT_ENCRYPTION) != encryption_S:
+            # (the triage facts have it already)
+            self.verdict.facts_D[C_FACT_ENCRYPTION] = encryption_S
+            self.verdict.modified = True
+        self.facts_D[C_FLOW_PERMISSIONS] = True
+        if len(permissions_L) == 3 and permissions_L[2]:
+            self.facts_D[C_FLOW_ENCRYPTED] = True
+
+#====================================================================
+# External tools
+#====================================================================
+#--------------------------------------------------------------------
+# Outcome of one run of an external tool (see run_external_tool).
+# CPU times and max RSS are -1 when the platform can't measure them
+# (e.g., no os.wait4 and no /proc under Jython/Windows).
+# 2026-10-19
+#--------------------------------------------------------------------
+class ToolRunResult(object):
+    """Outcome and resource usage of an external tool run"""
+
+    def __init__(self, tool_S, path_S, input_bytes, evidence_path_S=None):
+        self.tool_S        = tool_S
+        self.path_S        = path_S
+        # file of the case (path_S is usually its copy in the work dir)
+        self.evidence_path_S = evidence_path_S or path_S
+        self.input_bytes   = input_bytes
+        self.returncode    = None
+        self.stdout_S      = ""
+        self.stderr_S      = ""
+        self.wall_secs     = 0.0
+        self.user_cpu_secs = -1.0
+        self.sys_cpu_secs  = -1.0
+        self.max_rss_kb    = -1
+        self.limit_breached = False
+        self.cancelled      = False
+
+    #--------------------------------------------------------------------
+    # @return CPU seconds (user+sys) when known, wall seconds otherwise
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def cost_secs(self):
+        """cost of the run, used to rank the most expensive runs"""
+        if self.user_cpu_secs >= 0:
+            return self.user_cpu_secs + self.sys_cpu_secs
+        return self.wall_secs
+
+#--------------------------------------------------------------------
+# Adaptive concurrency controller of an external tool (AIMD).
+# Runs of the tool take a slot; the number of slots is adjusted every
+# 'window_secs' from the throughput and latency measured in the
+# window and from the system load:
+# - overload (load or latency up without throughput gain): halve
+# - throughput not worse and runs waiting for a slot: +1
+# - otherwise: keep
+# Every decision is logged so the bounds can be tuned.
+# 2026-10-19
+#--------------------------------------------------------------------
+class AdaptiveToolSlots(object):
+    """Adjustable number of concurrent runs of an external tool"""
+
+    def __init__(self, tool_S, min_slots, max_slots, window_secs):
+        self.m_tool_S = tool_S
+        self.m_min_slots = min_slots
+        self.m_max_slots = max_slots
+        self.m_window_secs = window_secs
+        self.m_num_cores = get_num_cores()
+
+        # Start in the middle of the range: the JVM-heavy verifier
+        # shouldn't start at full width on a big server
+        self.m_limit = max(min_slots, (min_slots + max_slots) / 2)
+        self.m_in_use = 0
+        self.m_waiting = 0
+        self.m_cond = threading.Condition()
+
+        # Measures of the current window
+        self.m_window_start = time.time()
+        self.m_window_runs = 0
+        self.m_window_latency = 0.0
+
+        # Measures of the previous window
+        self.m_prev_throughput = 0.0
+        self.m_prev_latency = 0.0
+
+        self.m_logger = \
+            Logger.getLogger(FindSignedPDFsFilesIngestModuleFactory.moduleName)
+
+    def acquire(self):
+        """wait for a free slot"""
+        self.m_cond.acquire()
+        self.m_waiting += 1
+        while self.m_in_use >= self.m_limit:
+            self.m_cond.wait()
+        self.m_waiting -= 1
+        self.m_in_use += 1
+        self.m_cond.release()
+
+    def release(self, latency_secs):
+        """free a slot, accounting the latency of the run"""
+        self.m_cond.acquire()
+        self.m_in_use -= 1
+        self.m_window_runs += 1
+        self.m_window_latency += latency_secs
+        self.adjust()
+        self.m_cond.notifyAll()
+        self.m_cond.release()
+
+    def snapshot(self):
+        """returns (limit, in use, waiting)"""
+        self.m_cond.acquire()
+        snapshot_T = (self.m_limit, self.m_in_use, self.m_waiting)
+        self.m_cond.release()
+        return snapshot_T
+
+    #--------------------------------------------------------------------
+    # AIMD decision at the end of a window (called with m_cond held)
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def adjust(self):
+        """adjust the number of slots"""
+        now = time.time()
+        elapsed_secs = now - self.m_window_start
+        if elapsed_secs < self.m_window_secs or\
+                self.m_window_runs < C_ADAPTIVE_MIN_RUNS:
+            return
+
+        throughput = self.m_window_runs / elapsed_secs
+        latency = self.m_window_latency / self.m_window_runs
+        load = get_system_load()
+
+        overloaded = load >= 0 and\
+                load > C_ADAPTIVE_LOAD_FACTOR * self.m_num_cores
+        slower = self.m_prev_latency > 0 and\
+                latency > C_ADAPTIVE_LATENCY_FACTOR * self.m_prev_latency and\
+                throughput <= self.m_prev_throughput
+
+        old_limit = self.m_limit
+        if overloaded or slower:
+            decision_S = "decrease"
+            self.m_limit = max(self.m_min_slots, self.m_limit / 2)
+        elif throughput >= 0.95 * self.m_prev_throughput and\
+                self.m_waiting > 0:
+            decision_S = "increase"
+            self.m_limit = min(self.m_max_slots, self.m_limit + 1)
+        else:
+            decision_S = "keep"
+
+        Log_S = "adaptive slots %s: %s %d->%d (throughput %.2f/s, "\
+                "latency %.2fs, load %.2f, waiting %d)" %\
+                (self.m_tool_S, decision_S, old_limit, self.m_limit,
+                 throughput, latency, load, self.m_waiting)
+        self.m_logger.log(Level.INFO, Log_S)
+
+        self.m_prev_throughput = throughput
+        self.m_prev_latency = latency
+        self.m_window_start = now
+        self.m_window_runs = 0
+        self.m_window_latency = 0.0
+
+#--------------------------------------------------------------------
+# Task of the ToolExecutor: a call fn(*args_T, run_handle=task).
+# The task is passed as the run handle of the tool run, so that a
+# cancel kills the process of the tool (see run_external_tool).
+# Waiters are woken through the (maybe shared) condition done_cond.
+# 2026-10-19
+#--------------------------------------------------------------------
+class ToolTask(object):
+    """Cancellable tool run submitted to the ToolExecutor"""
+
+    def __init__(self, fn, args_T, done_cond):
+        self.m_fn = fn
+        self.m_args_T = args_T
+        self.m_done_cond = done_cond
+        self.m_lock = threading.Lock()
+        self.m_process = None
+        self.cancelled = False
+        self.done = False
+        self.result = None
+        self.error = None
+
+    def run(self):
+        """run the call (unless cancelled before) and wake the waiters"""
+        if not self.cancelled:
+            try:
+                self.result = self.m_fn(*self.m_args_T, run_handle=self)
+            except:
+                # Java exceptions as well: the thread must survive
+                self.error = sys.exc_info()[1]
+        self.m_done_cond.acquire()
+        self.done = True
+        self.m_done_cond.notifyAll()
+        self.m_done_cond.release()
+
+    def wait(self):
+        """wait for the end of the task"""
+        self.m_done_cond.acquire()
+        while not self.done:
+            self.m_done_cond.wait()
+        self.m_done_cond.release()
+
+    def set_process(self, process):
+        """process of the tool run (killed if the task is cancelled)"""
+        self.m_lock.acquire()
+        self.m_process = process
+        cancelled = self.cancelled
+        self.m_lock.release()
+        if cancelled:
+            kill_process(process)
+
+    def cancel(self):
+        """cancel the task, killing its tool run if started"""
+        self.m_lock.acquire()
+        self.cancelled = True
+        process = self.m_process
+        self.m_lock.release()
+        if process is not None and not self.done:
+            kill_process(process)
+
+#--------------------------------------------------------------------
+# Fixed pool of threads running ToolTasks in submission order,
+# shared by all the module instances of the job (tool executor of
+# the parallel checks, pool of the deferred analysis).
+# 2026-10-19
+#--------------------------------------------------------------------
+class ToolExecutor(object):
+    """Shared pool of threads for the tool runs"""
+
+    def __init__(self, num_threads, queue_max=0, name_S="digiSignedPDF-tools"):
+        # submit() blocks when queue_max tasks are queued (0: no limit)
+        self.m_queue = Queue.Queue(queue_max)
+        self.m_threads_L = []
+        for i in range(num_threads):
+            thread = threading.Thread(target=self.worker,
+                                name="%s-%d" % (name_S, i))
+            thread.setDaemon(True)
+            thread.start()
+            self.m_threads_L.append(thread)
+
+    def submit(self, fn, args_T, done_cond=None):
+        """queue the call fn(*args_T, run_handle=task), return the task"""
+        if done_cond is None:
+            done_cond = threading.Condition()
+        task = ToolTask(fn, args_T, done_cond)
+        self.m_queue.put(task)
+        return task
+
+    def worker(self):
+        while True:
+            task = self.m_queue.get()
+            if task is None:
+                return
+            task.run()
+
+    def shutdown(self):
+        """stop the threads once the queued tasks are done"""
+        for thread in self.m_threads_L:
+            self.m_queue.put(None)
+        for thread in self.m_threads_L:
+            thread.join()
+
+#====================================================================
+# Budgeted triage
+#====================================================================
+#--------------------------------------------------------------------
+# Wall-clock and volume budget of the analysis of a data source.
+# The clock starts with the first PDF file of the data source.
+# 2026-10-19
+#--------------------------------------------------------------------
+class TriageBudget(object):
+    """Time and bytes budget of a data source"""
+
+    def __init__(self, max_secs, max_bytes):
+        self.m_max_secs = max_secs
+        self.m_max_bytes = max_bytes
+        self.m_time_start = time.time()
+        self.m_bytes = 0
+        self.m_lock = threading.Lock()
+
+    def exhausted(self):
+        """is the budget spent?"""
+        if self.m_max_secs > 0 and\
+                time.time() - self.m_time_start >= self.m_max_secs:
+            return True
+        return self.m_max_bytes > 0 and self.m_bytes >= self.m_max_bytes
+
+    def consume(self, num_bytes):
+        """charge an analyzed file to the budget"""
+        self.m_lock.acquire()
+        self.m_bytes += num_bytes
+        self.m_lock.release()
+
+#====================================================================
+# Carving
+#====================================================================
+#--------------------------------------------------------------------
+# Streaming scan of unallocated space for PDF files (see
+# C_CARVE_MARKERS_L). A PDF file starts at a %PDF- header and ends with the
+# last %%EOF before the next header (incremental updates add one
+# %%EOF per revision). Only offsets are kept: the chunks are fed in
+# order and dropped, but their last C_CARVE_OVERLAP bytes.
+# Files without %%EOF, or bigger than max_bytes, are cut at the last
+# %%EOF seen (dropped if there is none).
+# 2026-10-19
+#--------------------------------------------------------------------
+class PDFCarver(object):
+    """streaming carver of PDF files (offsets only)"""
+
+    def __init__(self, max_bytes, signed_only):
+        self.m_max_bytes = max_bytes
+        self.m_signed_only = signed_only
+        self.m_carved_L = []
+        self.num_headers = 0
+
+        # Open file: offset of its header, end of its last %%EOF and
+        # whether it has a /ByteRange (before that %%EOF)
+        self.m_start = None
+        self.m_end = None
+        self.m_signed = False
+        self.m_signed_pending = False
+
+        # End of the previous chunk and its offset
+        self.m_tail = ""
+        self.m_tail_offset = 0
+
+    def feed(self, chunk):
+        """scan the next chunk"""
+        buf = self.m_tail + chunk
+        base = self.m_tail_offset
+        # markers ending in the tail were found with the previous chunk
+        seen_end = len(self.m_tail)
+
+        markers_L = []
+        for marker_S in C_CARVE_MARKERS_L:
+            pos = buf.find(marker_S, max(0, seen_end - len(marker_S) + 1))
+            while pos >= 0:
+                markers_L.append((pos, marker_S))
+                pos = buf.find(marker_S, pos + 1)
+        markers_L.sort()
+
+        for pos, marker_S in markers_L:
+            offset = base + pos
+            if self.m_start is not None and\
+                            offset - self.m_start > self.m_max_bytes:
+                self.close()
+
+            if marker_S == C_CARVE_HEADER:
+                self.close()
+                self.m_start = offset
+                self.num_headers += 1
+            elif self.m_start is None:
+                # fragment of a file whose header is gone
+                continue
+            elif marker_S == C_CARVE_EOF:
+                self.m_end = offset + len(C_CARVE_EOF)
+                self.m_signed = self.m_signed or self.m_signed_pending
+            else:
+                self.m_signed_pending = True
+
+        keep = min(len(buf), C_CARVE_OVERLAP)
+        self.m_tail = buf[len(buf) - keep:]
+        self.m_tail_offset = base + len(buf) - keep
+
+    def close(self):
+        """close the open file, keeping it if it is complete"""
+        if self.m_start is not None and self.m_end is not None and\
+                        (self.m_signed or not self.m_signed_only):
+            self.m_carved_L.append((self.m_start, self.m_end - self.m_start,
+                                                            self.m_signed))
+        self.m_start = None
+        self.m_end = None
+        self.m_signed = False
+        self.m_signed_pending = False
+
+    def finish(self):
+        """end of the scan: [(offset, length, has /ByteRange)]"""
+        self.close()
+        return self.m_carved_L
+
+#====================================================================
+# Embedded PDF files
+#====================================================================
+#--------------------------------------------------------------------
+# Sequential reader of the content of an AbstractFile (read from the
+# image, no copy): same read() as a Python file
+# 2026-10-19
+#--------------------------------------------------------------------
+class ContentReader(object):
+    """file-like sequential reader of an AbstractFile"""
+
+    def __init__(self, file):
+        self.m_file = file
+        self.m_size = file.getSize()
+        self.m_offset = 0
+
+    def read(self, size):
+        """read up to size bytes ("" at the end)"""
+        data = read_content_S(self.m_file, self.m_offset,
+                                    min(size, self.m_size - self.m_offset))
+        self.m_offset += len(data)
+        return data
+
+#--------------------------------------------------------------------
+# Limits of the embedded files of a top-level file (zip bomb-like
+# attachments): embedded PDF files and inflated bytes left
+# 2026-10-19
+#--------------------------------------------------------------------
+class EmbeddedLimits(object):
+    """limits of the extraction of the embedded files of a file"""
+
+    def __init__(self, max_files, max_bytes):
+        self.files_left = max_files
+        self.bytes_left = max_bytes
+
+    def take_bytes(self, num_bytes):
+        """take num_bytes of output, False if over the limit"""
+        if num_bytes > self.bytes_left:
+            self.bytes_left = 0
+            return False
+        self.bytes_left -= num_bytes
+        return True
+
+#--------------------------------------------------------------------
+# Extraction of an embedded file stream to a temp file, fed with the
+# stream data as it is read. FlateDecode streams are inflated in
+# output chunks of C_EMBEDDED_OUT_CHUNK bytes (memory doesn't depend
+# on the compression ratio). The file is only written if its content
+# has a PDF header; other files are inflated to find their end, but
+# not written. feed() returns the bytes used up to where the extraction
+# ended (corrupt data, limit): the data after them is scanned for the
+# next embedded files.
+# 2026-10-19
+#--------------------------------------------------------------------
+class EmbeddedStream(object):
+    """extraction of an embedded file stream"""
+
+    def __init__(self, path_S, flate, length, limits, obj_num):
+        self.path_S = path_S
+        self.obj_num = obj_num
+        self.done = False
+        self.outcome_S = None
+
+        self.m_limits = limits
+        self.m_decompressor = None
+        if flate:
+            self.m_decompressor = zlib.decompressobj()
+        self.m_remaining = length       # unfiltered streams
+        self.m_head = ""                # output before the header check
+        self.m_is_pdf = None
+        self.m_F = None
+
+    def feed(self, data):
+        """take the stream data at the start of data; bytes used"""
+        if self.m_decompressor is None:
+            used = min(len(data), self.m_remaining)
+            self.m_remaining -= used
+            self.write(data[:used])
+            if self.m_remaining == 0 and not self.done:
+                self.end(C_EMBEDDED_PDF)
+            return used
+
+        pending = data
+        while len(pending) > 0 and not self.done:
+            try:
+                out = self.m_decompressor.decompress(pending,
+                                                    C_EMBEDDED_OUT_CHUNK)
+            except zlib.error:
+                self.end(C_EMBEDDED_CORRUPT)
+                return len(data) - len(pending)
+            self.write(out)
+            if self.m_decompressor.unused_data:
+                # end of the compressed stream
+                if not self.done:
+                    self.end(C_EMBEDDED_PDF)
+                return len(data) - len(self.m_decompressor.unused_data)
+            pending = self.m_decompressor.unconsumed_tail
+        return len(data) - len(pending)
+
+    def write(self, out):
+        """output of the stream"""
+        if len(out) == 0 or self.done:
+            return
+        if not self.m_limits.take_bytes(len(out)):
+            self.end(C_EMBEDDED_LIMIT)
+            return
+        if self.m_is_pdf is None:
+            self.m_head += out
+            if len(self.m_head) >= C_EMBEDDED_HEADER_BYTES:
+                self.check_header()
+        elif self.m_is_pdf:
+            self.m_F.write(out)
+
+    def check_header(self):
+        """PDF file? (if so, the temp file is created)"""
+        self.m_is_pdf = \
+                C_CARVE_HEADER in self.m_head[:C_EMBEDDED_HEADER_BYTES]
+        if self.m_is_pdf:
+            self.m_F = open(self.path_S, "wb")
+            self.m_F.write(self.m_head)
+        self.m_head = ""
+
+    def end(self, outcome_S):
+        """end of the extraction (outcome: C_EMBEDDED_*)"""
+        self.done = True
+        if outcome_S == C_EMBEDDED_PDF:
+            if self.m_is_pdf is None:
+                self.check_header()
+            if not self.m_is_pdf:
+                outcome_S = C_EMBEDDED_NOT_PDF
+        if self.m_F is not None:
+            self.m_F.close()
+            self.m_F = None
+            if outcome_S != C_EMBEDDED_PDF:
+                os.remove(self.path_S)
+        self.outcome_S = outcome_S
+
+#====================================================================
+# Signature digests
+#====================================================================
+#--------------------------------------------------------------------
+# Digests of the byte ranges of the signatures of a PDF file, fed
+# with the file in order (a single read, whatever the number of
+# signatures, and no more than a chunk in memory).
+# Every byte range starts at 0 and skips the hex string of its CMS
+# ([a=0, b, c, d]: bytes [0, b) and [c, c+d)). So a running digest of
+# the file is cloned at the start of each /Contents hex string (offset
+# b of a candidate signature); the clone skips the hex string, whose
+# CMS gives the algorithm and the signed digest, and goes on until
+# c+d. The /ByteRange of a signature is matched with its candidate
+# by b: it may come before or after the /Contents in the dictionary,
+# but always before c+d (it is signed).
+# 2026-10-19
+#--------------------------------------------------------------------
+class ByteRangeDigester(object):
+    """Digests of the signed byte ranges of a PDF file"""
+
+    def __init__(self, cms_parser, chain_cache=None,
+                                                revocation_store=None):
+        # cms_parser(cms bytes) -> (kind, [(hashlib name, digest)],
+        # chain, timestamp time), see cms_signed_digests_T
+        self.m_cms_parser = cms_parser
+        self.m_chain_cache = chain_cache
+        self.m_revocation_store = revocation_store
+        # with a revocation store: objects (number -> offset, last
+        # revision wins) and CRL streams referenced by the DSS
+        self.m_objects_D = {}
+        self.m_dss_refs_D = {}
+        self.m_running_D = dict([(name_S, hashlib.new(name_S))
+                                    for name_S in C_DIGEST_NAMES_L])
+        self.m_offset = 0           # file offset of the next chunk
+        self.m_tail = ""            # end of the previous chunk
+        self.m_byte_ranges_D = {}   # b -> [a, b, c, d]
+        self.m_open_L = []          # candidates being hashed
+        self.m_done_D = {}          # b -> candidate hashed up to c+d
+
+    def feed(self, chunk):
+        """hash the next chunk of the file"""
+        start = self.m_offset
+        buf = self.m_tail + chunk
+        seen = len(self.m_tail)
+        base = start - seen
+
+        # (tokens of the tail were found with the previous chunk)
+        for match in C_SIG_BYTE_RANGE_RE.finditer(buf):
+            if match.end() > seen:
+                byte_range_L = [int(match.group(i)) for i in range(1, 5)]
+                self.m_byte_ranges_D.setdefault(byte_range_L[1],
+                                                            byte_range_L)
+        if self.m_revocation_store is not None:
+            self.find_dss_tokens(buf, base, seen)
+        pos = 0
+        for match in C_SIG_CONTENTS_RE.finditer(buf):
+            if match.end() <= seen:
+                continue
+            hex_pos = base + match.end() - 1 - start
+            self.absorb(chunk, pos, hex_pos)
+            self.open_candidate(start + hex_pos)
+            pos = hex_pos
+        self.absorb(chunk, pos, len(chunk))
+
+        self.m_offset += len(chunk)
+        self.m_tail = buf[-C_SIG_OVERLAP:]
+
+    def find_dss_tokens(self, buf, base, seen):
+        """record the objects and the CRL references of the DSS"""
+        for match in C_OBJ_RE.finditer(buf):
+            if match.end() > seen:
+                self.m_objects_D[int(match.group(1))] = base + match.start()
+        for match in C_DSS_CRL_REFS_RE.finditer(buf):
+            if match.end() > seen:
+                for ref_match in C_DSS_REF_RE.finditer(match.group(1)):
+                    self.m_dss_refs_D[int(ref_match.group(1))] = True
+
+    def dss_crl_offsets_L(self):
+        """offsets of the CRL objects of the DSS (after the feed)"""
+        return sorted([self.m_objects_D[obj_num] for obj_num
+                    in self.m_dss_refs_D if obj_num in self.m_objects_D])
+
+    def open_candidate(self, b):
+        """candidate signature whose hex string starts at b"""
+        self.m_open_L.append({"b": b, "c": None, "hex_L": [], "hex_len": 0,
+                    "digests_D": dict([(name_S, digest.copy()) for
+                            name_S, digest in self.m_running_D.items()]),
+                    "kind": None, "expected_L": None, "chain_T": None,
+                    "tsa_time": None,
+                    "error": None})
+
+    def absorb(self, chunk, lo, hi):
+        """hash chunk[lo:hi]"""
+        if hi <= lo:
+            return
+        data = chunk[lo:hi]
+        for digest in self.m_running_D.itervalues():
+            digest.update(data)
+        offset = self.m_offset + lo
+        for candidate in list(self.m_open_L):
+            self.absorb_candidate(candidate, data, offset)
+
+    def absorb_candidate(self, candidate, data, offset):
+        """hash data (at offset) for a candidate"""
+        skip = 0
+        if candidate["c"] is None:
+            # still in the hex string
+            end = data.find(">")
+            hex_S = data
+            if end >= 0:
+                hex_S = data[:end]
+            candidate["hex_len"] += len(hex_S)
+            if candidate["hex_len"] > C_SIG_CMS_MAX_HEX:
+                self.m_open_L.remove(candidate)
+                return
+            candidate["hex_L"].append(hex_S)
+            if end < 0:
+                return
+            candidate["c"] = offset + end + 1
+            if not self.close_hex(candidate):
+                return
+            skip = end + 1
+
+        byte_range_L = self.m_byte_ranges_D.get(candidate["b"])
+        if byte_range_L is None:
+            if offset + len(data) - candidate["c"] > C_SIG_RANGE_WINDOW:
+                # no /ByteRange: not a signature
+                self.m_open_L.remove(candidate)
+                return
+            end = offset + len(data)
+        elif byte_range_L[2] != candidate["c"]:
+            # byte range that doesn't skip exactly this hex string
+            self.close_candidate(candidate)
+            return
+        else:
+            end = byte_range_L[2] + byte_range_L[3]
+
+        used = max(0, min(len(data), end - offset) - skip)
+        if used > 0:
+            segment = data[skip:skip + used]
+            for digest in candidate["digests_D"].itervalues():
+                digest.update(segment)
+        if byte_range_L is not None and offset + skip + used >= end:
+            self.close_candidate(candidate)
+
+    def close_hex(self, candidate):
+        """end of the hex string: parse the CMS (False: dropped)"""
+        hex_S = C_SIG_NOT_HEX_RE.sub("", "".join(candidate["hex_L"]))
+        candidate["hex_L"] = None
+        if len(hex_S) < C_SIG_CMS_MIN_HEX:
+            self.m_open_L.remove(candidate)
+            return False
+        if len(hex_S) % 2 == 1:
+            hex_S += "0"
+        try:
+            candidate["kind"], candidate["expected_L"], \
+                candidate["chain_T"], candidate["tsa_time"] = \
+                                self.m_cms_parser(binascii.unhexlify(hex_S))
+        except:
+            # Java exceptions as well (malformed CMS)
+            candidate["error"] = "%s" % (sys.exc_info()[1])
+        # only the digests of the algorithms of the CMS go on
+        names_D = dict([(name_S, True) for name_S, expected_S in
+                                        (candidate["expected_L"] or [])])
+        candidate["digests_D"] = dict([(name_S, digest) for name_S, digest
+                in candidate["digests_D"].items() if name_S in names_D])
+        return True
+
+    def close_candidate(self, candidate):
+        """candidate done: hashed up to c+d (or wrong byte range)"""
+        self.m_open_L.remove(candidate)
+        candidate["digests_D"] = dict([(name_S, digest.digest()) for
+                        name_S, digest in candidate["digests_D"].items()])
+        self.m_done_D[candidate["b"]] = candidate
+
+    def finish(self):
+        """result of each signature, in file order (see C_SIGD_*)"""
+        signatures_L = []
+        for b in sorted(self.m_byte_ranges_D.keys()):
+            byte_range_L = self.m_byte_ranges_D[b]
+            candidate = self.m_done_D.get(b)
+            signature_D = {C_SIGD_BYTE_RANGE: byte_range_L,
+                           C_SIGD_KIND: C_SIG_KIND_SIGNATURE,
+                           C_SIGD_ALGORITHM: None}
+            signatures_L.append(signature_D)
+            if candidate is None or byte_range_L[0] != 0 or\
+                    candidate["c"] != byte_range_L[2]:
+                # no CMS at b, byte range past the end of the file...
+                signature_D[C_SIGD_STATUS] = C_SIG_DIGEST_BAD_RANGE
+                continue
+            if candidate["error"] is not None or\
+                                            not candidate["expected_L"]:
+                signature_D[C_SIGD_STATUS] = C_SIG_DIGEST_CMS_ERROR
+                continue
+            signature_D[C_SIGD_KIND] = candidate["kind"]
+            signature_D[C_SIGD_ALGORITHM] = candidate["expected_L"][0][0]
+            signature_D[C_SIGD_STATUS] = signature_digest_status_S(
+                        candidate["expected_L"], candidate["digests_D"])
+            if self.m_chain_cache is not None:
+                signature_D[C_SIGD_CHAIN] = C_CHAIN_NO_CERTIFICATE
+                if candidate["chain_T"] is not None:
+                    signature_D[C_SIGD_CHAIN] = \
+                            self.m_chain_cache.validate(candidate["chain_T"])
+            if candidate["tsa_time"] is not None:
+                signature_D[C_SIGD_TSA_TIME] = long(candidate["tsa_time"])
+            if candidate["chain_T"] is not None:
+                signer_D = signer_identity_D(candidate["chain_T"])
+                if signer_D is not None:
+                    signature_D[C_SIGD_SIGNER] = signer_D
+            if self.m_revocation_store is not None and\
+                    candidate["chain_T"] is not None and\
+                    not self.m_revocation_store.is_empty():
+                signature_D[C_SIGD_REVOCATION] = \
+                    self.m_revocation_store.chain_status_S(candidate["chain_T"])
+        return signatures_L
+
+#--------------------------------------------------------------------
+# Concurrent LRU cache of the outcomes of the certificate chain
+# validations. The signed files of a case share a few signers and CAs:
+# a chain is validated once per (leaf, other certificates, bucket of
+# the validation time), whatever the number of files. The outcomes
+# are kept in the settings DB across jobs (see load/save).
+# Two threads missing the same chain both validate it (same outcome).
+# 2026-10-19
+#--------------------------------------------------------------------
+class ChainValidationCache(object):
+    """LRU cache of certificate chain validation outcomes"""
+
+    def __init__(self, max_entries, bucket_secs):
+        self.m_lock = threading.Lock()
+        self.m_max_entries = max_entries
+        self.m_bucket_secs = max(1, bucket_secs)
+        self.m_entries_D = collections.OrderedDict()  # key -> outcome
+        self.m_new_D = {}           # keys not saved yet
+        self.m_anchors = None       # trust anchors of the JVM (lazy)
+
+    def key_S(self, chain_T):
+        """cache key of a chain: leaf, other certificates, time bucket"""
+        leaf, others_L, time_millis = chain_T
+        if time_millis is None:
+            time_millis = time.time() * 1000
+        return "%s|%s|%d" % (certificate_fingerprint_S(leaf),
+                ",".join(sorted([certificate_fingerprint_S(cert)
+                                                for cert in others_L])),
+                int(time_millis / 1000 / self.m_bucket_secs))
+
+    def validate(self, chain_T):
+        """outcome of the validation of a chain (cached)"""
+        if self.m_max_entries <= 0:
+            return validate_chain_S(chain_T, self.trust_anchors())
+
+        key_S = self.key_S(chain_T)
+        self.m_lock.acquire()
+        outcome_S = self.m_entries_D.pop(key_S, None)
+        if outcome_S is not None:
+            # most recently used: last
+            self.m_entries_D[key_S] = outcome_S
+        self.m_lock.release()
+        record_cache_lookup(C_CACHE_CHAIN, outcome_S is not None)
+        if outcome_S is not None:
+            return outcome_S
+
+        outcome_S = validate_chain_S(chain_T, self.trust_anchors())
+        self.put(key_S, outcome_S, True)
+        return outcome_S
+
+    def put(self, key_S, outcome_S, new):
+        """add an outcome (new: to be saved), evicting the LRU ones"""
+        self.m_lock.acquire()
+        self.m_entries_D.pop(key_S, None)
+        self.m_entries_D[key_S] = outcome_S
+        if new:
+            self.m_new_D[key_S] = True
+        while len(self.m_entries_D) > self.m_max_entries:
+            old_key_S = self.m_entries_D.popitem(last=False)[0]
+            self.m_new_D.pop(old_key_S, None)
+        self.m_lock.release()
+
+    def trust_anchors(self):
+        """trust anchors of the JVM (loaded once)"""
+        self.m_lock.acquire()
+        try:
+            if self.m_anchors is None:
+                try:
+                    self.m_anchors = jvm_trust_anchors()
+                except:
+                    # no trust store: every validation is an error
+                    self.m_anchors = HashSet()
+            return self.m_anchors
+        finally:
+            self.m_lock.release()
+
+    def load(self, db_path_S):
+        """load the most recently used outcomes of the settings DB"""
+        Class.forName("org.sqlite.JDBC").newInstance()
+        dbConn = DriverManager.getConnection("jdbc:sqlite:%s" % db_path_S)
+        try:
+            stmt = dbConn.createStatement()
+            stmt.execute("CREATE TABLE IF NOT EXISTS %s (Cache_Key TEXT "
+                    "PRIMARY KEY, Outcome TEXT, Last_Used INTEGER);" %
+                    (C_CHAIN_CACHE_TABLE))
+            resultSet = stmt.executeQuery("SELECT Cache_Key, Outcome FROM "
+                    "%s ORDER BY Last_Used DESC LIMIT %d;" %
+                    (C_CHAIN_CACHE_TABLE, self.m_max_entries))
+            rows_L = []
+            while resultSet.next():
+                rows_L.append((resultSet.getString("Cache_Key"),
+                               resultSet.getString("Outcome")))
+            stmt.close()
+        finally:
+            dbConn.close()
+
+        # least recently used first
+        for key_S, outcome_S in reversed(rows_L):
+            self.put(key_S, outcome_S, False)
+        return len(rows_L)
+
+    def save(self, db_path_S):
+        """save the outcomes to the settings DB (new ones, LRU order)"""
+        self.m_lock.acquire()
+        entries_L = [(key_S, outcome_S) for key_S, outcome_S
+                            in self.m_entries_D.items()]
+        new_D = self.m_new_D
+        self.m_new_D = {}
+        self.m_lock.release()
+
+        Class.forName("org.sqlite.JDBC").newInstance()
+        dbConn = DriverManager.getConnection("jdbc:sqlite:%s" % db_path_S)
+        try:
+            dbConn.setAutoCommit(False)
+            stmt = dbConn.prepareStatement("INSERT OR REPLACE INTO %s "
+                    "(Cache_Key, Outcome, Last_Used) VALUES (?, ?, ?);" %
+                    (C_CHAIN_CACHE_TABLE))
+            # Last_Used: rank in the LRU order (saved entries too)
+            now = int(time.time())
+            for rank, (key_S, outcome_S) in enumerate(entries_L):
+                stmt.setString(1, key_S)
+                stmt.setString(2, outcome_S)
+                stmt.setLong(3, now * 1000000 + rank)
+                stmt.addBatch()
+            stmt.executeBatch()
+            stmt.close()
+
+            stmt = dbConn.createStatement()
+            stmt.execute("DELETE FROM %s WHERE Cache_Key NOT IN (SELECT "
+                    "Cache_Key FROM %s ORDER BY Last_Used DESC LIMIT %d);" %
+                    (C_CHAIN_CACHE_TABLE, C_CHAIN_CACHE_TABLE,
+                     self.m_max_entries))
+            stmt.close()
+            dbConn.commit()
+        finally:
+            dbConn.close()
+        return len(new_D)
+
+#--------------------------------------------------------------------
+# Offline store of revoked certificates (SQLite, see
+# C_REVOCATION_SCHEMA_L), filled with CRLs: imported in bulk from a
+# directory and cached from the DSS of the PDF files. Lookups are
+# indexed (issuer, serial) queries, with no network I/O.
+# The connection is shared by the threads (under m_lock).
+# 2026-10-19
+#--------------------------------------------------------------------
+class RevocationStore(object):
+    """Offline store of revoked certificates"""
+
+    def __init__(self, db_path_S):
+        self.m_lock = threading.Lock()
+        Class.forName("org.sqlite.JDBC").newInstance()
+        self.m_conn = DriverManager.getConnection("jdbc:sqlite:%s" %
+                                                                (db_path_S))
+        stmt = self.m_conn.createStatement()
+        for SQL_Statement in C_REVOCATION_SCHEMA_L:
+            stmt.execute(SQL_Statement)
+
+        # CRLs already in the store, and issuers with a CRL
+        self.m_crls_D = {}
+        self.m_issuers_D = {}
+        resultSet = stmt.executeQuery("SELECT Fingerprint, Issuer FROM crls;")
+        while resultSet.next():
+            self.m_crls_D[resultSet.getString("Fingerprint")] = True
+            self.m_issuers_D[resultSet.getString("Issuer")] = True
+        stmt.close()
+
+        self.m_lookup = self.m_conn.prepareStatement("SELECT "
+                "Revocation_Date FROM revoked WHERE Issuer = ? AND Serial = ?;")
+        # CRLs imported by this job (by source kind), lookups by status
+        self.m_imported_D = {}
+        self.m_lookups_D = dict([(status_S, 0)
+                                for status_S in C_REVOCATION_STATUSES_L])
+
+    def is_empty(self):
+        """no CRL at all?"""
+        return len(self.m_issuers_D) == 0
+
+    def import_crls(self, data_S, source_S, kind_S):
+        """import the CRLs (DER or PEM) of data_S; CRLs imported"""
+        if hashlib.sha256(data_S).hexdigest() in self.m_crls_D:
+            # same bytes as a CRL of the store (e.g., DSS of many files)
+            return 0
+        num_imported = 0
+        for crl in CertificateFactory.getInstance("X.509").generateCRLs(
+                                            ByteArrayInputStream(data_S)):
+            if self.add_crl(crl, source_S):
+                num_imported += 1
+        self.m_lock.acquire()
+        self.m_imported_D[kind_S] = \
+                            self.m_imported_D.get(kind_S, 0) + num_imported
+        self.m_lock.release()
+        return num_imported
+
+    def add_crl(self, crl, source_S):
+        """add a X509CRL (one transaction); False if already there"""
+        fingerprint_S = hashlib.sha256(crl.getEncoded().tostring()).hexdigest()
+        issuer_S = crl.getIssuerX500Principal().getName("CANONICAL")
+        next_update = -1
+        if crl.getNextUpdate() is not None:
+            next_update = crl.getNextUpdate().getTime()
+
+        self.m_lock.acquire()
+        try:
+            if fingerprint_S in self.m_crls_D:
+                return False
+            self.m_conn.setAutoCommit(False)
+            try:
+                stmt = self.m_conn.prepareStatement("INSERT INTO crls "
+                        "(Fingerprint, Issuer, This_Update, Next_Update, "
+                        "Source) VALUES (?, ?, ?, ?, ?);")
+                stmt.setString(1, fingerprint_S)
+                stmt.setString(2, issuer_S)
+                stmt.setLong(3, crl.getThisUpdate().getTime())
+                stmt.setLong(4, next_update)
+                stmt.setString(5, source_S)
+                stmt.executeUpdate()
+                stmt.close()
+
+                stmt = self.m_conn.prepareStatement("INSERT OR IGNORE INTO "
+                        "revoked (Issuer, Serial, Revocation_Date, Reason, "
+                        "Crl_Fingerprint) VALUES (?, ?, ?, ?, ?);")
+                num_pending = 0
+                for entry in (crl.getRevokedCertificates() or []):
+                    stmt.setString(1, issuer_S)
+                    stmt.setString(2, entry.getSerialNumber().toString(16))
+                    stmt.setLong(3, entry.getRevocationDate().getTime())
+                    stmt.setString(4, "%s" % (entry.getRevocationReason()))
+                    stmt.setString(5, fingerprint_S)
+                    stmt.addBatch()
+                    num_pending += 1
+                    if num_pending == C_REVOCATION_BATCH:
+                        stmt.executeBatch()
+                        num_pending = 0
+                stmt.executeBatch()
+                stmt.close()
+                self.m_conn.commit()
+            except SQLException:
+                self.m_conn.rollback()
+                raise
+            finally:
+                self.m_conn.setAutoCommit(True)
+            self.m_crls_D[fingerprint_S] = True
+            self.m_issuers_D[issuer_S] = True
+            return True
+        finally:
+            self.m_lock.release()
+
+    def status_S(self, cert, time_millis):
+        """revocation status (C_REVOCATION_*) of a certificate"""
+        issuer_S = cert.getIssuerX500Principal().getName("CANONICAL")
+        self.m_lock.acquire()
+        try:
+            if issuer_S not in self.m_issuers_D:
+                return C_REVOCATION_UNKNOWN
+            self.m_lookup.setString(1, issuer_S)
+            self.m_lookup.setString(2, cert.getSerialNumber().toString(16))
+            resultSet = self.m_lookup.executeQuery()
+            revocation_date = None
+            if resultSet.next():
+                revocation_date = resultSet.getLong("Revocation_Date")
+            resultSet.close()
+        finally:
+            self.m_lock.release()
+
+        if revocation_date is None:
+            return C_REVOCATION_GOOD
+        if time_millis is not None and revocation_date > time_millis:
+            return C_REVOCATION_REVOKED_LATER
+        return C_REVOCATION_REVOKED
+
+    def chain_status_S(self, chain_T):
+        """revocation status of a chain: the worst of its certificates"""
+        statuses_L = [C_REVOCATION_GOOD]
+        for cert in chain_path_L(chain_T):
+            if not is_self_signed(cert):
+                statuses_L.append(self.status_S(cert, chain_T[2]))
+        status_S = min(statuses_L, key=C_REVOCATION_STATUSES_L.index)
+        self.m_lock.acquire()
+        self.m_lookups_D[status_S] += 1
+        self.m_lock.release()
+        return status_S
+
+    def close(self):
+        """close the store"""
+        self.m_lock.acquire()
+        try:
+            self.m_lookup.close()
+            self.m_conn.close()
+        finally:
+            self.m_lock.release()
+
+#--------------------------------------------------------------------
+# Index of the signers of the signed files of a case (SQLite, in the
+# work dir, see C_SIGNER_INDEX_SCHEMA_L): "files signed by X" is an
+# indexed query, the PDF files are not read again. One row per
+# signature (the rows of a file are replaced when it is analyzed
+# again). The connection is shared by the threads (under m_lock).
+# 2026-10-19
+#--------------------------------------------------------------------
+class SignerIndex(object):
+    """Indexed table of the signers of the signed files"""
+
+    def __init__(self, db_path_S):
+        self.m_lock = threading.Lock()
+        self.m_db_path_S = db_path_S
+        Class.forName("org.sqlite.JDBC").newInstance()
+        self.m_conn = DriverManager.getConnection("jdbc:sqlite:%s" %
+                                                                (db_path_S))
+        stmt = self.m_conn.createStatement()
+        for SQL_Statement in C_SIGNER_INDEX_SCHEMA_L:
+            stmt.execute(SQL_Statement)
+        stmt.close()
+        self.m_insert = self.m_conn.prepareStatement("INSERT OR REPLACE "
+                "INTO signers (Obj_Id, Sig_Index, Data_Source_Id, Path, "
+                "Kind, Signer_Name, Subject, Issuer, Serial, Signing_Time, "
+                "Status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);")
+        self.num_rows = 0
+
+    def add(self, obj_id, ds_id, path_S, signatures_L):
+        """index the signers of a file (one transaction)"""
+        self.m_lock.acquire()
+        try:
+            self.m_conn.setAutoCommit(False)
+            try:
+                num_rows = 0
+                for sig_index, signature_D in enumerate(signatures_L):
+                    signer_D = signature_D.get(C_SIGD_SIGNER)
+                    if signer_D is None:
+                        continue
+                    self.m_insert.setLong(1, obj_id)
+                    self.m_insert.setInt(2, sig_index)
+                    self.m_insert.setLong(3, ds_id)
+                    self.m_insert.setString(4, path_S)
+                    self.m_insert.setString(5, signature_D[C_SIGD_KIND])
+                    self.m_insert.setString(6, signer_D[C_SIGNER_NAME])
+                    self.m_insert.setString(7, signer_D[C_SIGNER_SUBJECT])
+                    self.m_insert.setString(8, signer_D[C_SIGNER_ISSUER])
+                    self.m_insert.setString(9, signer_D[C_SIGNER_SERIAL])
+                    if signer_D[C_SIGNER_TIME] is None:
+                        self.m_insert.setObject(10, None)
+                    else:
+                        self.m_insert.setLong(10, signer_D[C_SIGNER_TIME])
+                    self.m_insert.setString(11, signature_D[C_SIGD_STATUS])
+                    self.m_insert.addBatch()
+                    num_rows += 1
+                self.m_insert.executeBatch()
+                self.m_conn.commit()
+                self.num_rows += num_rows
+            except SQLException:
+                self.m_conn.rollback()
+                raise
+            finally:
+                self.m_conn.setAutoCommit(True)
+        finally:
+            self.m_lock.release()
+
+    def close(self):
+        """close the index"""
+        self.m_lock.acquire()
+        try:
+            self.m_insert.close()
+            self.m_conn.close()
+        finally:
+            self.m_lock.release()
+
+#====================================================================
+# Path filters
+#====================================================================
+#--------------------------------------------------------------------
+# Include/exclude filters on the parent path of the files, compiled
+# once: globs that are plain directory prefixes (e.g., "/Windows/WinSxS"
+# or "/Program Files/*") go to a trie of path components, the other
+# globs and the regexes to a single combined regex. Matching a path
+# is then a walk of (at most) the depth of the trie plus one regex
+# search, whatever the number of patterns.
+# Paths are matched case insensitively, with '/' as separator.
+# 2026-10-19
+#--------------------------------------------------------------------
+class PathFilter(object):
+    """Compiled include/exclude filters on parent paths"""
+
+    # Key of the trie nodes that end a prefix
+    C_TRIE_END = ""
+
+    def __init__(self, include_globs_L, exclude_globs_L,
+                       include_regexes_L, exclude_regexes_L):
+        self.m_bad_regexes_L = []
+        self.m_include_T = self.compile(include_globs_L, include_regexes_L)
+        self.m_exclude_T = self.compile(exclude_globs_L, exclude_regexes_L)
+        # only the include patterns that compiled (a bad include regex
+        # alone must not skip every path)
+        trie_D, combined_re = self.m_include_T
+        self.m_has_include = len(trie_D) > 0 or combined_re is not None
+
+    def compile(self, globs_L, regexes_L):
+        """(prefix trie, combined regex or None) of the patterns"""
+        trie_D = {}
+        parts_L = []
+        for glob_S in globs_L:
+            glob_S = normalize_path_S(glob_S)
+            prefix_S = glob_S
+            while prefix_S.endswith("*") or prefix_S.endswith("/"):
+                prefix_S = prefix_S[:-1]
+            if len(prefix_S) > 0 and not re.search(r"[*?\[]", prefix_S):
+                self.add_prefix(trie_D, prefix_S)
+            else:
+                parts_L.append("^" + glob_to_regex_S(glob_S))
+        for regex_S in regexes_L:
+            try:
+                re.compile(regex_S)
+            except re.error, e:
+                self.m_bad_regexes_L.append((regex_S, e))
+                continue
+            parts_L.append(regex_S)
+
+        combined_re = None
+        if len(parts_L) > 0:
+            combined_re = re.compile("|".join(["(?:%s)" % (part_S)
+                                                for part_S in parts_L]),
+                                     re.IGNORECASE | re.DOTALL)
+        return (trie_D, combined_re)
+
+    def add_prefix(self, trie_D, prefix_S):
+        node_D = trie_D
+        for component_S in prefix_S.strip("/").split("/"):
+            node_D = node_D.setdefault(component_S, {})
+        node_D[PathFilter.C_TRIE_END] = True
+
+    def matches(self, compiled_T, path_S):
+        """does path_S (normalized) match the compiled patterns?"""
+        trie_D, combined_re = compiled_T
+        node_D = trie_D
+        if len(node_D) > 0:
+            for component_S in path_S.strip("/").split("/"):
+                node_D = node_D.get(component_S)
+                if node_D is None:
+                    break
+                if PathFilter.C_TRIE_END in node_D:
+                    return True
+        return combined_re is not None and\
+                            combined_re.search(path_S) is not None
+
+    def is_skipped(self, parent_path_S):
+        """should a file of the parent path be skipped?"""
+        path_S = normalize_path_S(parent_path_S)
+        if self.matches(self.m_exclude_T, path_S):
+            return True
+        return self.m_has_include and not self.matches(self.m_include_T,
+                                                                path_S)
+
+#====================================================================
+# Live metrics
+#====================================================================
+#--------------------------------------------------------------------
+# Background thread that periodically writes the counters of the
+# module to a Prometheus text-format file (node-exporter's textfile
+# collector, or a simple `watch cat`, can then follow the ingest).
+# 2026-10-19
+#--------------------------------------------------------------------
+class MetricsReporter(threading.Thread):
+    """Write the module counters every 'interval_secs' to a file"""
+
+    def __init__(self, metrics_fname, interval_secs):
+        threading.Thread.__init__(self, name="digiSignedPDF-metrics")
+        self.setDaemon(True)
+        self.m_metrics_fname = metrics_fname
+        self.m_interval_secs = interval_secs
+        self.m_stop_event = threading.Event()
+        self.m_start_time = time.time()
+        self.m_logger = \
+            Logger.getLogger(FindSignedPDFsFilesIngestModuleFactory.moduleName)
+
+    def run(self):
+        while not self.m_stop_event.isSet():
+            self.m_stop_event.wait(self.m_interval_secs)
+            self.write_metrics()
+
+    #--------------------------------------------------------------------
+    # Stop the thread. The thread writes a last snapshot before leaving.
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def stop(self):
+        """stop the reporter and wait for it"""
+        self.m_stop_event.set()
+        self.join(self.m_interval_secs + 5)
+
+    #--------------------------------------------------------------------
+    # Write the metrics file. The content is first written to a temp
+    # file and then renamed, so readers never see a partial file.
+    # @return None
+    # 2026-10-19
+    #--------------------------------------------------------------------
+    def write_metrics(self):
+        """write a snapshot of the counters to the metrics file"""
+        elapsed_secs = time.time() - self.m_start_time
+        metrics_S = build_metrics_text_S(elapsed_secs)
+
+        tmp_fname = self.m_metrics_fname + ".tmp"
+        try:
+            with open(tmp_fname, "w") as f:
+                f.write(metrics_S)
+            # os.rename() does not overwrite on Windows
+            if os.path.exists(self.m_metrics_fname):
+                os.remove(self.m_metrics_fname)
+            os.rename(tmp_fname, self.m_metrics_fname)
+        except:
+            Err_S = "Error writing metrics file '%s': %s (%s)" %\
+                (self.m_metrics_fname, sys.exc_info()[0], sys.exc_info()[1])
+            self.m_logger.log(Level.WARNING, Err_S)
+
+#====================================================================
+# Functions
+#====================================================================
+
+#--------------------------------------------------------------------
+# Checks whether fpath corresponds to an EXE file.
+# NOTE: right now, it just checks whether fpath is a file or not.
+# @param fpath [IN] full path of EXE to check
+# @return True if considered as EXE, False otherwise.
+# 2017-08-04
+#--------------------------------------------------------------------
+def is_exe(fpath):
+    """https://stackoverflow.com/questions/377017/
+                ...test-if-executable-exists-in-python\#377028"""
+##    return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
+    return os.path.isfile(fpath)
+
+#--------------------------------------------------------------------
+# @param path_verifier [IN] path of EXE used to verify whether PDF is
+#                           signed
+# @param path_pdf_file [IN] PDF file to check
+# @param evidence_path_S [IN] full path of the file of the case (for
+#                             the tools accounting)
+# @return returns the code that assesses the PDF file 'path_pdf_file'
+# 2017-08-04
+#--------------------------------------------------------------------
+def is_pdf_signed(path_verifier,path_pdf_file,evidence_path_S=None,
+                                                        run_handle=None):
+    """check whether path_pdf_file is a signed PDF"""
+
+    #------------------------------------------------------
+    # C_Log_Level controls whether we capture or not 
+    # STDOUT and STDERR from the "is digitally signed" test
+    # If captured, STDOUT and STDERR is written in individual 
+    # text files (two text files per EXEC: one for STDOUT and 
+    # another one for STDERR).The text files are written in 
+    # the case's TEMP directory
+    #------------------------------------------------------
+    if C_Log_Level >= C_LOG_EXEC_DETAILS:
+        capture_stdout_stderr = True
+    else:
+        capture_stdout_stderr = False
+
+    if not capture_stdout_stderr:
+        # device null
+        devnull = open(os.devnull, 'w')
+        Out_fileno = devnull
+        Err_fileno = devnull
+    else:
+        # We're going to capture STDOUT and STDERR to a file (FULL DEBUG)
+        #-- start of exclusive zone --
+        lock = FindSignedPDFsFilesIngestModuleFactory.g_lock
+        lock.acquire()
+        Sequence_S = ("%05d") %\
+                (FindSignedPDFsFilesIngestModuleFactory.g_PDFFiles_count)
+        lock.release()
+         #-- end of exclusive zone --
+
+
+        # STDOUT and STDERR are going to be save in the case's TEMP directory
+        temp_directory_S = Case.getCurrentCase().getTempDirectory()
+        Out_filename = ("%s\out_is_signed_%s.txt") %\
+                                    (temp_directory_S,Sequence_S)
+        Err_filename = ("%s\err_is_signed_%s.txt") %\
+                    (temp_directory_S,Sequence_S)
+
+        Out_fileno = open(Out_filename,"w")
+        Err_fileno = open(Err_filename,"w")
+
+    ret_verifier = None
+
+    if capture_stdout_stderr:
+        run_result = run_external_tool(C_TOOL_VERIFIER,
+                [path_verifier,path_pdf_file], path_pdf_file,
+                stdout_F=Out_fileno, stderr_F=Err_fileno,
+                run_handle=run_handle, evidence_path_S=evidence_path_S)
+        ret_verifier = run_result.returncode
+        Out_fileno.write(("ret_verifier=%s") % (ret_verifier))
+        Out_fileno.close()
+        Err_fileno.close()
+    else:
+        # STDERR is captured (not sent to devnull): it tells whether
+        # the JVM of the verifier hit the address space limit
+        run_result = run_external_tool(C_TOOL_VERIFIER,
+                [path_verifier,path_pdf_file], path_pdf_file,
+                stdout_F=devnull, run_handle=run_handle,
+                evidence_path_S=evidence_path_S)
+        ret_verifier = run_result.returncode
+        devnull.close()
+
+    if run_result.limit_breached:
+        return C_SIG_STAT_CODE_TOOL_LIMIT_EXCEEDED
+
+    return ret_verifier
+
+#---------------------------------------
+# Return codes for verifier.exe (JSign)
+#---------------------------------------
+C_SIG_STAT_CODE_NO_SIGNATURE        = 10
+C_SIG_STAT_CODE_TOOL_LIMIT_EXCEEDED = 130
+
+C_PDF_code_D = { 
+        0: 'SIG_STAT_CODE_INFO_SIGNATURE_VALID', 
+        10: 'SIG_STAT_CODE_WARNING_NO_SIGNATURE',
+        15: 'SIG_STAT_CODE_WARNING_ANY_WARNING',
+        20: 'SIG_STAT_CODE_WARNING_NO_REVOCATION_INFO',
+        30: 'SIG_STAT_CODE_WARNING_TIMESTAMP_INVALID',
+        40: 'SIG_STAT_CODE_WARNING_NO_TIMESTAMP_TOKEN',
+        50: 'SIG_STAT_CODE_WARNING_SIGNATURE_OCSP_INVALID',
+        60: 'SIG_STAT_CODE_WARNING_CERTIFICATE_CANT_BE_VERIFIED',
+        61: 'SIG_STAT_CODE_WARNING_CERTIFICATE_EXPIRED',
+        62: 'SIG_STAT_CODE_WARNING_CERTIFICATE_NOT_YET_VALID',
+        63: 'SIG_STAT_CODE_WARNING_CERTIFICATE_REVOKED',
+        64: 'SIG_STAT_CODE_WARNING_CERTIFICATE_UNSUPPORTED_CRITICAL_EXTENSION',
+        65: 'SIG_STAT_CODE_WARNING_CERTIFICATE_INVALID_STATE',
+        66: 'SIG_STAT_CODE_WARNING_CERTIFICATE_PROBLEM',
+        70: 'SIG_STAT_CODE_WARNING_UNSIGNED_CONTENT',
+        101:'SIG_STAT_CODE_ERROR_FILE_NOT_READABLE',
+        102: 'SIG_STAT_CODE_ERROR_UNEXPECTED_PROBLEM',
+        105: 'SIG_STAT_CODE_ERROR_ANY_ERROR',
+        110: 'SIG_STAT_CODE_ERROR_CERTIFICATION_BROKEN',
+        120: 'SIG_STAT_CODE_ERROR_REVISION_MODIFIED',
+        # Not a verifier code: set by the module when the verifier
+        # was stopped for breaching a resource limit
+        130: 'MODULE_CODE_ERROR_TOOL_LIMIT_EXCEEDED' }
+
+#--------------------------------------------------------------------
+# Returns a string representation of a JSigner PDF's code
+# @param pdf_code [IN] numerical PDF code
+# @return String representation as shown on C_PDF_code_D dictionary
+# 2017-08-07
+#--------------------------------------------------------------------
+def pdf_code_2_str(pdf_code):
+    """returns a string representation of a PDF code"""
+    if pdf_code in C_PDF_code_D:
+        return C_PDF_code_D[pdf_code]
+    else:
+        return "ERROR: unkwown code"
+
+#--------------------------------------------------------------------
+# Write the content of dict_D as CSV content to the file 'filename'
+# @param dict_D [IN] dictionary to write as CSV
+# @param col_sep_S [IN] separator for CSV
+# @param filename [IN] name of file to dump CSV
+# @return 0 if filename exists, 1 otherwise
+# 2017-08-07
+#--------------------------------------------------------------------
+def pdf_permissions_dict2CSVfile(dict_D, col_sep_S, filename):
+    """write content of dict_D in CSV format to file 'filename'"""
+    assert dict_D != None, "dict_D is None"
+    assert filename is not None , "filename is empty string"
+    assert len(filename)!=0 , "filename is empty string"
+
+    if os.path.exists(filename):
+        return 0
+
+    # We use encoding compatible with Windows, others filenames 
+    # with special characters are mangled, etc.
+    # encoding_S = 'utf-16-le'
+    # It works with utf-8 encoding.
+    encoding_S = 'utf-8'
+    S = "#FullPath%sEncryptFlag%sUserAccessFlag%sUserAccess_S%s"\
+        "UserAccessMask%sEncryption%s" %\
+            (col_sep_S,col_sep_S,col_sep_S,col_sep_S,col_sep_S,"\n")
+    Header_S = S.encode(encoding_S)                         
+
+    with open(filename,'w') as f:
+        # NOTE: if the BOM_UTF16_LE is added to the file, the CSV file
+        # becomes mangled when read by EXCEL (I didn't try with libreoffice
+        # or other programs). So, for now, the BOM below is commented out.
+        # 
+        # f.write(codecs.BOM_UTF16_LE)
+
+
+        # Write header
+        f.write(Header_S)
+        f.write("\n")
+
+        for key,value in sorted(dict_D.iteritems()):
+
+            value_0 = "(empty)"
+            value_1 = "(empty)"
+            value_2 = "(empty)"
+            value_len = len(value)
+            if value_len >= 1:
+                value_0 = value[0]
+            if value_len >= 2:
+                value_1 = value[1]
+            if value_len >= 3:
+                value_2 = value[2]
+            # permission mask and encryption (algorithm-key length)
+            value_3 = "(empty)"
+            value_4 = "(empty)"
+            if value_len >= 4 and value[3]:
+                value_3 = value[3]
+            if value_len >= 5 and value[4]:
+                value_4 = value[4]
+
+            S = "%s%s%s%s%s%s%s%s%s%s%s%s" %\
+                (key,col_sep_S,value_0,col_sep_S,
+                               value_1,col_sep_S,
+                               value_2,col_sep_S,
+                               value_3,col_sep_S,
+                               value_4,"\n")
+            Row_S = S.encode(encoding_S)
+
+            f.write(Row_S)
+
+    # Done with the file
+    f.close()
+
+    return 1
+
+#--------------------------------------------------------------------
+# Write the content of dict_D as CSV content to the file 'filename'
+# @param dict_D [IN] dictionary to write as CSV
+# @param col_sep_S [IN] separator for CSV
+# @param filename [IN] name of file to dump CSV
+# @return 0 if filename exists, 1 otherwise
+# 2017-08-07
+#--------------------------------------------------------------------
+def pdf_signed_dict2CSVfile(dict_D, col_sep_S, filename):
+    """write content of dict_D in CSV format to file 'filename'"""
+    assert dict_D != None, "dict_D is None"
+    assert filename is not None , "filename is empty string"
+    assert len(filename)!=0 , "filename is empty string"
+
+    # Bails out if the CSV file already exists
+    if os.path.exists(filename):
+        return 0
+
+    #Debug_S = "dict_D = '%s' (%d elements)" % (dict_D,len(dict_D))
+    #assert 0, Debug_S
+
+    # We use encoding compatible with Windows, others filenames 
+    # with special characters are mangled, etc.
+    # encoding_S = 'utf-16-le'
+    # It works with utf-8 encoding.
+    encoding_S = 'utf-8'
+    S = "#FullPath%sTmpPath%sSignedCode%sSignedCodeString%s" %\
+                        (col_sep_S,col_sep_S,col_sep_S,col_sep_S)
+    # Revisions (see revisions_csv_L) and signature digests
+    S = S + col_sep_S.join(C_REVISION_CSV_COLUMNS_L +
+                           [C_SIG_DIGEST_CSV_COLUMN]) + "\n"
+    Header_S = S.encode(encoding_S)                         
 
-        self.Error_Message = JLabel( "") 
-        self.Error_Message.setEnabled(True)
-        self.gbcPanel0.gridx = 0
-        self.gbcPanel0.gridy = 6
-        self.gbcPanel0.gridwidth = 1 
-        self.gbcPanel0.gridheight = 1 
-        self.gbcPanel0.fill = GridBagConstraints.BOTH 
-        self.gbcPanel0.weightx = 1 
-        self.gbcPanel0.weighty = 0 
-        self.gbcPanel0.anchor = GridBagConstraints.NORTH
-        self.gbPanel0.setConstraints( self.Error_Message, self.gbcPanel0 ) 
-        self.panel0.add( self.Error_Message ) 
+    with open(filename,'w') as f:
+        # NOTE: if the BOM_UTF16_LE is added to the file, the CSV file
+        # becomes mangled when read by EXCEL (I didn't try with libreoffice
+        # or other programs). So, the BOM below is commented out.
+        # 
+        # f.write(codecs.BOM_UTF16_LE)
+
+        # Write header
+        f.write(Header_S)
+        f.write("\n")
+
+
+        for key,value in sorted(dict_D.iteritems()):
+
+            value_0 = "(empty)"
+            value_1 = "(empty)"
+            value_2 = "(empty)"
+            value_len = len(value)
+            if value_len >= 1:
+                value_0 = value[0]
+            if value_len >= 2:
+                value_1 = value[1]
+            if value_len >= 3:
+                value_2 = value[2]
+
+
+            # Revision and signature digests columns (not there for
+            # the files without a verdict)
+            num_extra = len(C_REVISION_CSV_COLUMNS_L) + 1
+            revisions_L = list(value[3:3 + num_extra])
+            while len(revisions_L) < num_extra:
+                revisions_L.append("(empty)")
+
+            S = "%s%s%s%s%s%s%s%s%s%s" %\
+                (key,col_sep_S,value_0,col_sep_S,
+                               value_1,col_sep_S,
+                               value_2,col_sep_S,
+                col_sep_S.join(["%s" % (v) for v in revisions_L]),"\n")
+            Row_S = S.encode(encoding_S)
+
+            f.write(Row_S)
+
+    # Done with the file
+    f.close()
+
+    return 1
+
+
+
+#--------------------------------------------------------------------
+# Return the current (local) timestamp in ISO 
+# format (YYYY-MM-DD_HHMinSec)
+# @param None
+# @return string with localtime in ISO format
+# 2017-08-07
+#--------------------------------------------------------------------
+def get_now_timestamp_S():
+    """return a timestamp string"""
+##    now = time.localtime()
+##    now_S = datetime.datetime.fromtimestamp(now).strftime('%Y%m%d_%H%M%S')
+
+    now_S = time.strftime('%Y%m%d_%H%M%S')
+
+    return now_S
+
+#--------------------------------------------------------------------
+# Function that receives a dictionary ('dict_D') and returns
+# a string representing the dictionary.
+# Example of calling the function:
+#   dict2txt_S( dictionary )
+# @param dict_D [IN] source dictionary for CSV
+# @param add_num_elems [IN] if True, the string representing 
+# "dict_D" starts with the number of elements existing on the dict.
+# @return string representing dict_D
+# 2017-08-19
+#--------------------------------------------------------------------
+def dict2txt_S(dict_D,add_num_elems=False):
+    """returns a string representation of dict_D"""
+
+    if add_num_elems:
+        dict_S = "len=%s\n" % (len(dict_D))
+    else:
+        dict_S = ""
+    for key,val in dict_D.iteritems():
+        dict_S = dict_S + "\n'%s'='%s'" % (key,val)
+
+    return dict_S
+
+#--------------------------------------------------------------------
+# @param flag_str [IN] string of which a boolean representation 
+#                      is sought
+# @return True or False (boolean)
+# 2017-08-25
+#--------------------------------------------------------------------
+def str2boolean(flag_str):
+    """returns boolean representation of flag_str"""
+    flag_S = flag_str.lower()
+    if flag_S == "true":
+        return True
+    elif flag_S == "false":
+        return False
+
+#--------------------------------------------------------------------
+# @param flag [IN] flag of which a string return is wanted
+# @return True of False accordingly to the 'flag' parameter
+# 2017-08-25
+#--------------------------------------------------------------------
+def boolean2str(flag):
+    """Returns string representation of boolean flag"""
+    if flag:
+        return "True"
+    else:
+        return "False"
+
+#--------------------------------------------------------------------
+# Receives user_access_S string with JSON content regarding the
+# user access permission of the PDF file being analyzed.
+# It returns a bit-wise integer code pointing out which permissions are
+# ON (associated bit is 1) and which are not (associated bit is 0).
+# The strings are decoded once (memo, see C_CACHE_USER_ACCESS).
+# @param user_access_to_S [IN] JSON string with user permissions
+# @return
+# 2017-09-03
+#--------------------------------------------------------------------
+def user_access_to_int(user_access_S):
+    """permission mask of an exiftool UserAccess string"""
+    memo_D = FindSignedPDFsFilesIngestModuleFactory.g_user_access_memo_D
+    mask = memo_D.get(user_access_S)
+    record_cache_lookup(C_CACHE_USER_ACCESS, mask is not None)
+    if mask is not None:
+        return mask
+
+    mask = decode_user_access(user_access_S)
+    if len(memo_D) >= C_USER_ACCESS_MEMO_MAX:
+        memo_D.clear()
+    memo_D[user_access_S] = mask
+    return mask
+
+#--------------------------------------------------------------------
+# Decode an exiftool UserAccess string (e.g., "Print, Copy, Annotate")
+# into its permission mask (see C_USER_ACCESS_D)
+# @param user_access_S [IN] UserAccess string
+# @return permission mask
+# 2026-10-19
+#--------------------------------------------------------------------
+def decode_user_access(user_access_S):
+    """permission mask of a UserAccess string (not memoized)"""
+    mask = 0
+    for elem in user_access_S.split(","):
+        # lower-case + remove any space from the string
+        mask |= C_USER_ACCESS_D.get(elem.lower().strip(), 0)
+
+    # DEBUG
+    if C_Log_Level >= C_LOG_FILE_DETAILS:
+        Msg_S = "UserAccess '%s': mask 0x%02x" % (user_access_S, mask)
+        Logger.getLogger(FindSignedPDFsFilesIngestModuleFactory.moduleName)\
+                                                .log(Level.INFO, Msg_S)
+    return mask
+
+# --------------------------------------------------------------------
+# Convert numeric representation of user access to a 
+# string representation.
+# @param user_access_int [IN] 
+# @return string with the representation of the giver user access 
+# NOTE:
+# Only assemble and modify permissions are considered
+#
+# AssembleON_ModifyON
+# AssembleOFF_ModifyON
+# AssembleON_ModifyON
+# AssembleOFF_ModifyOFF
+# 
+# 2017-09-09
+#--------------------------------------------------------------------
+
+def user_access_numeric_to_str(user_access_int):
+    """convert numeric user access to str for autopsy usage"""
+    return C_USER_ACCESS_LABELS_L[user_access_int & (C_PERMISSION_MASKS - 1)]
+
+#--------------------------------------------------------------------
+# Label (assemble/modify) of a permission mask, for the table
+# C_USER_ACCESS_LABELS_L
+# @param mask [IN] permission mask
+# @return C_AssembleXXX_ModifyXXX
+# 2026-10-19
+#--------------------------------------------------------------------
+def user_access_mask_label_S(mask):
+    """assemble/modify label of a permission mask"""
+    if mask & C_ASSEMBLE:
+        if mask & C_MODIFY:
+            return C_AssembleON_ModifyON
+        return C_AssembleON_ModifyOFF
+    if mask & C_MODIFY:
+        return C_AssembleOFF_ModifyON
+    return C_AssembleOFF_ModifyOFF
+
+#--------------------------------------------------------------------
+# Encryption algorithm and key length of a PDF file, from exiftool's
+# Encryption tag (e.g., "Standard V4.4 (128-bit AES)" -> "AES-128",
+# "Standard V2.3 (128-bit)" -> "RC4-128")
+# @param encryption_S [IN] Encryption tag, None if not encrypted
+# @return label, "" if not encrypted, C_ENCRYPTION_UNKNOWN if the tag
+#         gives no key length
+# 2026-10-19
+#--------------------------------------------------------------------
+def encryption_label_S(encryption_S):
+    """encryption algorithm and key length of a PDF file"""
+    if not encryption_S:
+        return ""
+    bits_match = C_ENCRYPTION_BITS_RE.search(encryption_S)
+    if bits_match is None:
+        return C_ENCRYPTION_UNKNOWN
+    if "AES" in encryption_S.upper():
+        return "AES-%s" % (bits_match.group(1))
+    return "RC4-%s" % (bits_match.group(1))
+
+#--------------------------------------------------------------------
+# Histogram of the permission masks (all C_PERMISSION_MASKS of them,
+# not only assemble/modify) and of the encryption of the PDF files.
+# Each thread counts in its own shard (preallocated list indexed by
+# the mask): no lock per file. The shards are merged for the report.
+# A file is counted once, at the end of its analysis: the counts of a
+# file to be retried are kept aside (last attempt wins) until it ends,
+# and are merged as is if its retries never end.
+# 2026-10-19
+#--------------------------------------------------------------------
+class PermissionHistogram(object):
+    """Sharded histogram of the permission masks"""
+
+    def __init__(self):
+        self.m_lock = threading.Lock()
+        self.m_local = threading.local()
+        self.m_shards_L = []
+        self.m_retried_D = {}       # path -> add() arguments
+
+    def shard(self):
+        """shard of the calling thread"""
+        shard = getattr(self.m_local, "shard", None)
+        if shard is None:
+            shard = {"masks_L": [0] * C_PERMISSION_MASKS,
+                     "encryption_D": {}}
+            self.m_local.shard = shard
+            self.m_lock.acquire()
+            self.m_shards_L.append(shard)
+            self.m_lock.release()
+        return shard
+
+    def add(self, user_access_flag, user_access_code, encryption_flag,
+                                                            encryption_S):
+        """count the permissions of a PDF file"""
+        shard = self.shard()
+        if user_access_flag:
+            shard["masks_L"][user_access_code & (C_PERMISSION_MASKS - 1)] += 1
+        if encryption_flag:
+            encryption_D = shard["encryption_D"]
+            encryption_S = encryption_S or C_ENCRYPTION_UNKNOWN
+            encryption_D[encryption_S] = encryption_D.get(encryption_S, 0) + 1
+
+    def add_retried(self, path_S, counts_T):
+        """keep the counts of a file to be retried (see add)"""
+        self.m_lock.acquire()
+        self.m_retried_D[path_S] = counts_T
+        self.m_lock.release()
+
+    def forget_retried(self, path_S):
+        """end of the analysis of a file: drop its kept counts"""
+        if len(self.m_retried_D) == 0:
+            return
+        self.m_lock.acquire()
+        self.m_retried_D.pop(path_S, None)
+        self.m_lock.release()
+
+    def merged_T(self):
+        """(counts by mask, counts by encryption) of all the shards"""
+        self.m_lock.acquire()
+        retried_L = self.m_retried_D.values()
+        self.m_retried_D = {}
+        self.m_lock.release()
+        for counts_T in retried_L:
+            self.add(*counts_T)
+
+        masks_L = [0] * C_PERMISSION_MASKS
+        encryption_D = {}
+        self.m_lock.acquire()
+        shards_L = list(self.m_shards_L)
+        self.m_lock.release()
+        for shard in shards_L:
+            for mask, count in enumerate(shard["masks_L"]):
+                masks_L[mask] += count
+            for encryption_S, count in shard["encryption_D"].iteritems():
+                encryption_D[encryption_S] = \
+                                    encryption_D.get(encryption_S, 0) + count
+        return (masks_L, encryption_D)
+
+#--------------------------------------------------------------------
+# Compact table of the permission masks: one line per mask seen, most
+# frequent first, one column per permission ('+' granted)
+# @param masks_L [IN] counts by mask (see PermissionHistogram)
+# @return table (lines), empty if no mask was seen
+# 2026-10-19
+#--------------------------------------------------------------------
+def permission_histogram_table_S(masks_L):
+    """compact table of the permission masks"""
+    seen_L = [(count, mask) for mask, count in enumerate(masks_L) if count]
+    if len(seen_L) == 0:
+        return ""
+    seen_L.sort(key=lambda entry_T: (-entry_T[0], entry_T[1]))
+    lines_L = ["mask %s  files" % (" ".join([letter_S for bit, letter_S,
+                            name_S in C_PERMISSION_LETTERS_L]))]
+    for count, mask in seen_L:
+        lines_L.append("0x%02x %s  %d" % (mask, " ".join([
+                        "+" if mask & bit else "-"
+                        for bit, letter_S, name_S in C_PERMISSION_LETTERS_L]),
+                        count))
+    lines_L.append("(%s)" % (", ".join(["%s=%s" % (letter_S, name_S)
+                    for bit, letter_S, name_S in C_PERMISSION_LETTERS_L])))
+    return "\n".join(lines_L)
+
+#--------------------------------------------------------------------
+# Returns True if user_access_code has one or none of 
+# C_ASSEMBLE / C_MODIFY properties activated.
+# @param user_access_code [IN] binary encoded user access code
+# @return True / False
+# 2017-09-22
+#--------------------------------------------------------------------
+def OLD_is_interesting_user_access(user_access_int):
+    "return True if user_access_code interests us"""
+    if user_access_int == 0:
+        return False
+    elif (user_access_int & C_ASSEMBLE) and (user_access_int & C_MODIFY):
+        return True
+    elif (user_access_int & C_ASSEMBLE) and ((user_access_int & C_MODIFY)==0):
+        return True
+    elif ((user_access_int & C_ASSEMBLE)==0) and (user_access_int & C_MODIFY):
+        return True
+
+
+#--------------------------------------------------------------------
+# Returns True if user_access_code has one or none of 
+# C_ASSEMBLE / C_MODIFY properties activated.
+# @param user_access_code [IN] binary encoded user access code
+# @return True / False
+# 2017-09-22
+#--------------------------------------------------------------------
+def is_interesting_user_access(user_access_int):
+    "return True if user_access_code interests us"""
+    return C_USER_ACCESS_INTERESTING_L[
+                                user_access_int & (C_PERMISSION_MASKS - 1)]
+
+#--------------------------------------------------------------------
+# Label and "interesting" flag of every permission mask (decoded
+# once, at load time)
+#--------------------------------------------------------------------
+C_USER_ACCESS_LABELS_L = [user_access_mask_label_S(mask)
+                                    for mask in range(C_PERMISSION_MASKS)]
+C_USER_ACCESS_INTERESTING_L = [(mask & C_ASSEMBLE) == 0 or
+                               (mask & C_MODIFY) == 0
+                                    for mask in range(C_PERMISSION_MASKS)]
+
+#--------------------------------------------------------------------
+# Convert the string kept in the settings DB to the type of the
+# default value of the advanced setting 'name_S'
+# @param name_S  [IN] name of the advanced setting
+# @param value_S [IN] string value
+# @return converted value, None if value_S is not valid
+# 2026-10-19
+#--------------------------------------------------------------------
+def advanced_setting_from_str(name_S, value_S):
+    """convert value_S to the type of the advanced setting name_S"""
+    default = C_ADVANCED_SETTINGS_DEFAULTS_D[name_S]
+    if value_S is None:
+        return None
+    value_S = value_S.strip()
+
+    try:
+        if isinstance(default, bool):
+            return str2boolean(value_S)
+        elif isinstance(default, (int, long)):
+            return int(value_S)
+        elif isinstance(default, float):
+            return float(value_S)
+        else:
+            return value_S
+    except ValueError:
+        return None
+
+#--------------------------------------------------------------------
+# @param value [IN] value of an advanced setting
+# @return string representation (as kept in the settings DB)
+# 2026-10-19
+#--------------------------------------------------------------------
+def advanced_setting_to_str(value):
+    """returns the string representation of an advanced setting"""
+    if isinstance(value, bool):
+        return boolean2str(value)
+    return "%s" % (value)
+
+#--------------------------------------------------------------------
+# Count a hit/miss of the cache 'cache_name_S', in the shard of the
+# calling thread (g_lock is only taken once per thread, to register
+# its shard: lookups on the hot path, e.g. user_access_to_int, don't
+# serialize the threads)
+# @param cache_name_S [IN] name of the cache
+# @param hit          [IN] True for a hit, False for a miss
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def record_cache_lookup(cache_name_S, hit):
+    """update the hits/misses counters of a cache"""
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    shard_D = getattr(Factory.g_cache_stats_local, "shard_D", None)
+    if shard_D is None:
+        shard_D = {}
+        Factory.g_cache_stats_local.shard_D = shard_D
+        Factory.g_lock.acquire()
+        Factory.g_cache_stats_L.append(shard_D)
+        Factory.g_lock.release()
+    stats_L = shard_D.get(cache_name_S)
+    if stats_L is None:
+        stats_L = shard_D[cache_name_S] = [0, 0]
+    if hit:
+        stats_L[0] += 1
+    else:
+        stats_L[1] += 1
+
+#--------------------------------------------------------------------
+# Hits/misses of the caches, merged from the shards of the threads
+# (a snapshot: the threads go on counting)
+# @return dict cache name -> [hits, misses]
+# 2026-10-19
+#--------------------------------------------------------------------
+def merged_cache_stats_D():
+    """hits/misses of the caches of all the threads"""
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    stats_D = {}
+    for shard_D in list(Factory.g_cache_stats_L):
+        for cache_name_S, (hits, misses) in shard_D.items():
+            stats_L = stats_D.setdefault(cache_name_S, [0, 0])
+            stats_L[0] += hits
+            stats_L[1] += misses
+    return stats_D
+
+#--------------------------------------------------------------------
+# Add the size of 'path_S' to the size of the temp store, once per
+# run (a copy reused by a retry, a checkpoint reload or a re-run is
+# already counted)
+# @param path_S [IN] temp copy of a PDF file
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def add_temp_store_bytes(path_S):
+    """account the size of a temp copy"""
+    try:
+        size = os.path.getsize(path_S)
+    except OSError:
+        return
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    Factory.g_lock.acquire()
+    if path_S not in Factory.g_temp_store_paths_D:
+        Factory.g_temp_store_paths_D[path_S] = True
+        Factory.g_temp_store_bytes += size
+    Factory.g_lock.release()
+
+#--------------------------------------------------------------------
+# Mark the start/end of an external tool run (tool queue depth)
+# @param tool_S [IN] name of the tool (C_TOOL_VERIFIER, ...)
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def tool_run_begin(tool_S):
+    """one more run of tool_S in flight"""
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    Factory.g_lock.acquire()
+    Factory.g_tool_queue_depth_D[tool_S] += 1
+    Factory.g_lock.release()
+
+def tool_run_end(tool_S):
+    """one less run of tool_S in flight"""
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    Factory.g_lock.acquire()
+    Factory.g_tool_queue_depth_D[tool_S] -= 1
+    Factory.g_lock.release()
+
+#--------------------------------------------------------------------
+# Build the content of the metrics file (Prometheus text format).
+# @param elapsed_secs [IN] seconds since the reporter started
+# @return string with the metrics
+# 2026-10-19
+#--------------------------------------------------------------------
+def build_metrics_text_S(elapsed_secs):
+    """return the module counters in Prometheus text format"""
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+
+    #-- start of exclusive zone --
+    Factory.g_lock.acquire()
+    files_count       = Factory.g_files_count
+    not_PDF_count     = Factory.g_NotPDFFiles_count
+    PDF_count         = Factory.g_PDFFiles_count
+    signed_count      = Factory.g_signedPDFFiles_count
+    inserted_count    = Factory.g_PDFFilesInserted_count
+    permission_D      = dict(Factory.g_permission_Stats_D)
+    queue_depth_D     = dict(Factory.g_tool_queue_depth_D)
+    cache_stats_D     = merged_cache_stats_D()
+    temp_store_bytes  = Factory.g_temp_store_bytes
+    tool_usage_D      = dict([(k, list(v)) for k, v in
+                                    Factory.g_tool_usage_D.iteritems()])
+    limit_breaches_D  = dict(Factory.g_tool_limit_breaches_D)
+    tool_slots_D      = dict(Factory.g_tool_slots_D)
+    triage_stats_D    = dict(Factory.g_triage_stats_D)
+    flow_rules_D      = dict(Factory.g_flow_rules_stats_D)
+    tool_cancelled_D  = dict(Factory.g_tool_cancelled_D)
+    deferred_D        = dict(Factory.g_deferred_stats_D)
+    known_stats_D     = dict(Factory.g_known_stats_D)
+    budget_stats_D    = dict(Factory.g_budget_stats_D)
+    Factory.g_lock.release()
+    #-- end of exclusive zone --
+
+    P = C_METRICS_PREFIX
+    Lines_L = []
+
+    def add_metric(name_S, type_S, help_S, samples_L):
+        """samples_L: list of (labels_S, value)"""
+        Lines_L.append("# HELP %s_%s %s" % (P, name_S, help_S))
+        Lines_L.append("# TYPE %s_%s %s" % (P, name_S, type_S))
+        for labels_S, value in samples_L:
+            Lines_L.append("%s_%s%s %s" % (P, name_S, labels_S, value))
+
+    add_metric("files_total", "counter",
+            "Files analyzed by the module", [("", files_count)])
+    add_metric("not_pdf_files_total", "counter",
+            "Files that are not PDF", [("", not_PDF_count)])
+    add_metric("pdf_files_total", "counter",
+            "PDF files analyzed", [("", PDF_count)])
+    add_metric("signed_pdf_files_total", "counter",
+            "Digitally signed PDF files", [("", signed_count)])
+    add_metric("inserted_pdf_files_total", "counter",
+            "PDF files inserted as interesting files", [("", inserted_count)])
+    add_metric("permission_pdf_files_total", "counter",
+            "PDF files with interesting permissions",
+            [('{permission="%s"}' % (k), v) for k, v in
+                                        sorted(permission_D.iteritems())])
+
+    if elapsed_secs > 0:
+        files_rate = files_count / elapsed_secs
+        PDF_rate = PDF_count / elapsed_secs
+    else:
+        files_rate = PDF_rate = 0.0
+    add_metric("files_per_second", "gauge",
+            "Average throughput (files) since the start",
+            [("", "%.3f" % files_rate)])
+    add_metric("pdf_files_per_second", "gauge",
+            "Average throughput (PDF files) since the start",
+            [("", "%.3f" % PDF_rate)])
+    add_metric("elapsed_seconds", "gauge",
+            "Seconds since the start of the metrics reporter",
+            [("", "%.1f" % elapsed_secs)])
+
+    add_metric("tool_queue_depth", "gauge",
+            "External tool runs started and not yet finished",
+            [('{tool="%s"}' % (k), v) for k, v in
+                                        sorted(queue_depth_D.iteritems())])
+
+    hit_rate_L = []
+    for name_S, (hits, misses) in sorted(cache_stats_D.iteritems()):
+        lookups = hits + misses
+        if lookups > 0:
+            rate = float(hits) / lookups
+        else:
+            rate = 0.0
+        hit_rate_L.append(('{cache="%s"}' % (name_S), "%.4f" % rate))
+    add_metric("cache_hits_total", "counter", "Cache hits",
+            [('{cache="%s"}' % (k), v[0]) for k, v in
+                                        sorted(cache_stats_D.iteritems())])
+    add_metric("cache_misses_total", "counter", "Cache misses",
+            [('{cache="%s"}' % (k), v[1]) for k, v in
+                                        sorted(cache_stats_D.iteritems())])
+    add_metric("cache_hit_ratio", "gauge", "Cache hit ratio", hit_rate_L)
+
+    add_metric("temp_store_bytes", "gauge",
+            "Bytes of the temp copies of the PDF files used in this run",
+            [("", temp_store_bytes)])
+
+    usage_keys_L = sorted(tool_usage_D.iterkeys())
+    def usage_samples_L(index, fmt_S):
+        return [('{tool="%s",size="%s"}' % (k), fmt_S % tool_usage_D[k][index])
+                    for k in usage_keys_L]
+    add_metric("tool_runs_total", "counter", "External tool runs",
+            usage_samples_L(C_USAGE_RUNS, "%d"))
+    add_metric("tool_wall_seconds_total", "counter",
+            "Wall time of the external tool runs",
+            usage_samples_L(C_USAGE_WALL, "%.3f"))
+    add_metric("tool_user_cpu_seconds_total", "counter",
+            "User CPU time of the external tool runs (-1: unknown)",
+            usage_samples_L(C_USAGE_USER_CPU, "%.3f"))
+    add_metric("tool_sys_cpu_seconds_total", "counter",
+            "System CPU time of the external tool runs (-1: unknown)",
+            usage_samples_L(C_USAGE_SYS_CPU, "%.3f"))
+    add_metric("tool_max_rss_kbytes", "gauge",
+            "Peak RSS of the external tool runs (-1: unknown)",
+            usage_samples_L(C_USAGE_MAX_RSS, "%d"))
+    add_metric("tool_input_bytes_total", "counter",
+            "Bytes of the files given to the external tools",
+            usage_samples_L(C_USAGE_BYTES, "%d"))
+    add_metric("triage_decisions_total", "counter",
+            "Triage decisions (verifier run or avoided)",
+            [('{decision="%s"}' % (k), v) for k, v in
+                                        sorted(triage_stats_D.iteritems())])
+
+    add_metric("known_files_total", "counter",
+            "PDF files not analyzed: known files and known verdicts",
+            [('{outcome="%s"}' % (k), v) for k, v in
+                                        sorted(known_stats_D.iteritems())])
+
+    add_metric("budget_files_total", "counter",
+            "PDF files of the budgeted triage",
+            [('{outcome="%s"}' % (k), v) for k, v in
+                                        sorted(budget_stats_D.iteritems())])
+
+    add_metric("deferred_files_total", "counter",
+            "PDF files of the deferred analysis",
+            [('{state="%s"}' % (k), v) for k, v in
+                                        sorted(deferred_D.iteritems())])
+    add_metric("deferred_queue_depth", "gauge",
+            "PDF files waiting for (or in) the deferred analysis",
+            [("", deferred_D["queued"] - deferred_D["analyzed"]
+                                       - deferred_D["cancelled"])])
+
+    add_metric("tool_runs_cancelled_total", "counter",
+            "Tool runs cancelled (result not needed anymore)",
+            [('{tool="%s"}' % (k), v) for k, v in
+                                        sorted(tool_cancelled_D.iteritems())])
+
+    add_metric("flow_rules_fired_total", "counter",
+            "Rules of the analysis flow fired",
+            [('{rule="%s"}' % (k), v) for k, v in
+                                        sorted(flow_rules_D.iteritems())])
+
+    slots_L = [(tool_S, tool_slots_D[tool_S].snapshot())
+                                    for tool_S in sorted(tool_slots_D)]
+    add_metric("tool_slots", "gauge",
+            "Concurrent runs allowed by the adaptive controller",
+            [('{tool="%s"}' % (k), v[0]) for k, v in slots_L])
+    add_metric("tool_slots_in_use", "gauge",
+            "Runs holding a slot of the adaptive controller",
+            [('{tool="%s"}' % (k), v[1]) for k, v in slots_L])
+    add_metric("tool_slots_waiting", "gauge",
+            "Runs waiting for a slot of the adaptive controller",
+            [('{tool="%s"}' % (k), v[2]) for k, v in slots_L])
+    add_metric("tool_limit_breaches_total", "counter",
+            "External tool runs stopped by a resource limit",
+            [('{tool="%s"}' % (k), v) for k, v in
+                                        sorted(limit_breaches_D.iteritems())])
+
+    return "\n".join(Lines_L) + "\n"
 
-        self.add(self.panel0)
+#--------------------------------------------------------------------
+# Run an external tool, accounting its wall time, CPU time, peak
+# RSS and input size (per tool and size bucket).
+# CPU time and RSS come from os.wait4() (rusage of the child), when
+# the platform has it, else (Jython on Linux) from samples of
+# /proc/<pid>. Otherwise only the wall time is measured.
+# @param tool_S      [IN] name of the tool (C_TOOL_VERIFIER, ...)
+# @param cmd_L       [IN] command line
+# @param path_S      [IN] input file of the tool
+# @param stdout_F    [IN] file for STDOUT (None: captured in stdout_S)
+# @param stderr_F    [IN] file for STDERR (None: captured in stderr_S)
+# @param run_handle  [IN] ToolTask of the run, if cancellable
+#                         (a cancel kills the process)
+# @param evidence_path_S [IN] full path of the file of the case whose
+#                         copy is path_S (None: path_S)
+# @return ToolRunResult object
+# 2026-10-19
+#--------------------------------------------------------------------
+def run_external_tool(tool_S, cmd_L, path_S, stdout_F=None, stderr_F=None,
+                                    run_handle=None, evidence_path_S=None):
+    """run an external tool, accounting its resource usage"""
+    try:
+        input_bytes = os.path.getsize(path_S)
+    except OSError:
+        input_bytes = 0
+    result = ToolRunResult(tool_S, path_S, input_bytes, evidence_path_S)
+
+    if stdout_F is None:
+        stdout_arg = subprocess.PIPE
+    else:
+        stdout_arg = stdout_F
+    if stderr_F is None:
+        stderr_arg = subprocess.PIPE
+    else:
+        stderr_arg = stderr_F
+
+    limits_D = get_tool_limits_D()
+    cmd_L, preexec_fn = apply_tool_limits(cmd_L, limits_D)
+
+    tool_run_begin(tool_S)
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    slots = Factory.g_tool_slots_D.get(tool_S)
+    if slots is not None:
+        slots.acquire()
+    try:
+        time_start = time.time()
+        env_D = get_tool_env_D(tool_S)
+        if preexec_fn is None:
+            process = Popen(cmd_L, stdout=stdout_arg, stderr=stderr_arg,
+                                                    env=env_D)
+        else:
+            process = Popen(cmd_L, stdout=stdout_arg, stderr=stderr_arg,
+                                    preexec_fn=preexec_fn, env=env_D)
+        if run_handle is not None:
+            # from now on, a cancel kills the process
+            run_handle.set_process(process)
+
+        if hasattr(os, "wait4"):
+            wait_with_rusage(process, result)
+        elif platform_is_linux() and getattr(process, "pid", None):
+            wait_with_proc_samples(process, result)
+        else:
+            stdout_S, stderr_S = process.communicate()
+            result.returncode = process.returncode
+            result.stdout_S = stdout_S or ""
+            result.stderr_S = stderr_S or ""
+
+        result.wall_secs = time.time() - time_start
+    finally:
+        if slots is not None:
+            slots.release(time.time() - time_start)
+        tool_run_end(tool_S)
+
+    if run_handle is not None and run_handle.cancelled:
+        # killed on purpose: not a limit breach
+        result.cancelled = True
+        Factory.g_lock.acquire()
+        Factory.g_tool_cancelled_D[tool_S] += 1
+        Factory.g_lock.release()
+    elif len(limits_D) > 0:
+        result.limit_breached = is_limit_breach(result, limits_D)
+        if result.limit_breached:
+            Factory.g_lock.acquire()
+            Factory.g_tool_limit_breaches_D[tool_S] += 1
+            Factory.g_lock.release()
+
+    account_tool_run(result)
+    return result
 
+#--------------------------------------------------------------------
+# Environment of a tool run: the verifier without network lookups
+# gets C_OFFLINE_JAVA_OPTIONS_S in JAVA_TOOL_OPTIONS (read by any
+# JVM, whatever the launcher of the verifier)
+# @param tool_S [IN] C_TOOL_*
+# @return environment dict, None to inherit the module's one
+# 2026-10-19
+#--------------------------------------------------------------------
+def get_tool_env_D(tool_S):
+    """environment of a tool run (None: inherited)"""
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    if tool_S != C_TOOL_VERIFIER or not Factory.g_verifier_offline:
+        return None
+    env_D = dict(os.environ)
+    env_D["JAVA_TOOL_OPTIONS"] = ("%s %s" % (env_D.get("JAVA_TOOL_OPTIONS",
+                                    ""), C_OFFLINE_JAVA_OPTIONS_S)).strip()
+    return env_D
 
-    #--------------------------------------------------------------------
-    # 2017-08-25
-    #--------------------------------------------------------------------
-    def customizeComponents(self):
-        """customize components"""
+#--------------------------------------------------------------------
+# @return dict with the active (non zero) tool limits, empty if
+#         limits are not set or not supported on this platform
+# 2026-10-19
+#--------------------------------------------------------------------
+def get_tool_limits_D():
+    """returns the configured, non-zero, per-process tool limits"""
+    if not platform_is_linux():
+        return {}
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    Factory.g_lock.acquire()
+    limits_D = dict([(k, v) for k, v in Factory.g_tool_limits_D.iteritems()
+                                                            if v > 0])
+    Factory.g_lock.release()
+    return limits_D
 
-        # Read values from DB
-        self.check_Database_entries()
+#--------------------------------------------------------------------
+# Apply per-process limits to the command line of a tool.
+# With the 'resource' module (POSIX CPython), limits and nice are set
+# by a preexec function in the child. Otherwise (e.g., Jython, where
+# preexec_fn is not supported) the command is wrapped by the 'prlimit'
+# and 'nice' commands. The I/O class is always set with 'ionice'.
+# Wrappers that can't be found are skipped.
+# @param cmd_L    [IN] command line
+# @param limits_D [IN] active limits (see get_tool_limits_D)
+# @return (command line, preexec function or None)
+# 2026-10-19
+#--------------------------------------------------------------------
+def apply_tool_limits(cmd_L, limits_D):
+    """returns the command line and preexec_fn enforcing limits_D"""
+    if len(limits_D) == 0:
+        return cmd_L, None
+
+    as_mb     = limits_D.get(C_TOOL_LIMIT_AS_MB_FIELD, 0)
+    cpu_secs  = limits_D.get(C_TOOL_LIMIT_CPU_SECS_FIELD, 0)
+    nofile    = limits_D.get(C_TOOL_LIMIT_NOFILE_FIELD, 0)
+    nice      = limits_D.get(C_TOOL_NICE_FIELD, 0)
+    ionice    = limits_D.get(C_TOOL_IONICE_CLASS_FIELD, 0)
+
+    preexec_fn = None
+    prefix_L = []
+
+    if resource is not None:
+        def preexec_fn():
+            if as_mb > 0:
+                as_bytes = as_mb * 1024 * 1024
+                resource.setrlimit(resource.RLIMIT_AS, (as_bytes, as_bytes))
+            if cpu_secs > 0:
+                # soft limit sends SIGXCPU, hard limit (+5s) SIGKILL
+                resource.setrlimit(resource.RLIMIT_CPU,
+                                            (cpu_secs, cpu_secs + 5))
+            if nofile > 0:
+                resource.setrlimit(resource.RLIMIT_NOFILE, (nofile, nofile))
+            if nice > 0:
+                os.nice(nice)
+    else:
+        prlimit_path = find_exe_in_path("prlimit")
+        if prlimit_path is not None:
+            prlimit_L = [prlimit_path]
+            if as_mb > 0:
+                prlimit_L.append("--as=%d" % (as_mb * 1024 * 1024))
+            if cpu_secs > 0:
+                prlimit_L.append("--cpu=%d:%d" % (cpu_secs, cpu_secs + 5))
+            if nofile > 0:
+                prlimit_L.append("--nofile=%d" % (nofile))
+            if len(prlimit_L) > 1:
+                prefix_L += prlimit_L + ["--"]
+
+        nice_path = find_exe_in_path("nice")
+        if nice > 0 and nice_path is not None:
+            prefix_L += [nice_path, "-n", "%d" % (nice)]
+
+    ionice_path = find_exe_in_path("ionice")
+    if ionice > 0 and ionice_path is not None:
+        prefix_L += [ionice_path, "-c", "%d" % (ionice)]
+
+    return prefix_L + list(cmd_L), preexec_fn
 
-        insert_duplicate_flag = self.local_settings.get_insert_duplicate_flag()
-        self.checkbox.setSelected(insert_duplicate_flag)
+#--------------------------------------------------------------------
+# Classify a tool run as a breach of the resource limits: killed by
+# a limit-related signal, CPU time at the CPU limit, or an allocation
+# failure reported on STDERR.
+# @param result   [IN] ToolRunResult object
+# @param limits_D [IN] active limits
+# @return True if the run breached a limit
+# 2026-10-19
+#--------------------------------------------------------------------
+def is_limit_breach(result, limits_D):
+    """True if the tool run was stopped by a resource limit"""
+    returncode = result.returncode
+    if returncode is None:
+        return False
 
-        create_csv_file_flag = self.local_settings.get_create_csv_file_flag()
-        self.checkbox_create_file.setSelected(create_csv_file_flag)
+    # Popen gives -signal; under Jython (Java Process) it is 128+signal
+    for sig in C_LIMIT_SIGNALS_L:
+        if returncode == -sig or returncode == 128 + sig:
+            return True
 
-    def getSettings(self):
-        return self.local_settings
+    cpu_secs = limits_D.get(C_TOOL_LIMIT_CPU_SECS_FIELD, 0)
+    if cpu_secs > 0 and result.user_cpu_secs >= 0 and\
+            result.user_cpu_secs + result.sys_cpu_secs >= cpu_secs:
+        return True
 
-#====================================================================
-# Functions
-#====================================================================
+    if returncode != 0 and\
+            limits_D.get(C_TOOL_LIMIT_AS_MB_FIELD, 0) > 0:
+        for mark_S in C_LIMIT_STDERR_MARKS_L:
+            if mark_S in result.stderr_S:
+                return True
+
+    return False
 
 #--------------------------------------------------------------------
-# Checks whether fpath corresponds to an EXE file.
-# NOTE: right now, it just checks whether fpath is a file or not.
-# @param fpath [IN] full path of EXE to check
-# @return True if considered as EXE, False otherwise.
-# 2017-08-04
+# @return True if running on Linux (also under Jython)
+# 2026-10-19
 #--------------------------------------------------------------------
-def is_exe(fpath):
-    """https://stackoverflow.com/questions/377017/
-                ...test-if-executable-exists-in-python\#377028"""
-##    return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
-    return os.path.isfile(fpath)
+def platform_is_linux():
+    """True if the module is running on Linux"""
+    if sys.platform.startswith("linux"):
+        return True
+    if sys.platform.startswith("java"):
+        os_name_S = System.getProperty("os.name")
+        return os_name_S is not None and os_name_S.lower().startswith("linux")
+    return False
 
 #--------------------------------------------------------------------
-# @param path_verifier [IN] path of EXE used to verify whether PDF is
-#                           signed
-# @param path_pdf_file [IN] PDF file to check
-# @return returns the code that assesses the PDF file 'path_pdf_file'
-# 2017-08-04
+# @param exe_name_S [IN] name of an executable
+# @return full path of exe_name_S in the PATH, None if not found
+# 2026-10-19
 #--------------------------------------------------------------------
-def is_pdf_signed(path_verifier,path_pdf_file):
-    """check whether path_pdf_file is a signed PDF"""
+def find_exe_in_path(exe_name_S):
+    """look for an executable in the PATH"""
+    for dir_S in os.environ.get("PATH", "").split(os.pathsep):
+        full_path_S = os.path.join(dir_S, exe_name_S)
+        if os.path.isfile(full_path_S):
+            return full_path_S
+    return None
 
-    #------------------------------------------------------
-    # C_Log_Level controls whether we capture or not 
-    # STDOUT and STDERR from the "is digitally signed" test
-    # If captured, STDOUT and STDERR is written in individual 
-    # text files (two text files per EXEC: one for STDOUT and 
-    # another one for STDERR).The text files are written in 
-    # the case's TEMP directory
-    #------------------------------------------------------
-    if C_Log_Level >= C_LOG_EXEC_DETAILS:
-        capture_stdout_stderr = True
+#--------------------------------------------------------------------
+# Collect the output of 'process' and reap it with os.wait4(), filling
+# returncode, output and rusage fields of 'result'.
+# STDERR is drained by a helper thread to avoid a pipe deadlock.
+# @param process [IN] Popen object
+# @param result  [IN/OUT] ToolRunResult object
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def wait_with_rusage(process, result):
+    """wait for process with os.wait4, filling result"""
+    stderr_chunks_L = []
+    stderr_thread = None
+    if process.stderr is not None:
+        def drain_stderr():
+            stderr_chunks_L.append(process.stderr.read())
+        stderr_thread = threading.Thread(target=drain_stderr)
+        stderr_thread.setDaemon(True)
+        stderr_thread.start()
+
+    if process.stdout is not None:
+        result.stdout_S = process.stdout.read()
+        process.stdout.close()
+    if stderr_thread is not None:
+        stderr_thread.join()
+        result.stderr_S = "".join(stderr_chunks_L)
+        process.stderr.close()
+
+    pid, status, rusage = os.wait4(process.pid, 0)
+    if os.WIFSIGNALED(status):
+        process.returncode = -os.WTERMSIG(status)
     else:
-        capture_stdout_stderr = False
+        process.returncode = os.WEXITSTATUS(status)
 
-    if not capture_stdout_stderr:
-        # device null
-        devnull = open(os.devnull, 'w')
-        Out_fileno = devnull
-        Err_fileno = devnull
-    else:
-        # We're going to capture STDOUT and STDERR to a file (FULL DEBUG)
-        #-- start of exclusive zone --
-        lock = threading.Lock()
-        lock.acquire()
-        Sequence_S = ("%05d") %\
-                (FindSignedPDFsFilesIngestModuleFactory.g_PDFFiles_count)
-        lock.release()
-         #-- end of exclusive zone --
+    result.returncode    = process.returncode
+    result.user_cpu_secs = rusage.ru_utime
+    result.sys_cpu_secs  = rusage.ru_stime
+    # ru_maxrss is in KB on Linux
+    result.max_rss_kb    = rusage.ru_maxrss
 
+#--------------------------------------------------------------------
+# Collect the output of 'process' while a helper thread samples its
+# /proc/<pid> (CPU times of 'stat', VmHWM of 'status'), filling
+# returncode, output and resource usage fields of 'result'.
+# The wrappers of apply_tool_limits exec the tool in the same process.
+# The last sample is taken at most C_PROC_SAMPLE_SECS before the end:
+# the CPU time of that interval is missed. A run too short for a
+# sample keeps the usage unknown (-1).
+# @param process [IN] Popen object
+# @param result  [IN/OUT] ToolRunResult object
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def wait_with_proc_samples(process, result):
+    """wait for process, sampling its /proc usage into result"""
+    done = threading.Event()
+    def sample_proc():
+        while True:
+            usage_T = read_proc_usage_T(process.pid)
+            if usage_T is not None:
+                user_cpu_secs, sys_cpu_secs, max_rss_kb = usage_T
+                result.user_cpu_secs = user_cpu_secs
+                result.sys_cpu_secs  = sys_cpu_secs
+                result.max_rss_kb = max(result.max_rss_kb, max_rss_kb)
+            if done.wait(C_PROC_SAMPLE_SECS) or done.isSet():
+                return
+    sampler_thread = threading.Thread(target=sample_proc)
+    sampler_thread.setDaemon(True)
+    sampler_thread.start()
+
+    try:
+        stdout_S, stderr_S = process.communicate()
+    finally:
+        done.set()
+        sampler_thread.join()
+    result.returncode = process.returncode
+    result.stdout_S = stdout_S or ""
+    result.stderr_S = stderr_S or ""
 
-        # STDOUT and STDERR are going to be save in the case's TEMP directory
-        temp_directory_S = Case.getCurrentCase().getTempDirectory()
-        Out_filename = ("%s\out_is_signed_%s.txt") %\
-                                    (temp_directory_S,Sequence_S)
-        Err_filename = ("%s\err_is_signed_%s.txt") %\
-                    (temp_directory_S,Sequence_S)
+#--------------------------------------------------------------------
+# Resource usage of a running process, from /proc/<pid>/stat (utime,
+# stime, plus cutime and cstime of its reaped children, e.g., the JVM
+# of a launcher script) and /proc/<pid>/status (VmHWM: peak RSS)
+# @param pid [IN] process id
+# @return (user CPU secs, sys CPU secs, peak RSS KB or -1),
+#         None if the process is gone
+# 2026-10-19
+#--------------------------------------------------------------------
+def read_proc_usage_T(pid):
+    """CPU times and peak RSS of a running process (/proc)"""
+    try:
+        with open("/proc/%d/stat" % (pid), "r") as f:
+            stat_S = f.read()
+        max_rss_kb = -1
+        with open("/proc/%d/status" % (pid), "r") as f:
+            for line_S in f:
+                if line_S.startswith("VmHWM:"):
+                    max_rss_kb = int(line_S.split()[1])
+                    break
+    except (IOError, OSError, ValueError):
+        return None
 
-        Out_fileno = open(Out_filename,"w")
-        Err_fileno = open(Err_filename,"w")
+    # the command name (2nd field) may hold spaces and parentheses
+    fields_L = stat_S[stat_S.rfind(")") + 2:].split()
+    try:
+        utime, stime, cutime, cstime = [int(S) for S in fields_L[11:15]]
+    except ValueError:
+        return None
+    return ((utime + cutime) / C_PROC_CLOCK_TICKS,
+            (stime + cstime) / C_PROC_CLOCK_TICKS, max_rss_kb)
 
-    ret_verifier = None
+#--------------------------------------------------------------------
+# @param size [IN] size in bytes
+# @return label of the size bucket of 'size' (see C_SIZE_BUCKETS_L)
+# 2026-10-19
+#--------------------------------------------------------------------
+def size_bucket_S(size):
+    """returns the size bucket label of 'size' bytes"""
+    for limit, label_S in C_SIZE_BUCKETS_L:
+        if limit is None or size < limit:
+            return label_S
 
-    if capture_stdout_stderr:
-        ret_verifier = subprocess.call(
-             [path_verifier,path_pdf_file],stdout=Out_fileno,stderr=Err_fileno)
-        Out_fileno.write(("ret_verifier=%s") % (ret_verifier))
-        Out_fileno.close()
-        Err_fileno.close()
-    else:
-        ret_verifier = subprocess.call(
-                  [path_verifier,path_pdf_file],stdout=devnull,stderr=devnull)
-        devnull.close()
+#--------------------------------------------------------------------
+# Add a tool run to the per (tool, size bucket) accounting and to
+# the list of the most expensive runs.
+# @param result [IN] ToolRunResult object
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def account_tool_run(result):
+    """aggregate the resource usage of a tool run"""
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    key = (result.tool_S, size_bucket_S(result.input_bytes))
+    cost = result.cost_secs()
+
+    #-- start of exclusive zone --
+    Factory.g_lock.acquire()
+    usage_L = Factory.g_tool_usage_D.get(key)
+    if usage_L is None:
+        usage_L = [0, 0.0, 0.0, 0.0, 0, 0]
+        if result.user_cpu_secs < 0:
+            # CPU/RSS can't be measured on this platform
+            usage_L[C_USAGE_USER_CPU] = -1.0
+            usage_L[C_USAGE_SYS_CPU]  = -1.0
+            usage_L[C_USAGE_MAX_RSS]  = -1
+        Factory.g_tool_usage_D[key] = usage_L
+
+    usage_L[C_USAGE_RUNS]  += 1
+    usage_L[C_USAGE_WALL]  += result.wall_secs
+    usage_L[C_USAGE_BYTES] += result.input_bytes
+    if result.user_cpu_secs >= 0:
+        usage_L[C_USAGE_USER_CPU] += result.user_cpu_secs
+        usage_L[C_USAGE_SYS_CPU]  += result.sys_cpu_secs
+        usage_L[C_USAGE_MAX_RSS] = max(usage_L[C_USAGE_MAX_RSS],
+                                                    result.max_rss_kb)
+
+    entry = (cost, result.tool_S, result.evidence_path_S, result.path_S,
+             result.input_bytes, result.wall_secs, result.user_cpu_secs,
+             result.sys_cpu_secs, result.max_rss_kb)
+    if len(Factory.g_tool_top_L) < Factory.g_tool_top_n:
+        heapq.heappush(Factory.g_tool_top_L, entry)
+    elif Factory.g_tool_top_n > 0 and cost > Factory.g_tool_top_L[0][0]:
+        heapq.heapreplace(Factory.g_tool_top_L, entry)
+    Factory.g_lock.release()
+    #-- end of exclusive zone --
 
-    return ret_verifier
+#--------------------------------------------------------------------
+# Write the tools accounting (see report_tool_usage) to a CSV file
+# @param usage_D   [IN] (tool, size bucket) -> accounting list
+# @param top_L     [IN] most expensive runs (sorted)
+# @param col_sep_S [IN] separator for CSV
+# @param filename  [IN] name of file to dump CSV
+# @return 0 if filename exists, 1 otherwise
+# 2026-10-19
+#--------------------------------------------------------------------
+def tool_usage2CSVfile(usage_D, top_L, col_sep_S, filename):
+    """write the tools accounting in CSV format to file 'filename'"""
+    if os.path.exists(filename):
+        return 0
 
-#---------------------------------------
-# Return codes for verifier.exe (JSign)
-#---------------------------------------
-C_PDF_code_D = { 
-        0: 'SIG_STAT_CODE_INFO_SIGNATURE_VALID', 
-        10: 'SIG_STAT_CODE_WARNING_NO_SIGNATURE',
-        15: 'SIG_STAT_CODE_WARNING_ANY_WARNING',
-        20: 'SIG_STAT_CODE_WARNING_NO_REVOCATION_INFO',
-        30: 'SIG_STAT_CODE_WARNING_TIMESTAMP_INVALID',
-        40: 'SIG_STAT_CODE_WARNING_NO_TIMESTAMP_TOKEN',
-        50: 'SIG_STAT_CODE_WARNING_SIGNATURE_OCSP_INVALID',
-        60: 'SIG_STAT_CODE_WARNING_CERTIFICATE_CANT_BE_VERIFIED',
-        61: 'SIG_STAT_CODE_WARNING_CERTIFICATE_EXPIRED',
-        62: 'SIG_STAT_CODE_WARNING_CERTIFICATE_NOT_YET_VALID',
-        63: 'SIG_STAT_CODE_WARNING_CERTIFICATE_REVOKED',
-        64: 'SIG_STAT_CODE_WARNING_CERTIFICATE_UNSUPPORTED_CRITICAL_EXTENSION',
-        65: 'SIG_STAT_CODE_WARNING_CERTIFICATE_INVALID_STATE',
-        66: 'SIG_STAT_CODE_WARNING_CERTIFICATE_PROBLEM',
-        70: 'SIG_STAT_CODE_WARNING_UNSIGNED_CONTENT',
-        101:'SIG_STAT_CODE_ERROR_FILE_NOT_READABLE',
-        102: 'SIG_STAT_CODE_ERROR_UNEXPECTED_PROBLEM',
-        105: 'SIG_STAT_CODE_ERROR_ANY_ERROR',
-        110: 'SIG_STAT_CODE_ERROR_CERTIFICATION_BROKEN',
-        120: 'SIG_STAT_CODE_ERROR_REVISION_MODIFIED' }
+    encoding_S = 'utf-8'
+    with open(filename,'w') as f:
+        S = col_sep_S.join(["#Tool", "SizeBucket", "Runs", "WallSecs",
+                "UserCPUSecs", "SysCPUSecs", "MaxRSS_KB", "InputBytes"])
+        f.write(S + "\n")
+        for tool_S, bucket_S in sorted(usage_D.iterkeys()):
+            U = usage_D[(tool_S, bucket_S)]
+            S = col_sep_S.join([tool_S, bucket_S, "%d" % U[C_USAGE_RUNS],
+                    "%.3f" % U[C_USAGE_WALL], "%.3f" % U[C_USAGE_USER_CPU],
+                    "%.3f" % U[C_USAGE_SYS_CPU], "%d" % U[C_USAGE_MAX_RSS],
+                    "%d" % U[C_USAGE_BYTES]])
+            f.write(S + "\n")
+
+        f.write("\n")
+        S = col_sep_S.join(["#TopCostSecs", "Tool", "FullPath", "InputBytes",
+                "WallSecs", "UserCPUSecs", "SysCPUSecs", "MaxRSS_KB",
+                "TempPath"])
+        f.write(S + "\n")
+        for (cost, tool_S, evidence_path_S, path_S, size, wall, user_cpu,
+                                                sys_cpu, rss) in top_L:
+            S = col_sep_S.join(["%.3f" % cost, tool_S, evidence_path_S,
+                    "%d" % size, "%.3f" % wall, "%.3f" % user_cpu,
+                    "%.3f" % sys_cpu, "%d" % rss, path_S])
+            f.write(S.encode(encoding_S) + "\n")
+
+    return 1
 
 #--------------------------------------------------------------------
-# Returns a string representation of a JSigner PDF's code
-# @param pdf_code [IN] numerical PDF code
-# @return String representation as shown on C_PDF_code_D dictionary
-# 2017-08-07
+# @param secs [IN] seconds (negative: unknown)
+# @return string with the seconds, "n/a" if unknown
+# 2026-10-19
 #--------------------------------------------------------------------
-def pdf_code_2_str(pdf_code):
-    """returns a string representation of a PDF code"""
-    if pdf_code in C_PDF_code_D:
-        return C_PDF_code_D[pdf_code]
-    else:
-        return "ERROR: unkwown code"
+def secs_or_na_S(secs):
+    """format seconds, 'n/a' when unknown"""
+    if secs < 0:
+        return "n/a"
+    return "%.1fs" % (secs)
+
+def value_or_na_S(value):
+    """format a value, 'n/a' when unknown (negative)"""
+    if value < 0:
+        return "n/a"
+    return "%d" % (value)
 
 #--------------------------------------------------------------------
-# Write the content of dict_D as CSV content to the file 'filename'
-# @param dict_D [IN] dictionary to write as CSV
-# @param col_sep_S [IN] separator for CSV
-# @param filename [IN] name of file to dump CSV
+# Write the outcome of the retry queue to a CSV file
+# @param recovered_L [IN] full paths of the recovered files
+# @param permanent_L [IN] (full path, reason) of the failed files
+# @param col_sep_S   [IN] separator for CSV
+# @param filename    [IN] name of file to dump CSV
 # @return 0 if filename exists, 1 otherwise
-# 2017-08-07
+# 2026-10-19
 #--------------------------------------------------------------------
-def pdf_permissions_dict2CSVfile(dict_D, col_sep_S, filename):
-    """write content of dict_D in CSV format to file 'filename'"""
-    assert dict_D != None, "dict_D is None"
-    assert filename is not None , "filename is empty string"
-    assert len(filename)!=0 , "filename is empty string"
-
+def retry_outcome2CSVfile(recovered_L, permanent_L, col_sep_S, filename):
+    """write the outcome of the retries in CSV format to 'filename'"""
     if os.path.exists(filename):
         return 0
 
-    # We use encoding compatible with Windows, others filenames 
-    # with special characters are mangled, etc.
-    # encoding_S = 'utf-16-le'
-    # It works with utf-8 encoding.
     encoding_S = 'utf-8'
-    S = "#FullPath%sEncryptFlag%sUserAccessFlag%sUserAccess_S%s" %\
-            (col_sep_S,col_sep_S,col_sep_S,"\n")
-    Header_S = S.encode(encoding_S)                         
-
     with open(filename,'w') as f:
-        # NOTE: if the BOM_UTF16_LE is added to the file, the CSV file
-        # becomes mangled when read by EXCEL (I didn't try with libreoffice
-        # or other programs). So, for now, the BOM below is commented out.
-        # 
-        # f.write(codecs.BOM_UTF16_LE)
+        S = "#FullPath%sOutcome%sReason%s" % (col_sep_S,col_sep_S,"\n")
+        f.write(S)
+        for fullFilePath_S in recovered_L:
+            S = "%s%sRECOVERED%s%s" % (fullFilePath_S,col_sep_S,col_sep_S,"\n")
+            f.write(S.encode(encoding_S))
+        for fullFilePath_S, reason_S in permanent_L:
+            S = "%s%sFAILED%s%s%s" %\
+                    (fullFilePath_S,col_sep_S,col_sep_S,reason_S,"\n")
+            f.write(S.encode(encoding_S))
 
+    return 1
 
-        # Write header
-        f.write(Header_S)
-        f.write("\n")
+#--------------------------------------------------------------------
+# @return number of cores available to the JVM (or to Python)
+# 2026-10-19
+#--------------------------------------------------------------------
+def get_num_cores():
+    """number of available cores"""
+    try:
+        return Runtime.getRuntime().availableProcessors()
+    except:
+        import multiprocessing
+        return multiprocessing.cpu_count()
 
-        for key,value in sorted(dict_D.iteritems()):
+#--------------------------------------------------------------------
+# @return system load average of the last minute, -1 if not
+#         available (e.g., on Windows)
+# 2026-10-19
+#--------------------------------------------------------------------
+def get_system_load():
+    """load average of the last minute"""
+    try:
+        return ManagementFactory.getOperatingSystemMXBean()\
+                                        .getSystemLoadAverage()
+    except:
+        if hasattr(os, "getloadavg"):
+            return os.getloadavg()[0]
+        return -1.0
 
-            value_0 = "(empty)"
-            value_1 = "(empty)"
-            value_2 = "(empty)"
-            value_len = len(value)
-            if value_len >= 1:
-                value_0 = value[0]
-            if value_len >= 2:
-                value_1 = value[1]
-            if value_len >= 3:
-                value_2 = value[2]
+#--------------------------------------------------------------------
+# Permissions list [User_Access_flag, User_Access_code, Encryption_flag]
+# from the exiftool tags of a PDF file
+# @param data_D [IN] exiftool tags (see get_pdf_metadata)
+# @return permissions list
+# 2026-10-19
+#--------------------------------------------------------------------
+def permissions_from_exif_D(data_D):
+    """permissions list from the exiftool tags"""
+    Encryption_flag = False
+    User_Access_flag = False
+    User_Access_code_binary = 0
+
+    C_ENCRYPTION_key="Encryption"
+    if C_ENCRYPTION_key in data_D:
+        Encryption_flag = True
+
+    C_USER_ACCESS_key="UserAccess"
+    if C_USER_ACCESS_key in data_D:
+        User_Access_value_S = data_D[C_USER_ACCESS_key]
+        User_Access_flag = True
+
+        User_Access_code_binary = user_access_to_int( User_Access_value_S )
+
+    return [User_Access_flag,User_Access_code_binary,Encryption_flag]
+
+#--------------------------------------------------------------------
+# Native scan of a PDF file for signature indicators, in a single
+# forward pass (chunks with overlap, so tokens across chunk
+# boundaries are found). Object streams, which may hold compressed
+# signature dictionaries, are then inflated and scanned as well.
+# @param path_S [IN] PDF file
+# @return dict with the facts C_FACT_SIG_INDICATORS (sorted list),
+#         C_FACT_ACROFORM, C_FACT_OBJSTM, C_FACT_ENCRYPT_DICT and
+#         C_FACT_SCAN_COMPLETE
+# 2026-10-19
+#--------------------------------------------------------------------
+def scan_pdf_indicators(path_S):
+    """scan a PDF file for signature indicators"""
+    tokens_D = {}
+    objstm_offsets_L = []
+    scan_complete = True
+
+    try:
+        with open(path_S, "rb") as f:
+            offset = 0          # file offset of buf[0]
+            objstm_pending = False
+            buf = ""
+            while True:
+                chunk = f.read(C_SCAN_CHUNK_SIZE)
+                if not chunk:
+                    break
+                buf = buf + chunk
+                scan_tokens(buf, tokens_D)
+
+                # Data offsets of the object streams (the keyword
+                # 'stream' follows the dictionary, maybe in the next chunk)
+                starts_L = [match.end() for match in
+                                        C_SCAN_OBJSTM_RE.finditer(buf)]
+                if objstm_pending:
+                    starts_L.insert(0, 0)
+                objstm_pending = False
+                for start in starts_L:
+                    stream_match = C_SCAN_STREAM_RE.search(buf, start)
+                    if stream_match is None:
+                        objstm_pending = True
+                        continue
+                    data_offset = offset + stream_match.end()
+                    if data_offset not in objstm_offsets_L:
+                        objstm_offsets_L.append(data_offset)
+
+                keep = min(len(buf), C_SCAN_OVERLAP)
+                offset += len(buf) - keep
+                buf = buf[len(buf) - keep:]
+
+            if objstm_pending or C_SCAN_ESCAPED_OBJSTM in tokens_D:
+                scan_complete = False
+            out_left = C_SCAN_OBJSTM_MAX_OUT
+            for data_offset in objstm_offsets_L:
+                scanned, out_bytes = scan_objstm(f, data_offset, tokens_D,
+                                                                out_left)
+                out_left -= out_bytes
+                if not scanned:
+                    scan_complete = False
+    except IOError:
+        scan_complete = False
+
+    facts_D = {}
+    facts_D[C_FACT_SIG_INDICATORS] = sorted([token_S for token_S in tokens_D
+                                    if token_S in C_SCAN_SIG_TOKENS_L])
+    facts_D[C_FACT_ACROFORM]      = "AcroForm" in tokens_D
+    facts_D[C_FACT_OBJSTM]        = len(objstm_offsets_L)
+    facts_D[C_FACT_ENCRYPT_DICT]  = "Encrypt" in tokens_D
+    facts_D[C_FACT_SCAN_COMPLETE] = scan_complete
+    return facts_D
+
+#--------------------------------------------------------------------
+# Record the tokens of C_SCAN_RE found in 'buf', names with #xx
+# escapes included
+# @param buf      [IN] bytes to scan
+# @param tokens_D [IN/OUT] token -> True
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def scan_tokens(buf, tokens_D):
+    """record the scan tokens of buf"""
+    for match in C_SCAN_RE.finditer(buf):
+        token_S = match.group(1) or match.group(2)
+        if token_S is not None:
+            tokens_D[token_S] = True
+            continue
+
+        name_S = decode_name_S(match.group(3))
+        if name_S in C_SCAN_NAMES_D:
+            tokens_D[name_S] = True
+            if name_S == "ObjStm":
+                tokens_D[C_SCAN_ESCAPED_OBJSTM] = True
+        elif name_S in C_SCAN_SIG_NAMES_D:
+            window_S = decode_name_S(buf[
+                            max(0, match.start() - C_SCAN_ESCAPE_WINDOW):
+                            match.end() + C_SCAN_ESCAPE_WINDOW])
+            for window_match in C_SCAN_RE.finditer(window_S):
+                if window_match.group(2) is not None:
+                    tokens_D[window_match.group(2)] = True
+
+#--------------------------------------------------------------------
+# Decode the #xx escapes of PDF names
+# @param name_S [IN] name (or bytes with names)
+# @return decoded string
+# 2026-10-19
+#--------------------------------------------------------------------
+def decode_name_S(name_S):
+    """decode the #xx escapes of a PDF name"""
+    return C_NAME_ESCAPE_RE.sub(
+                lambda escape: chr(int(escape.group(1), 16)), name_S)
+
+#--------------------------------------------------------------------
+# Inflate the object stream whose data starts at 'data_offset' and
+# scan it. The stream is read in chunks until zlib reports its end,
+# and inflated in output chunks of C_SCAN_CHUNK_SIZE bytes (memory
+# doesn't depend on the compression ratio).
+# @param f           [IN] PDF file (open)
+# @param data_offset [IN] offset of the stream data
+# @param tokens_D    [IN/OUT] token -> True
+# @param max_out     [IN] max bytes to inflate
+# @return (True if the stream was scanned, False otherwise (not
+#         FlateDecode, encrypted, truncated or too big), bytes inflated)
+# 2026-10-19
+#--------------------------------------------------------------------
+def scan_objstm(f, data_offset, tokens_D, max_out):
+    """inflate and scan an object stream"""
+    decompressor = zlib.decompressobj()
+    f.seek(data_offset)
+    bytes_read = 0
+    out_bytes = 0
+    tail = ""
+    while bytes_read < C_SCAN_OBJSTM_MAX_BYTES:
+        chunk = f.read(C_SCAN_CHUNK_SIZE)
+        if not chunk:
+            return (False, out_bytes)
+        bytes_read += len(chunk)
+        pending = chunk
+        while len(pending) > 0:
+            if out_bytes >= max_out:
+                return (False, out_bytes)
+            try:
+                data = decompressor.decompress(pending,
+                                    min(C_SCAN_CHUNK_SIZE, max_out - out_bytes))
+            except zlib.error:
+                return (False, out_bytes)
+            out_bytes += len(data)
+            buf = tail + data
+            scan_tokens(buf, tokens_D)
+            tail = buf[-C_SCAN_OVERLAP:]
+            if decompressor.unused_data:
+                # end of the compressed stream
+                return (True, out_bytes)
+            pending = decompressor.unconsumed_tail
+    return (False, out_bytes)
+
+#--------------------------------------------------------------------
+# Decision table of the triage (see C_TRIAGE_DECISION_D)
+# @param facts_D [IN] triage facts
+# @return True if the verifier must be run
+# 2026-10-19
+#--------------------------------------------------------------------
+def triage_needs_verifier(facts_D):
+    """decide from the triage facts whether to run the verifier"""
+    key_T = (len(facts_D[C_FACT_SIG_INDICATORS]) > 0,
+             facts_D[C_FACT_SCAN_COMPLETE])
+    return C_TRIAGE_DECISION_D[key_T]
+
+#--------------------------------------------------------------------
+# Rule of the analysis flow for the facts 'facts_D': the cheapest
+# of the matching rules of C_FLOW_RULES_L (the first one on ties)
+# @param facts_D [IN] facts of the analysis (C_FLOW_*)
+# @return rule tuple, None if no rule matches
+# 2026-10-19
+#--------------------------------------------------------------------
+def choose_flow_rule(facts_D):
+    """cheapest flow rule matching the facts"""
+    best_rule_T = None
+    for rule_T in C_FLOW_RULES_L:
+        matches = True
+        for fact_S, accepted_T in rule_T[C_RULE_WHEN].iteritems():
+            if facts_D[fact_S] not in accepted_T:
+                matches = False
+                break
+        if not matches:
+            continue
+        if best_rule_T is None or rule_T[C_RULE_COST] < best_rule_T[C_RULE_COST]:
+            best_rule_T = rule_T
+    return best_rule_T
+
+#--------------------------------------------------------------------
+# Count a firing of the flow rule 'rule_S'
+# @param rule_S [IN] rule name
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def count_flow_rule(rule_S):
+    """count a flow rule fired"""
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    Factory.g_lock.acquire()
+    Factory.g_flow_rules_stats_D[rule_S] += 1
+    Factory.g_lock.release()
+
+#--------------------------------------------------------------------
+# Flow state (C_SIGNATURE_*) of a verifier code
+# @param signed_code [IN] verifier code (see C_PDF_code_D)
+# @return C_SIGNATURE_* string
+# 2026-10-19
+#--------------------------------------------------------------------
+def signature_state_S(signed_code):
+    """flow state of a verifier code"""
+    if signed_code == 0 or (signed_code >= 20 and signed_code <= 66):
+        return C_SIGNATURE_SIGNED
+    if signed_code == C_SIG_STAT_CODE_NO_SIGNATURE:
+        return C_SIGNATURE_NOT_SIGNED
+    if signed_code in C_RETRY_SIG_CODES_L:
+        return C_SIGNATURE_TRANSIENT
+    if signed_code in C_REVISION_CODES_L:
+        return C_SIGNATURE_MODIFIED
+    return C_SIGNATURE_FAILED
+
+#--------------------------------------------------------------------
+# Kill a process of a tool (no error if it is already gone)
+# @param process [IN] Popen object
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def kill_process(process):
+    """kill a tool process, ignoring processes already gone"""
+    try:
+        process.kill()
+    except OSError:
+        pass
+
+#--------------------------------------------------------------------
+# Quick check of whether a file may be a PDF file (by the extension
+# or by the MIME type), for the fast-reject path of process().
+# is_pdf_file() has the final say on the candidates.
+# @param file   [IN] AbstractFile
+# @param name_S [IN] name of the file
+# @return True if the file is a candidate PDF file
+# 2026-10-19
+#--------------------------------------------------------------------
+def is_pdf_candidate(file, name_S):
+    """quick extension/MIME check of a candidate PDF file"""
+    if name_S[-4:] in C_PDF_EXTENSIONS_D:
+        return True
+    return file.getMIMEType() in C_PDF_MIME_TYPES_D
+
+#--------------------------------------------------------------------
+# Incremental update analysis of a PDF file, in a single forward pass
+# with constant memory (the buffer, plus a few counters and up to
+# C_REVISION_MAX_OBJECTS object numbers per signature).
+# A revision ends with a %%EOF (after its xref/trailer and startxref).
+# A signature covers the bytes up to the end of its /ByteRange, i.e.,
+# up to the end of a revision: the objects whose header comes after
+# that end were written after signing. They are "changed" if their
+# number existed when the file was signed (max object number and
+# /Size seen before), "added" otherwise. Xref streams are not counted.
+# Objects inside object streams are not seen (the object stream is).
+# @param path_S [IN] path of the PDF file
+# @return dict (see C_REV_*), JSON serializable (checkpoint)
+# 2026-10-19
+#--------------------------------------------------------------------
+def analyze_revisions(path_S):
+    """find the revisions and the changes after signing of a PDF file"""
+    eof_ends_L = []
+    signatures_L = []
+    max_obj_num = -1
+    last_size = 0
+    file_size = 0
+
+    with open(path_S, "rb") as f:
+        buf = ""
+        offset = 0          # file offset of buf[0]
+        final = False
+        while not final:
+            chunk = f.read(C_SCAN_CHUNK_SIZE)
+            final = not chunk
+            file_size += len(chunk)
+            buf = buf + chunk
+
+            # tokens close to the end wait for the next chunk (they may
+            # be cut, and the dictionary of an object must be there)
+            limit = len(buf)
+            if not final:
+                limit = max(0, len(buf) - C_REVISION_PEEK)
+            keep_from = limit
+            for match in C_REVISION_RE.finditer(buf):
+                if match.start() >= limit:
+                    break
+                keep_from = max(limit, match.end())
+                token_offset = offset + match.start()
+
+                if match.group(1) is not None:
+                    obj_num = int(match.group(1))
+                    # dictionary of the object (before its data)
+                    dict_S = buf[match.end():match.end() + C_REVISION_PEEK]
+                    for end_S in ("stream", "endobj"):
+                        end = dict_S.find(end_S)
+                        if end >= 0:
+                            dict_S = dict_S[:end]
+                    is_xref = C_XREF_STREAM_RE.search(dict_S) is not None
+                    for signature_D in signatures_L:
+                        if token_offset < signature_D["end"] or is_xref:
+                            continue
+                        if signature_D["baseline"] is None:
+                            signature_D["baseline"] = \
+                                            max(max_obj_num, last_size - 1)
+                        if obj_num <= signature_D["baseline"]:
+                            count_revision_object(signature_D,
+                                    C_REV_CHANGED, C_REV_CHANGED_OBJS, obj_num)
+                        else:
+                            count_revision_object(signature_D,
+                                    C_REV_ADDED, C_REV_ADDED_OBJS, obj_num)
+                    max_obj_num = max(max_obj_num, obj_num)
+                elif match.group(2) is not None:
+                    byte_range_L = [int(match.group(i)) for i in range(2, 6)]
+                    signatures_L.append({
+                            C_REV_BYTE_RANGE: byte_range_L,
+                            "end": byte_range_L[2] + byte_range_L[3],
+                            "baseline": None,
+                            C_REV_CHANGED: 0, C_REV_ADDED: 0,
+                            C_REV_CHANGED_OBJS: [], C_REV_ADDED_OBJS: []})
+                elif match.group(6) is not None:
+                    last_size = int(match.group(6))
+                else:
+                    eof_ends_L.append(token_offset + len(C_CARVE_EOF))
+
+            keep_from = min(keep_from, len(buf))
+            offset += keep_from
+            buf = buf[keep_from:]
+
+    last_signed_end = 0
+    for signature_D in signatures_L:
+        end = signature_D.pop("end")
+        del signature_D["baseline"]
+        # revision covered: the one whose %%EOF ends the byte range
+        signature_D[C_REV_REVISION] = 1 + len([eof_end for eof_end
+                    in eof_ends_L if eof_end + C_REVISION_EOL_MAX < end])
+        last_signed_end = max(last_signed_end, end)
+
+    return {C_REV_REVISIONS: len(eof_ends_L),
+            C_REV_SIGNATURES: signatures_L,
+            C_REV_UNSIGNED_BYTES: max(0, file_size - last_signed_end)}
+
+#--------------------------------------------------------------------
+# Count an object written after a signature (see analyze_revisions)
+# @param signature_D [IN/OUT] signature of the revision scan
+# @param count_key_S [IN] C_REV_CHANGED or C_REV_ADDED
+# @param objs_key_S  [IN] C_REV_CHANGED_OBJS or C_REV_ADDED_OBJS
+# @param obj_num     [IN] object number
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def count_revision_object(signature_D, count_key_S, objs_key_S, obj_num):
+    """count an object written after a signature"""
+    signature_D[count_key_S] += 1
+    if len(signature_D[objs_key_S]) < C_REVISION_MAX_OBJECTS:
+        signature_D[objs_key_S].append(obj_num)
+
+#--------------------------------------------------------------------
+# Values of the revision columns of the CSV file of the signed files
+# (see C_REVISION_CSV_COLUMNS_L)
+# @param revisions_D [IN] result of analyze_revisions
+# @return list of values
+# 2026-10-19
+#--------------------------------------------------------------------
+def revisions_csv_L(revisions_D):
+    """CSV values of the revisions of a PDF file"""
+    signatures_L = revisions_D[C_REV_SIGNATURES]
+    changed, added = 0, 0
+    if len(signatures_L) > 0:
+        changed = signatures_L[0][C_REV_CHANGED]
+        added = signatures_L[0][C_REV_ADDED]
+    return [revisions_D[C_REV_REVISIONS],
+            ",".join(["%d" % (signature_D[C_REV_REVISION])
+                                    for signature_D in signatures_L]),
+            changed, added, revisions_D[C_REV_UNSIGNED_BYTES]]
+
+#--------------------------------------------------------------------
+# Text of the revisions of a PDF file (artifact comment), e.g.,
+# "3 revisions; signature 1 (revision 1): 2 objects changed [5, 9],
+#  1 added [12] after signing; 1834 unsigned bytes"
+# @param revisions_D [IN] result of analyze_revisions
+# @return text
+# 2026-10-19
+#--------------------------------------------------------------------
+def revisions_summary_S(revisions_D):
+    """text of the revisions of a PDF file"""
+    parts_L = ["%d revisions" % (revisions_D[C_REV_REVISIONS])]
+    for index, signature_D in enumerate(revisions_D[C_REV_SIGNATURES]):
+        parts_L.append("signature %d (revision %d): %d objects changed "
+                "%s, %d added %s after signing" %
+                (index + 1, signature_D[C_REV_REVISION],
+                 signature_D[C_REV_CHANGED], signature_D[C_REV_CHANGED_OBJS],
+                 signature_D[C_REV_ADDED], signature_D[C_REV_ADDED_OBJS]))
+    parts_L.append("%d unsigned bytes" % (revisions_D[C_REV_UNSIGNED_BYTES]))
+    return "; ".join(parts_L)
+
+#--------------------------------------------------------------------
+# Integrity of each signature of a PDF file, in-process (see
+# ByteRangeDigester): the file is read once, whatever the number of
+# signatures
+# With a revocation store, the CRLs of the DSS of the file are added
+# to the store before the revocation status of the signatures.
+# @param path_S           [IN] path of the PDF file
+# @param chain_cache      [IN] ChainValidationCache, None for no chain
+#                              validation
+# @param revocation_store [IN] RevocationStore, None for no revocation
+#                              status
+# @return list of dicts (see C_SIGD_*), in file order, JSON
+#         serializable (checkpoint)
+# 2026-10-19
+#--------------------------------------------------------------------
+def check_signature_digests(path_S, chain_cache=None,
+                                                revocation_store=None):
+    """integrity of each signature of a PDF file"""
+    digester = ByteRangeDigester(cms_signed_digests_T, chain_cache,
+                                                        revocation_store)
+    with open(path_S, "rb") as f:
+        while True:
+            chunk = f.read(C_SCAN_CHUNK_SIZE)
+            if not chunk:
+                break
+            digester.feed(chunk)
+
+        if revocation_store is not None:
+            source_S = "dss:%s" % (os.path.basename(path_S))
+            for offset in digester.dss_crl_offsets_L():
+                crl_S = read_stream_data_S(f, offset, C_DSS_CRL_MAX_BYTES)
+                if crl_S is None:
+                    continue
+                try:
+                    revocation_store.import_crls(crl_S, source_S, "dss")
+                except:
+                    # not a CRL (Java exceptions as well)
+                    pass
+    return digester.finish()
+
+#--------------------------------------------------------------------
+# Data of the stream of an object: FlateDecode or no filter, with a
+# direct /Length or up to "endstream"
+# @param f         [IN] PDF file (opened "rb")
+# @param offset    [IN] offset of the object header
+# @param max_bytes [IN] max bytes read, and max bytes of the data
+# @return data, None if the stream is not there, not supported or
+#         inflates to more than max_bytes
+# 2026-10-19
+#--------------------------------------------------------------------
+def read_stream_data_S(f, offset, max_bytes):
+    """data of the stream of an object"""
+    f.seek(offset)
+    buf = f.read(max_bytes)
+    stream_match = C_SCAN_STREAM_RE.search(buf)
+    if stream_match is None:
+        return None
+    dict_S = buf[:stream_match.start()]
+    if "endobj" in dict_S:
+        # an object without a stream
+        return None
+    data_S = buf[stream_match.end():]
+
+    if "/Filter" in dict_S:
+        filter_match = C_STREAM_FILTER_RE.search(dict_S)
+        if filter_match is None or\
+                (filter_match.group(1) or filter_match.group(2)) !=\
+                                                        "FlateDecode":
+            return None
+        decompressor = zlib.decompressobj()
+        try:
+            data_S = decompressor.decompress(data_S, max_bytes)
+        except zlib.error:
+            return None
+        if decompressor.unconsumed_tail:
+            # over max_bytes (e.g., a deflate bomb)
+            return None
+        return data_S
+
+    length_match = C_STREAM_LENGTH_RE.search(dict_S)
+    if length_match is not None:
+        return data_S[:int(length_match.group(1))]
+    end = data_S.find("endstream")
+    if end < 0:
+        return None
+    return data_S[:end].rstrip("\r\n")
 
-            S = "%s%s%s%s%s%s%s%s" %\
-                (key,col_sep_S,value_0,col_sep_S,
-                               value_1,col_sep_S,
-                               value_2,"\n")
-            Row_S = S.encode(encoding_S)
+#--------------------------------------------------------------------
+# Signed digests of the CMS of a signature (see C_CMS_PARSER_S):
+# messageDigest signed attribute of each signer, SHA-1 encapsulated
+# as the content (adbe.pkcs7.sha1), or imprint of a document
+# timestamp (RFC 3161). Also the certificates of the (first) signer
+# for the chain validation, at signing time if it is signed, and the
+# time of the timestamp (token of the signature, or the document
+# timestamp itself)
+# @param cms_S [IN] DER bytes of the CMS (trailing zeros allowed)
+# @return (C_SIG_KIND_*, [(hashlib name or None if not supported,
+#          signed digest or None if there is none)],
+#          (leaf X509Certificate, [other X509Certificate],
+#           signing time in ms or None) or None without certificate,
+#          time of the timestamp in ms or None)
+# 2026-10-19
+#--------------------------------------------------------------------
+def cms_signed_digests_T(cms_S):
+    """kind, signed digests and chain of the CMS of a signature"""
+    if C_CMS_PARSER_S != "bouncycastle":
+        return pkcs7_signed_digests_T(cms_S)
+
+    signed_data = CMSSignedData(cms_S)
+    signers_L = list(signed_data.getSignerInfos().getSigners())
+    if signed_data.getSignedContentTypeOID() == C_CMS_TST_INFO_OID:
+        info = TimeStampToken(signed_data).getTimeStampInfo()
+        oid_S = info.getHashAlgorithm().getAlgorithm().getId()
+        gen_time = info.getGenTime().getTime()
+        return (C_SIG_KIND_TIMESTAMP, [(C_DIGEST_OIDS_D.get(oid_S),
+                            info.getMessageImprintDigest().tostring())],
+                cms_chain_T(signed_data, signers_L, gen_time), gen_time)
+
+    content = signed_data.getSignedContent()
+    digests_L = []
+    signing_time = None
+    tsa_time = None
+    for signer in signers_L:
+        if tsa_time is None:
+            tsa_time = cms_timestamp_time(signer)
+        name_S = C_DIGEST_OIDS_D.get(signer.getDigestAlgOID())
+        expected_S = None
+        attributes = signer.getSignedAttributes()
+        if content is not None:
+            name_S = "sha1"
+            expected_S = content.getContent().tostring()
+        elif attributes is not None:
+            attribute = attributes.get(CMSAttributes.messageDigest)
+            if attribute is not None:
+                expected_S = attribute.getAttrValues().getObjectAt(0)\
+                                                .getOctets().tostring()
+        if attributes is not None and signing_time is None:
+            attribute = attributes.get(CMSAttributes.signingTime)
+            if attribute is not None:
+                signing_time = Time.getInstance(attribute.getAttrValues()\
+                                .getObjectAt(0)).getDate().getTime()
+        digests_L.append((name_S, expected_S))
+    return (C_SIG_KIND_SIGNATURE, digests_L,
+            cms_chain_T(signed_data, signers_L, signing_time), tsa_time)
 
-            f.write(Row_S)
+#--------------------------------------------------------------------
+# Time of the signature timestamp token of a signer (unsigned
+# attribute, RFC 3161), BouncyCastle
+# @param signer [IN] SignerInformation
+# @return time in ms, None without (readable) token
+# 2026-10-19
+#--------------------------------------------------------------------
+def cms_timestamp_time(signer):
+    """time of the signature timestamp token of a signer"""
+    attributes = signer.getUnsignedAttributes()
+    if attributes is None:
+        return None
+    attribute = attributes.get(
+                        PKCSObjectIdentifiers.id_aa_signatureTimeStampToken)
+    if attribute is None:
+        return None
+    try:
+        token = TimeStampToken(CMSSignedData(attribute.getAttrValues()\
+                        .getObjectAt(0).toASN1Primitive().getEncoded()))
+        return token.getTimeStampInfo().getGenTime().getTime()
+    except:
+        # malformed token (Java exceptions as well)
+        return None
 
-    # Done with the file
-    f.close()
+#--------------------------------------------------------------------
+# Certificates of the first signer of a CMS (BouncyCastle)
+# @param signed_data  [IN] CMSSignedData
+# @param signers_L    [IN] its SignerInformation
+# @param signing_time [IN] signing time in ms (None: unknown)
+# @return chain tuple (see cms_signed_digests_T), None if the
+#         certificate of the signer is not in the CMS
+# 2026-10-19
+#--------------------------------------------------------------------
+def cms_chain_T(signed_data, signers_L, signing_time):
+    """certificates of the first signer of a CMS"""
+    if len(signers_L) == 0:
+        return None
+    factory = CertificateFactory.getInstance("X.509")
+    leaf = None
+    others_L = []
+    try:
+        for holder in signed_data.getCertificates().getMatches(None):
+            cert = factory.generateCertificate(
+                                    ByteArrayInputStream(holder.getEncoded()))
+            if leaf is None and signers_L[0].getSID().match(holder):
+                leaf = cert
+            else:
+                others_L.append(cert)
+    except:
+        # malformed certificate: no chain (the digests still count)
+        return None
+    if leaf is None:
+        return None
+    return (leaf, others_L, signing_time)
 
-    return 1
+#--------------------------------------------------------------------
+# Signed digests of the CMS of a signature with the JDK's PKCS#7
+# parser (no BouncyCastle): timestamp tokens are not parsed, so
+# their digests and times can't be checked
+# @param cms_S [IN] DER bytes of the CMS
+# @return see cms_signed_digests_T
+# 2026-10-19
+#--------------------------------------------------------------------
+def pkcs7_signed_digests_T(cms_S):
+    """kind, signed digests and chain of a CMS (JDK parser)"""
+    pkcs7 = PKCS7(cms_S)
+    kind_S = C_SIG_KIND_SIGNATURE
+    if "%s" % (pkcs7.getContentInfo().getContentType()) == \
+                                                    C_CMS_TST_INFO_OID:
+        kind_S = C_SIG_KIND_TIMESTAMP
+
+    digests_L = []
+    signing_time = None
+    for signer in pkcs7.getSignerInfos():
+        name_S = C_DIGEST_OIDS_D.get(
+                        "%s" % (signer.getDigestAlgorithmId().getOID()))
+        expected_S = None
+        attributes = signer.getAuthenticatedAttributes()
+        if attributes is not None and kind_S == C_SIG_KIND_SIGNATURE:
+            value = attributes.getAttributeValue(
+                                        PKCS9Attribute.MESSAGE_DIGEST_OID)
+            if value is not None:
+                expected_S = value.tostring()
+            value = attributes.getAttributeValue(
+                                        PKCS9Attribute.SIGNING_TIME_OID)
+            if value is not None and signing_time is None:
+                signing_time = value.getTime()
+        digests_L.append((name_S, expected_S))
+
+    chain_T = None
+    signers_L = list(pkcs7.getSignerInfos())
+    if len(signers_L) > 0 and signers_L[0].getCertificate(pkcs7) is not None:
+        leaf = signers_L[0].getCertificate(pkcs7)
+        chain_T = (leaf, [cert for cert in (pkcs7.getCertificates() or [])
+                                        if not cert.equals(leaf)],
+                   signing_time)
+    return (kind_S, digests_L, chain_T, None)
 
 #--------------------------------------------------------------------
-# Write the content of dict_D as CSV content to the file 'filename'
-# @param dict_D [IN] dictionary to write as CSV
-# @param col_sep_S [IN] separator for CSV
-# @param filename [IN] name of file to dump CSV
-# @return 0 if filename exists, 1 otherwise
-# 2017-08-07
+# Integrity status of a signature: the worst of its signers
+# @param expected_L [IN] signed digests (see cms_signed_digests_T)
+# @param digests_D  [IN] hashlib name -> digest of the byte range
+# @return C_SIG_DIGEST_*
+# 2026-10-19
 #--------------------------------------------------------------------
-def pdf_signed_dict2CSVfile(dict_D, col_sep_S, filename):
-    """write content of dict_D in CSV format to file 'filename'"""
-    assert dict_D != None, "dict_D is None"
-    assert filename is not None , "filename is empty string"
-    assert len(filename)!=0 , "filename is empty string"
+def signature_digest_status_S(expected_L, digests_D):
+    """integrity status of a signature"""
+    statuses_L = []
+    for name_S, expected_S in expected_L:
+        if name_S is None:
+            statuses_L.append(C_SIG_DIGEST_UNSUPPORTED)
+        elif expected_S is None:
+            statuses_L.append(C_SIG_DIGEST_UNCHECKED)
+        elif digests_D.get(name_S) == expected_S:
+            statuses_L.append(C_SIG_DIGEST_INTACT)
+        else:
+            statuses_L.append(C_SIG_DIGEST_MISMATCH)
+    return min(statuses_L, key=C_SIG_DIGEST_STATUSES_L.index)
 
-    # Bails out if the CSV file already exists
-    if os.path.exists(filename):
-        return 0
+#--------------------------------------------------------------------
+# Validate the certificate chain of a signature (PKIX, no revocation
+# check, see RevocationStore for that)
+# @param chain_T [IN] chain tuple (see cms_signed_digests_T)
+# @param anchors [IN] Set of TrustAnchor (see jvm_trust_anchors)
+# @return C_CHAIN_VALID, C_CHAIN_ERROR or the reason of the failure
+#         in lower case (e.g., "expired", "no_trust_anchor")
+# 2026-10-19
+#--------------------------------------------------------------------
+def validate_chain_S(chain_T, anchors):
+    """outcome of the validation of a certificate chain"""
+    time_millis = chain_T[2]
+    path_L = chain_path_L(chain_T)
+    if len(path_L) > 1 and is_self_signed(path_L[-1]):
+        # the root is a trust anchor, not part of the path
+        path_L.pop()
+
+    try:
+        params = PKIXParameters(anchors)
+        params.setRevocationEnabled(False)
+        if time_millis is not None:
+            params.setDate(Date(long(time_millis)))
+        cert_path = CertificateFactory.getInstance("X.509")\
+                                            .generateCertPath(path_L)
+        CertPathValidator.getInstance("PKIX").validate(cert_path, params)
+    except CertPathValidatorException, e:
+        return ("%s" % (e.getReason())).lower()
+    except:
+        # e.g., no trust anchor at all
+        return C_CHAIN_ERROR
+    return C_CHAIN_VALID
 
-    #Debug_S = "dict_D = '%s' (%d elements)" % (dict_D,len(dict_D))
-    #assert 0, Debug_S
+#--------------------------------------------------------------------
+# Certification path of a signature: from the leaf through the
+# issuers found among the other certificates of the CMS (up to a
+# self-signed one, if there)
+# @param chain_T [IN] chain tuple (see cms_signed_digests_T)
+# @return list of X509Certificate, leaf first
+# 2026-10-19
+#--------------------------------------------------------------------
+def chain_path_L(chain_T):
+    """certification path of a signature, leaf first"""
+    leaf, others_L, time_millis = chain_T
+    path_L = [leaf]
+    remaining_L = list(others_L)
+    while not is_self_signed(path_L[-1]):
+        issuer_L = [cert for cert in remaining_L if
+                        cert.getSubjectX500Principal().equals(
+                                    path_L[-1].getIssuerX500Principal())]
+        if len(issuer_L) == 0:
+            break
+        path_L.append(issuer_L[0])
+        remaining_L.remove(issuer_L[0])
+    return path_L
 
-    # We use encoding compatible with Windows, others filenames 
-    # with special characters are mangled, etc.
-    # encoding_S = 'utf-16-le'
-    # It works with utf-8 encoding.
-    encoding_S = 'utf-8'
-    S = "#FullPath%sTmpPath%sSignedCode%sSignedCodeString%s" %\
-                        (col_sep_S,col_sep_S,col_sep_S,"\n")
-    Header_S = S.encode(encoding_S)                         
+#--------------------------------------------------------------------
+# Identity of the signer of a signature: its certificate (leaf of the
+# chain) and the signing time of the CMS
+# @param chain_T [IN] chain tuple (see cms_signed_digests_T)
+# @return dict (see C_SIGNER_*), JSON serializable (checkpoint), None
+#         if the certificate can't be read
+# 2026-10-19
+#--------------------------------------------------------------------
+def signer_identity_D(chain_T):
+    """identity of the signer of a signature"""
+    leaf, others_L, time_millis = chain_T
+    try:
+        subject_S = leaf.getSubjectX500Principal().getName("RFC2253")
+        name_S = None
+        # (RDNs from the most significant one: the last CN wins)
+        for rdn in LdapName(subject_S).getRdns():
+            if rdn.getType().upper() == "CN":
+                name_S = "%s" % (rdn.getValue())
+        signer_D = {C_SIGNER_NAME: name_S or subject_S,
+                    C_SIGNER_SUBJECT: subject_S,
+                    C_SIGNER_ISSUER:
+                        leaf.getIssuerX500Principal().getName("RFC2253"),
+                    C_SIGNER_SERIAL: leaf.getSerialNumber().toString(16),
+                    C_SIGNER_TIME: None}
+    except:
+        # malformed certificate (Java exceptions as well)
+        return None
+    if time_millis is not None:
+        signer_D[C_SIGNER_TIME] = long(time_millis)
+    return signer_D
 
-    with open(filename,'w') as f:
-        # NOTE: if the BOM_UTF16_LE is added to the file, the CSV file
-        # becomes mangled when read by EXCEL (I didn't try with libreoffice
-        # or other programs). So, the BOM below is commented out.
-        # 
-        # f.write(codecs.BOM_UTF16_LE)
+#--------------------------------------------------------------------
+# Times of the signatures of a PDF file, for the timeline: claimed
+# signing time of each signature (the signing time of a document
+# timestamp is its TSA time) and time of its timestamp
+# @param signatures_L [IN] signatures (see check_signature_digests)
+# @return [(index of the signature, C_TIME_*, time in ms, signer
+#          name or None)]
+# 2026-10-19
+#--------------------------------------------------------------------
+def signature_times_L(signatures_L):
+    """times of the signatures of a PDF file"""
+    times_L = []
+    for index, signature_D in enumerate(signatures_L):
+        signer_D = signature_D.get(C_SIGD_SIGNER) or {}
+        name_S = signer_D.get(C_SIGNER_NAME)
+        if signature_D[C_SIGD_KIND] == C_SIG_KIND_SIGNATURE and\
+                            signer_D.get(C_SIGNER_TIME) is not None:
+            times_L.append((index, C_TIME_SIGNING,
+                                    signer_D[C_SIGNER_TIME], name_S))
+        if signature_D.get(C_SIGD_TSA_TIME) is not None:
+            times_L.append((index, C_TIME_TSA,
+                                    signature_D[C_SIGD_TSA_TIME], name_S))
+    return times_L
 
-        # Write header
-        f.write(Header_S)
-        f.write("\n")
+#--------------------------------------------------------------------
+# Is a certificate self-signed (subject == issuer)?
+# @param cert [IN] X509Certificate
+# @return True if self-signed
+# 2026-10-19
+#--------------------------------------------------------------------
+def is_self_signed(cert):
+    """is a certificate self-signed?"""
+    return cert.getSubjectX500Principal().equals(
+                                            cert.getIssuerX500Principal())
 
+#--------------------------------------------------------------------
+# SHA-256 fingerprint of a certificate
+# @param cert [IN] X509Certificate
+# @return fingerprint (hex)
+# 2026-10-19
+#--------------------------------------------------------------------
+def certificate_fingerprint_S(cert):
+    """SHA-256 fingerprint of a certificate"""
+    return hashlib.sha256(cert.getEncoded().tostring()).hexdigest()
 
-        for key,value in sorted(dict_D.iteritems()):
+#--------------------------------------------------------------------
+# Trust anchors of the JVM (its cacerts trust store)
+# @return Set of TrustAnchor
+# 2026-10-19
+#--------------------------------------------------------------------
+def jvm_trust_anchors():
+    """trust anchors of the JVM's cacerts"""
+    cacerts_S = os.path.join(System.getProperty("java.home"),
+                             "lib", "security", "cacerts")
+    key_store = KeyStore.getInstance(KeyStore.getDefaultType())
+    stream = FileInputStream(cacerts_S)
+    try:
+        key_store.load(stream, None)
+    finally:
+        stream.close()
+    return PKIXParameters(key_store).getTrustAnchors()
 
-            value_0 = "(empty)"
-            value_1 = "(empty)"
-            value_2 = "(empty)"
-            value_len = len(value)
-            if value_len >= 1:
-                value_0 = value[0]
-            if value_len >= 2:
-                value_1 = value[1]
-            if value_len >= 3:
-                value_2 = value[2]
+#--------------------------------------------------------------------
+# Value of the signature digests column of the CSV file of the
+# signed files, e.g., "intact,mismatch"
+# @param signatures_L [IN] result of check_signature_digests
+# @return text
+# 2026-10-19
+#--------------------------------------------------------------------
+def signature_digests_csv_S(signatures_L):
+    """CSV value of the signature digests of a PDF file"""
+    return ",".join([signature_D[C_SIGD_STATUS]
+                                    for signature_D in signatures_L])
 
+#--------------------------------------------------------------------
+# Text of the signature digests of a PDF file (artifact), e.g.,
+# "signature 1 (sha256): intact, chain valid; timestamp 2 (sha256):
+#  mismatch, chain expired"
+# @param signatures_L [IN] result of check_signature_digests
+# @return text
+# 2026-10-19
+#--------------------------------------------------------------------
+def signature_digests_summary_S(signatures_L):
+    """text of the signature digests of a PDF file"""
+    if len(signatures_L) == 0:
+        return "no signature byte range"
+    parts_L = []
+    for index, signature_D in enumerate(signatures_L):
+        S = "%s %d (%s): %s" % (signature_D[C_SIGD_KIND], index + 1,
+                                signature_D[C_SIGD_ALGORITHM] or "?",
+                                signature_D[C_SIGD_STATUS])
+        if signature_D.get(C_SIGD_SIGNER) is not None:
+            S = S + ", signed by " + signature_D[C_SIGD_SIGNER][C_SIGNER_NAME]
+        if signature_D.get(C_SIGD_CHAIN) is not None:
+            S = S + ", chain " + signature_D[C_SIGD_CHAIN]
+        if signature_D.get(C_SIGD_REVOCATION) is not None:
+            S = S + ", revocation " + signature_D[C_SIGD_REVOCATION]
+        parts_L.append(S)
+    return "; ".join(parts_L)
 
-            S = "%s%s%s%s%s%s%s%s" %\
-                (key,col_sep_S,value_0,col_sep_S,
-                               value_1,col_sep_S,
-                               value_2,"\n")
-            Row_S = S.encode(encoding_S)
+#--------------------------------------------------------------------
+# Count the signature digests of a PDF file
+# @param signatures_L [IN] result of check_signature_digests (None:
+#                          the file couldn't be read)
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def count_signature_digests(signatures_L):
+    """count the integrity statuses of the signatures of a file"""
+    if signatures_L is None:
+        return
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    Factory.g_lock.acquire()
+    Factory.g_digest_files_count += 1
+    for signature_D in signatures_L:
+        Factory.g_digest_stats_D[signature_D[C_SIGD_STATUS]] += 1
+    Factory.g_lock.release()
 
-            f.write(Row_S)
+#--------------------------------------------------------------------
+# Sort key of the PDF candidates of the data source mode: size
+# bucket first (small files give results early), then path (files of
+# the same directory are close on disk), then size
+# @param file [IN] AbstractFile
+# @return sort key tuple
+# 2026-10-19
+#--------------------------------------------------------------------
+def pdf_candidate_sort_key(file):
+    """sort key of a PDF candidate (size bucket, path, size)"""
+    size = file.getSize()
+    bucket_index = 0
+    for limit, label_S in C_SIZE_BUCKETS_L:
+        if limit is None or size < limit:
+            break
+        bucket_index += 1
+    return (bucket_index, file.getParentPath(), size)
 
-    # Done with the file
-    f.close()
+#--------------------------------------------------------------------
+# Count the permissions of a PDF file in the histogram of the job,
+# once per file: a file to be retried is counted when its analysis
+# ends (or with the report, if its retries never end)
+# @param analysis [IN] PDFAnalysis at the end of an attempt
+# @param final    [IN] True: stop rule, False: retry rule
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def count_permissions(analysis, final):
+    """count the permissions of an analysis in the histogram"""
+    histogram = FindSignedPDFsFilesIngestModuleFactory.g_permission_histogram
+    if histogram is None:
+        return
+    counts_T = analysis.permission_counts_T
+    if not final:
+        if counts_T is not None:
+            histogram.add_retried(analysis.full_path_S, counts_T)
+        return
+    histogram.forget_retried(analysis.full_path_S)
+    if counts_T is not None:
+        histogram.add(*counts_T)
 
-    return 1
+#--------------------------------------------------------------------
+# Count the outcome of a file marked KNOWN (see C_KNOWN_FILES_FIELD)
+# at the end of its analysis
+# @param facts_D [IN] facts of the analysis
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def count_known_file(facts_D):
+    """count the outcome of a KNOWN file"""
+    known_S = facts_D[C_FLOW_KNOWN]
+    if known_S == C_KNOWN_FILES_SKIP:
+        key_S = C_KNOWN_STAT_SKIPPED
+    elif known_S != C_KNOWN_FILES_CACHED_ONLY:
+        return
+    elif facts_D[C_FLOW_SIGNATURE] == C_SIGNATURE_UNKNOWN:
+        key_S = C_KNOWN_STAT_UNCACHED
+    else:
+        key_S = C_KNOWN_STAT_CACHED
 
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    Factory.g_lock.acquire()
+    Factory.g_known_stats_D[key_S] += 1
+    Factory.g_lock.release()
 
+#--------------------------------------------------------------------
+# Keep the conclusive verdict (signed or not signed) of a file with
+# a MD5, for the known verdicts file of this case
+# @param file     [IN] AbstractFile
+# @param analysis [IN] PDFAnalysis (finished)
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def remember_known_verdict(file, analysis):
+    """keep a conclusive verdict by MD5"""
+    if analysis.facts_D[C_FLOW_SIGNATURE] not in (C_SIGNATURE_SIGNED,
+                                                  C_SIGNATURE_NOT_SIGNED,
+                                                  C_SIGNATURE_MODIFIED):
+        return
+    md5_S = file.getMd5Hash()
+    if not md5_S:
+        return
+
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    Factory.g_lock.acquire()
+    Factory.g_seen_verdicts_D[md5_S.lower()] = analysis.verdict.to_D()
+    Factory.g_lock.release()
 
 #--------------------------------------------------------------------
-# Return the current (local) timestamp in ISO 
-# format (YYYY-MM-DD_HHMinSec)
-# @param None
-# @return string with localtime in ISO format
-# 2017-08-07
+# Write known verdicts to a CSV file (MD5, verifier code, permissions)
+# @param verdicts_D [IN] MD5 -> verdict dict (see PDFVerdict.to_D)
+# @param col_sep_S  [IN] separator for CSV
+# @param filename   [IN] name of file to dump CSV
+# @return 1 (the file is rewritten: it accumulates the known verdicts)
+# 2026-10-19
 #--------------------------------------------------------------------
-def get_now_timestamp_S():
-    """return a timestamp string"""
-##    now = time.localtime()
-##    now_S = datetime.datetime.fromtimestamp(now).strftime('%Y%m%d_%H%M%S')
+def known_verdicts2CSVfile(verdicts_D, col_sep_S, filename):
+    """write the known verdicts in CSV format to 'filename'"""
+    # Keep the verdicts of the previous runs of this case
+    if os.path.exists(filename):
+        old_verdicts_D = CSVfile2known_verdicts_D(col_sep_S, filename)
+        old_verdicts_D.update(verdicts_D)
+        verdicts_D = old_verdicts_D
 
-    now_S = time.strftime('%Y%m%d_%H%M%S')
+    with open(filename,'w') as f:
+        S = col_sep_S.join(["#MD5", "SignedCode", "UserAccessFlag",
+                            "UserAccessCode", "EncryptionFlag"]) + "\n"
+        f.write(S)
+        for md5_S in sorted(verdicts_D):
+            verdict_D = verdicts_D[md5_S]
+            permissions_L = verdict_D.get("permissions")
+            if permissions_L is None or len(permissions_L) != 3:
+                permissions_L = ["", "", ""]
+            else:
+                permissions_L = [boolean2str(permissions_L[0]),
+                                 "%d" % (permissions_L[1]),
+                                 boolean2str(permissions_L[2])]
+            S = col_sep_S.join([md5_S, "%d" % (verdict_D["signed_code"])] +
+                                                    permissions_L) + "\n"
+            f.write(S)
 
-    return now_S
+    return 1
 
 #--------------------------------------------------------------------
-# Function that receives a dictionary ('dict_D') and returns
-# a string representing the dictionary.
-# Example of calling the function:
-#   dict2txt_S( dictionary )
-# @param dict_D [IN] source dictionary for CSV
-# @param add_num_elems [IN] if True, the string representing 
-# "dict_D" starts with the number of elements existing on the dict.
-# @return string representing dict_D
-# 2017-08-19
+# Read a known verdicts CSV file (see known_verdicts2CSVfile)
+# @param col_sep_S [IN] separator for CSV
+# @param filename  [IN] CSV file
+# @return dict MD5 -> verdict dict (malformed lines are skipped)
+# 2026-10-19
 #--------------------------------------------------------------------
-def dict2txt_S(dict_D,add_num_elems=False):
-    """returns a string representation of dict_D"""
+def CSVfile2known_verdicts_D(col_sep_S, filename):
+    """read the known verdicts of a CSV file"""
+    verdicts_D = {}
+    with open(filename,'r') as f:
+        for line_S in f:
+            line_S = line_S.strip()
+            if len(line_S) == 0 or line_S.startswith("#"):
+                continue
+            fields_L = line_S.split(col_sep_S)
+            if len(fields_L) != 5:
+                continue
+            try:
+                verdict_D = {"signed_code": int(fields_L[1]),
+                             "permissions": None}
+                if len(fields_L[3]) > 0:
+                    verdict_D["permissions"] = [str2boolean(fields_L[2]),
+                                                int(fields_L[3]),
+                                                str2boolean(fields_L[4])]
+            except ValueError:
+                continue
+            verdicts_D[fields_L[0].lower()] = verdict_D
+    return verdicts_D
 
-    if add_num_elems:
-        dict_S = "len=%s\n" % (len(dict_D))
-    else:
-        dict_S = ""
-    for key,val in dict_D.iteritems():
-        dict_S = dict_S + "\n'%s'='%s'" % (key,val)
+#--------------------------------------------------------------------
+# Path normalized for the path filters: '/' separators, lower case,
+# leading and trailing '/'
+# @param path_S [IN] path (e.g., AbstractFile.getParentPath())
+# @return normalized path
+# 2026-10-19
+#--------------------------------------------------------------------
+def normalize_path_S(path_S):
+    """normalize a path for the path filters"""
+    path_S = path_S.replace("\\", "/").lower()
+    if not path_S.startswith("/"):
+        path_S = "/" + path_S
+    if not path_S.endswith("/") and not path_S.endswith("*"):
+        path_S = path_S + "/"
+    return path_S
 
-    return dict_S
+#--------------------------------------------------------------------
+# Regex (anchored at the end) of a glob of the path filters
+# @param glob_S [IN] glob (normalized)
+# @return regex string
+# 2026-10-19
+#--------------------------------------------------------------------
+def glob_to_regex_S(glob_S):
+    """regex of a glob, without fnmatch's trailing flags"""
+    regex_S = fnmatch.translate(glob_S)
+    # Python 2.7: '...\Z(?ms)'; newer versions: '(?s:...)\Z'
+    if regex_S.endswith("(?ms)"):
+        regex_S = regex_S[:-len("(?ms)")]
+    return regex_S
 
 #--------------------------------------------------------------------
-# @param flag_str [IN] string of which a boolean representation 
-#                      is sought
-# @return True or False (boolean)
-# 2017-08-25
+# Part of the priority of a PDF file that needs no read of its
+# content (size and path): the order of the data source candidates,
+# which is computed before any budget check
+# @param file [IN] AbstractFile
+# @return score (higher first, see C_BUDGET_SCORE_*)
+# 2026-10-19
 #--------------------------------------------------------------------
-def str2boolean(flag_str):
-    """returns boolean representation of flag_str"""
-    flag_S = flag_str.lower()
-    if flag_S == "true":
-        return True
-    elif flag_S == "false":
-        return False
+def budget_base_priority(file):
+    """priority score of a PDF file from its size and path"""
+    score = 0
+    size = file.getSize()
+    if size < C_BUDGET_SMALL_BYTES:
+        score += C_BUDGET_SCORE_SMALL
+    elif size >= C_BUDGET_LARGE_BYTES:
+        score += C_BUDGET_SCORE_LARGE
+
+    if C_BUDGET_USER_PATHS_RE.search(file.getParentPath()):
+        score += C_BUDGET_SCORE_USER_PATH
+    return score
 
 #--------------------------------------------------------------------
-# @param flag [IN] flag of which a string return is wanted
-# @return True of False accordingly to the 'flag' parameter
-# 2017-08-25
+# Priority of a PDF file for the budgeted triage: small files, files
+# of the users' paths, and files with signature/encryption markers
+# (pre-scan of the start and end of the content) come first.
+# The score of a file is computed once, when the file comes up for
+# analysis (the pre-scan is charged to the budget's clock).
+# @param file [IN] AbstractFile
+# @return score (higher first, see C_BUDGET_SCORE_*)
+# 2026-10-19
 #--------------------------------------------------------------------
-def boolean2str(flag):
-    """Returns string representation of boolean flag"""
-    if flag:
-        return "True"
-    else:
-        return "False"
+def budget_priority(file):
+    """priority score of a PDF file"""
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    obj_id = file.getId()
+    score = Factory.g_budget_scores_D.get(obj_id)
+    if score is not None:
+        return score
+
+    score = budget_base_priority(file)
+    size = file.getSize()
+    tokens_D = {}
+    scan_tokens(read_content_S(file, 0, C_BUDGET_HEAD_BYTES), tokens_D)
+    if size > C_BUDGET_HEAD_BYTES:
+        tail_offset = max(C_BUDGET_HEAD_BYTES, size - C_BUDGET_TAIL_BYTES)
+        scan_tokens(read_content_S(file, tail_offset, size - tail_offset),
+                                                                tokens_D)
+    for token_S in C_SCAN_SIG_TOKENS_L:
+        if token_S in tokens_D:
+            score += C_BUDGET_SCORE_SIGNATURE
+            break
+    if "Encrypt" in tokens_D:
+        score += C_BUDGET_SCORE_ENCRYPT
+
+    Factory.g_lock.acquire()
+    Factory.g_budget_scores_D[obj_id] = score
+    Factory.g_lock.release()
+    return score
 
 #--------------------------------------------------------------------
-# Receives user_access_S string with JSON content regarding the
-# user access permission of the PDF file being analyzed.
-# It returns a bit-wise integer code pointing out which permissions are
-# ON (associated bit is 1) and which are not (associated bit is 0).
-# @param user_access_to_S [IN] JSON string with user permissions
-# @return
-# 2017-09-03
+# Read part of the content of a file (in the image, no copy)
+# @param file   [IN] AbstractFile
+# @param offset [IN] offset of the first byte
+# @param length [IN] number of bytes
+# @return bytes read (string), empty string on error
+# 2026-10-19
 #--------------------------------------------------------------------
-def user_access_to_int(user_access_S):
-    if len(user_access_S) == 0:
-        return 0
+def read_content_S(file, offset, length):
+    """read length bytes of the content of file at offset"""
+    if length <= 0:
+        return ""
+    buffer = jarray.zeros(length, "b")
+    try:
+        num_read = file.read(buffer, offset, length)
+    except:
+        return ""
+    if num_read <= 0:
+        return ""
+    return jarray_bytes_S(buffer, num_read)
 
-    user_access_L = user_access_S.split(",")
-    if len(user_access_L) == 0:
-        # No content -- empty list
-        return 0
+#--------------------------------------------------------------------
+# The first 'num_read' bytes of a Java byte array, as a string, copied
+# once (buffer.tostring()[:num_read] copies the whole array, then the
+# slice; a full buffer needs no slice)
+# @param buffer   [IN] jarray of bytes
+# @param num_read [IN] number of bytes read in the buffer
+# @return string
+# 2026-10-19
+#--------------------------------------------------------------------
+def jarray_bytes_S(buffer, num_read):
+    """bytes read in a Java byte array"""
+    if num_read == len(buffer):
+        return buffer.tostring()
+    return buffer[:num_read].tostring()
 
-    # Still here? Good
-    ret_value = 0
-    num_flags_on = 0
-    for elem in user_access_L:
-        # lower-case + remove any space from the string
-        elem_lower = elem.lower().strip()
-        if elem_lower in C_USER_ACCESS_D:
-            ret_value = ret_value + C_USER_ACCESS_D[elem_lower]
-            num_flags_on = num_flags_on + 1
+#--------------------------------------------------------------------
+# Extract the PDF files embedded in a PDF file, in a single pass over
+# its content: the embedded file streams are inflated as the chunks
+# are read (see EmbeddedStream), and the names of the embedded files
+# are taken from the file specifications met along the way.
+# @param reader     [IN] file-like object (read()) with the PDF file
+# @param prefix_S   [IN] prefix of the paths of the extracted files
+# @param limits     [IN/OUT] EmbeddedLimits
+# @param outcomes_D [IN/OUT] outcome -> count (see C_EMBEDDED_OUTCOMES_L)
+# @return list of (name, path) of the extracted PDF files
+# 2026-10-19
+#--------------------------------------------------------------------
+def extract_embedded_pdfs(reader, prefix_S, limits, outcomes_D):
+    """extract the PDF files embedded in a PDF file"""
+    extracted_L = []
+    names_D = {}        # object number -> name (file specifications)
+    buf = ""
+    offset = 0          # offset of buf[0]
+    seen = 0            # the embedded file dicts before were handled
+    current = None      # EmbeddedStream whose data is being read
+
+    def done(current):
+        outcomes_D[current.outcome_S] += 1
+        if current.outcome_S == C_EMBEDDED_PDF:
+            limits.files_left -= 1
+            extracted_L.append(current)
+
+    while True:
+        chunk = reader.read(C_SCAN_CHUNK_SIZE)
+        if not chunk:
+            break
+        if current is not None:
+            used = current.feed(chunk)
+            if not current.done:
+                offset += len(chunk)
+                continue
+            done(current)
+            current = None
+            offset += used
+            seen = offset
+            chunk = chunk[used:]
+
+        buf = buf + chunk
+        record_filespec_names(buf, names_D)
+        pos = max(0, seen - offset)
+        while True:
+            match = C_EMBEDDED_RE.search(buf, pos)
+            if match is None:
+                break
+            stream_match = C_SCAN_STREAM_RE.search(buf, match.end())
+            if stream_match is None:
+                # keyword in the next chunk
+                break
+
+            # Dictionary of the stream, from the header of its object
+            dict_start = max(0, match.start() - C_EMBEDDED_DICT_MAX)
+            obj_match = None
+            for obj_match in C_OBJ_RE.finditer(buf, dict_start,
+                                                        match.start()):
+                pass
+            obj_num = None
+            if obj_match is not None:
+                obj_num = int(obj_match.group(1))
+                dict_start = obj_match.end()
+
+            data_start = stream_match.end()
+            pos = data_start
+            seen = offset + data_start
+            current = open_embedded_stream(buf[dict_start:stream_match.start()],
+                                "%s.emb%d.pdf" % (prefix_S, offset + data_start),
+                                limits, outcomes_D, obj_num)
+            if current is None:
+                continue
+            used = current.feed(buf[data_start:])
+            if not current.done:
+                # the data goes on in the next chunks
+                break
+            done(current)
+            current = None
+            pos = data_start + used
+            seen = offset + pos
+
+        if current is not None:
+            offset += len(buf)
+            buf = ""
+            continue
+        keep = min(len(buf), C_EMBEDDED_DICT_MAX)
+        offset += len(buf) - keep
+        buf = buf[len(buf) - keep:]
+
+    if current is not None:
+        current.end(C_EMBEDDED_TRUNCATED)
+        done(current)
+
+    return [(embedded_name_S(names_D, index, stream.obj_num), stream.path_S)
+                            for index, stream in enumerate(extracted_L)]
 
-            # DEBUG
-            Msg_S = "[DEBUG] access '%s' ON (%d added to ret_value)" %\
-                    (elem_lower,C_USER_ACCESS_D[elem_lower])
-            print Msg_S
+#--------------------------------------------------------------------
+# Start the extraction of an embedded file stream
+# @param dict_S     [IN] dictionary of the stream
+# @param path_S     [IN] path of the extracted file
+# @param limits     [IN] EmbeddedLimits
+# @param outcomes_D [IN/OUT] outcome -> count
+# @param obj_num    [IN] object number of the stream (None: unknown)
+# @return EmbeddedStream, None if the stream is skipped
+# 2026-10-19
+#--------------------------------------------------------------------
+def open_embedded_stream(dict_S, path_S, limits, outcomes_D, obj_num):
+    """start the extraction of an embedded file stream"""
+    if limits.files_left <= 0 or limits.bytes_left <= 0:
+        outcomes_D[C_EMBEDDED_LIMIT] += 1
+        return None
 
-    # DEBUG
-    Msg_S = "[DEBUG] %d flags ON (ret_value=%d)" % (num_flags_on, ret_value)
-    print Msg_S
+    if "/Filter" in dict_S:
+        filter_match = C_STREAM_FILTER_RE.search(dict_S)
+        if filter_match is None or\
+                (filter_match.group(1) or filter_match.group(2)) !=\
+                                                        "FlateDecode":
+            outcomes_D[C_EMBEDDED_UNSUPPORTED] += 1
+            return None
+        return EmbeddedStream(path_S, True, 0, limits, obj_num)
+
+    length_match = C_STREAM_LENGTH_RE.search(dict_S)
+    if length_match is None:
+        # indirect /Length: the end of the data is unknown
+        outcomes_D[C_EMBEDDED_UNSUPPORTED] += 1
+        return None
+    return EmbeddedStream(path_S, False, int(length_match.group(1)),
+                                                        limits, obj_num)
 
-    return ret_value
+#--------------------------------------------------------------------
+# Record the names of the embedded files of the file specifications
+# found in 'buf' (the embedded file stream is referenced by /EF)
+# @param buf     [IN] bytes of the PDF file
+# @param names_D [IN/OUT] object number -> name
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def record_filespec_names(buf, names_D):
+    """record the names of the file specifications of buf"""
+    for ef_match in C_FILESPEC_EF_RE.finditer(buf):
+        name_match = None
+        for name_match in C_FILESPEC_NAME_RE.finditer(buf,
+                max(0, ef_match.start() - C_FILESPEC_SPAN), ef_match.start()):
+            pass
+        if name_match is not None:
+            names_D[int(ef_match.group(1))] = name_match.group(1)
 
-# --------------------------------------------------------------------
-# Convert numeric representation of user access to a 
-# string representation.
-# @param user_access_int [IN] 
-# @return string with the representation of the giver user access 
-# NOTE:
-# Only assemble and modify permissions are considered
-#
-# AssembleON_ModifyON
-# AssembleOFF_ModifyON
-# AssembleON_ModifyON
-# AssembleOFF_ModifyOFF
-# 
-# 2017-09-09
 #--------------------------------------------------------------------
+# Name of an embedded file in its nested path: the name of its file
+# specification (printable ASCII only), or its object number
+# @param names_D [IN] object number -> name
+# @param index   [IN] index of the embedded PDF file in its parent
+# @param obj_num [IN] object number of the stream (None: unknown)
+# @return name
+# 2026-10-19
+#--------------------------------------------------------------------
+def embedded_name_S(names_D, index, obj_num):
+    """name of an embedded file in its nested path"""
+    name_S = names_D.get(obj_num)
+    if name_S is None:
+        if obj_num is None:
+            return "embedded_%d.pdf" % (index)
+        return "obj_%d.pdf" % (obj_num)
+    if name_S.startswith("\xfe\xff"):
+        # UTF-16BE text string
+        name_S = name_S[2:].replace("\x00", "")
+    name_S = "".join([c if " " <= c <= "~" and c not in "\\/>"
+                                                    else "_" for c in name_S])
+    return name_S.strip() or "obj_%d.pdf" % (obj_num)
 
-def user_access_numeric_to_str(user_access_int):
-    """convert numeric user access to str for autopsy usage"""
+#--------------------------------------------------------------------
+# Nested path of the embedded file of an artifact (TSK_PATH)
+# @param art [IN] BlackboardArtifact
+# @return nested path, None for the artifacts of the file itself
+# 2026-10-19
+#--------------------------------------------------------------------
+def artifact_embedded_path_S(art):
+    """nested path of the embedded file of an artifact"""
+    attribute = art.getAttribute(BlackboardAttribute.Type(
+                            BlackboardAttribute.ATTRIBUTE_TYPE.TSK_PATH))
+    if attribute is None:
+        return None
+    return attribute.getValueString()
 
-    if ((user_access_int & C_ASSEMBLE)==0)and((user_access_int & C_MODIFY==0)):
-        return C_AssembleOFF_ModifyOFF
-    elif (user_access_int & C_ASSEMBLE) and (user_access_int & C_MODIFY):
-        return C_AssembleON_ModifyON
-    elif (user_access_int & C_ASSEMBLE) and ((user_access_int & C_MODIFY)==0):
-        return C_AssembleON_ModifyOFF
-    elif ((user_access_int & C_ASSEMBLE)==0) and (user_access_int & C_MODIFY):
-        return C_AssembleOFF_ModifyON
-    else:
-        Msg_S = "Unexpected value for user_access_int: 0x%x" % (user_access_int)
-        return Msg_S
+#--------------------------------------------------------------------
+# Text of the outcomes of the embedded file streams (for the logs)
+# @param outcomes_D [IN] outcome -> count
+# @return "outcome=count, ..."
+# 2026-10-19
+#--------------------------------------------------------------------
+def embedded_outcomes_S(outcomes_D):
+    """text of the outcomes of the embedded file streams"""
+    return ", ".join(["%s=%d" % (outcome_S, outcomes_D[outcome_S])
+                                for outcome_S in C_EMBEDDED_OUTCOMES_L])
 
 #--------------------------------------------------------------------
-# Returns True if user_access_code has one or none of 
-# C_ASSEMBLE / C_MODIFY properties activated.
-# @param user_access_code [IN] binary encoded user access code
-# @return True / False
-# 2017-09-22
+# Layout of a carved file in the image: the part [offset, offset +
+# length) of a file is mapped to image ranges through the layout of
+# the file (its ranges, in sequence order)
+# @param layout_L [IN] list of TskFileRange of the file
+# @param offset   [IN] offset of the carved file in the file
+# @param length   [IN] length of the carved file
+# @return list of TskFileRange (image offsets)
+# 2026-10-19
 #--------------------------------------------------------------------
-def OLD_is_interesting_user_access(user_access_int):
-    "return True if user_access_code interests us"""
-    if user_access_int == 0:
-        return False
-    elif (user_access_int & C_ASSEMBLE) and (user_access_int & C_MODIFY):
-        return True
-    elif (user_access_int & C_ASSEMBLE) and ((user_access_int & C_MODIFY)==0):
-        return True
-    elif ((user_access_int & C_ASSEMBLE)==0) and (user_access_int & C_MODIFY):
-        return True
+def carved_ranges_L(layout_L, offset, length):
+    """image ranges of a part of a file"""
+    ranges_L = []
+    end = offset + length
+    range_offset = 0
+    for file_range in layout_L:
+        range_len = file_range.getByteLen()
+        lo = max(offset, range_offset)
+        hi = min(end, range_offset + range_len)
+        if lo < hi:
+            ranges_L.append(TskFileRange(
+                        file_range.getByteStart() + lo - range_offset,
+                        hi - lo, len(ranges_L)))
+        range_offset += range_len
+        if range_offset >= end:
+            break
+    return ranges_L
 
+#--------------------------------------------------------------------
+# Count an outcome of the budgeted triage
+# @param key_S [IN] key of g_budget_stats_D
+# @return None
+# 2026-10-19
+#--------------------------------------------------------------------
+def count_budget_stat(key_S):
+    """count an outcome of the budgeted triage"""
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    Factory.g_lock.acquire()
+    Factory.g_budget_stats_D[key_S] += 1
+    Factory.g_lock.release()
 
 #--------------------------------------------------------------------
-# Returns True if user_access_code has one or none of 
-# C_ASSEMBLE / C_MODIFY properties activated.
-# @param user_access_code [IN] binary encoded user access code
-# @return True / False
-# 2017-09-22
+# Record a file deferred by the budgeted triage
+# @param ds_id    [IN] id of the data source
+# @param file     [IN] AbstractFile
+# @param score    [IN] priority of the file
+# @param reason_S [IN] C_BUDGET_REASON_*
+# @return None
+# 2026-10-19
 #--------------------------------------------------------------------
-def is_interesting_user_access(user_access_int):
-    "return True if user_access_code interests us"""
-    if (user_access_int & C_ASSEMBLE) == 0:
-        return True
-    if (user_access_int & C_MODIFY) == 0:
-        return True
+def record_budget_deferred(ds_id, file, score, reason_S):
+    """record a file deferred by the budgeted triage"""
+    fullFilePath_S = os.path.join(file.getParentPath(), file.getName())
+    Factory = FindSignedPDFsFilesIngestModuleFactory
+    Factory.g_lock.acquire()
+    Factory.g_budget_deferred_D[ds_id][file.getId()] = \
+                    (score, file.getSize(), reason_S, fullFilePath_S)
+    Factory.g_budget_stats_D["deferred"] += 1
+    Factory.g_lock.release()
 
-    # Still here?
-    return False
+#--------------------------------------------------------------------
+# Write the files deferred by the budgeted triage to a CSV file
+# @param files_D   [IN] obj_id -> (score, size, reason, full path)
+# @param col_sep_S [IN] separator for CSV
+# @param filename  [IN] name of file to dump CSV
+# @return 1 (the file is rewritten: it holds what is still deferred)
+# 2026-10-19
+#--------------------------------------------------------------------
+def budget_deferred2CSVfile(files_D, col_sep_S, filename):
+    """write the deferred files in CSV format to 'filename'"""
+    encoding_S = 'utf-8'
+    with open(filename,'w') as f:
+        S = col_sep_S.join(["#ObjId", "Score", "Size", "Reason",
+                                                    "FullPath"]) + "\n"
+        f.write(S)
+        entries_L = sorted(files_D.iteritems(),
+                           key=lambda item_T: (-item_T[1][0], item_T[0]))
+        for obj_id, (score, size, reason_S, fullFilePath_S) in entries_L:
+            S = col_sep_S.join(["%d" % (obj_id), "%d" % (score),
+                                "%d" % (size), reason_S,
+                                fullFilePath_S]) + "\n"
+            f.write(S.encode(encoding_S))
+
+    return 1
 
+#--------------------------------------------------------------------
+# Read the files deferred by a previous budgeted triage
+# @param col_sep_S [IN] separator for CSV
+# @param filename  [IN] CSV file (see budget_deferred2CSVfile)
+# @return dict obj_id -> True, None if there is no file
+# 2026-10-19
+#--------------------------------------------------------------------
+def CSVfile2budget_deferred_D(col_sep_S, filename):
+    """read the ids of the deferred files"""
+    deferred_D = {}
+    if not os.path.isfile(filename):
+        return None
+    with open(filename,'r') as f:
+        for line_S in f:
+            if line_S.startswith("#"):
+                continue
+            try:
+                deferred_D[long(line_S.split(col_sep_S, 1)[0])] = True
+            except ValueError:
+                continue
+    return deferred_D
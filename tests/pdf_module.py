@@ -0,0 +1,76 @@
+#--------------------------------------------------------------------
+# Loads digiSignedOrProtected_PDFs.py for the unit tests.
+# Under Jython (Autopsy's classpath), the module is loaded as is.
+# Under CPython 2.7, the Java/Autopsy packages it imports are replaced
+# by stubs: only the pure Python parts (flow rules, native scans,
+# carver, digests, filters) can be tested there.
+# Run from the root of the repository:
+#   python2 -m unittest discover -s tests
+# 2026-10-19
+#--------------------------------------------------------------------
+import imp
+import os
+import sys
+import types
+
+C_MODULE_PATH_S = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               os.pardir, "digiSignedOrProtected_PDFs.py")
+
+C_JAVA_PACKAGES_L = ["jarray", "java", "java.awt", "java.awt.event",
+        "java.io", "java.io.File", "java.lang", "java.lang.management",
+        "java.security", "java.security.cert", "java.sql", "java.util",
+        "java.util.logging", "javax", "javax.naming", "javax.naming.ldap",
+        "javax.swing", "javax.swing.filechooser", "org", "org.sleuthkit",
+        "org.sleuthkit.autopsy", "org.sleuthkit.autopsy.casemodule",
+        "org.sleuthkit.autopsy.casemodule.services",
+        "org.sleuthkit.autopsy.coreutils", "org.sleuthkit.autopsy.datamodel",
+        "org.sleuthkit.autopsy.ingest",
+        "org.sleuthkit.autopsy.ingest.IngestModule",
+        "org.sleuthkit.datamodel"]
+
+class JavaStub(object):
+    """any attribute, call or subclass of a Java object"""
+
+    def __init__(self, *args_T, **kwargs_D):
+        pass
+
+    def __getattr__(self, name_S):
+        if name_S.startswith("__"):
+            raise AttributeError(name_S)
+        return JavaStub()
+
+    def __call__(self, *args_T, **kwargs_D):
+        return JavaStub()
+
+class JavaStubClass(type):
+    """class attributes of a stub class (e.g., Level.INFO)"""
+
+    def __getattr__(cls, name_S):
+        if name_S.startswith("__"):
+            raise AttributeError(name_S)
+        return JavaStub()
+
+class JavaStubPackage(types.ModuleType):
+    """Java package whose names are stub classes"""
+
+    def __getattr__(self, name_S):
+        if name_S.startswith("__"):
+            raise AttributeError(name_S)
+        return JavaStubClass(name_S, (JavaStub,), {})
+
+# path -> loaded module
+g_modules_D = {}
+
+def load_module(path_S=C_MODULE_PATH_S):
+    """the ingest module (loaded once), or another version of it
+    (e.g., a previous revision, for the benchmarks)"""
+    path_S = os.path.abspath(path_S)
+    if path_S not in g_modules_D:
+        if not sys.platform.startswith("java"):
+            for package_S in C_JAVA_PACKAGES_L:
+                sys.modules.setdefault(package_S, JavaStubPackage(package_S))
+        name_S = "digiSignedOrProtected_PDFs"
+        if len(g_modules_D) > 0:
+            name_S = "%s_%d" % (name_S, len(g_modules_D))
+        g_modules_D[path_S] = imp.load_source(name_S, path_S)
+    return g_modules_D[path_S]
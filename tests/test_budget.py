@@ -0,0 +1,88 @@
+#--------------------------------------------------------------------
+# Budgeted triage: files deferred by a previous run
+# (budget_deferred_only) and priority of the candidates.
+# 2026-10-19
+#--------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+import unittest
+
+from pdf_module import load_module
+
+dsp = load_module()
+
+class MockFile(object):
+    """AbstractFile of a PDF file"""
+    def __init__(self, obj_id, size=1000, parent_path_S="/Users/bob/"):
+        self.m_obj_id = obj_id
+        self.m_size = size
+        self.m_parent_path_S = parent_path_S
+    def getId(self):
+        return self.m_obj_id
+    def getSize(self):
+        return self.m_size
+    def getParentPath(self):
+        return self.m_parent_path_S
+
+class BudgetDeferredOnlyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.Factory = dsp.FindSignedPDFsFilesIngestModuleFactory
+        self.saved_D = {}
+        for name_S in ["g_budget_D", "g_budget_previous_D",
+                       "g_budget_deferred_D", "g_budget_low_D"]:
+            self.saved_D[name_S] = getattr(self.Factory, name_S)
+            setattr(self.Factory, name_S, {})
+        self.saved_D["g_budget_stats_D"] = self.Factory.g_budget_stats_D
+        self.Factory.g_budget_stats_D = \
+                                dict.fromkeys(self.Factory.g_budget_stats_D, 0)
+
+        self.tmp_dir_S = tempfile.mkdtemp()
+        settings = dsp.Process_FindSignedPDFFilesWithUISettings()
+        settings.set_advanced_setting(dsp.C_BUDGET_DEFERRED_ONLY_FIELD, "True")
+        self.module = dsp.FindSignedPDFFilesIngestModule(settings)
+        self.module.m_workDir = self.tmp_dir_S
+        self.module.m_data_source_id = 7
+        self.logs_L = []
+        self.module.log = lambda level, msg: self.logs_L.append(msg)
+
+    def tearDown(self):
+        for name_S, value in self.saved_D.iteritems():
+            setattr(self.Factory, name_S, value)
+        shutil.rmtree(self.tmp_dir_S)
+
+    def test_no_previous_run(self):
+        self.module.load_budget()
+        self.assertFalse(self.module.budget_defers(MockFile(1)))
+        self.assertFalse(self.module.budget_defers(MockFile(2)))
+        self.assertEqual(self.Factory.g_budget_stats_D["done_before"], 0)
+        self.assertTrue([msg for msg in self.logs_L
+                                if "no files deferred" in msg])
+
+    def test_previous_run(self):
+        deferred_fname = os.path.join(self.tmp_dir_S,
+                                      dsp.C_BUDGET_DEFERRED_FNAME % (7))
+        with open(deferred_fname, "w") as f:
+            f.write("#obj_id;score;size;reason;path\n")
+            f.write("2;3;1000;budget_exhausted;/Users/bob/b.pdf\n")
+        self.module.load_budget()
+        self.assertTrue(self.module.budget_defers(MockFile(1)))
+        self.assertFalse(self.module.budget_defers(MockFile(2)))
+        self.assertEqual(self.Factory.g_budget_stats_D["done_before"], 1)
+
+class BudgetPriorityTest(unittest.TestCase):
+
+    def test_base_priority_reads_nothing(self):
+        reads_L = []
+        candidates_L = [MockFile(1, 20 << 20, "/Windows/Temp/"),
+                        MockFile(2, 1000, "/Windows/Temp/"),
+                        MockFile(3, 1000, "/Users/bob/Documents/")]
+        for file in candidates_L:
+            file.read = lambda *args_T: reads_L.append(args_T)
+        candidates_L.sort(key=lambda file: -dsp.budget_base_priority(file))
+        self.assertEqual([file.getId() for file in candidates_L], [3, 2, 1])
+        self.assertEqual(reads_L, [])
+
+if __name__ == "__main__":
+    unittest.main()
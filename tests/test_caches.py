@@ -0,0 +1,150 @@
+#--------------------------------------------------------------------
+# Caches of the analysis: certificate chain validation outcomes (LRU,
+# time buckets, bookkeeping of the outcomes to be saved) and the known
+# verdicts CSV file (round trip, merge with the previous runs).
+# The certificates are strings (their own fingerprint) and the
+# validation is stubbed (outcome and number of calls).
+# 2026-10-19
+#--------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+import unittest
+
+from pdf_module import load_module
+
+dsp = load_module()
+
+C_BUCKET_SECS = 3600
+
+class ChainValidationCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.validate_chain_S = dsp.validate_chain_S
+        self.certificate_fingerprint_S = dsp.certificate_fingerprint_S
+        self.validated_L = []
+        dsp.validate_chain_S = self.stub_validate_chain_S
+        dsp.certificate_fingerprint_S = lambda cert: cert
+
+        self.cache = dsp.ChainValidationCache(3, C_BUCKET_SECS)
+        self.cache.m_anchors = "anchors"
+
+    def tearDown(self):
+        dsp.validate_chain_S = self.validate_chain_S
+        dsp.certificate_fingerprint_S = self.certificate_fingerprint_S
+
+    def stub_validate_chain_S(self, chain_T, anchors):
+        self.validated_L.append(chain_T[0])
+        return "valid:" + chain_T[0]
+
+    def chain_T(self, leaf_S, secs=0):
+        return (leaf_S, ["intermediate", "root"], secs * 1000)
+
+    def test_hit(self):
+        self.assertEqual(self.cache.validate(self.chain_T("a")), "valid:a")
+        self.assertEqual(self.cache.validate(self.chain_T("a")), "valid:a")
+        self.assertEqual(self.validated_L, ["a"])
+
+    def test_key(self):
+        key_S = self.cache.key_S(("a", ["root", "intermediate"],
+                                  C_BUCKET_SECS * 1000 * 5 + 1))
+        # other certificates in any order
+        self.assertEqual(key_S, "a|intermediate,root|5")
+
+    def test_time_bucket(self):
+        self.cache.validate(self.chain_T("a", 0))
+        self.cache.validate(self.chain_T("a", C_BUCKET_SECS - 1))
+        self.assertEqual(self.validated_L, ["a"])
+        # next bucket: validated again
+        self.cache.validate(self.chain_T("a", C_BUCKET_SECS))
+        self.assertEqual(self.validated_L, ["a", "a"])
+
+    def test_lru_eviction(self):
+        for leaf_S in ["a", "b", "c"]:
+            self.cache.validate(self.chain_T(leaf_S))
+        # 'a' most recently used: 'b' is evicted
+        self.cache.validate(self.chain_T("a"))
+        self.cache.validate(self.chain_T("d"))
+        self.assertEqual([key_S.split("|")[0] for key_S in
+                                self.cache.m_entries_D], ["c", "a", "d"])
+        del self.validated_L[:]
+        self.cache.validate(self.chain_T("b"))
+        self.assertEqual(self.validated_L, ["b"])
+
+    def test_new_on_eviction(self):
+        # loaded from the settings DB: not to be saved
+        self.cache.put(self.cache.key_S(self.chain_T("old")), "valid:old",
+                                                                    False)
+        for leaf_S in ["a", "b"]:
+            self.cache.validate(self.chain_T(leaf_S))
+        self.assertEqual(sorted([key_S.split("|")[0] for key_S in
+                                        self.cache.m_new_D]), ["a", "b"])
+        # evicted: 'old' then 'a', no longer to be saved
+        self.cache.validate(self.chain_T("c"))
+        self.cache.validate(self.chain_T("d"))
+        self.assertEqual(sorted([key_S.split("|")[0] for key_S in
+                                    self.cache.m_new_D]), ["b", "c", "d"])
+        for key_S in self.cache.m_new_D:
+            self.assertTrue(key_S in self.cache.m_entries_D)
+
+    def test_disabled(self):
+        cache = dsp.ChainValidationCache(0, C_BUCKET_SECS)
+        cache.m_anchors = "anchors"
+        cache.validate(self.chain_T("a"))
+        cache.validate(self.chain_T("a"))
+        self.assertEqual(self.validated_L, ["a", "a"])
+        self.assertEqual(len(cache.m_entries_D), 0)
+
+C_MD5_A = "0123456789abcdef0123456789abcdef"
+C_MD5_B = "fedcba9876543210fedcba9876543210"
+C_MD5_C = "00112233445566778899aabbccddeeff"
+
+class KnownVerdictsCSVTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir_S = tempfile.mkdtemp()
+        self.fname = os.path.join(self.tmp_dir_S, dsp.C_KNOWN_VERDICTS_FNAME)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir_S)
+
+    def test_round_trip(self):
+        verdicts_D = {C_MD5_A: {"signed_code": 1,
+                                "permissions": [True, 4, False]},
+                      C_MD5_B: {"signed_code": 0, "permissions": None}}
+        dsp.known_verdicts2CSVfile(verdicts_D, ";", self.fname)
+        self.assertEqual(dsp.CSVfile2known_verdicts_D(";", self.fname),
+                         verdicts_D)
+
+    def test_merge_with_previous_run(self):
+        dsp.known_verdicts2CSVfile(
+                {C_MD5_A: {"signed_code": 1, "permissions": None},
+                 C_MD5_B: {"signed_code": 0, "permissions": None}},
+                ";", self.fname)
+        # this run: new verdict of B, C added, A kept
+        dsp.known_verdicts2CSVfile(
+                {C_MD5_B: {"signed_code": 2, "permissions": [False, 0, True]},
+                 C_MD5_C: {"signed_code": 3, "permissions": None}},
+                ";", self.fname)
+        verdicts_D = dsp.CSVfile2known_verdicts_D(";", self.fname)
+        self.assertEqual(sorted(verdicts_D), [C_MD5_C, C_MD5_A, C_MD5_B])
+        self.assertEqual(verdicts_D[C_MD5_A]["signed_code"], 1)
+        self.assertEqual(verdicts_D[C_MD5_B],
+                    {"signed_code": 2, "permissions": [False, 0, True]})
+
+    def test_malformed_lines(self):
+        with open(self.fname, "w") as f:
+            f.write("#MD5;SignedCode;UserAccessFlag;UserAccessCode;"
+                    "EncryptionFlag\n")
+            f.write("\n")
+            f.write("%s;1;;;\n" % (C_MD5_A.upper()))
+            f.write("%s;1;True\n" % (C_MD5_B))
+            f.write("%s;signed;;;\n" % (C_MD5_B))
+            f.write("%s;1;True;all;False\n" % (C_MD5_C))
+        verdicts_D = dsp.CSVfile2known_verdicts_D(";", self.fname)
+        # MD5 in lower case
+        self.assertEqual(verdicts_D,
+                         {C_MD5_A: {"signed_code": 1, "permissions": None}})
+
+if __name__ == "__main__":
+    unittest.main()
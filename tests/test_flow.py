@@ -0,0 +1,117 @@
+#--------------------------------------------------------------------
+# Flow rules (C_FLOW_RULES_L): whatever the verifier code, the
+# analysis of a PDF file ends with a stop or a retry rule.
+# The actions are not run: their effect on the facts is replayed
+# through the PDFAnalysis setters, as run_flow_action does.
+# 2026-10-19
+#--------------------------------------------------------------------
+import unittest
+
+from pdf_module import load_module
+
+dsp = load_module()
+
+# Triage with a signature indicator (the verifier is run)
+C_TRIAGE_FACTS_D = {dsp.C_FACT_SIG_INDICATORS: ["ByteRange"],
+                    dsp.C_FACT_ACROFORM: True,
+                    dsp.C_FACT_OBJSTM: 0,
+                    dsp.C_FACT_ENCRYPT_DICT: False,
+                    dsp.C_FACT_SCAN_COMPLETE: True}
+
+def replay_action(action_S, analysis, signed_code):
+    """effect of an action on the facts (no tool, no artifact)"""
+    if action_S == dsp.C_ACTION_COPY:
+        analysis.facts_D[dsp.C_FLOW_COPY] = dsp.C_COPY_DONE
+    elif action_S == dsp.C_ACTION_TRIAGE:
+        analysis.set_triage_facts(dict(C_TRIAGE_FACTS_D))
+    elif action_S in (dsp.C_ACTION_VERIFIER, dsp.C_ACTION_PARALLEL_CHECKS):
+        analysis.set_signed_code(signed_code)
+    elif action_S == dsp.C_ACTION_ASSUME_NOT_SIGNED:
+        analysis.set_signed_code(dsp.C_SIG_STAT_CODE_NO_SIGNATURE)
+    elif action_S == dsp.C_ACTION_EXIFTOOL:
+        analysis.set_permissions([False, 0, False])
+    elif action_S == dsp.C_ACTION_REVISIONS:
+        analysis.set_revisions(None)
+    elif action_S == dsp.C_ACTION_DIGESTS:
+        analysis.set_signature_digests(None)
+    elif action_S == dsp.C_ACTION_EMIT_SIGNATURE:
+        analysis.facts_D[dsp.C_FLOW_STAGE] = dsp.C_STAGE_PERMISSIONS
+    elif action_S == dsp.C_ACTION_EMIT_PERMISSIONS:
+        analysis.facts_D[dsp.C_FLOW_STAGE] = dsp.C_STAGE_DONE
+
+def run_flow(analysis, signed_code):
+    """names of the rules fired, up to the stop/retry one"""
+    rules_L = []
+    for step in range(dsp.C_FLOW_MAX_STEPS):
+        rule_T = dsp.choose_flow_rule(analysis.facts_D)
+        if rule_T is None:
+            raise AssertionError("code %d: no rule for facts %s (after %s)" %
+                                    (signed_code, analysis.facts_D, rules_L))
+        rules_L.append(rule_T[dsp.C_RULE_NAME])
+        action_S = rule_T[dsp.C_RULE_ACTION]
+        if action_S in (dsp.C_ACTION_STOP, dsp.C_ACTION_RETRY):
+            return (action_S, rules_L)
+        replay_action(action_S, analysis, signed_code)
+    raise AssertionError("code %d: no stop after %d steps (%s)" %
+                            (signed_code, dsp.C_FLOW_MAX_STEPS, rules_L))
+
+class FlowRulesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = dsp.Process_FindSignedPDFFilesWithUISettings()
+        self.module = dsp.FindSignedPDFFilesIngestModule(self.settings)
+        self.cms_parser_S = dsp.C_CMS_PARSER_S
+
+    def tearDown(self):
+        dsp.C_CMS_PARSER_S = self.cms_parser_S
+
+    def check_every_code(self, embedded=False):
+        for signed_code in sorted(dsp.C_PDF_code_D.keys()):
+            analysis = self.module.new_analysis(None, "/f.pdf", "/tmp/f.pdf")
+            if embedded:
+                analysis.embedded_depth = 1
+                analysis.facts_D[dsp.C_FLOW_COPY] = dsp.C_COPY_DONE
+            action_S, rules_L = run_flow(analysis, signed_code)
+
+            expected_S = dsp.C_ACTION_STOP
+            if signed_code in dsp.C_RETRY_SIG_CODES_L:
+                expected_S = dsp.C_ACTION_RETRY
+            self.assertEqual(action_S, expected_S,
+                             "code %d: %s" % (signed_code, rules_L))
+
+            revisions_S = analysis.facts_D[dsp.C_FLOW_REVISIONS]
+            if signed_code in dsp.C_REVISION_CODES_L:
+                self.assertEqual(revisions_S, dsp.C_REVISIONS_DONE)
+            else:
+                self.assertEqual(revisions_S, dsp.C_REVISIONS_OFF)
+
+    def test_default_settings(self):
+        self.check_every_code()
+
+    def test_default_settings_with_digests(self):
+        # digests need a CMS parser (none outside of Autopsy)
+        dsp.C_CMS_PARSER_S = "bouncycastle"
+        self.check_every_code()
+
+    def test_embedded_file(self):
+        dsp.C_CMS_PARSER_S = "bouncycastle"
+        self.check_every_code(embedded=True)
+
+    def test_digests_only_with_a_signature(self):
+        dsp.C_CMS_PARSER_S = "bouncycastle"
+        for signed_code in sorted(dsp.C_PDF_code_D.keys()):
+            analysis = self.module.new_analysis(None, "/f.pdf", "/tmp/f.pdf")
+            run_flow(analysis, signed_code)
+            state_S = dsp.signature_state_S(signed_code)
+            digests_S = analysis.facts_D[dsp.C_FLOW_DIGESTS]
+            if state_S in dsp.C_SIGNATURE_PRESENT_T:
+                self.assertEqual(digests_S, dsp.C_DIGESTS_DONE)
+            else:
+                self.assertEqual(digests_S, dsp.C_DIGESTS_OFF)
+
+    def test_triage_off(self):
+        self.settings.set_advanced_setting(dsp.C_TRIAGE_FIELD, "False")
+        self.check_every_code()
+
+if __name__ == "__main__":
+    unittest.main()
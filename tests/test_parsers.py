@@ -0,0 +1,388 @@
+#--------------------------------------------------------------------
+# Native parsers on small PDF fixtures: triage scan, revision scan,
+# carver, signature digests and path filters.
+# The fixtures are built in memory (fixed width byte ranges, filled
+# once the offsets are known).
+# 2026-10-19
+#--------------------------------------------------------------------
+import binascii
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+from StringIO import StringIO
+
+from pdf_module import load_module
+
+dsp = load_module()
+
+C_BYTE_RANGE_S = "/ByteRange [0 %010d %010d %010d]"
+C_CMS_HEX_LEN = 400
+
+def signed_revision_S(doc_S, obj_num, alg_S, tamper=False):
+    """doc_S plus a revision with a signature covering all of it"""
+    placeholder_S = "0" * C_CMS_HEX_LEN
+    empty_range_S = C_BYTE_RANGE_S % (0, 0, 0)
+    dict_S = ("%d 0 obj\n<< /Type /Sig %s /Contents <%s> >>\nendobj\n" %
+                                    (obj_num, empty_range_S, placeholder_S))
+    start = len(doc_S)
+    doc_S = doc_S + dict_S + "trailer\n<< /Size %d >>\n%%%%EOF\n" %\
+                                                            (obj_num + 1)
+    b = start + dict_S.index("<" + placeholder_S)
+    c = b + len(placeholder_S) + 2
+    d = len(doc_S) - c
+    doc_S = doc_S.replace(empty_range_S, C_BYTE_RANGE_S % (b, c, d))
+
+    # "CMS" read by fake_cms_parser: algorithm and signed digest
+    digest = hashlib.new(alg_S)
+    digest.update(doc_S[:b])
+    digest.update(doc_S[c:c + d])
+    signed_S = digest.digest()
+    if tamper:
+        signed_S = hashlib.new(alg_S, "tampered").digest()
+    hex_S = binascii.hexlify(alg_S + "|" + signed_S)
+    hex_S = hex_S + "0" * (C_CMS_HEX_LEN - len(hex_S))
+    return doc_S[:b + 1] + hex_S + doc_S[c - 1:]
+
+def fake_cms_parser(cms):
+    """(kind, [(hashlib name, digest)], chain, timestamp time)"""
+    alg_S, signed_S = cms.rstrip("\0").split("|", 1)
+    return (dsp.C_SIG_KIND_SIGNATURE, [(alg_S, signed_S)], None, None)
+
+C_UNSIGNED_PDF_S = "%PDF-1.7\n1 0 obj\n<< /Type /Catalog >>\nendobj\n" +\
+                   "trailer\n<< /Size 2 >>\n%%EOF\n"
+
+class ParserTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir_S = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir_S)
+
+    def write_pdf(self, content_S):
+        path_S = os.path.join(self.tmp_dir_S, "fixture.pdf")
+        with open(path_S, "wb") as f:
+            f.write(content_S)
+        return path_S
+
+class ScanPdfIndicatorsTest(ParserTestCase):
+
+    def test_unsigned(self):
+        facts_D = dsp.scan_pdf_indicators(self.write_pdf(C_UNSIGNED_PDF_S))
+        self.assertEqual(facts_D[dsp.C_FACT_SIG_INDICATORS], [])
+        self.assertTrue(facts_D[dsp.C_FACT_SCAN_COMPLETE])
+        self.assertFalse(facts_D[dsp.C_FACT_ENCRYPT_DICT])
+
+    def test_signed(self):
+        path_S = self.write_pdf(signed_revision_S(C_UNSIGNED_PDF_S, 2,
+                                                                "sha256"))
+        facts_D = dsp.scan_pdf_indicators(path_S)
+        self.assertEqual(facts_D[dsp.C_FACT_SIG_INDICATORS],
+                                                    ["ByteRange", "Type"])
+        self.assertTrue(facts_D[dsp.C_FACT_SCAN_COMPLETE])
+
+    def test_token_across_chunks(self):
+        content_S = signed_revision_S(C_UNSIGNED_PDF_S, 2, "sha256")
+        chunk_size = dsp.C_SCAN_CHUNK_SIZE
+        dsp.C_SCAN_CHUNK_SIZE = content_S.index("/ByteRange") + 3
+        try:
+            facts_D = dsp.scan_pdf_indicators(self.write_pdf(content_S))
+        finally:
+            dsp.C_SCAN_CHUNK_SIZE = chunk_size
+        self.assertIn("ByteRange", facts_D[dsp.C_FACT_SIG_INDICATORS])
+
+    def test_signature_in_object_stream(self):
+        stream_S = zlib.compress("<< /Type /Sig /ByteRange [0 1 2 3] >>")
+        content_S = "%%PDF-1.7\n3 0 obj\n<< /Type /ObjStm /Length %d >>\n" \
+                    "stream\n%s\nendstream\nendobj\n%%%%EOF\n" %\
+                                                (len(stream_S), stream_S)
+        facts_D = dsp.scan_pdf_indicators(self.write_pdf(content_S))
+        self.assertEqual(facts_D[dsp.C_FACT_OBJSTM], 1)
+        self.assertEqual(facts_D[dsp.C_FACT_SIG_INDICATORS],
+                                                    ["ByteRange", "Type"])
+        self.assertTrue(facts_D[dsp.C_FACT_SCAN_COMPLETE])
+
+    def test_object_stream_bomb(self):
+        # 32 MB of zeros in 32 KB: inflated up to the cap, not further
+        stream_S = zlib.compress("\0" * (32 << 20) +
+                                 "<< /Type /Sig /ByteRange [0 1 2 3] >>")
+        content_S = "%%PDF-1.7\n3 0 obj\n<< /Type /ObjStm /Length %d >>\n" \
+                    "stream\n%s\nendstream\nendobj\n%%%%EOF\n" %\
+                                                (len(stream_S), stream_S)
+        max_out = dsp.C_SCAN_OBJSTM_MAX_OUT
+        dsp.C_SCAN_OBJSTM_MAX_OUT = 4 << 20
+        try:
+            facts_D = dsp.scan_pdf_indicators(self.write_pdf(content_S))
+        finally:
+            dsp.C_SCAN_OBJSTM_MAX_OUT = max_out
+        self.assertEqual(facts_D[dsp.C_FACT_SIG_INDICATORS], [])
+        self.assertFalse(facts_D[dsp.C_FACT_SCAN_COMPLETE])
+        self.assertTrue(dsp.triage_needs_verifier(facts_D))
+
+    def test_escaped_names(self):
+        content_S = signed_revision_S(C_UNSIGNED_PDF_S, 2, "sha256")
+        content_S = content_S.replace("/ByteRange", "/Byte#52ange")
+        content_S = content_S.replace("/Type /Sig", "/Typ#65 /#53ig")
+        facts_D = dsp.scan_pdf_indicators(self.write_pdf(content_S))
+        self.assertEqual(facts_D[dsp.C_FACT_SIG_INDICATORS],
+                                                    ["ByteRange", "Type"])
+
+    def test_escaped_object_stream(self):
+        content_S = "%PDF-1.7\n3 0 obj\n<< /Type /#4FbjStm /Length 4 >>\n" \
+                    "stream\nxxxx\nendstream\nendobj\n%%EOF\n"
+        facts_D = dsp.scan_pdf_indicators(self.write_pdf(content_S))
+        self.assertEqual(facts_D[dsp.C_FACT_SIG_INDICATORS], [])
+        self.assertFalse(facts_D[dsp.C_FACT_SCAN_COMPLETE])
+
+    def test_other_escaped_names(self):
+        content_S = C_UNSIGNED_PDF_S.replace("/Catalog",
+                                        "/Cat#61log /Name#20x /Byte#20Range")
+        facts_D = dsp.scan_pdf_indicators(self.write_pdf(content_S))
+        self.assertEqual(facts_D[dsp.C_FACT_SIG_INDICATORS], [])
+        self.assertTrue(facts_D[dsp.C_FACT_SCAN_COMPLETE])
+
+    def test_encrypted(self):
+        content_S = C_UNSIGNED_PDF_S.replace("/Size 2",
+                                             "/Size 2 /Encrypt 5 0 R")
+        facts_D = dsp.scan_pdf_indicators(self.write_pdf(content_S))
+        self.assertTrue(facts_D[dsp.C_FACT_ENCRYPT_DICT])
+
+class AnalyzeRevisionsTest(ParserTestCase):
+
+    def test_unsigned(self):
+        revisions_D = dsp.analyze_revisions(self.write_pdf(C_UNSIGNED_PDF_S))
+        self.assertEqual(revisions_D[dsp.C_REV_REVISIONS], 1)
+        self.assertEqual(revisions_D[dsp.C_REV_SIGNATURES], [])
+
+    def test_changes_after_signing(self):
+        signed_S = signed_revision_S(C_UNSIGNED_PDF_S, 2, "sha256")
+        update_S = "1 0 obj\n<< /Type /Catalog /Changed true >>\nendobj\n" \
+                   "5 0 obj\n<< >>\nendobj\n" \
+                   "trailer\n<< /Size 6 >>\n%%EOF\n"
+        revisions_D = dsp.analyze_revisions(self.write_pdf(signed_S +
+                                                                update_S))
+        self.assertEqual(revisions_D[dsp.C_REV_REVISIONS], 3)
+        self.assertEqual(revisions_D[dsp.C_REV_UNSIGNED_BYTES], len(update_S))
+        signature_D, = revisions_D[dsp.C_REV_SIGNATURES]
+        self.assertEqual(signature_D[dsp.C_REV_REVISION], 2)
+        self.assertEqual(signature_D[dsp.C_REV_CHANGED_OBJS], [1])
+        self.assertEqual(signature_D[dsp.C_REV_ADDED_OBJS], [5])
+
+class PDFCarverTest(unittest.TestCase):
+
+    def carve(self, data_S, signed_only, chunk_size=7):
+        carver = dsp.PDFCarver(1 << 20, signed_only)
+        for pos in range(0, len(data_S), chunk_size):
+            carver.feed(data_S[pos:pos + chunk_size])
+        return carver.finish()
+
+    def test_carve(self):
+        signed_S = signed_revision_S(C_UNSIGNED_PDF_S, 2, "sha256")
+        data_S = "\0" * 100 + C_UNSIGNED_PDF_S + "\0" * 50 + signed_S +\
+                 "\0" * 30 + "%PDF-1.4 no end"
+        second = 100 + len(C_UNSIGNED_PDF_S) + 50
+        # each file ends with its last %%EOF (not the end of line)
+        self.assertEqual(self.carve(data_S, False),
+            [(100, len(C_UNSIGNED_PDF_S) - 1, False),
+             (second, len(signed_S) - 1, True)])
+        self.assertEqual(self.carve(data_S, True),
+            [(second, len(signed_S) - 1, True)])
+
+def embedded_obj_S(obj_num, data_S, flate=True, filter_S=None):
+    """object of an embedded file stream"""
+    if flate:
+        data_S = zlib.compress(data_S)
+        filter_S = filter_S or "/FlateDecode"
+    dict_S = "/Type /EmbeddedFile /Length %d" % (len(data_S))
+    if filter_S is not None:
+        dict_S = "%s /Filter %s" % (dict_S, filter_S)
+    return "%d 0 obj\n<< %s >>\nstream\n%s\nendstream\nendobj\n" %\
+                                                (obj_num, dict_S, data_S)
+
+def filespec_obj_S(obj_num, name_S, ef_num):
+    """file specification of an embedded file stream"""
+    return "%d 0 obj\n<< /Type /Filespec /F (%s) /EF << /F %d 0 R >> >>\n" \
+           "endobj\n" % (obj_num, name_S, ef_num)
+
+def container_pdf_S(*objs_T):
+    return "%PDF-1.7\n" + "".join(objs_T) + "trailer\n<< /Size 9 >>\n%%EOF\n"
+
+class EmbeddedPdfsTest(ParserTestCase):
+
+    def extract(self, content_S, max_files=8, max_bytes=1 << 20,
+                                                        chunk_size=None):
+        limits = dsp.EmbeddedLimits(max_files, max_bytes)
+        outcomes_D = dict.fromkeys(dsp.C_EMBEDDED_OUTCOMES_L, 0)
+        scan_chunk_size = dsp.C_SCAN_CHUNK_SIZE
+        if chunk_size is not None:
+            dsp.C_SCAN_CHUNK_SIZE = chunk_size
+        try:
+            extracted_L = dsp.extract_embedded_pdfs(StringIO(content_S),
+                            os.path.join(self.tmp_dir_S, "parent.pdf"),
+                            limits, outcomes_D)
+        finally:
+            dsp.C_SCAN_CHUNK_SIZE = scan_chunk_size
+        outcomes_D = dict([(outcome_S, count) for outcome_S, count
+                                    in outcomes_D.iteritems() if count > 0])
+        return (extracted_L, outcomes_D)
+
+    def read_file(self, path_S):
+        with open(path_S, "rb") as f:
+            return f.read()
+
+    def test_flate_and_direct_length(self):
+        signed_S = signed_revision_S(C_UNSIGNED_PDF_S, 2, "sha256")
+        content_S = container_pdf_S(filespec_obj_S(4, "a.pdf", 5),
+                                    embedded_obj_S(5, signed_S),
+                                    embedded_obj_S(6, C_UNSIGNED_PDF_S,
+                                                                flate=False),
+                                    embedded_obj_S(7, "just text"))
+        for chunk_size in (None, 97, 1000):
+            extracted_L, outcomes_D = self.extract(content_S,
+                                                    chunk_size=chunk_size)
+            self.assertEqual([name_S for name_S, path_S in extracted_L],
+                             ["a.pdf", "obj_6.pdf"])
+            self.assertEqual(self.read_file(extracted_L[0][1]), signed_S)
+            self.assertEqual(self.read_file(extracted_L[1][1]),
+                                                        C_UNSIGNED_PDF_S)
+            self.assertEqual(outcomes_D, {dsp.C_EMBEDDED_PDF: 2,
+                                          dsp.C_EMBEDDED_NOT_PDF: 1})
+
+    def test_utf16_name(self):
+        name_S = "\xfe\xff" + "".join(["\0" + c for c in "r\xe9/x.pdf"])
+        content_S = container_pdf_S(filespec_obj_S(4, name_S, 5),
+                                    embedded_obj_S(5, C_UNSIGNED_PDF_S))
+        extracted_L, outcomes_D = self.extract(content_S)
+        self.assertEqual([name_S for name_S, path_S in extracted_L],
+                         ["r__x.pdf"])
+        self.assertEqual(dsp.embedded_name_S({}, 3, None), "embedded_3.pdf")
+        self.assertEqual(dsp.embedded_name_S({8: "  "}, 0, 8), "obj_8.pdf")
+
+    def test_limits(self):
+        # deflate bomb: inflated up to the bytes limit, then dropped
+        bomb_S = "%PDF-1.4\n" + "\0" * (16 << 20)
+        content_S = container_pdf_S(embedded_obj_S(5, bomb_S),
+                                    embedded_obj_S(6, C_UNSIGNED_PDF_S))
+        extracted_L, outcomes_D = self.extract(content_S, max_bytes=1 << 20)
+        self.assertEqual(extracted_L, [])
+        self.assertEqual(outcomes_D, {dsp.C_EMBEDDED_LIMIT: 2})
+        self.assertEqual(os.listdir(self.tmp_dir_S), [])
+
+        content_S = container_pdf_S(embedded_obj_S(5, C_UNSIGNED_PDF_S),
+                                    embedded_obj_S(6, C_UNSIGNED_PDF_S))
+        extracted_L, outcomes_D = self.extract(content_S, max_files=1)
+        self.assertEqual(len(extracted_L), 1)
+        self.assertEqual(outcomes_D, {dsp.C_EMBEDDED_PDF: 1,
+                                      dsp.C_EMBEDDED_LIMIT: 1})
+
+    def test_truncated(self):
+        for flate in (True, False):
+            content_S = container_pdf_S(embedded_obj_S(5, C_UNSIGNED_PDF_S,
+                                                                flate=flate))
+            cut_S = content_S[:content_S.index("stream\n") + 7 + 20]
+            extracted_L, outcomes_D = self.extract(cut_S)
+            self.assertEqual(extracted_L, [])
+            self.assertEqual(outcomes_D, {dsp.C_EMBEDDED_TRUNCATED: 1})
+            self.assertEqual(os.listdir(self.tmp_dir_S), [])
+
+    def test_corrupt_and_unsupported(self):
+        corrupt_S = embedded_obj_S(5, "%PDF-1.4 not deflated", flate=False,
+                                   filter_S="/FlateDecode")
+        content_S = container_pdf_S(corrupt_S,
+                                    embedded_obj_S(6, C_UNSIGNED_PDF_S,
+                                        flate=False, filter_S="/DCTDecode"))
+        extracted_L, outcomes_D = self.extract(content_S)
+        self.assertEqual(extracted_L, [])
+        self.assertEqual(outcomes_D, {dsp.C_EMBEDDED_CORRUPT: 1,
+                                      dsp.C_EMBEDDED_UNSUPPORTED: 1})
+
+class ByteRangeDigesterTest(unittest.TestCase):
+
+    def digest(self, content_S, chunk_size):
+        digester = dsp.ByteRangeDigester(fake_cms_parser)
+        for pos in range(0, len(content_S), chunk_size):
+            digester.feed(content_S[pos:pos + chunk_size])
+        return digester.finish()
+
+    def test_two_signatures(self):
+        content_S = signed_revision_S(C_UNSIGNED_PDF_S, 2, "sha256")
+        content_S = signed_revision_S(content_S, 3, "sha1")
+        for chunk_size in (13, 512, len(content_S)):
+            signatures_L = self.digest(content_S, chunk_size)
+            self.assertEqual([(signature_D[dsp.C_SIGD_ALGORITHM],
+                               signature_D[dsp.C_SIGD_STATUS])
+                              for signature_D in signatures_L],
+                             [("sha256", dsp.C_SIG_DIGEST_INTACT),
+                              ("sha1", dsp.C_SIG_DIGEST_INTACT)])
+
+    def test_mismatch(self):
+        content_S = signed_revision_S(C_UNSIGNED_PDF_S, 2, "sha256",
+                                                                tamper=True)
+        signature_D, = self.digest(content_S, 64)
+        self.assertEqual(signature_D[dsp.C_SIGD_STATUS],
+                                                dsp.C_SIG_DIGEST_MISMATCH)
+
+    def test_bad_byte_range(self):
+        content_S = signed_revision_S(C_UNSIGNED_PDF_S, 2, "sha256")
+        signature_D, = self.digest(content_S[:-20], 64)
+        self.assertEqual(signature_D[dsp.C_SIGD_STATUS],
+                                                dsp.C_SIG_DIGEST_BAD_RANGE)
+
+class ReadStreamDataTest(ParserTestCase):
+
+    def read(self, dict_S, data_S, max_bytes=1 << 20):
+        path_S = self.write_pdf("7 0 obj\n%s\nstream\n%s\nendstream\n"
+                                "endobj\n" % (dict_S, data_S))
+        with open(path_S, "rb") as f:
+            return dsp.read_stream_data_S(f, 0, max_bytes)
+
+    def test_length(self):
+        self.assertEqual(self.read("<< /Length 4 >>", "crl!"), "crl!")
+
+    def test_flate(self):
+        stream_S = zlib.compress("crl" * 1000)
+        self.assertEqual(self.read("<< /Filter /FlateDecode /Length %d >>" %
+                                   (len(stream_S)), stream_S), "crl" * 1000)
+
+    def test_flate_bomb(self):
+        # 64 MB of zeros in 64 KB: not inflated past max_bytes
+        stream_S = zlib.compress("\0" * (64 << 20))
+        self.assertEqual(self.read("<< /Filter /FlateDecode /Length %d >>" %
+                                   (len(stream_S)), stream_S), None)
+
+class PathFilterTest(unittest.TestCase):
+
+    def test_exclude(self):
+        path_filter = dsp.PathFilter([], ["/Windows/WinSxS/*", "*/Temp/*"],
+                                     [], [r"/cache\d+/"])
+        self.assertTrue(path_filter.is_skipped("/windows/winsxs/x86_a/"))
+        self.assertTrue(path_filter.is_skipped("\\Users\\bob\\Temp\\"))
+        self.assertTrue(path_filter.is_skipped("/data/Cache12/"))
+        self.assertFalse(path_filter.is_skipped("/Windows/System32/"))
+        self.assertFalse(path_filter.is_skipped("/Users/bob/Documents/"))
+
+    def test_include(self):
+        path_filter = dsp.PathFilter(["/Users/*"], ["/Users/*/AppData/*"],
+                                     [], [])
+        self.assertFalse(path_filter.is_skipped("/Users/bob/Documents/"))
+        self.assertTrue(path_filter.is_skipped("/Users/bob/AppData/x/"))
+        self.assertTrue(path_filter.is_skipped("/Program Files/"))
+
+    def test_bad_regex(self):
+        path_filter = dsp.PathFilter([], [], [], ["(unclosed"])
+        self.assertEqual(len(path_filter.m_bad_regexes_L), 1)
+        self.assertFalse(path_filter.is_skipped("/(unclosed/"))
+        # a bad include regex is not an include filter
+        path_filter = dsp.PathFilter([], [], ["/users/(bob"], [])
+        self.assertEqual(len(path_filter.m_bad_regexes_L), 1)
+        self.assertFalse(path_filter.is_skipped("/Users/alice/Documents/"))
+        path_filter = dsp.PathFilter([], [], ["/users/(bob", "/users/bob/"],
+                                     [])
+        self.assertFalse(path_filter.is_skipped("/Users/bob/Documents/"))
+        self.assertTrue(path_filter.is_skipped("/Users/alice/Documents/"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#--------------------------------------------------------------------
+# Histogram of the permissions: a file is counted once, whatever the
+# number of attempts of its analysis (see count_permissions).
+# 2026-10-19
+#--------------------------------------------------------------------
+import threading
+import unittest
+
+from pdf_module import load_module
+
+dsp = load_module()
+
+def analysis_with_permissions(path_S, user_access_code):
+    analysis = dsp.PDFAnalysis(None, path_S, "/tmp/f.pdf")
+    analysis.permission_counts_T = (True, user_access_code, True, "AES-128")
+    return analysis
+
+class PermissionHistogramTest(unittest.TestCase):
+
+    def setUp(self):
+        self.Factory = dsp.FindSignedPDFsFilesIngestModuleFactory
+        self.histogram = self.Factory.g_permission_histogram
+        self.Factory.g_permission_histogram = dsp.PermissionHistogram()
+
+    def tearDown(self):
+        self.Factory.g_permission_histogram = self.histogram
+
+    def merged_T(self):
+        return self.Factory.g_permission_histogram.merged_T()
+
+    def test_retried_then_done(self):
+        for attempt in range(3):
+            dsp.count_permissions(analysis_with_permissions("/a.pdf", 0x44),
+                                                                    False)
+        dsp.count_permissions(analysis_with_permissions("/a.pdf", 0x04), True)
+        dsp.count_permissions(analysis_with_permissions("/b.pdf", 0x44), True)
+        masks_L, encryption_D = self.merged_T()
+        self.assertEqual(sum(masks_L), 2)
+        self.assertEqual(masks_L[0x04], 1)
+        self.assertEqual(masks_L[0x44], 1)
+        self.assertEqual(encryption_D, {"AES-128": 2})
+
+    def test_retries_never_end(self):
+        for attempt in range(3):
+            dsp.count_permissions(analysis_with_permissions("/a.pdf", 0x44),
+                                                                    False)
+        masks_L, encryption_D = self.merged_T()
+        self.assertEqual(sum(masks_L), 1)
+        self.assertEqual(masks_L[0x44], 1)
+
+    def test_no_permissions(self):
+        dsp.count_permissions(dsp.PDFAnalysis(None, "/a.pdf", "/t.pdf"), True)
+        masks_L, encryption_D = self.merged_T()
+        self.assertEqual(sum(masks_L), 0)
+
+# Bit-test functions replaced by the tables C_USER_ACCESS_LABELS_L and
+# C_USER_ACCESS_INTERESTING_L (the reference of the tables)
+def bit_test_label_S(user_access_int):
+    if ((user_access_int & dsp.C_ASSEMBLE)==0) and\
+                                ((user_access_int & dsp.C_MODIFY)==0):
+        return dsp.C_AssembleOFF_ModifyOFF
+    elif (user_access_int & dsp.C_ASSEMBLE) and\
+                                (user_access_int & dsp.C_MODIFY):
+        return dsp.C_AssembleON_ModifyON
+    elif (user_access_int & dsp.C_ASSEMBLE) and\
+                                ((user_access_int & dsp.C_MODIFY)==0):
+        return dsp.C_AssembleON_ModifyOFF
+    else:
+        return dsp.C_AssembleOFF_ModifyON
+
+def bit_test_interesting(user_access_int):
+    if (user_access_int & dsp.C_ASSEMBLE) == 0:
+        return True
+    if (user_access_int & dsp.C_MODIFY) == 0:
+        return True
+    return False
+
+class UserAccessTablesTest(unittest.TestCase):
+
+    def test_tables_match_bit_tests(self):
+        self.assertEqual(len(dsp.C_USER_ACCESS_LABELS_L),
+                                                    dsp.C_PERMISSION_MASKS)
+        self.assertEqual(len(dsp.C_USER_ACCESS_INTERESTING_L),
+                                                    dsp.C_PERMISSION_MASKS)
+        for mask in range(dsp.C_PERMISSION_MASKS):
+            self.assertEqual(dsp.user_access_numeric_to_str(mask),
+                             bit_test_label_S(mask), "mask 0x%02x" % (mask))
+            self.assertEqual(bool(dsp.is_interesting_user_access(mask)),
+                             bit_test_interesting(mask), "mask 0x%02x" % (mask))
+
+    def test_memo(self):
+        for user_access_S in ["Print, Copy", "Assemble, Modify", "",
+                              "Print, Copy"]:
+            self.assertEqual(dsp.user_access_to_int(user_access_S),
+                             dsp.decode_user_access(user_access_S))
+        hits, misses = dsp.merged_cache_stats_D()[dsp.C_CACHE_USER_ACCESS]
+        self.assertTrue(hits >= 1)
+
+    def test_cache_stats_per_thread(self):
+        def lookups():
+            for i in range(1000):
+                dsp.record_cache_lookup("test_cache", i % 4 != 0)
+        threads_L = [threading.Thread(target=lookups) for i in range(4)]
+        for thread in threads_L:
+            thread.start()
+        for thread in threads_L:
+            thread.join()
+        self.assertEqual(dsp.merged_cache_stats_D()["test_cache"],
+                                                                [3000, 1000])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,261 @@
+#--------------------------------------------------------------------
+# External tools: adaptive concurrency slots (AIMD decisions) and
+# per-process resource limits (command prefix or preexec function,
+# classification of the breaches), usage sampled in /proc.
+# The clock and the system load are stubbed: each window is driven by
+# hand (runs released, time advanced, load set).
+# 2026-10-19
+#--------------------------------------------------------------------
+import os
+import subprocess
+import sys
+import unittest
+
+from pdf_module import load_module
+
+dsp = load_module()
+
+class StubClock(object):
+    """time module of the controller (time() only)"""
+    def __init__(self):
+        self.now = 1000.0
+    def time(self):
+        return self.now
+
+class RecordingLogger(object):
+    def __init__(self):
+        self.msgs_L = []
+    def log(self, level, msg):
+        self.msgs_L.append(msg)
+
+class AdaptiveToolSlotsTest(unittest.TestCase):
+
+    C_NUM_CORES = 4
+
+    def setUp(self):
+        self.time = dsp.time
+        self.get_system_load = dsp.get_system_load
+        self.get_num_cores = dsp.get_num_cores
+        self.clock = StubClock()
+        self.load = 1.0
+        dsp.time = self.clock
+        dsp.get_system_load = lambda: self.load
+        dsp.get_num_cores = lambda: self.C_NUM_CORES
+
+        self.slots = dsp.AdaptiveToolSlots("verifier", 1, 8, 10)
+        self.logger = RecordingLogger()
+        self.slots.m_logger = self.logger
+
+    def tearDown(self):
+        dsp.time = self.time
+        dsp.get_system_load = self.get_system_load
+        dsp.get_num_cores = self.get_num_cores
+
+    def window(self, num_runs, latency_secs, waiting=0, secs=10):
+        """runs of a window (decision at the end of the last one): limit"""
+        # runs in flight (acquire() would block past the limit)
+        self.slots.m_waiting = waiting
+        self.slots.m_in_use = num_runs
+        for i in range(num_runs - 1):
+            self.slots.release(latency_secs)
+        self.clock.now += secs
+        self.slots.release(latency_secs)
+        return self.slots.snapshot()[0]
+
+    def last_decision_S(self):
+        return self.logger.msgs_L[-1].split(": ")[1].split(" ")[0]
+
+    def test_starts_in_the_middle(self):
+        self.assertEqual(self.slots.snapshot(), (4, 0, 0))
+
+    def test_increase_while_runs_wait(self):
+        self.assertEqual(self.window(4, 2.0, waiting=3), 5)
+        self.assertEqual(self.last_decision_S(), "increase")
+        self.assertEqual(self.window(4, 2.0, waiting=3), 6)
+        # up to max_slots
+        for i in range(5):
+            self.window(4, 2.0, waiting=3)
+        self.assertEqual(self.slots.snapshot()[0], 8)
+
+    def test_keep_without_waiting_runs(self):
+        self.assertEqual(self.window(4, 2.0), 4)
+        self.assertEqual(self.last_decision_S(), "keep")
+
+    def test_decrease_on_load(self):
+        self.load = 1.5 * self.C_NUM_CORES + 0.1
+        self.assertEqual(self.window(4, 2.0, waiting=3), 2)
+        self.assertEqual(self.last_decision_S(), "decrease")
+        self.assertEqual(self.window(4, 2.0, waiting=3), 1)
+        # down to min_slots
+        self.assertEqual(self.window(4, 2.0, waiting=3), 1)
+
+    def test_unknown_load(self):
+        self.load = -1.0
+        self.assertEqual(self.window(4, 2.0, waiting=3), 5)
+
+    def test_decrease_when_slower(self):
+        self.window(4, 2.0)
+        # latency x2 and fewer runs in the window: overload
+        self.assertEqual(self.window(4, 4.0, waiting=3, secs=20), 2)
+        self.assertEqual(self.last_decision_S(), "decrease")
+
+    def test_slower_with_more_throughput(self):
+        self.window(4, 2.0)
+        # latency x2 but more runs per second: not an overload
+        self.assertEqual(self.window(8, 4.0, waiting=3), 5)
+
+    def test_window_not_over(self):
+        # too short: no decision, the runs count in the next window
+        self.assertEqual(self.window(4, 2.0, waiting=3, secs=5), 4)
+        self.assertEqual(self.logger.msgs_L, [])
+        self.assertEqual(self.window(1, 2.0, waiting=3, secs=5), 5)
+
+    def test_too_few_runs(self):
+        self.assertEqual(self.window(dsp.C_ADAPTIVE_MIN_RUNS - 1, 2.0,
+                                            waiting=3, secs=60), 4)
+        self.assertEqual(self.logger.msgs_L, [])
+
+C_ALL_LIMITS_D = {dsp.C_TOOL_LIMIT_AS_MB_FIELD: 512,
+                  dsp.C_TOOL_LIMIT_CPU_SECS_FIELD: 60,
+                  dsp.C_TOOL_LIMIT_NOFILE_FIELD: 64,
+                  dsp.C_TOOL_NICE_FIELD: 10,
+                  dsp.C_TOOL_IONICE_CLASS_FIELD: 3}
+
+class ApplyToolLimitsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.resource = dsp.resource
+        self.find_exe_in_path = dsp.find_exe_in_path
+        self.exes_L = ["prlimit", "nice", "ionice"]
+        dsp.find_exe_in_path = lambda exe_name_S: \
+            "/usr/bin/" + exe_name_S if exe_name_S in self.exes_L else None
+
+    def tearDown(self):
+        dsp.resource = self.resource
+        dsp.find_exe_in_path = self.find_exe_in_path
+
+    def test_no_limits(self):
+        self.assertEqual(dsp.apply_tool_limits(["tool", "a.pdf"], {}),
+                         (["tool", "a.pdf"], None))
+
+    def test_prefix_without_resource(self):
+        # Jython: no 'resource' module, no preexec_fn
+        dsp.resource = None
+        cmd_L, preexec_fn = dsp.apply_tool_limits(["tool", "a.pdf"],
+                                                        C_ALL_LIMITS_D)
+        self.assertEqual(preexec_fn, None)
+        self.assertEqual(cmd_L, ["/usr/bin/prlimit", "--as=536870912",
+                                 "--cpu=60:65", "--nofile=64", "--",
+                                 "/usr/bin/nice", "-n", "10",
+                                 "/usr/bin/ionice", "-c", "3",
+                                 "tool", "a.pdf"])
+
+    def test_missing_wrappers(self):
+        dsp.resource = None
+        self.exes_L = ["nice"]
+        cmd_L, preexec_fn = dsp.apply_tool_limits(["tool"], C_ALL_LIMITS_D)
+        self.assertEqual(cmd_L, ["/usr/bin/nice", "-n", "10", "tool"])
+
+    def test_only_ionice(self):
+        dsp.resource = None
+        cmd_L, preexec_fn = dsp.apply_tool_limits(["tool"],
+                                    {dsp.C_TOOL_IONICE_CLASS_FIELD: 2})
+        self.assertEqual(cmd_L, ["/usr/bin/ionice", "-c", "2", "tool"])
+
+    @unittest.skipIf(dsp.resource is None, "no 'resource' module")
+    def test_preexec_with_resource(self):
+        cmd_L, preexec_fn = dsp.apply_tool_limits(["tool"], C_ALL_LIMITS_D)
+        self.assertEqual(cmd_L, ["/usr/bin/ionice", "-c", "3", "tool"])
+        # limits as seen by the child
+        script_S = "import resource\n" \
+                   "for res in ['NOFILE', 'CPU', 'AS']:\n" \
+                   "    print '%d %d' % resource.getrlimit(" \
+                                        "getattr(resource, 'RLIMIT_' + res))"
+        out_S = subprocess.check_output([sys.executable, "-c", script_S],
+                                        preexec_fn=preexec_fn)
+        self.assertEqual(out_S.split(), ["64", "64", "60", "65",
+                                         "536870912", "536870912"])
+
+def tool_run_result(returncode, cpu_secs=-1.0, stderr_S=""):
+    result = dsp.ToolRunResult("verifier", "/tmp/a.pdf", 1000)
+    result.returncode = returncode
+    if cpu_secs >= 0:
+        result.user_cpu_secs = cpu_secs * 0.75
+        result.sys_cpu_secs = cpu_secs * 0.25
+    result.stderr_S = stderr_S
+    return result
+
+class IsLimitBreachTest(unittest.TestCase):
+
+    def breach(self, result, limits_D=C_ALL_LIMITS_D):
+        return dsp.is_limit_breach(result, limits_D)
+
+    def test_signals(self):
+        for sig in dsp.C_LIMIT_SIGNALS_L:
+            # Popen (-signal) and Java Process (128 + signal)
+            self.assertTrue(self.breach(tool_run_result(-sig)))
+            self.assertTrue(self.breach(tool_run_result(128 + sig)))
+            # whatever the limits
+            self.assertTrue(self.breach(tool_run_result(-sig), {}))
+        self.assertFalse(self.breach(tool_run_result(-15)))
+        self.assertFalse(self.breach(tool_run_result(128 + 15)))
+
+    def test_not_finished(self):
+        self.assertFalse(self.breach(tool_run_result(None)))
+
+    def test_cpu_at_the_limit(self):
+        self.assertTrue(self.breach(tool_run_result(1, cpu_secs=60)))
+        self.assertTrue(self.breach(tool_run_result(0, cpu_secs=61)))
+        self.assertFalse(self.breach(tool_run_result(1, cpu_secs=59.9)))
+        # CPU time unknown (-1)
+        self.assertFalse(self.breach(tool_run_result(1)))
+        self.assertFalse(self.breach(tool_run_result(1, cpu_secs=120),
+                            {dsp.C_TOOL_LIMIT_AS_MB_FIELD: 512}))
+
+    def test_stderr_marks(self):
+        for mark_S in dsp.C_LIMIT_STDERR_MARKS_L:
+            stderr_S = "Error: %s\n" % (mark_S)
+            self.assertTrue(self.breach(tool_run_result(1,
+                                                    stderr_S=stderr_S)))
+            # exit code 0, or no address space limit: not a breach
+            self.assertFalse(self.breach(tool_run_result(0,
+                                                    stderr_S=stderr_S)))
+            self.assertFalse(self.breach(tool_run_result(1,
+                    stderr_S=stderr_S), {dsp.C_TOOL_LIMIT_CPU_SECS_FIELD: 60}))
+        self.assertFalse(self.breach(tool_run_result(1,
+                                            stderr_S="bad PDF file\n")))
+
+@unittest.skipIf(not os.path.exists("/proc/self/stat"), "no /proc")
+class ProcUsageTest(unittest.TestCase):
+
+    def test_own_usage(self):
+        user_cpu_secs, sys_cpu_secs, max_rss_kb = \
+                                        dsp.read_proc_usage_T(os.getpid())
+        self.assertTrue(user_cpu_secs >= 0 and sys_cpu_secs >= 0)
+        self.assertTrue(max_rss_kb > 0)
+
+    def test_process_gone(self):
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        self.assertEqual(dsp.read_proc_usage_T(process.pid), None)
+
+    def test_samples_of_a_tool(self):
+        # ~64 MB resident, then ~1 CPU second
+        script_S = "import sys, time\n" \
+                   "data = bytearray(64 << 20)\n" \
+                   "end = time.time() + 1.0\n" \
+                   "while time.time() < end: pass\n" \
+                   "sys.stdout.write('out'); sys.stderr.write('err')\n" \
+                   "sys.exit(3)"
+        process = subprocess.Popen([sys.executable, "-c", script_S],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        result = dsp.ToolRunResult("verifier", "/tmp/a.pdf", 1000)
+        dsp.wait_with_proc_samples(process, result)
+        self.assertEqual((result.returncode, result.stdout_S,
+                          result.stderr_S), (3, "out", "err"))
+        self.assertTrue(0.5 < result.user_cpu_secs + result.sys_cpu_secs
+                                                                    < 1.5)
+        self.assertTrue(result.max_rss_kb > 60000)
+
+if __name__ == "__main__":
+    unittest.main()